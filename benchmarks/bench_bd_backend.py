@@ -0,0 +1,64 @@
+"""Micro-benchmark: per-call poll latency of the bd subprocess and daemon paths.
+
+Usage:
+    python benchmarks/bench_bd_backend.py --db /path/to/beads/db --label role-qa
+
+Requires ``bd`` on PATH. The daemon path is skipped when no bd daemon is
+listening on the database's socket.
+"""
+
+import argparse
+import statistics
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from bd_agent_chameleon.bd_daemon import BdDaemonClient
+from bd_agent_chameleon.beads_task_manager import BeadsTaskManager
+
+
+def _measure(poll: Callable[[], object], iterations: int) -> list[float]:
+    """Return per-call latencies in milliseconds."""
+    samples: list[float] = []
+    for _ in range(iterations):
+        start: float = time.perf_counter()
+        poll()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _report(name: str, samples: list[float]) -> None:
+    """Print mean, median and p99 latency for one backend."""
+    ordered: list[float] = sorted(samples)
+    p99: float = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{name:<12} n={len(samples):<5} mean={statistics.fmean(samples):8.3f} ms"
+        f"  p50={statistics.median(samples):8.3f} ms  p99={p99:8.3f} ms"
+    )
+
+
+def main() -> None:
+    """Run both backends against the same database and label."""
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db", type=Path, required=True)
+    parser.add_argument("--label", default="role-bench")
+    parser.add_argument("--iterations", type=int, default=200)
+    args: argparse.Namespace = parser.parse_args()
+
+    subprocess_mgr: BeadsTaskManager = BeadsTaskManager(args.db)
+    _report(
+        "subprocess",
+        _measure(lambda: subprocess_mgr.poll(args.label), args.iterations),
+    )
+
+    daemon: BdDaemonClient = BdDaemonClient.for_db(args.db)
+    if not daemon.connect():
+        print("daemon       skipped: no bd daemon listening")
+        return
+    daemon_mgr: BeadsTaskManager = BeadsTaskManager(args.db, daemon)
+    _report("daemon", _measure(lambda: daemon_mgr.poll(args.label), args.iterations))
+    daemon.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""End-to-end throughput benchmark for the poll-claim-launch loop.
+
+Usage:
+    python benchmarks/bench_loop.py --workers 1,10,100 --tasks 10,1000,100000
+    python benchmarks/bench_loop.py --json baseline.json
+    python benchmarks/bench_loop.py --compare baseline.json
+
+Runs entirely offline. ``benchmarks/fakes`` is put first on PATH, so that
+``bd`` is a stand-in backed by a beads-shaped SQLite database and ``claude``
+is a stand-in that sleeps for ``--session-seconds``. Each worker is a separate
+process running a real ``Chameleon`` with ``BeadsTaskManager`` and
+``ClaudeLauncher``, and exits once a poll finds the queue empty.
+
+Reported per scenario: completed tasks per second, claim-to-launch latency
+percentiles, mean poll cost, and peak RSS per worker process.
+"""
+
+import argparse
+import json
+import os
+import resource
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+from bd_agent_chameleon.beads_task_manager import BeadsTaskManager
+from bd_agent_chameleon.chameleon import Chameleon
+from bd_agent_chameleon.claude_launcher import ClaudeLauncher
+from bd_agent_chameleon.config_manager import ConfigManager
+from bd_agent_chameleon.leases import default_owner
+from bd_agent_chameleon.models import Task
+from bd_agent_chameleon.protocols import ClaimConflictError
+from bd_agent_chameleon.selection import SelectionStrategy, create_selector
+from bd_agent_chameleon.sqlite_reader import SqliteTaskReader
+
+FAKES_DIR: Path = Path(__file__).resolve().parent / "fakes"
+ROLE_NAME: str = "bench"
+LABEL: str = f"role-{ROLE_NAME}"
+
+
+class _InstrumentedTaskManager(BeadsTaskManager):
+    """BeadsTaskManager that times polls, stamps claims, and stops when idle."""
+
+    def __init__(
+        self, db: Path, reader: SqliteTaskReader | None, poll_limit: int | None,
+    ) -> None:
+        """Wrap a real manager over the benchmark database."""
+        super().__init__(db, reader=reader, poll_limit=poll_limit)
+        self.poll_ms: list[float] = []
+        self.claimed_at: dict[str, float] = {}
+        self.conflicts: int = 0
+        self.chameleon: Chameleon | None = None
+
+    def poll(self, label: str) -> list[Task]:
+        """Poll, recording its cost, and shut down once nothing is open."""
+        start: float = time.perf_counter()
+        tasks: list[Task] = super().poll(label)
+        self.poll_ms.append((time.perf_counter() - start) * 1000)
+        if not tasks and self.chameleon is not None:
+            self.chameleon.shutdown()
+        return tasks
+
+    def claim(self, task_id: str) -> None:
+        """Claim, counting lost races, and stamp the time."""
+        try:
+            super().claim(task_id)
+        except ClaimConflictError:
+            self.conflicts += 1
+            raise
+        self.claimed_at[task_id] = time.time()
+
+
+def _run_worker(args: argparse.Namespace) -> None:
+    """Serve the benchmark role until the queue is empty, then write stats."""
+    reader: SqliteTaskReader | None = (
+        SqliteTaskReader(args.db, args.poll_limit) if args.sqlite_poll else None
+    )
+    task_mgr: _InstrumentedTaskManager = _InstrumentedTaskManager(
+        args.db, reader, args.poll_limit,
+    )
+    chameleon: Chameleon = Chameleon(
+        ConfigManager(args.config),
+        task_mgr,
+        ClaudeLauncher(),
+        ROLE_NAME,
+        timedelta(0),
+        selector=create_selector(
+            SelectionStrategy(args.select), default_owner(), args.select_window,
+        ),
+    )
+    task_mgr.chameleon = chameleon
+    chameleon.run()
+    stats: dict[str, Any] = {
+        "claimed_at": task_mgr.claimed_at,
+        "poll_ms": task_mgr.poll_ms,
+        "conflicts": task_mgr.conflicts,
+        "maxrss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+    args.out.write_text(json.dumps(stats))
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    """Return the value at ``fraction`` of a sorted list."""
+    if not ordered:
+        return float("nan")
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _run_scenario(
+    workers: int, tasks: int, args: argparse.Namespace,
+) -> dict[str, float]:
+    """Seed a queue, drain it with ``workers`` processes, and measure."""
+    with tempfile.TemporaryDirectory(prefix="chameleon-bench-") as tmp:
+        root: Path = Path(tmp)
+        db: Path = root / "beads"
+        db.mkdir()
+        config: Path = root / "roles.toml"
+        config.write_text(f'[{ROLE_NAME}]\nprompt = "Bench."\ninteractive = false\n')
+        launches: Path = root / "launches.log"
+        env: dict[str, str] = {
+            **os.environ,
+            "PATH": f"{FAKES_DIR}{os.pathsep}{os.environ.get('PATH', '')}",
+            "FAKE_CLAUDE_SECONDS": str(args.session_seconds),
+            "FAKE_CLAUDE_LOG": str(launches),
+        }
+        subprocess.run(
+            [
+                "bd", "seed", "--db", str(db), "--count", str(tasks),
+                "--label", LABEL, "--description-bytes", str(args.description_bytes),
+            ],
+            env=env, check=True, stdout=subprocess.DEVNULL,
+        )
+
+        outs: list[Path] = [root / f"worker-{i}.json" for i in range(workers)]
+        cmd: list[str] = [
+            sys.executable, __file__, "--worker",
+            "--db", str(db), "--config", str(config),
+            "--select", args.select, "--select-window", str(args.select_window),
+        ]
+        if args.sqlite_poll:
+            cmd.append("--sqlite-poll")
+        if args.poll_limit is not None:
+            cmd += ["--poll-limit", str(args.poll_limit)]
+        start: float = time.perf_counter()
+        procs: list[subprocess.Popen[bytes]] = [
+            subprocess.Popen([*cmd, "--out", str(out)], env=env) for out in outs
+        ]
+        for proc in procs:
+            proc.wait()
+        elapsed: float = time.perf_counter() - start
+
+        conn: sqlite3.Connection = sqlite3.connect(db / "beads.db")
+        (completed,) = conn.execute(
+            "SELECT COUNT(*) FROM issues WHERE status = 'closed'",
+        ).fetchone()
+        conn.close()
+
+        stats: list[dict[str, Any]] = [
+            json.loads(out.read_text()) for out in outs if out.exists()
+        ]
+        claimed_at: dict[str, float] = {}
+        for worker_stats in stats:
+            claimed_at.update(worker_stats["claimed_at"])
+        latencies: list[float] = []
+        for line in launches.read_text().splitlines() if launches.exists() else []:
+            title, launched = line.rsplit(" ", 1)
+            if title in claimed_at:
+                latencies.append((float(launched) - claimed_at[title]) * 1000)
+        latencies.sort()
+        polls: list[float] = [ms for s in stats for ms in s["poll_ms"]]
+        rss_mb: list[float] = [s["maxrss_kb"] / 1024 for s in stats]
+
+    return {
+        "workers": workers,
+        "tasks": tasks,
+        "completed": completed,
+        "seconds": elapsed,
+        "tasks_per_sec": completed / elapsed if elapsed else 0.0,
+        "claim_to_launch_p50_ms": _percentile(latencies, 0.50),
+        "claim_to_launch_p90_ms": _percentile(latencies, 0.90),
+        "claim_to_launch_p99_ms": _percentile(latencies, 0.99),
+        "claim_conflicts": sum(s["conflicts"] for s in stats),
+        "polls": len(polls),
+        "poll_mean_ms": statistics.fmean(polls) if polls else float("nan"),
+        "worker_rss_max_mb": max(rss_mb, default=float("nan")),
+        "worker_rss_mean_mb": statistics.fmean(rss_mb) if rss_mb else float("nan"),
+    }
+
+
+def _report(result: dict[str, float], baseline: dict[str, float] | None) -> None:
+    """Print one scenario, with deltas against a baseline when given."""
+    line: str = (
+        f"workers={result['workers']:<4.0f} tasks={result['tasks']:<7.0f}"
+        f" {result['tasks_per_sec']:9.1f} tasks/s"
+        f"  claim->launch p50={result['claim_to_launch_p50_ms']:7.1f}"
+        f" p90={result['claim_to_launch_p90_ms']:7.1f}"
+        f" p99={result['claim_to_launch_p99_ms']:7.1f} ms"
+        f"  poll={result['poll_mean_ms']:7.2f} ms x{result['polls']:.0f}"
+        f"  conflicts={result['claim_conflicts']:.0f}"
+        f"  rss={result['worker_rss_max_mb']:6.1f} MB"
+    )
+    if baseline is not None:
+        before: float = baseline["tasks_per_sec"]
+        change: float = (result["tasks_per_sec"] - before) / before * 100
+        line += f"  ({change:+.1f}% tasks/s vs baseline)"
+    print(line, flush=True)
+
+
+def _int_list(value: str) -> list[int]:
+    """Parse a comma-separated list of integers."""
+    return [int(part) for part in value.split(",")]
+
+
+def main() -> None:
+    """Run every workers x tasks scenario and report, save, or compare."""
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--workers", type=_int_list, default=[1, 10])
+    parser.add_argument("--tasks", type=_int_list, default=[10, 1000])
+    parser.add_argument("--session-seconds", type=float, default=0.0)
+    parser.add_argument("--description-bytes", type=int, default=200)
+    parser.add_argument("--sqlite-poll", action="store_true")
+    parser.add_argument("--poll-limit", type=int)
+    parser.add_argument(
+        "--select",
+        choices=[strategy.value for strategy in SelectionStrategy],
+        default=SelectionStrategy.FIRST.value,
+    )
+    parser.add_argument("--select-window", type=int, default=8)
+    parser.add_argument("--json", type=Path, help="write results to this file")
+    parser.add_argument("--compare", type=Path, help="baseline results to diff")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--db", type=Path, help=argparse.SUPPRESS)
+    parser.add_argument("--config", type=Path, help=argparse.SUPPRESS)
+    parser.add_argument("--out", type=Path, help=argparse.SUPPRESS)
+    args: argparse.Namespace = parser.parse_args()
+
+    if args.worker:
+        _run_worker(args)
+        return
+
+    baselines: dict[str, dict[str, float]] = (
+        json.loads(args.compare.read_text()) if args.compare else {}
+    )
+    results: dict[str, dict[str, float]] = {}
+    for tasks in args.tasks:
+        for workers in args.workers:
+            key: str = f"w{workers}-t{tasks}"
+            results[key] = _run_scenario(workers, tasks, args)
+            _report(results[key], baselines.get(key))
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
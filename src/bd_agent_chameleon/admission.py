@@ -0,0 +1,259 @@
+"""Host-load admission control and cross-process token buckets for session launches."""
+
+import fcntl
+import logging
+import os
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from bd_agent_chameleon.models import Role
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+_PROC: Path = Path("/proc")
+
+
+def default_admission_dir() -> Path:
+    """Return the per-user directory that holds this host's bucket files."""
+    base: str = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return Path(base) / f"bd-agent-chameleon-{os.getuid()}" / "admission"
+
+
+@dataclass(frozen=True)
+class HostSample:
+    """One reading of the host's load signals; None where unavailable."""
+
+    load_per_cpu: float
+    available_mb: float | None = None
+    cpu_pressure: float | None = None
+    memory_pressure: float | None = None
+
+
+def _pressure(path: Path) -> float | None:
+    """Return the ``some avg10`` stall percentage from a PSI file."""
+    try:
+        text: str = path.read_text()
+    except OSError:
+        return None
+    for line in text.splitlines():
+        fields: list[str] = line.split()
+        if fields and fields[0] == "some":
+            for field in fields[1:]:
+                key, _, value = field.partition("=")
+                if key == "avg10":
+                    return float(value)
+    return None
+
+
+def _available_mb(path: Path) -> float | None:
+    """Return MemAvailable from a meminfo file, in MiB."""
+    try:
+        with open(path) as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+def read_host_sample(proc: Path = _PROC) -> HostSample:
+    """Read load average, available memory, and PSI pressure from ``proc``."""
+    return HostSample(
+        load_per_cpu=os.getloadavg()[0] / (os.cpu_count() or 1),
+        available_mb=_available_mb(proc / "meminfo"),
+        cpu_pressure=_pressure(proc / "pressure" / "cpu"),
+        memory_pressure=_pressure(proc / "pressure" / "memory"),
+    )
+
+
+def _exceeds(value: float | None, limit: float | None) -> bool:
+    """Return whether both are known and ``value`` is above ``limit``."""
+    return value is not None and limit is not None and value > limit
+
+
+@dataclass(frozen=True)
+class HostLimits:
+    """Thresholds past which the host is too busy to start another session.
+
+    Pressure limits are PSI ``some avg10`` percentages. None disables a check,
+    and so does a signal the host does not provide.
+    """
+
+    max_load_per_cpu: float | None = None
+    min_available_mb: float | None = None
+    max_cpu_pressure: float | None = None
+    max_memory_pressure: float | None = None
+
+    def violation(self, sample: HostSample) -> str | None:
+        """Describe the first limit the sample breaks, or return None."""
+        if _exceeds(sample.load_per_cpu, self.max_load_per_cpu):
+            return f"load {sample.load_per_cpu:.2f} per CPU"
+        if _exceeds(self.min_available_mb, sample.available_mb):
+            return f"{sample.available_mb:.0f} MiB available"
+        if _exceeds(sample.cpu_pressure, self.max_cpu_pressure):
+            return f"CPU pressure {sample.cpu_pressure}%"
+        if _exceeds(sample.memory_pressure, self.max_memory_pressure):
+            return f"memory pressure {sample.memory_pressure}%"
+        return None
+
+    @property
+    def enabled(self) -> bool:
+        """Return whether any limit is set, so that sampling the host matters."""
+        return any(
+            limit is not None
+            for limit in (
+                self.max_load_per_cpu,
+                self.min_available_mb,
+                self.max_cpu_pressure,
+                self.max_memory_pressure,
+            )
+        )
+
+
+class FileTokenBucket:
+    """Token bucket whose state lives in a file shared by every process on a host.
+
+    Each take locks the file with ``flock``, refills the bucket for the time
+    since the last update, and writes it back, so workers in separate
+    processes draw from one budget. ``rate`` is tokens per second and
+    ``burst`` the bucket's capacity.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        rate: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Use the bucket stored at ``path``, creating its directory if needed."""
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        if burst < 1:
+            raise ValueError(f"burst must be at least 1, got {burst}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._path: Path = path
+        self._rate: float = rate
+        self._burst: int = burst
+        self._clock: Callable[[], float] = clock
+
+    def _update(self, change: Callable[[float], tuple[float, float]]) -> float:
+        """Apply ``change`` to the refilled token count under the file lock.
+
+        ``change`` maps the current tokens to the new tokens and a result,
+        which is returned.
+        """
+        fd: int = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            now: float = self._clock()
+            tokens: float = float(self._burst)
+            try:
+                stored_tokens, stored_at = os.pread(fd, 64, 0).split()
+                elapsed: float = max(0.0, now - float(stored_at))
+                tokens = min(self._burst, float(stored_tokens) + elapsed * self._rate)
+            except ValueError:
+                pass
+            tokens, result = change(tokens)
+            state: bytes = f"{tokens:.6f} {now:.6f}".encode()
+            os.ftruncate(fd, 0)
+            os.pwrite(fd, state, 0)
+            return result
+        finally:
+            os.close(fd)
+
+    def try_take(self) -> float:
+        """Take one token and return 0.0, or return the seconds until one is due."""
+
+        def take(tokens: float) -> tuple[float, float]:
+            """Spend a token if there is a whole one."""
+            if tokens >= 1:
+                return tokens - 1, 0.0
+            return tokens, (1 - tokens) / self._rate
+
+        return self._update(take)
+
+    def give_back(self) -> None:
+        """Return a token taken for a launch that did not go ahead."""
+        self._update(lambda tokens: (min(self._burst, tokens + 1), 0.0))
+
+
+class HostAdmissionController:
+    """Admits a session only while the host is healthy and both buckets allow it.
+
+    Host signals are checked first, so a busy host spends no tokens. Then
+    the role's bucket, sized by its ``launches_per_minute`` and
+    ``launch_burst``, and the host-wide bucket are drawn from. If the host
+    bucket is empty, the role's token is given back. Role buckets are files
+    in ``bucket_dir``, shared by every worker serving the role on this host.
+    """
+
+    def __init__(
+        self,
+        limits: HostLimits | None = None,
+        host_bucket: FileTokenBucket | None = None,
+        bucket_dir: Path | None = None,
+        recheck: float = 1.0,
+        sampler: Callable[[], HostSample] = read_host_sample,
+    ) -> None:
+        """Initialize with host limits, buckets, and the host recheck delay."""
+        self._limits: HostLimits = limits if limits is not None else HostLimits()
+        self._host_bucket: FileTokenBucket | None = host_bucket
+        self._bucket_dir: Path = (
+            bucket_dir if bucket_dir is not None else default_admission_dir()
+        )
+        self._role_buckets: dict[tuple[str, float, int], FileTokenBucket] = {}
+        self._recheck: float = recheck
+        self._sampler: Callable[[], HostSample] = sampler
+
+    def _role_bucket(self, role: Role) -> FileTokenBucket | None:
+        """Return the role's bucket, rebuilt whenever its configured rate changes."""
+        if role.launches_per_minute is None:
+            return None
+        key: tuple[str, float, int] = (
+            role.name, role.launches_per_minute, role.launch_burst,
+        )
+        bucket: FileTokenBucket | None = self._role_buckets.get(key)
+        if bucket is None:
+            bucket = FileTokenBucket(
+                self._bucket_dir / f"role-{role.name}.bucket",
+                role.launches_per_minute / 60,
+                role.launch_burst,
+            )
+            self._role_buckets[key] = bucket
+        return bucket
+
+    def admit(self, role: Role) -> float:
+        """Take a launch slot for the role and return 0.0, or the seconds to wait."""
+        reason: str | None = (
+            self._limits.violation(self._sampler()) if self._limits.enabled else None
+        )
+        if reason is not None:
+            logger.info("deferring a %s session: %s", role.name, reason)
+            return self._recheck
+        role_bucket: FileTokenBucket | None = self._role_bucket(role)
+        if role_bucket is not None:
+            wait: float = role_bucket.try_take()
+            if wait > 0:
+                logger.info("deferring a %s session: role launch rate", role.name)
+                return wait
+        if self._host_bucket is not None:
+            wait = self._host_bucket.try_take()
+            if wait > 0:
+                if role_bucket is not None:
+                    role_bucket.give_back()
+                logger.info("deferring a %s session: host launch rate", role.name)
+                return wait
+        return 0.0
+
+    def refund(self, role: Role) -> None:
+        """Give back the role and host tokens taken for a launch that never ran."""
+        role_bucket: FileTokenBucket | None = self._role_bucket(role)
+        if role_bucket is not None:
+            role_bucket.give_back()
+        if self._host_bucket is not None:
+            self._host_bucket.give_back()
@@ -0,0 +1,336 @@
+"""Asyncio implementations of the task manager and session launcher protocols."""
+
+import asyncio
+import json
+import signal
+import subprocess
+import sys
+from collections.abc import Collection, Coroutine
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from bd_agent_chameleon.beads_task_manager import (
+    CLAIM_CONFLICT_MARKER,
+    DescriptionCache,
+    ParsedTaskCache,
+    _shown_description,
+    open_entries,
+    park_args,
+    ready_args,
+    release_args,
+)
+from bd_agent_chameleon.claude_launcher import ARGV_PROMPT_LIMIT, ClaudeLauncher
+from bd_agent_chameleon.models import Role, SessionOutcome, Task
+from bd_agent_chameleon.protocols import (
+    ClaimConflictError,
+    SessionFailedError,
+    SessionLauncher,
+    TaskManager,
+)
+from bd_agent_chameleon.session_log import CHUNK_SIZE, RotatingLog
+
+
+class ThreadedTaskManager:
+    """AsyncTaskManager that runs a synchronous TaskManager on worker threads."""
+
+    def __init__(self, task_mgr: TaskManager) -> None:
+        """Wrap the synchronous task manager."""
+        self._task_mgr: TaskManager = task_mgr
+
+    async def poll(self, label: str) -> list[Task]:
+        """List open tasks matching the given label."""
+        return await asyncio.to_thread(self._task_mgr.poll, label)
+
+    async def poll_any(self, labels: list[str]) -> list[Task]:
+        """List open tasks carrying at least one of the given labels."""
+        return await asyncio.to_thread(self._task_mgr.poll_any, labels)
+
+    async def claim(self, task_id: str) -> None:
+        """Claim a task."""
+        await asyncio.to_thread(self._task_mgr.claim, task_id)
+
+    async def describe(self, task: Task) -> Task:
+        """Return the task with its full description."""
+        return await asyncio.to_thread(self._task_mgr.describe, task)
+
+    async def complete(self, task_id: str) -> None:
+        """Complete a task."""
+        await asyncio.to_thread(self._task_mgr.complete, task_id)
+
+    async def release(self, task_id: str) -> None:
+        """Release a claimed task."""
+        await asyncio.to_thread(self._task_mgr.release, task_id)
+
+    async def park(self, task_id: str) -> None:
+        """Park a task that keeps failing."""
+        await asyncio.to_thread(self._task_mgr.park, task_id)
+
+    async def claim_next(
+        self, label: str, exclude: Collection[str] = (),
+    ) -> Task | None:
+        """Claim one open task carrying the label and return it, or None."""
+        return await asyncio.to_thread(self._task_mgr.claim_next, label, exclude)
+
+
+class ThreadedSessionLauncher:
+    """AsyncSessionLauncher that runs a synchronous launcher on a worker thread."""
+
+    def __init__(self, launcher: SessionLauncher) -> None:
+        """Wrap the synchronous launcher."""
+        self._launcher: SessionLauncher = launcher
+
+    async def launch(self, role: Role, task: Task) -> None:
+        """Launch a session and wait for it to finish."""
+        await asyncio.to_thread(self._launcher.launch, role, task)
+
+
+class AsyncBeadsTaskManager:
+    """AsyncTaskManager that runs the bd CLI with ``create_subprocess_exec``.
+
+    Like ``BeadsTaskManager``, polls return at most ``poll_limit`` summaries
+    and ``describe`` fetches a task's description with ``bd show``.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        poll_limit: int | None = None,
+        descriptions: DescriptionCache | None = None,
+    ) -> None:
+        """Initialize with the path to the beads database directory."""
+        self._db_path: Path = db_path
+        self._poll_limit: int | None = poll_limit
+        self._descriptions: DescriptionCache = (
+            descriptions if descriptions is not None else DescriptionCache()
+        )
+        self._parsed: ParsedTaskCache = ParsedTaskCache()
+
+    async def _run_bd(self, args: list[str]) -> Any:
+        """Execute a bd CLI command and return parsed JSON output."""
+        cmd: list[str] = ["bd", *args, "--json", "--db", str(self._db_path)]
+        proc: asyncio.subprocess.Process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await proc.communicate()
+        if proc.returncode:
+            raise subprocess.CalledProcessError(
+                proc.returncode, cmd, stdout.decode(), stderr.decode(),
+            )
+        return json.loads(stdout)
+
+    async def _list(self, labels: list[str], any_label: bool) -> list[Task]:
+        """List open task summaries carrying the labels."""
+        raw: list[dict[str, Any]] | None = await self._run_bd(
+            ready_args(labels, any_label, self._poll_limit),
+        )
+        return self._parsed.parse(open_entries(raw, self._poll_limit), summary=True)
+
+    async def poll(self, label: str) -> list[Task]:
+        """List open task summaries matching the given label."""
+        return await self._list([label], any_label=False)
+
+    async def poll_any(self, labels: list[str]) -> list[Task]:
+        """List open task summaries carrying at least one of the given labels."""
+        return await self._list(labels, any_label=True)
+
+    async def claim(self, task_id: str) -> None:
+        """Claim a task, raising ``ClaimConflictError`` if it is already claimed."""
+        try:
+            await self._run_bd(["update", task_id, "--claim"])
+        except subprocess.CalledProcessError as exc:
+            if CLAIM_CONFLICT_MARKER in (exc.stderr or "").lower():
+                raise ClaimConflictError(task_id) from exc
+            raise
+
+    async def describe(self, task: Task) -> Task:
+        """Return the task with its full description, fetching it for a summary."""
+        if not task.summary:
+            return task
+        description: str | None = self._descriptions.get(task.id)
+        if description is None:
+            description = _shown_description(
+                await self._run_bd(["show", task.id]),
+            )
+            self._descriptions.put(task.id, description)
+        return replace(task, description=description, summary=False)
+
+    async def complete(self, task_id: str) -> None:
+        """Complete a task by closing it."""
+        await self._run_bd(["close", task_id])
+        self._descriptions.discard(task_id)
+
+    async def release(self, task_id: str) -> None:
+        """Release a claimed task by reopening it and clearing its assignee."""
+        await self._run_bd(release_args(task_id))
+
+    async def park(self, task_id: str) -> None:
+        """Park a task by blocking it and clearing its assignee."""
+        await self._run_bd(park_args(task_id))
+        self._descriptions.discard(task_id)
+
+    async def claim_next(
+        self, label: str, exclude: Collection[str] = (),
+    ) -> Task | None:
+        """Poll the label and claim the first open task no one else holds."""
+        for task in await self.poll(label):
+            if task.id in exclude:
+                continue
+            try:
+                await self.claim(task.id)
+            except ClaimConflictError:
+                continue
+            return task
+        return None
+
+
+class AsyncClaudeLauncher:
+    """AsyncSessionLauncher that runs the Claude CLI with ``create_subprocess_exec``.
+
+    Commands and prompt transport are shared with ``ClaudeLauncher``. With a
+    ``log_dir``, non-interactive output is streamed into per-task rotating
+    logs; otherwise the session inherits the worker's stdout and stderr.
+    Role timeouts, CPU and memory caps, and SIGTERM-then-SIGKILL escalation
+    work as in ``ClaudeLauncher``.
+    """
+
+    def __init__(
+        self,
+        log_dir: Path | None = None,
+        max_log_bytes: int = 64 * 1024 * 1024,
+        log_backups: int = 1,
+        tee: bool = False,
+        argv_prompt_limit: int = ARGV_PROMPT_LIMIT,
+        kill_grace: float = 10.0,
+    ) -> None:
+        """Configure output capture, prompt transport, and kill escalation."""
+        self._invocations: ClaudeLauncher = ClaudeLauncher(
+            argv_prompt_limit=argv_prompt_limit,
+        )
+        self._log_dir: Path | None = log_dir
+        self._max_log_bytes: int = max_log_bytes
+        self._log_backups: int = log_backups
+        self._tee: bool = tee
+        self._kill_grace: float = kill_grace
+
+    @staticmethod
+    async def _feed(proc: asyncio.subprocess.Process, data: bytes) -> None:
+        """Write the prompt to the session's stdin and close it."""
+        assert proc.stdin is not None
+        try:
+            proc.stdin.write(data)
+            await proc.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        proc.stdin.close()
+
+    @staticmethod
+    async def _pump(
+        stream: asyncio.StreamReader, log: RotatingLog, tee: BinaryIO | None,
+    ) -> None:
+        """Copy one output stream into the log in bounded chunks."""
+        while chunk := await stream.read(CHUNK_SIZE):
+            log.write(chunk)
+            if tee is not None:
+                tee.write(chunk)
+                tee.flush()
+
+    @staticmethod
+    async def _spawn(
+        cmd: list[str], role: Role, group: bool, **kwargs: Any,
+    ) -> asyncio.subprocess.Process:
+        """Start a session process and cap it, killing it if the caps fail."""
+        proc: asyncio.subprocess.Process = await asyncio.create_subprocess_exec(
+            *cmd, start_new_session=group, **kwargs,
+        )
+        try:
+            ClaudeLauncher.apply_limits(proc.pid, role)
+        except BaseException:
+            ClaudeLauncher.signal_session(proc.pid, signal.SIGKILL, group)
+            await proc.wait()
+            raise
+        return proc
+
+    async def _supervise(
+        self,
+        proc: asyncio.subprocess.Process,
+        work: asyncio.Future[Any],
+        timeout: float | None,
+        group: bool,
+    ) -> bool:
+        """Wait for a session, stopping it once it overruns; return if it did.
+
+        Output pumps in ``work`` keep running while the session shuts down.
+        """
+        done, _ = await asyncio.wait({work}, timeout=timeout)
+        if done:
+            await work
+            return False
+        ClaudeLauncher.signal_session(proc.pid, signal.SIGTERM, group)
+        done, _ = await asyncio.wait({work}, timeout=self._kill_grace)
+        if not done or group:
+            ClaudeLauncher.signal_session(proc.pid, signal.SIGKILL, group)
+        await work
+        return True
+
+    async def launch(self, role: Role, task: Task) -> None:
+        """Run a Claude session for the given role and task to completion.
+
+        Raises ``SessionFailedError`` if the session timed out or exited
+        non-zero.
+        """
+        cmd, stdin_data, prompt_file = self._invocations.prepare(role, task)
+        capture: bool = self._log_dir is not None and not role.interactive
+        group: bool = capture or not sys.stdin.isatty()
+        pipe: int | None = asyncio.subprocess.PIPE if capture else None
+        try:
+            proc: asyncio.subprocess.Process = await self._spawn(
+                cmd,
+                role,
+                group,
+                stdin=None if stdin_data is None else asyncio.subprocess.PIPE,
+                stdout=pipe,
+                stderr=pipe,
+            )
+            jobs: list[Coroutine[Any, Any, None]] = []
+            if stdin_data is not None:
+                jobs.append(self._feed(proc, stdin_data))
+            log: RotatingLog | None = None
+            if capture:
+                assert self._log_dir is not None
+                assert proc.stdout is not None
+                assert proc.stderr is not None
+                log = RotatingLog(
+                    self._log_dir / f"{task.id}.log",
+                    self._max_log_bytes,
+                    self._log_backups,
+                )
+                jobs.append(self._pump(
+                    proc.stdout, log, sys.stdout.buffer if self._tee else None,
+                ))
+                jobs.append(self._pump(
+                    proc.stderr, log, sys.stderr.buffer if self._tee else None,
+                ))
+            work: asyncio.Future[Any] = asyncio.gather(*jobs, proc.wait())
+            try:
+                timed_out: bool = await self._supervise(
+                    proc, work, role.timeout_seconds, group,
+                )
+            except BaseException:
+                work.cancel()
+                ClaudeLauncher.signal_session(proc.pid, signal.SIGKILL, group)
+                await proc.wait()
+                raise
+            finally:
+                if log is not None:
+                    log.close()
+        finally:
+            if prompt_file is not None:
+                prompt_file.unlink(missing_ok=True)
+        if timed_out:
+            raise SessionFailedError(task.id, SessionOutcome.TIMED_OUT)
+        if proc.returncode != 0:
+            raise SessionFailedError(task.id, SessionOutcome.FAILED, proc.returncode)
@@ -0,0 +1,223 @@
+"""Asyncio-native orchestrator that multiplexes many sessions on one event loop."""
+
+import asyncio
+import logging
+import signal
+from collections.abc import Sequence
+from datetime import timedelta
+
+from bd_agent_chameleon.config_manager import ConfigManager
+from bd_agent_chameleon.models import Role, Task
+from bd_agent_chameleon.poll_scheduler import PollBackoff, RetryTracker
+from bd_agent_chameleon.protocols import (
+    AdmissionController,
+    AsyncSessionLauncher,
+    AsyncTaskManager,
+    CandidateSelector,
+    ClaimConflictError,
+    SessionFailedError,
+)
+from bd_agent_chameleon.selection import FirstSelector
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+class AsyncChameleon:
+    """Event-loop counterpart of ``Chameleon``.
+
+    Every session is an ``asyncio`` task rather than a thread, so one process
+    can keep hundreds of sessions in flight while it keeps polling. Up to
+    ``concurrency`` sessions run at once, subject to each role's
+    ``max_concurrency``. Interactive sessions share the terminal, so only
+    one of them runs at a time. Role resolution, backoff, candidate selection, and
+    claim-conflict handling match the threaded orchestrator.
+    """
+
+    def __init__(
+        self,
+        config_mgr: ConfigManager,
+        task_mgr: AsyncTaskManager,
+        launcher: AsyncSessionLauncher,
+        role_name: str | Sequence[str],
+        poll_interval: timedelta = timedelta(seconds=2),
+        concurrency: int = 1,
+        backoff: PollBackoff | None = None,
+        selector: CandidateSelector | None = None,
+        admission: AdmissionController | None = None,
+        retries: RetryTracker | None = None,
+    ) -> None:
+        """Initialize with injected dependencies and role configuration.
+
+        With ``admission``, a role's tasks are claimed only once the
+        controller admits a session for it; refused roles wait for a later
+        poll, and the slot is refunded if the claim is then lost. ``retries``
+        spaces out new attempts at a task whose session failed and parks it
+        once it has failed too often.
+        """
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        role_names: tuple[str, ...] = (
+            (role_name,) if isinstance(role_name, str) else tuple(role_name)
+        )
+        if not role_names:
+            raise ValueError("at least one role name is required")
+        self._config_mgr: ConfigManager = config_mgr
+        self._task_mgr: AsyncTaskManager = task_mgr
+        self._launcher: AsyncSessionLauncher = launcher
+        self._role_names: tuple[str, ...] = role_names
+        self._backoff: PollBackoff = (
+            backoff if backoff is not None else PollBackoff(poll_interval)
+        )
+        self._concurrency: int = concurrency
+        self._selector: CandidateSelector = (
+            selector if selector is not None else FirstSelector()
+        )
+        self._admission: AdmissionController | None = admission
+        self._retries: RetryTracker = (
+            retries if retries is not None else RetryTracker()
+        )
+        self._stopping: asyncio.Event = asyncio.Event()
+        self._roles: dict[str, Role] = {}
+        self._sessions: dict[asyncio.Task[None], tuple[Role, Task]] = {}
+
+    def _load_roles(self) -> None:
+        """Resolve the configured role names, indexed by label."""
+        roles: list[Role] = [self._config_mgr.load_role(n) for n in self._role_names]
+        self._roles = {role.label: role for role in roles}
+
+    def _role_for(self, task: Task) -> Role | None:
+        """Pick the role that should run a task, if that role has a free slot."""
+        role: Role | None
+        if len(self._roles) == 1:
+            role = next(iter(self._roles.values()))
+        else:
+            role = next(
+                (self._roles[label] for label in task.labels if label in self._roles),
+                None,
+            )
+        if role is None:
+            return None
+        running: list[Role] = [r for r, _ in self._sessions.values()]
+        if role.interactive and any(r.interactive for r in running):
+            return None
+        if role.max_concurrency is None:
+            return role
+        busy: int = sum(1 for r in running if r.name == role.name)
+        return role if busy < role.max_concurrency else None
+
+    async def _poll_tasks(self) -> list[Task]:
+        """Poll once for open tasks across every served label."""
+        labels: list[str] = list(self._roles)
+        if len(labels) == 1:
+            return await self._task_mgr.poll(labels[0])
+        return await self._task_mgr.poll_any(labels)
+
+    async def _fill_slots(self) -> int:
+        """Poll, then claim and start sessions for free slots; return how many."""
+        self._reap()
+        self._load_roles()
+        tasks: list[Task] = self._selector.order(await self._poll_tasks())
+        running: set[str] = {task.id for _, task in self._sessions.values()}
+        deferred: set[str] = set()
+        started: int = 0
+        for task in tasks:
+            if self._stopping.is_set() or len(self._sessions) >= self._concurrency:
+                break
+            role: Role | None = self._role_for(task)
+            if task.id in running or not task.ready or role is None:
+                continue
+            if self._retries.cooling(task.id):
+                continue
+            if role.name in deferred:
+                continue
+            if self._admission is not None and self._admission.admit(role) > 0:
+                deferred.add(role.name)
+                continue
+            try:
+                await self._task_mgr.claim(task.id)
+            except ClaimConflictError:
+                logger.info("task %s was claimed by another worker", task.id)
+                if self._admission is not None:
+                    self._admission.refund(role)
+                continue
+            session: asyncio.Task[None] = asyncio.create_task(
+                self._run_session(role, task), name=f"session-{task.id}",
+            )
+            self._sessions[session] = (role, task)
+            started += 1
+        return started
+
+    async def _run_session(self, role: Role, task: Task) -> None:
+        """Describe a claimed task, launch its session, then complete or release it.
+
+        A task that has failed as often as ``retries`` allows is parked
+        instead of released.
+        """
+        task = await self._task_mgr.describe(task)
+        try:
+            await self._launcher.launch(role, task)
+        except SessionFailedError as exc:
+            if self._retries.failed(task.id):
+                logger.warning("%s; parking the task after repeated failures", exc)
+                await self._task_mgr.park(task.id)
+            else:
+                logger.warning("%s; releasing the task", exc)
+                await self._task_mgr.release(task.id)
+            return
+        self._retries.succeeded(task.id)
+        await self._task_mgr.complete(task.id)
+
+    def _reap(self) -> None:
+        """Forget finished sessions, re-raising any error they ended with."""
+        done: list[asyncio.Task[None]] = [s for s in self._sessions if s.done()]
+        for session in done:
+            del self._sessions[session]
+        for session in done:
+            session.result()
+
+    async def _idle(self, found_work: bool) -> None:
+        """Wait until it is worth polling again.
+
+        With every slot busy this waits for a session to end. Otherwise it
+        returns at once after finding work, or waits out the backoff interval
+        (cut short by a session ending) after an empty poll.
+        """
+        full: bool = len(self._sessions) >= self._concurrency
+        if found_work and not full:
+            return
+        timeout: float | None = (
+            None if full else self._backoff.next_interval().total_seconds()
+        )
+        stop: asyncio.Task[bool] = asyncio.create_task(self._stopping.wait())
+        try:
+            await asyncio.wait(
+                {stop, *self._sessions},
+                timeout=timeout,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        finally:
+            stop.cancel()
+
+    async def run(self) -> None:
+        """Run the poll-and-launch loop until shutdown, then drain sessions."""
+        self._load_roles()
+        try:
+            while not self._stopping.is_set():
+                started: int = await self._fill_slots()
+                if started:
+                    self._backoff.reset()
+                await self._idle(started > 0)
+        finally:
+            if self._sessions:
+                await asyncio.wait(self._sessions)
+            self._reap()
+
+    def shutdown(self) -> None:
+        """Stop claiming new tasks; ``run`` returns once sessions finish."""
+        self._stopping.set()
+
+    def install_signal_handlers(self) -> None:
+        """Shut down on SIGINT or SIGTERM delivered to the running loop."""
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, self.shutdown)
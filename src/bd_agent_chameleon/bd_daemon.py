@@ -0,0 +1,95 @@
+"""Persistent client for the bd daemon's RPC socket."""
+
+import io
+import json
+import socket
+import threading
+from pathlib import Path
+from typing import Any
+
+DAEMON_SOCKET_NAME: str = "bd.sock"
+
+
+class BdDaemonError(Exception):
+    """Raised when the bd daemon answers a request with an error."""
+
+
+class BdDaemonClient:
+    """Keeps one connection to the bd daemon open and serializes requests over it.
+
+    Requests and responses are newline-delimited JSON objects on a Unix domain
+    socket. Transport failures surface as ``OSError`` or ``ValueError`` so that
+    callers can fall back to the bd CLI; errors reported by the daemon itself
+    raise ``BdDaemonError``.
+    """
+
+    def __init__(self, socket_path: Path, timeout: float = 5.0) -> None:
+        """Initialize with the daemon socket path and a per-request timeout."""
+        self._socket_path: Path = socket_path
+        self._timeout: float = timeout
+        self._lock: threading.Lock = threading.Lock()
+        self._sock: socket.socket | None = None
+        self._reader: io.BufferedReader | None = None
+
+    @classmethod
+    def for_db(cls, db_path: Path, timeout: float = 5.0) -> "BdDaemonClient":
+        """Build a client for the daemon serving the given beads database."""
+        beads_dir: Path = db_path if db_path.is_dir() else db_path.parent
+        return cls(beads_dir / DAEMON_SOCKET_NAME, timeout)
+
+    def connect(self) -> bool:
+        """Open the connection and ping the daemon; return whether it answered."""
+        try:
+            self.request("ping", {})
+        except (OSError, ValueError, BdDaemonError):
+            self.close()
+            return False
+        return True
+
+    def _ensure_connected(self) -> socket.socket:
+        """Return the open socket, connecting first if needed."""
+        if self._sock is None:
+            sock: socket.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self._timeout)
+            try:
+                sock.connect(str(self._socket_path))
+            except OSError:
+                sock.close()
+                raise
+            self._sock = sock
+            self._reader = sock.makefile("rb")
+        return self._sock
+
+    def request(self, operation: str, args: dict[str, Any]) -> Any:
+        """Send one request and return the ``data`` field of the response."""
+        payload: bytes = json.dumps({"operation": operation, "args": args}).encode()
+        with self._lock:
+            try:
+                sock: socket.socket = self._ensure_connected()
+                sock.sendall(payload + b"\n")
+                assert self._reader is not None
+                line: bytes = self._reader.readline()
+            except OSError:
+                self._close_locked()
+                raise
+            if not line:
+                self._close_locked()
+                raise ConnectionError("bd daemon closed the connection")
+        response: dict[str, Any] = json.loads(line)
+        if not response.get("success", False):
+            raise BdDaemonError(response.get("error", "unknown bd daemon error"))
+        return response.get("data")
+
+    def _close_locked(self) -> None:
+        """Close the connection; the caller must hold the lock."""
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def close(self) -> None:
+        """Close the connection if it is open."""
+        with self._lock:
+            self._close_locked()
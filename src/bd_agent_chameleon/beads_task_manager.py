@@ -1,29 +1,300 @@
 """Concrete TaskManager implementation backed by the bd CLI."""
 
 import json
+import logging
+import sqlite3
 import subprocess
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Collection, Iterable
+from dataclasses import replace
+from datetime import timedelta
 from pathlib import Path
 from typing import Any
 
-from bd_agent_chameleon.models import Task, TaskStatus
+from bd_agent_chameleon.bd_daemon import BdDaemonClient, BdDaemonError
+from bd_agent_chameleon.models import (
+    DEFAULT_PRIORITY,
+    Task,
+    TaskStatus,
+    intern_labels,
+    parse_timestamp,
+    task_status,
+)
+from bd_agent_chameleon.protocols import ClaimConflictError, Tracer, claim_first
+from bd_agent_chameleon.selection import PriorityOrdering
+from bd_agent_chameleon.sqlite_reader import SqliteTaskReader
+from bd_agent_chameleon.tracing import NULL_TRACER
 
+logger: logging.Logger = logging.getLogger(__name__)
 
-def _parse_task(data: dict[str, Any]) -> Task:
-    """Parse a bd JSON object into a Task."""
+CLAIM_CONFLICT_MARKER: str = "already claimed"
+# bd ready and bd list cap their output unless given a limit; 0 lifts the cap.
+NO_LIMIT: int = 0
+DEFAULT_DESCRIPTION_CACHE_SIZE: int = 64
+
+
+def _parse_task(data: dict[str, Any], summary: bool = False) -> Task:
+    """Parse a bd JSON object into a Task.
+
+    Polls come from ``bd ready``, which leaves out tasks with open blockers,
+    so every parsed task is ready. With ``summary``, the description is
+    dropped so that a poll keeps only what ranking and claiming need.
+    """
+    priority: Any = data.get("priority")
     return Task(
         id=data["id"],
         title=data["title"],
-        description=data.get("description", ""),
-        status=TaskStatus(data["status"]),
+        description="" if summary else data.get("description") or "",
+        status=task_status(data["status"]),
+        labels=intern_labels(data.get("labels") or ()),
+        priority=DEFAULT_PRIORITY if priority is None else int(priority),
+        created_at=parse_timestamp(data.get("created_at")),
+        summary=summary,
+    )
+
+
+_TaskKey = tuple[str, str, bool]
+
+
+class ParsedTaskCache:
+    """Reuses the Task parsed on the previous poll for entries that did not change.
+
+    An entry is identified by its id and ``updated_at``. Entries without
+    ``updated_at`` are always parsed afresh. Each poll's tasks replace the
+    cache, so it never holds more than one poll's worth of tasks.
+    """
+
+    def __init__(self) -> None:
+        """Start with an empty cache."""
+        self._tasks: dict[_TaskKey, Task] = {}
+
+    def parse(self, entries: list[dict[str, Any]], summary: bool) -> list[Task]:
+        """Parse bd ready entries, reusing unchanged tasks from the last call."""
+        previous: dict[_TaskKey, Task] = self._tasks
+        current: dict[_TaskKey, Task] = {}
+        tasks: list[Task] = []
+        for entry in entries:
+            updated_at: Any = entry.get("updated_at")
+            if not updated_at:
+                tasks.append(_parse_task(entry, summary))
+                continue
+            key: _TaskKey = (entry["id"], updated_at, summary)
+            task: Task | None = previous.get(key)
+            if task is None:
+                task = _parse_task(entry, summary)
+            current[key] = task
+            tasks.append(task)
+        self._tasks = current
+        return tasks
+
+
+def release_args(task_id: str) -> list[str]:
+    """Build the ``bd update`` arguments that undo ``bd update --claim``.
+
+    A claim sets both the status and the assignee, and bd refuses to claim
+    an assigned task, so both are reset.
+    """
+    return ["update", task_id, "--status", TaskStatus.OPEN.value, "--assignee", ""]
+
+
+def park_args(task_id: str) -> list[str]:
+    """Build the ``bd update`` arguments that unassign a task and block it."""
+    return [
+        "update", task_id, "--status", TaskStatus.BLOCKED.value, "--assignee", "",
+    ]
+
+
+# Some bd versions count in-progress work as ready; open_entries drops it.
+_READY_STATUSES: tuple[TaskStatus, ...] = (TaskStatus.OPEN, TaskStatus.IN_PROGRESS)
+
+
+def open_entries(
+    raw: list[dict[str, Any]] | None, limit: int | None,
+) -> list[dict[str, Any]]:
+    """Keep at most ``limit`` open entries of a ``bd ready`` result.
+
+    Some bd versions also count in-progress work as ready; it is not
+    claimable, so it is left out of polls.
+    """
+    entries: list[dict[str, Any]] = [
+        entry for entry in raw or () if entry["status"] == TaskStatus.OPEN.value
+    ]
+    return entries[:limit]
+
+
+def _listed(
+    data: Any,
+    labels: list[str],
+    any_label: bool,
+    statuses: Collection[TaskStatus],
+) -> bool:
+    """Return whether a listing holds only tasks in ``statuses`` with the labels.
+
+    Entries without a ``labels`` field are only checked for their status.
+    """
+    if data is None:
+        return True
+    if not isinstance(data, list):
+        return False
+    wanted: set[str] = set(labels)
+    allowed: set[str] = {status.value for status in statuses}
+    for entry in data:
+        if entry.get("status") not in allowed:
+            return False
+        carried: Any = entry.get("labels")
+        if carried is None:
+            continue
+        present: set[str] = wanted.intersection(carried)
+        matched: bool = bool(present) if any_label else present == wanted
+        if not matched:
+            return False
+    return True
+
+
+def _shown_description(raw: Any) -> str:
+    """Return the description from ``bd show`` output, a list or a single issue."""
+    issue: Any = raw[0] if isinstance(raw, list) and raw else raw
+    if not isinstance(issue, dict):
+        return ""
+    return str(issue.get("description") or "")
+
+
+def ready_args(labels: list[str], any_label: bool, limit: int | None) -> list[str]:
+    """Build the ``bd ready`` arguments for unblocked tasks carrying the labels.
+
+    The limit is always passed, since bd's default would silently cap polls.
+    """
+    args: list[str] = (
+        ["ready", "--label-any", ",".join(labels)]
+        if any_label
+        else ["ready", "--label", labels[0]]
     )
+    return [*args, "--limit", str(NO_LIMIT if limit is None else limit)]
+
+
+class DescriptionCache:
+    """Thread-safe LRU cache of task descriptions, keyed by task id.
+
+    A released task is usually offered again soon, so keeping the last few
+    descriptions saves a fetch when the same task is claimed twice.
+    """
+
+    def __init__(self, size: int = DEFAULT_DESCRIPTION_CACHE_SIZE) -> None:
+        """Keep at most ``size`` descriptions; 0 disables the cache."""
+        self._size: int = size
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    def get(self, task_id: str) -> str | None:
+        """Return the cached description and mark it recently used."""
+        with self._lock:
+            description: str | None = self._entries.get(task_id)
+            if description is not None:
+                self._entries.move_to_end(task_id)
+            return description
+
+    def put(self, task_id: str, description: str) -> None:
+        """Cache a description, evicting the least recently used if full."""
+        if self._size <= 0:
+            return
+        with self._lock:
+            self._entries[task_id] = description
+            self._entries.move_to_end(task_id)
+            while len(self._entries) > self._size:
+                self._entries.popitem(last=False)
+
+    def discard(self, task_id: str) -> None:
+        """Forget a task's description, for example once it is closed."""
+        with self._lock:
+            self._entries.pop(task_id, None)
+
+
+class OpenTaskView:
+    """Local copy of the open tasks for one set of labels, kept by change cursor.
+
+    ``apply`` folds in the tasks that changed since ``cursor``: open ones
+    are added or replaced, and any other status removes the task.
+    """
+
+    def __init__(self, tasks: Iterable[Task], cursor: str, synced_at: float) -> None:
+        """Start from a full listing taken at ``synced_at``."""
+        self.tasks: dict[str, Task] = {task.id: task for task in tasks}
+        self.cursor: str = cursor
+        self.synced_at: float = synced_at
+
+    def apply(self, changed: Iterable[Task], cursor: str) -> None:
+        """Fold in changed tasks and advance the cursor."""
+        for task in changed:
+            if task.status == TaskStatus.OPEN:
+                self.tasks[task.id] = task
+            else:
+                self.tasks.pop(task.id, None)
+        self.cursor = cursor
+
+    def discard(self, task_id: str) -> None:
+        """Drop a task known to be open no longer."""
+        self.tasks.pop(task_id, None)
 
 
 class BeadsTaskManager:
-    """Concrete TaskManager that shells out to the bd CLI."""
+    """Concrete TaskManager that shells out to the bd CLI.
+
+    When a connected ``BdDaemonClient`` is injected, reads (``list`` and
+    ``show``) go over its long-lived socket instead. bd's RPC schema is not
+    documented, so a daemon that errors, becomes unreachable, or answers a
+    poll with tasks that are not open or lack the labels is dropped in
+    favour of one ``bd`` subprocess per call. Writes always go through the
+    CLI, whose ``--claim`` compare-and-set and error text are known.
 
-    def __init__(self, db_path: Path) -> None:
+    Without a reader, polls run ``bd ready``, so tasks with open blockers
+    are never offered. When a ``SqliteTaskReader`` is injected, ``poll``
+    reads the database directly and returns blocked tasks with ``ready``
+    False; claims and completes always go through bd so that its write
+    semantics are preserved.
+
+    Polls return summaries without descriptions, at most ``poll_limit`` of
+    them. ``describe`` fetches the full description of the one task that is
+    about to run, and keeps recent ones in a ``DescriptionCache``.
+
+    With both a reader and a ``resync_interval``, polls are served from an
+    ``OpenTaskView`` per label set. Each poll reads only the rows updated
+    since the view's cursor, and the view is rebuilt from a full listing
+    once it is ``resync_interval`` old. A view can briefly still offer a
+    task that another worker has claimed. The claim then fails with
+    ``ClaimConflictError``, because claims always go through bd, and the
+    task is dropped from the view.
+
+    A ``tracer`` receives spans for each daemon request, direct read, ``bd``
+    process run, JSON decode, and task parse.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        daemon: BdDaemonClient | None = None,
+        reader: SqliteTaskReader | None = None,
+        tracer: Tracer | None = None,
+        poll_limit: int | None = None,
+        descriptions: DescriptionCache | None = None,
+        resync_interval: timedelta | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
         """Initialize with the path to the beads database directory."""
         self._db_path: Path = db_path
+        self._daemon: BdDaemonClient | None = daemon
+        self._reader: SqliteTaskReader | None = reader
+        self._tracer: Tracer = tracer if tracer is not None else NULL_TRACER
+        self._poll_limit: int | None = poll_limit
+        self._descriptions: DescriptionCache = (
+            descriptions if descriptions is not None else DescriptionCache()
+        )
+        self._parsed: ParsedTaskCache = ParsedTaskCache()
+        self._resync_interval: timedelta | None = resync_interval
+        self._clock: Callable[[], float] = clock
+        self._views: dict[tuple[str, ...], OpenTaskView] = {}
+        self._views_lock: threading.Lock = threading.Lock()
 
     def _run_bd(self, args: list[str]) -> Any:
         """Execute a bd CLI command and return parsed JSON output."""
@@ -32,22 +303,199 @@ class BeadsTaskManager:
             "--json",
             "--db", str(self._db_path),
         ]
-        result: subprocess.CompletedProcess[str] = subprocess.run(
-            cmd, capture_output=True, check=True, text=True,
+        with self._tracer.span("bd.exec", command=args[0]):
+            result: subprocess.CompletedProcess[str] = subprocess.run(
+                cmd, capture_output=True, check=True, text=True,
+            )
+        with self._tracer.span("bd.decode", command=args[0], size=len(result.stdout)):
+            return json.loads(result.stdout)
+
+    def _drop_daemon(self, reason: object) -> None:
+        """Stop using the daemon for the rest of this manager's life."""
+        logger.warning(
+            "bd daemon unusable (%s); falling back to bd subprocesses", reason,
         )
-        return json.loads(result.stdout)
+        if self._daemon is not None:
+            self._daemon.close()
+            self._daemon = None
+
+    def _read(
+        self,
+        operation: str,
+        rpc_args: dict[str, Any],
+        cli_args: list[str],
+        accept: Callable[[Any], bool] = lambda _: True,
+    ) -> Any:
+        """Run a read through the daemon if available, else through the CLI.
+
+        A daemon answer that ``accept`` rejects is treated like a failed
+        request, since it means the daemon did not honour the arguments.
+        """
+        if self._daemon is not None:
+            try:
+                with self._tracer.span("bd.daemon", command=operation):
+                    data: Any = self._daemon.request(operation, rpc_args)
+            except (OSError, ValueError, BdDaemonError) as exc:
+                self._drop_daemon(exc)
+            else:
+                if accept(data):
+                    return data
+                self._drop_daemon(f"unexpected {operation} result")
+        return self._run_bd(cli_args)
+
+    def _read_direct(self, labels: list[str]) -> list[Task] | None:
+        """Poll through the SQLite reader, or return None to use bd instead."""
+        if self._reader is None:
+            return None
+        try:
+            with self._tracer.span("sqlite.poll"):
+                if self._resync_interval is None:
+                    return self._reader.poll_any(labels)
+                return self._read_view(self._reader, labels, self._resync_interval)
+        except sqlite3.Error as exc:
+            logger.warning(
+                "direct SQLite poll failed (%s); falling back to bd ready", exc,
+            )
+            self._reader.close()
+            self._reader = None
+            return None
+
+    def _read_view(
+        self, reader: SqliteTaskReader, labels: list[str], resync: timedelta,
+    ) -> list[Task]:
+        """Bring the labels' view up to date and return its most urgent tasks.
+
+        With a poll limit, only ready tasks are ranked, so blocked ones never
+        take the places of tasks a worker could claim.
+        """
+        key: tuple[str, ...] = tuple(sorted(labels))
+        with self._views_lock:
+            now: float = self._clock()
+            view: OpenTaskView | None = self._views.get(key)
+            if view is None or now - view.synced_at >= resync.total_seconds():
+                with self._tracer.span("sqlite.resync"):
+                    tasks, cursor = reader.snapshot(labels)
+                view = OpenTaskView(tasks, cursor, now)
+                self._views[key] = view
+            else:
+                changed, cursor = reader.changes(labels, view.cursor)
+                view.apply(changed, cursor)
+            current: list[Task] = list(view.tasks.values())
+        if self._poll_limit is None:
+            return current
+        ready: list[Task] = [task for task in current if task.ready]
+        ranked: list[Task] = PriorityOrdering(self._poll_limit).order(ready)
+        return ranked[: self._poll_limit]
+
+    def _forget(self, task_id: str) -> None:
+        """Drop a task that is no longer open from every view."""
+        with self._views_lock:
+            for view in self._views.values():
+                view.discard(task_id)
+
+    def _parse_tasks(self, raw: list[dict[str, Any]] | None) -> list[Task]:
+        """Parse at most ``poll_limit`` open entries of a bd ready result."""
+        entries: list[dict[str, Any]] = open_entries(raw, self._poll_limit)
+        with self._tracer.span("parse_tasks", count=len(entries)):
+            return self._parsed.parse(entries, summary=True)
+
+    def _list(self, labels: list[str], any_label: bool) -> list[Task]:
+        """List open task summaries carrying the labels."""
+        direct: list[Task] | None = self._read_direct(labels)
+        if direct is not None:
+            return direct
+        rpc_args: dict[str, Any] = {
+            "labels_any" if any_label else "labels": labels,
+            "status": TaskStatus.OPEN.value,
+            "limit": NO_LIMIT if self._poll_limit is None else self._poll_limit,
+        }
+        raw: list[dict[str, Any]] | None = self._read(
+            "ready",
+            rpc_args,
+            ready_args(labels, any_label, self._poll_limit),
+            lambda data: _listed(data, labels, any_label, _READY_STATUSES),
+        )
+        return self._parse_tasks(raw)
 
     def poll(self, label: str) -> list[Task]:
-        """List open tasks matching the given label."""
-        raw: list[dict[str, Any]] = self._run_bd(
-            ["list", "--label", label],
+        """List open task summaries matching the given label."""
+        return self._list([label], any_label=False)
+
+    def poll_any(self, labels: list[str]) -> list[Task]:
+        """List open task summaries carrying at least one of the given labels."""
+        return self._list(labels, any_label=True)
+
+    def count_in_progress(self, label: str) -> int:
+        """Count the tasks carrying the label that workers currently hold."""
+        status: TaskStatus = TaskStatus.IN_PROGRESS
+        raw: list[dict[str, Any]] | None = self._read(
+            "list",
+            {"labels": [label], "status": status.value, "limit": NO_LIMIT},
+            [
+                "list", "--label", label,
+                "--status", status.value,
+                "--limit", str(NO_LIMIT),
+            ],
+            lambda data: _listed(data, [label], False, (status,)),
+        )
+        return len(raw or [])
+
+    def _fetch_description(self, task_id: str) -> str:
+        """Read a task's description directly if possible, else with ``bd show``."""
+        if self._reader is not None:
+            try:
+                with self._tracer.span("sqlite.describe", task=task_id):
+                    description: str | None = self._reader.description(task_id)
+                if description is not None:
+                    return description
+            except sqlite3.Error as exc:
+                logger.warning("direct SQLite read failed (%s); using bd show", exc)
+        return _shown_description(
+            self._read("show", {"id": task_id}, ["show", task_id]),
         )
-        return [_parse_task(entry) for entry in raw]
+
+    def describe(self, task: Task) -> Task:
+        """Return the task with its full description, fetching it for a summary."""
+        if not task.summary:
+            return task
+        description: str | None = self._descriptions.get(task.id)
+        if description is None:
+            with self._tracer.span("describe", task=task.id):
+                description = self._fetch_description(task.id)
+            self._descriptions.put(task.id, description)
+        return replace(task, description=description, summary=False)
 
     def claim(self, task_id: str) -> None:
-        """Claim a task by setting its status to in_progress."""
-        self._run_bd(["update", task_id, "--claim"])
+        """Claim a task by setting its status to in_progress.
+
+        ``bd update --claim`` only succeeds on an unclaimed task, so it acts
+        as a compare-and-set. When bd reports that the task is already
+        claimed, this raises ``ClaimConflictError`` rather than bd's error.
+        Either way the task is no longer open, so it leaves the poll views.
+        """
+        try:
+            self._run_bd(["update", task_id, "--claim"])
+        except subprocess.CalledProcessError as exc:
+            if CLAIM_CONFLICT_MARKER in (exc.stderr or "").lower():
+                self._forget(task_id)
+                raise ClaimConflictError(task_id) from exc
+            raise
+        self._forget(task_id)
+
+    def claim_next(self, label: str, exclude: Collection[str] = ()) -> Task | None:
+        """Poll the label and claim the first open task no one else holds."""
+        return claim_first(self, self.poll(label), exclude)
 
     def complete(self, task_id: str) -> None:
         """Complete a task by closing it."""
         self._run_bd(["close", task_id])
+        self._descriptions.discard(task_id)
+
+    def release(self, task_id: str) -> None:
+        """Release a claimed task by reopening it and clearing its assignee."""
+        self._run_bd(release_args(task_id))
+
+    def park(self, task_id: str) -> None:
+        """Park a task by blocking it and clearing its assignee."""
+        self._run_bd(park_args(task_id))
+        self._descriptions.discard(task_id)
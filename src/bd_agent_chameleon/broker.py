@@ -0,0 +1,432 @@
+"""Host-local poll broker and the TaskManager that talks to it.
+
+One ``TaskBroker`` per host owns the only poller against the task store. It
+pushes the open tasks for each subscribed label to chameleons connected over
+a Unix domain socket, and arbitrates claims so that two local workers never
+race for the same task. Messages are newline-delimited JSON objects.
+"""
+
+import contextlib
+import itertools
+import json
+import logging
+import socket
+import socketserver
+import threading
+from collections.abc import Collection
+from concurrent.futures import Future
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+from bd_agent_chameleon.models import (
+    Task,
+    intern_labels,
+    parse_timestamp,
+    task_status,
+)
+from bd_agent_chameleon.protocols import ClaimConflictError, TaskManager, claim_first
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+BROKER_SOCKET_NAME: str = "chameleon-broker.sock"
+_CONFLICT: str = "conflict"
+
+
+class BrokerError(Exception):
+    """Raised when the broker rejects a request for a reason other than a conflict."""
+
+
+def default_socket_path(db_path: Path) -> Path:
+    """Return the broker socket path for a beads database."""
+    beads_dir: Path = db_path if db_path.is_dir() else db_path.parent
+    return beads_dir / BROKER_SOCKET_NAME
+
+
+def _task_to_dict(task: Task) -> dict[str, Any]:
+    """Serialize a Task for the wire."""
+    return {
+        "id": task.id,
+        "title": task.title,
+        "description": task.description,
+        "status": task.status.value,
+        "labels": list(task.labels),
+        "priority": task.priority,
+        "created_at": task.created_at.isoformat() if task.created_at else None,
+        "ready": task.ready,
+        "summary": task.summary,
+    }
+
+
+def _task_from_dict(data: dict[str, Any]) -> Task:
+    """Deserialize a Task from the wire."""
+    return Task(
+        id=data["id"],
+        title=data["title"],
+        description=data["description"],
+        status=task_status(data["status"]),
+        labels=intern_labels(data["labels"]),
+        priority=data["priority"],
+        created_at=parse_timestamp(data["created_at"]),
+        ready=data["ready"],
+        summary=data.get("summary", False),
+    )
+
+
+class _Subscriber:
+    """A connected chameleon and the labels it wants offers for."""
+
+    def __init__(self, wfile: Any) -> None:
+        """Wrap the connection's write side."""
+        self._wfile: Any = wfile
+        self._write_lock: threading.Lock = threading.Lock()
+        self.labels: set[str] = set()
+
+    def send(self, message: dict[str, Any]) -> None:
+        """Write one message to the connection."""
+        data: bytes = json.dumps(message).encode() + b"\n"
+        with self._write_lock:
+            self._wfile.write(data)
+            self._wfile.flush()
+
+
+class _BrokerHandler(socketserver.StreamRequestHandler):
+    """Serves one chameleon connection."""
+
+    def handle(self) -> None:
+        """Register the connection and answer its requests until it closes."""
+        broker: TaskBroker = self.server.broker  # type: ignore[attr-defined]
+        subscriber: _Subscriber = _Subscriber(self.wfile)
+        broker._add_subscriber(subscriber)
+        try:
+            for line in self.rfile:
+                request: dict[str, Any] = json.loads(line)
+                subscriber.send(broker._handle_request(subscriber, request))
+        except (OSError, ValueError) as exc:
+            logger.debug("broker connection closed: %s", exc)
+        finally:
+            broker._remove_subscriber(subscriber)
+
+
+class _BrokerServer(socketserver.ThreadingUnixStreamServer):
+    """Unix socket server carrying a reference back to its broker."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, broker: "TaskBroker") -> None:
+        """Bind the socket and remember the broker."""
+        self.broker: TaskBroker = broker
+        super().__init__(str(socket_path), _BrokerHandler)
+
+
+class TaskBroker:
+    """Owns the host's poller and pushes task offers to local chameleons."""
+
+    def __init__(
+        self,
+        task_mgr: TaskManager,
+        socket_path: Path,
+        poll_interval: timedelta = timedelta(seconds=2),
+    ) -> None:
+        """Initialize with the backing task manager and the socket to serve."""
+        self._task_mgr: TaskManager = task_mgr
+        self._socket_path: Path = socket_path
+        self._poll_interval: timedelta = poll_interval
+        self._lock: threading.Lock = threading.Lock()
+        self._subscribers: set[_Subscriber] = set()
+        self._claims: dict[str, _Subscriber] = {}
+        self._wake: threading.Event = threading.Event()
+        self._stopping: threading.Event = threading.Event()
+        self._server: _BrokerServer | None = None
+
+    def _add_subscriber(self, subscriber: _Subscriber) -> None:
+        """Register a newly connected chameleon."""
+        with self._lock:
+            self._subscribers.add(subscriber)
+
+    def _remove_subscriber(self, subscriber: _Subscriber) -> None:
+        """Forget a disconnected chameleon and the claims it held."""
+        with self._lock:
+            self._subscribers.discard(subscriber)
+            for task_id in [t for t, s in self._claims.items() if s is subscriber]:
+                del self._claims[task_id]
+
+    def _handle_request(
+        self, subscriber: _Subscriber, request: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Answer one request from a chameleon."""
+        reply: dict[str, Any] = {"type": "reply", "id": request.get("id")}
+        op: str = request.get("op", "")
+        result: dict[str, Any] = {}
+        try:
+            if op == "subscribe":
+                with self._lock:
+                    subscriber.labels.update(request["labels"])
+                self._wake.set()
+            elif op == "claim":
+                self._claim(subscriber, request["task"])
+            elif op == "describe":
+                task: Task = self._task_mgr.describe(_task_from_dict(request["task"]))
+                result["task"] = _task_to_dict(task)
+            elif op == "complete":
+                self._task_mgr.complete(request["task"])
+                with self._lock:
+                    self._claims.pop(request["task"], None)
+            elif op == "release":
+                self._task_mgr.release(request["task"])
+                with self._lock:
+                    self._claims.pop(request["task"], None)
+                self._wake.set()
+            elif op == "park":
+                self._task_mgr.park(request["task"])
+                with self._lock:
+                    self._claims.pop(request["task"], None)
+            else:
+                raise BrokerError(f"unknown operation {op!r}")
+        except ClaimConflictError:
+            return {**reply, "ok": False, "error": _CONFLICT}
+        except Exception as exc:
+            logger.warning("broker %s request failed: %s", op, exc)
+            return {**reply, "ok": False, "error": str(exc)}
+        return {**reply, "ok": True, **result}
+
+    def _claim(self, subscriber: _Subscriber, task_id: str) -> None:
+        """Claim a task for one subscriber unless another local worker has it."""
+        with self._lock:
+            if task_id in self._claims:
+                raise ClaimConflictError(task_id)
+            self._claims[task_id] = subscriber
+        try:
+            self._task_mgr.claim(task_id)
+        except BaseException:
+            with self._lock:
+                self._claims.pop(task_id, None)
+            raise
+
+    def _publish(self) -> None:
+        """Poll once for every subscribed label and push offers."""
+        with self._lock:
+            subscribers: list[tuple[_Subscriber, frozenset[str]]] = [
+                (s, frozenset(s.labels)) for s in self._subscribers if s.labels
+            ]
+        labels: list[str] = sorted(set().union(*(wanted for _, wanted in subscribers)))
+        if not labels:
+            return
+        tasks: list[Task] = (
+            self._task_mgr.poll(labels[0])
+            if len(labels) == 1
+            else self._task_mgr.poll_any(labels)
+        )
+        with self._lock:
+            claimed: set[str] = set(self._claims)
+        for subscriber, wanted in subscribers:
+            offered: list[dict[str, Any]] = [
+                _task_to_dict(task)
+                for task in tasks
+                if task.id not in claimed
+                and (len(labels) == 1 or not wanted.isdisjoint(task.labels))
+            ]
+            try:
+                subscriber.send({"type": "offer", "tasks": offered})
+            except OSError:
+                self._remove_subscriber(subscriber)
+
+    def _poll_loop(self) -> None:
+        """Publish offers every interval, or sooner when woken."""
+        while not self._stopping.is_set():
+            try:
+                self._publish()
+            except Exception:
+                logger.exception("broker poll failed")
+            self._wake.wait(self._poll_interval.total_seconds())
+            self._wake.clear()
+
+    def serve_forever(self) -> None:
+        """Serve chameleons until ``shutdown`` is called."""
+        self._socket_path.unlink(missing_ok=True)
+        self._server = _BrokerServer(self._socket_path, self)
+        threads: list[threading.Thread] = [
+            threading.Thread(target=self._server.serve_forever, daemon=True),
+            threading.Thread(target=self._poll_loop, daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            while not self._stopping.wait(1.0):
+                pass
+        finally:
+            self._server.shutdown()
+            self._server.server_close()
+            self._socket_path.unlink(missing_ok=True)
+            for thread in threads:
+                thread.join()
+
+    def shutdown(self) -> None:
+        """Ask ``serve_forever`` to stop."""
+        self._stopping.set()
+        self._wake.set()
+
+
+class BrokerTaskManager:
+    """TaskManager served by a host-local ``TaskBroker``.
+
+    ``poll`` answers from the latest offer pushed by the broker, so it never
+    touches the task store itself. The manager also acts as a
+    ``ChangeWatcher``: ``wait`` returns as soon as an offer with different
+    content arrives.
+    """
+
+    def __init__(self, socket_path: Path, timeout: float = 30.0) -> None:
+        """Connect to the broker's socket."""
+        self._timeout: float = timeout
+        self._sock: socket.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.connect(str(socket_path))
+        self._rfile: Any = self._sock.makefile("rb")
+        self._send_lock: threading.Lock = threading.Lock()
+        self._ids: itertools.count[int] = itertools.count(1)
+        self._pending: dict[int, Future[dict[str, Any]]] = {}
+        self._cond: threading.Condition = threading.Condition()
+        self._labels: set[str] = set()
+        self._offer: list[Task] = []
+        self._offers_seen: int = 0
+        self._version: int = 0
+        self._closed: bool = False
+        self._reader: threading.Thread = threading.Thread(
+            target=self._read_loop, daemon=True,
+        )
+        self._reader.start()
+
+    def _read_loop(self) -> None:
+        """Route replies to waiting callers and store pushed offers."""
+        try:
+            for line in self._rfile:
+                message: dict[str, Any] = json.loads(line)
+                if message.get("type") == "offer":
+                    self._store_offer(
+                        [_task_from_dict(entry) for entry in message["tasks"]],
+                    )
+                else:
+                    future: Future[dict[str, Any]] | None = self._pending.pop(
+                        message.get("id", -1), None,
+                    )
+                    if future is not None:
+                        future.set_result(message)
+        except (OSError, ValueError) as exc:
+            logger.debug("broker connection closed: %s", exc)
+        finally:
+            for future in list(self._pending.values()):
+                future.set_exception(ConnectionError("broker connection closed"))
+            self._pending.clear()
+
+    def _store_offer(self, tasks: list[Task]) -> None:
+        """Replace the current offer and wake waiters if it changed."""
+        with self._cond:
+            self._offers_seen += 1
+            if tasks != self._offer:
+                self._offer = tasks
+                self._version += 1
+            self._cond.notify_all()
+
+    def _request(self, op: str, **fields: Any) -> dict[str, Any]:
+        """Send one request and wait for its reply."""
+        request_id: int = next(self._ids)
+        future: Future[dict[str, Any]] = Future()
+        self._pending[request_id] = future
+        data: bytes = json.dumps({"id": request_id, "op": op, **fields}).encode()
+        with self._send_lock:
+            self._sock.sendall(data + b"\n")
+        return future.result(timeout=self._timeout)
+
+    def _subscribe(self, labels: list[str]) -> None:
+        """Subscribe to new labels and wait for the first offer covering them."""
+        new: set[str] = set(labels) - self._labels
+        if not new:
+            return
+        with self._cond:
+            seen: int = self._offers_seen
+        reply: dict[str, Any] = self._request("subscribe", labels=sorted(new))
+        if not reply["ok"]:
+            raise BrokerError(reply["error"])
+        self._labels |= new
+        with self._cond:
+            self._cond.wait_for(lambda: self._offers_seen > seen, self._timeout)
+
+    def _offered(self, labels: list[str]) -> list[Task]:
+        """Return the current offer restricted to the given labels."""
+        with self._cond:
+            offer: list[Task] = list(self._offer)
+        if self._labels <= set(labels):
+            return offer
+        wanted: set[str] = set(labels)
+        return [task for task in offer if not wanted.isdisjoint(task.labels)]
+
+    def _drop_from_offer(self, task_id: str) -> None:
+        """Remove a task from the local offer until the broker re-offers it."""
+        with self._cond:
+            self._offer = [task for task in self._offer if task.id != task_id]
+
+    def poll(self, label: str) -> list[Task]:
+        """List open tasks offered for the given label."""
+        self._subscribe([label])
+        return self._offered([label])
+
+    def poll_any(self, labels: list[str]) -> list[Task]:
+        """List open tasks offered for any of the given labels."""
+        self._subscribe(labels)
+        return self._offered(labels)
+
+    def claim(self, task_id: str) -> None:
+        """Claim a task through the broker."""
+        reply: dict[str, Any] = self._request("claim", task=task_id)
+        self._drop_from_offer(task_id)
+        if not reply["ok"]:
+            if reply["error"] == _CONFLICT:
+                raise ClaimConflictError(task_id)
+            raise BrokerError(reply["error"])
+
+    def describe(self, task: Task) -> Task:
+        """Fetch a summary's full description through the broker."""
+        if not task.summary:
+            return task
+        reply: dict[str, Any] = self._request("describe", task=_task_to_dict(task))
+        if not reply["ok"]:
+            raise BrokerError(reply["error"])
+        return _task_from_dict(reply["task"])
+
+    def complete(self, task_id: str) -> None:
+        """Complete a task through the broker."""
+        reply: dict[str, Any] = self._request("complete", task=task_id)
+        if not reply["ok"]:
+            raise BrokerError(reply["error"])
+
+    def release(self, task_id: str) -> None:
+        """Release a claimed task through the broker."""
+        reply: dict[str, Any] = self._request("release", task=task_id)
+        if not reply["ok"]:
+            raise BrokerError(reply["error"])
+
+    def park(self, task_id: str) -> None:
+        """Park a task that keeps failing through the broker."""
+        reply: dict[str, Any] = self._request("park", task=task_id)
+        if not reply["ok"]:
+            raise BrokerError(reply["error"])
+
+    def claim_next(self, label: str, exclude: Collection[str] = ()) -> Task | None:
+        """Claim the first offered task for the label that no one else holds."""
+        return claim_first(self, self.poll(label), exclude)
+
+    def wait(self, timeout: float) -> bool:
+        """Block until the broker pushes a different offer or the timeout elapses."""
+        with self._cond:
+            version: int = self._version
+            return self._cond.wait_for(lambda: self._version != version, timeout)
+
+    def close(self) -> None:
+        """Close the connection to the broker."""
+        if self._closed:
+            return
+        self._closed = True
+        with contextlib.suppress(OSError):
+            self._sock.shutdown(socket.SHUT_RDWR)
+        self._sock.close()
+        self._reader.join(timeout=self._timeout)
@@ -1,12 +1,33 @@
 """Core orchestrator that coordinates task polling, claiming, and session launching."""
 
+import logging
+import threading
 import time
+from collections import deque
+from collections.abc import Callable, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import timedelta
 from enum import StrEnum
 
 from bd_agent_chameleon.config_manager import ConfigManager
+from bd_agent_chameleon.leases import LeaseKeeper
+from bd_agent_chameleon.metrics import ChameleonMetrics, CounterValue
 from bd_agent_chameleon.models import Role, Task
-from bd_agent_chameleon.protocols import SessionLauncher, TaskManager
+from bd_agent_chameleon.poll_scheduler import PollBackoff, RetryTracker
+from bd_agent_chameleon.protocols import (
+    AdmissionController,
+    CandidateSelector,
+    ChangeWatcher,
+    ClaimConflictError,
+    SessionFailedError,
+    SessionLauncher,
+    TaskManager,
+    Tracer,
+)
+from bd_agent_chameleon.selection import FirstSelector
+from bd_agent_chameleon.tracing import NULL_TRACER, CycleProfiler
+
+logger: logging.Logger = logging.getLogger(__name__)
 
 
 class ChameleonState(StrEnum):
@@ -25,45 +46,533 @@ class Chameleon:
         config_mgr: ConfigManager,
         task_mgr: TaskManager,
         launcher: SessionLauncher,
-        role_name: str,
+        role_name: str | Sequence[str],
         poll_interval: timedelta = timedelta(seconds=2),
+        concurrency: int = 1,
+        watcher: ChangeWatcher | None = None,
+        backoff: PollBackoff | None = None,
+        prefetch: int = 0,
+        leases: LeaseKeeper | None = None,
+        metrics: ChameleonMetrics | None = None,
+        tracer: Tracer | None = None,
+        profiler: CycleProfiler | None = None,
+        selector: CandidateSelector | None = None,
+        admission: AdmissionController | None = None,
+        retries: RetryTracker | None = None,
     ) -> None:
-        """Initialize with injected dependencies and role configuration."""
+        """Initialize with injected dependencies and role configuration.
+
+        ``role_name`` may name several roles, served from one combined poll;
+        each task is dispatched to the role whose label it carries. With
+        ``concurrency`` greater than one, sessions run on a worker pool and
+        up to that many tasks are claimed and in flight at once, subject to
+        each role's ``max_concurrency``; interactive sessions share the
+        terminal and never overlap. With a ``watcher``, an idle
+        chameleon re-polls as soon as the task store changes, and the poll
+        interval only bounds how long it waits. A ``backoff`` policy replaces
+        the fixed ``poll_interval`` with an adaptive one. With ``prefetch``
+        greater than zero, up to that many next tasks are polled for and
+        claimed in the background while sessions run, and completions are
+        reported off the critical path. With ``leases``, every claimed task
+        holds a heartbeated lease until it is completed or released, so that
+        a reaper can re-open it if this process dies. With ``metrics``, session
+        durations and the time spent in each state are recorded; wrap
+        ``task_mgr`` in a ``MeteredTaskManager`` to record store calls too.
+        A ``tracer`` receives one span per poll, idle wait, claim, launch,
+        and completion, and a ``profiler`` is ticked at the start of every
+        poll cycle. A ``selector`` decides the order in which polled tasks
+        are tried, so that a role's workers can spread out over its queue
+        instead of all racing for the first task. With ``admission``, a task
+        is claimed only once the controller admits a session for its role;
+        until then the launch is deferred and nothing is claimed. ``retries``
+        spaces out new attempts at a task whose session failed and parks it
+        once it has failed too often.
+        """
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        if prefetch < 0:
+            raise ValueError(f"prefetch must not be negative, got {prefetch}")
+        role_names: tuple[str, ...] = (
+            (role_name,) if isinstance(role_name, str) else tuple(role_name)
+        )
+        if not role_names:
+            raise ValueError("at least one role name is required")
         self._config_mgr: ConfigManager = config_mgr
         self._task_mgr: TaskManager = task_mgr
         self._launcher: SessionLauncher = launcher
-        self._role_name: str = role_name
-        self._poll_interval: timedelta = poll_interval
+        self._role_names: tuple[str, ...] = role_names
+        self._backoff: PollBackoff = (
+            backoff if backoff is not None else PollBackoff(poll_interval)
+        )
+        self._concurrency: int = concurrency
+        self._watcher: ChangeWatcher | None = watcher
         self._state: ChameleonState = ChameleonState.POLLING
+        self._roles: dict[str, Role] = {}
         self._current_task: Task | None = None
+        self._current_role: Role | None = None
+        self._candidates: list[tuple[Role, Task]] = []
+        self._pool: ThreadPoolExecutor | None = None
+        self._in_flight: dict[Future[None], tuple[Role, Task]] = {}
+        self._prefetch_depth: int = prefetch
+        self._background: ThreadPoolExecutor | None = None
+        self._background_lock: threading.Lock = threading.Lock()
+        self._prefetch_future: Future[None] | None = None
+        self._prefetched: deque[tuple[Role, Task]] = deque()
+        self._completions: list[Future[None]] = []
+        self._current_claimed: bool = False
+        self._leases: LeaseKeeper | None = leases
+        self._metrics: ChameleonMetrics | None = metrics
+        self._state_counters: dict[ChameleonState, CounterValue] = (
+            {s: metrics.state_seconds.labels(s.value) for s in ChameleonState}
+            if metrics is not None
+            else {}
+        )
+        self._state_since: float = time.monotonic()
+        self._tracer: Tracer = tracer if tracer is not None else NULL_TRACER
+        self._profiler: CycleProfiler | None = profiler
+        self._selector: CandidateSelector = (
+            selector if selector is not None else FirstSelector()
+        )
+        self._admission: AdmissionController | None = admission
+        self._retries: RetryTracker = (
+            retries if retries is not None else RetryTracker()
+        )
 
-    def _poll(self, role: Role) -> None:
-        """Poll for open tasks and transition to executing if one is found."""
-        tasks: list[Task] = self._task_mgr.poll(role.label)
-        if tasks:
-            self._current_task = tasks[0]
-            self._state = ChameleonState.EXECUTING
-        else:
-            time.sleep(self._poll_interval.total_seconds())
+    def _load_roles(self) -> None:
+        """Resolve the configured role names, indexed by label."""
+        roles: list[Role] = [self._config_mgr.load_role(n) for n in self._role_names]
+        self._roles = {role.label: role for role in roles}
 
-    def _execute(self, role: Role) -> None:
-        """Claim the current task, launch a session, and mark it complete."""
-        assert self._current_task is not None
-        self._task_mgr.claim(self._current_task.id)
-        self._launcher.launch(role, self._current_task)
-        self._task_mgr.complete(self._current_task.id)
+    def _poll_tasks(self) -> list[Task]:
+        """Poll once for open tasks across every served label."""
+        labels: list[str] = list(self._roles)
+        if len(labels) == 1:
+            return self._task_mgr.poll(labels[0])
+        return self._task_mgr.poll_any(labels)
+
+    def _has_free_slot(self, role: Role) -> bool:
+        """Return whether the role is below its cap and may use the terminal.
+
+        Interactive sessions share this process's terminal, so only one of
+        them runs at a time whatever the concurrency.
+        """
+        running: list[Role] = [r for r, _ in self._in_flight.values()]
+        if role.interactive and any(r.interactive for r in running):
+            return False
+        if role.max_concurrency is None:
+            return True
+        busy: int = sum(1 for r in running if r.name == role.name)
+        return busy < role.max_concurrency
+
+    @staticmethod
+    def _matching_role(task: Task, roles: dict[str, Role]) -> Role | None:
+        """Return the role whose label the task carries, if any."""
+        if len(roles) == 1:
+            return next(iter(roles.values()))
+        return next((roles[label] for label in task.labels if label in roles), None)
+
+    def _role_for(self, task: Task) -> Role | None:
+        """Pick the role that should run a task, if that role has a free slot."""
+        role: Role | None = self._matching_role(task, self._roles)
+        if role is None or not self._has_free_slot(role):
+            return None
+        return role
+
+    def _poll(self) -> None:
+        """Poll for open tasks and transition to executing if one is found.
+
+        Roles are re-resolved on every poll so that config edits apply to the
+        next task without a restart.
+        """
+        self._reap_finished()
+        self._load_roles()
+        self._await_prefetch()
+        if self._take_prefetched():
+            return
+        with self._tracer.span("poll", labels=len(self._roles)):
+            tasks: list[Task] = self._selector.order(self._poll_tasks())
+        running: set[str] = {task.id for _, task in self._in_flight.values()}
+        running.update(task.id for _, task in self._prefetched)
+        candidates: list[tuple[Role, Task]] = []
+        capped: bool = False
+        for task in tasks:
+            if task.id in running or not task.ready or self._retries.cooling(task.id):
+                continue
+            role: Role | None = self._role_for(task)
+            if role is not None:
+                candidates.append((role, task))
+            elif self._matching_role(task, self._roles) is not None:
+                capped = True
+        if not candidates:
+            if capped:
+                self._wait_for_session()
+            else:
+                self._wait_for_change()
+            return
+        self._backoff.reset()
+        candidates = self._admitted(candidates)
+        if candidates:
+            self._current_role, self._current_task = candidates[0]
+            self._candidates = candidates[1:]
+            self._transition(ChameleonState.EXECUTING)
+
+    def _admitted(
+        self, candidates: list[tuple[Role, Task]],
+    ) -> list[tuple[Role, Task]]:
+        """Keep the candidates of the first role admitted to start a session.
+
+        If no role is admitted, wait as long as the controller asks and keep
+        nothing, so the launch is deferred to a later poll.
+        """
+        if self._admission is None:
+            return candidates
+        delays: list[float] = []
+        for role in dict.fromkeys(role for role, _ in candidates):
+            delay: float = self._admission.admit(role)
+            if delay <= 0:
+                return [(r, task) for r, task in candidates if r == role]
+            delays.append(delay)
+        self._defer(min(delays))
+        return []
+
+    def _defer(self, timeout: float) -> None:
+        """Wait out an admission refusal before the next poll."""
+        if self._metrics is not None:
+            self._metrics.launch_deferrals.inc()
+        with self._tracer.span("defer", timeout=timeout):
+            time.sleep(timeout)
+
+    def _wait_for_change(self) -> None:
+        """Idle until the task store changes or the poll interval elapses."""
+        timeout: float = self._backoff.next_interval().total_seconds()
+        with self._tracer.span("idle", timeout=timeout):
+            if self._watcher is None:
+                time.sleep(timeout)
+            else:
+                self._watcher.wait(timeout)
+
+    def _wait_for_session(self) -> None:
+        """Wait for a session to end while every waiting task's role is at its cap.
+
+        The queue is not empty, so the backoff is reset rather than grown, and
+        the wait ends as soon as a session frees a slot.
+        """
+        self._backoff.reset()
+        timeout: float = self._backoff.current.total_seconds()
+        with self._tracer.span("capped", timeout=timeout):
+            if self._in_flight:
+                wait(self._in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+            else:
+                time.sleep(timeout)
+
+    def _execute(self) -> None:
+        """Claim the current task, launch a session, and mark it complete.
+
+        In concurrent mode the session is handed to the worker pool and this
+        only blocks while every slot is occupied. If another worker claimed
+        the task first, the next candidate from the same poll is tried; once
+        every candidate is lost, the admission slot taken for the launch is
+        refunded and the chameleon goes back to polling.
+        """
+        claimed: tuple[Role, Task] | None = self._claim_candidate()
+        if claimed is not None:
+            role, task = claimed
+            self._schedule_prefetch(task.id)
+            self._start_session(role, task)
+        elif self._admission is not None and self._current_role is not None:
+            self._admission.refund(self._current_role)
         self._current_task = None
-        self._state = ChameleonState.POLLING
+        self._current_role = None
+        self._current_claimed = False
+        self._candidates = []
+        self._transition(ChameleonState.POLLING)
+
+    def _claim_candidate(self) -> tuple[Role, Task] | None:
+        """Claim the current task, falling back to the poll's other candidates."""
+        assert self._current_task is not None
+        assert self._current_role is not None
+        current: tuple[Role, Task] = (self._current_role, self._current_task)
+        if self._current_claimed:
+            return current
+        for role, task in (current, *self._candidates):
+            if self._try_claim(task):
+                return role, task
+        return None
+
+    def _try_claim(self, task: Task) -> bool:
+        """Claim a task, returning False if another worker got it first."""
+        try:
+            with self._tracer.span("claim", task=task.id):
+                self._task_mgr.claim(task.id)
+        except ClaimConflictError:
+            logger.info("task %s was claimed by another worker", task.id)
+            return False
+        if self._leases is not None:
+            self._leases.track(task.id)
+        return True
+
+    def _take_prefetched(self) -> bool:
+        """Move a prefetched task whose role has a free slot into execution.
+
+        Returns whether the cycle was handled. A prefetched task is already
+        claimed, so if admission refuses its launch the chameleon waits for
+        it rather than polling for more work and asking for admission again.
+        """
+        with self._background_lock:
+            ready: list[tuple[Role, Task]] = [
+                (self._roles.get(role.label, role), task)
+                for role, task in self._prefetched
+            ]
+            index: int | None = next(
+                (i for i, (role, _) in enumerate(ready) if self._has_free_slot(role)),
+                None,
+            )
+            if index is None:
+                return False
+            admission: AdmissionController | None = self._admission
+            delay: float = (
+                admission.admit(ready[index][0]) if admission is not None else 0.0
+            )
+            if delay <= 0:
+                del self._prefetched[index]
+        if delay > 0:
+            self._defer(delay)
+            return True
+        role, task = ready[index]
+        self._backoff.reset()
+        self._current_task = task
+        self._current_role = role
+        self._current_claimed = True
+        self._transition(ChameleonState.EXECUTING)
+        return True
+
+    def _schedule_prefetch(self, current_id: str) -> None:
+        """Start a background poll-and-claim if the look-ahead has room."""
+        if self._background is None:
+            return
+        if self._prefetch_future is not None and not self._prefetch_future.done():
+            return
+        with self._background_lock:
+            wanted: int = self._prefetch_depth - len(self._prefetched)
+            excluded: set[str] = {task.id for _, task in self._prefetched}
+        if wanted <= 0:
+            return
+        excluded.update(task.id for _, task in self._in_flight.values())
+        excluded.add(current_id)
+        self._prefetch_future = self._background.submit(
+            self._prefetch, dict(self._roles), frozenset(excluded), wanted,
+        )
+
+    def _prefetch(
+        self, roles: dict[str, Role], excluded: frozenset[str], wanted: int,
+    ) -> None:
+        """Poll and claim up to ``wanted`` tasks for later execution."""
+        labels: list[str] = list(roles)
+        try:
+            with self._tracer.span("prefetch.poll", wanted=wanted):
+                tasks: list[Task] = self._selector.order(
+                    self._task_mgr.poll(labels[0])
+                    if len(labels) == 1
+                    else self._task_mgr.poll_any(labels)
+                )
+            for task in tasks:
+                if wanted == 0 or self._state == ChameleonState.SHUTDOWN:
+                    break
+                role: Role | None = self._matching_role(task, roles)
+                if (
+                    task.id in excluded
+                    or not task.ready
+                    or self._retries.cooling(task.id)
+                    or role is None
+                    or not self._try_claim(task)
+                ):
+                    continue
+                with self._background_lock:
+                    self._prefetched.append((role, task))
+                wanted -= 1
+        except Exception:
+            logger.exception("prefetch failed; tasks will be polled normally")
+
+    def _await_prefetch(self) -> None:
+        """Wait for a running prefetch so the loop never races it for a claim."""
+        if self._prefetch_future is not None:
+            wait([self._prefetch_future])
+            self._prefetch_future = None
+
+    def _start_session(self, role: Role, task: Task) -> None:
+        """Run a claimed task inline or hand it to the worker pool."""
+        if self._pool is None:
+            self._run_session(role, task)
+        else:
+            future: Future[None] = self._pool.submit(self._run_session, role, task)
+            self._in_flight[future] = (role, task)
+            self._wait_for_free_slot()
+
+    def _transition(self, state: ChameleonState) -> None:
+        """Move to a new state unless shutdown has already been requested."""
+        if self._state != ChameleonState.SHUTDOWN:
+            self._record_state_time()
+            self._state = state
+
+    def _record_state_time(self) -> None:
+        """Credit the time since the last transition to the current state."""
+        if self._metrics is None:
+            return
+        now: float = time.monotonic()
+        self._state_counters[self._state].inc(now - self._state_since)
+        self._state_since = now
+
+    def _run_session(self, role: Role, task: Task) -> None:
+        """Launch a session for a claimed task, then complete or release it.
+
+        A polled task is only a summary, so its full description is fetched
+        first. A session that failed or timed out has its task released back
+        to open instead of being marked complete, or parked once it has
+        failed as often as ``retries`` allows.
+        """
+        with self._tracer.span("describe", task=task.id):
+            task = self._task_mgr.describe(task)
+        finish: Callable[[str], None] = self._complete
+        try:
+            with self._tracer.span("launch", task=task.id, role=role.name):
+                if self._metrics is None:
+                    self._launcher.launch(role, task)
+                else:
+                    self._launch_metered(role, task, self._metrics)
+        except SessionFailedError as exc:
+            if self._retries.failed(task.id):
+                logger.warning("%s; parking the task after repeated failures", exc)
+                finish = self._park
+            else:
+                logger.warning("%s; releasing the task", exc)
+                finish = self._release
+        else:
+            self._retries.succeeded(task.id)
+        if self._background is None:
+            finish(task.id)
+            return
+        future: Future[None] = self._background.submit(finish, task.id)
+        with self._background_lock:
+            self._completions.append(future)
+
+    def _launch_metered(
+        self, role: Role, task: Task, metrics: ChameleonMetrics,
+    ) -> None:
+        """Launch a session, recording its duration and any failure."""
+        start: float = time.monotonic()
+        try:
+            self._launcher.launch(role, task)
+        except Exception:
+            metrics.session_failures.labels(role.name).inc()
+            raise
+        finally:
+            metrics.session_seconds.labels(role.name).observe(
+                time.monotonic() - start
+            )
+
+    def _complete(self, task_id: str) -> None:
+        """Mark a task complete and give up its lease."""
+        with self._tracer.span("complete", task=task_id):
+            self._task_mgr.complete(task_id)
+        if self._leases is not None:
+            self._leases.untrack(task_id)
+
+    def _release(self, task_id: str) -> None:
+        """Return a task to open and give up its lease."""
+        with self._tracer.span("release", task=task_id):
+            self._task_mgr.release(task_id)
+        if self._leases is not None:
+            self._leases.untrack(task_id)
+
+    def _park(self, task_id: str) -> None:
+        """Set a task that keeps failing aside and give up its lease."""
+        with self._tracer.span("park", task=task_id):
+            self._task_mgr.park(task_id)
+        if self._leases is not None:
+            self._leases.untrack(task_id)
+
+    def _reap(self, done: set[Future[None]]) -> None:
+        """Forget finished sessions, re-raising any error they ended with."""
+        for future in done:
+            del self._in_flight[future]
+        for future in done:
+            future.result()
+
+    def _reap_finished(self) -> None:
+        """Reap sessions and completions that have finished without blocking."""
+        self._reap({future for future in self._in_flight if future.done()})
+        with self._background_lock:
+            done: list[Future[None]] = [f for f in self._completions if f.done()]
+            self._completions = [f for f in self._completions if not f.done()]
+        for future in done:
+            future.result()
+
+    def _wait_for_free_slot(self) -> None:
+        """Block until at least one execution slot is free."""
+        self._reap_finished()
+        if len(self._in_flight) >= self._concurrency:
+            done, _ = wait(self._in_flight, return_when=FIRST_COMPLETED)
+            self._reap(done)
+
+    def _drain(self) -> None:
+        """Wait for in-flight sessions to finish and release the worker pools.
+
+        Prefetched tasks that never started are released back to open.
+        """
+        try:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+                self._reap(set(self._in_flight))
+        finally:
+            self._drain_background()
+
+    def _drain_background(self) -> None:
+        """Release unstarted prefetched tasks and flush pending completions."""
+        if self._background is None:
+            return
+        self._await_prefetch()
+        while self._prefetched:
+            _, task = self._prefetched.popleft()
+            try:
+                self._task_mgr.release(task.id)
+            except Exception:
+                logger.exception("failed to release prefetched task %s", task.id)
+                continue
+            if self._leases is not None:
+                self._leases.untrack(task.id)
+        self._background.shutdown(wait=True)
+        self._background = None
+        self._reap_finished()
 
     def run(self) -> None:
         """Run the main polling-executing loop until shutdown."""
-        role: Role = self._config_mgr.load_role(self._role_name)
-        while self._state != ChameleonState.SHUTDOWN:
-            if self._state == ChameleonState.POLLING:
-                self._poll(role)
-            elif self._state == ChameleonState.EXECUTING:
-                self._execute(role)
+        self._load_roles()
+        if self._concurrency > 1:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self._concurrency, thread_name_prefix="chameleon",
+            )
+        if self._prefetch_depth > 0:
+            self._background = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="chameleon-prefetch",
+            )
+        try:
+            while self._state != ChameleonState.SHUTDOWN:
+                if self._state == ChameleonState.POLLING:
+                    if self._profiler is not None:
+                        self._profiler.tick()
+                    self._poll()
+                elif self._state == ChameleonState.EXECUTING:
+                    self._execute()
+        finally:
+            if self._profiler is not None:
+                self._profiler.finish()
+            self._drain()
+            self._record_state_time()
 
     def shutdown(self) -> None:
-        """Signal the chameleon to stop after the current cycle."""
+        """Signal the chameleon to stop after the current cycle.
+
+        Sessions already in flight are allowed to finish before ``run`` returns.
+        """
         self._state = ChameleonState.SHUTDOWN
@@ -1,14 +1,69 @@
 """Concrete SessionLauncher that invokes the Claude CLI."""
 
+import contextlib
+import logging
+import os
+import resource
+import signal
 import subprocess
 import sys
+import tempfile
 import termios
+from pathlib import Path
+from typing import Any
 
-from bd_agent_chameleon.models import Role, Task
+from bd_agent_chameleon.models import Role, SessionOutcome, Task
+from bd_agent_chameleon.protocols import SessionFailedError
+from bd_agent_chameleon.session_log import RotatingLog, pump_process
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Largest encoded prompt passed on the command line; well under the 128 KiB
+# per-argument limit (MAX_ARG_STRLEN) on Linux.
+ARGV_PROMPT_LIMIT: int = 32 * 1024
+
+_SHM_DIR: Path = Path("/dev/shm")
 
 
 class ClaudeLauncher:
-    """Launches Claude CLI sessions with prompt composition and terminal management."""
+    """Launches Claude CLI sessions with prompt composition and terminal management.
+
+    With a ``log_dir``, non-interactive sessions have their stdout and stderr
+    streamed into ``<log_dir>/<task id>.log``, rotated once it passes
+    ``max_log_bytes``, and optionally teed to the console. Interactive
+    sessions always keep the terminal.
+
+    Prompts larger than ``argv_prompt_limit`` bytes never go through argv:
+    non-interactive sessions read them from stdin, and interactive ones are
+    pointed at a private temp file (memory-backed where ``/dev/shm`` exists)
+    that is removed when the session ends.
+
+    Sessions run under their role's ``timeout_seconds``, ``cpu_seconds``, and
+    ``memory_mb``. The CPU and memory caps are set with ``prlimit`` on the
+    new process (Linux only), so no code runs between fork and exec. A
+    session that overruns its timeout gets SIGTERM, then SIGKILL once
+    ``kill_grace`` seconds have passed. Sessions that do not need the
+    terminal run in their own process group, so the signals reach every
+    process they started. A session that times out or exits non-zero raises
+    ``SessionFailedError``.
+    """
+
+    def __init__(
+        self,
+        log_dir: Path | None = None,
+        max_log_bytes: int = 64 * 1024 * 1024,
+        log_backups: int = 1,
+        tee: bool = False,
+        argv_prompt_limit: int = ARGV_PROMPT_LIMIT,
+        kill_grace: float = 10.0,
+    ) -> None:
+        """Configure output capture, prompt transport, and kill escalation."""
+        self._log_dir: Path | None = log_dir
+        self._max_log_bytes: int = max_log_bytes
+        self._log_backups: int = log_backups
+        self._tee: bool = tee
+        self._argv_prompt_limit: int = argv_prompt_limit
+        self._kill_grace: float = kill_grace
 
     @staticmethod
     def _compose_prompt(role: Role, task: Task) -> str:
@@ -16,9 +71,12 @@ class ClaudeLauncher:
         return f"{role.prompt}\n\n## Task: {task.title}\n\n{task.description}"
 
     @staticmethod
-    def _build_command(prompt: str, role: Role) -> list[str]:
-        """Build the Claude CLI command from a prompt and role configuration."""
-        cmd: list[str] = ["claude", prompt]
+    def _build_command(prompt: str | None, role: Role) -> list[str]:
+        """Build the Claude CLI command from a prompt and role configuration.
+
+        With no prompt, the CLI reads it from stdin.
+        """
+        cmd: list[str] = ["claude"] if prompt is None else ["claude", prompt]
 
         if not role.interactive:
             cmd.append("--print")
@@ -29,20 +87,197 @@ class ClaudeLauncher:
         return cmd
 
     @staticmethod
-    def _launch_with_tty(cmd: list[str]) -> None:
-        """Run a subprocess with terminal state save/restore."""
+    def _write_prompt_file(prompt: bytes) -> Path:
+        """Write a prompt to a private temp file, in memory where possible."""
+        directory: str | None = str(_SHM_DIR) if _SHM_DIR.is_dir() else None
+        fd, name = tempfile.mkstemp(
+            prefix="chameleon-prompt-", suffix=".md", dir=directory,
+        )
+        with os.fdopen(fd, "wb") as f:
+            f.write(prompt)
+        return Path(name)
+
+    @staticmethod
+    def apply_limits(pid: int, role: Role) -> None:
+        """Cap a started session's CPU time and memory at its role's limits.
+
+        Memory is capped as the data segment rather than the address space,
+        because Node reserves far more address space than it ever touches.
+        """
+        caps: list[tuple[int, int]] = []
+        if role.cpu_seconds is not None:
+            caps.append((resource.RLIMIT_CPU, role.cpu_seconds))
+        if role.memory_mb is not None:
+            caps.append((resource.RLIMIT_DATA, role.memory_mb * 1024 * 1024))
+        if not caps:
+            return
+        if sys.platform != "linux":
+            logger.warning(
+                "CPU and memory caps need Linux; role %s runs uncapped", role.name,
+            )
+            return
+        for limit, value in caps:
+            with contextlib.suppress(ProcessLookupError):
+                resource.prlimit(pid, limit, (value, value))
+
+    @staticmethod
+    def signal_session(pid: int, signum: int, group: bool) -> None:
+        """Send a signal to a session, or to its whole process group."""
+        with contextlib.suppress(ProcessLookupError):
+            if group:
+                os.killpg(pid, signum)
+            else:
+                os.kill(pid, signum)
+
+    def _terminate(self, proc: subprocess.Popen[bytes], group: bool) -> None:
+        """Stop a session with SIGTERM, escalating to SIGKILL after the grace period.
+
+        For a process group, SIGKILL also goes to any process left behind
+        once the session itself has exited.
+        """
+        self.signal_session(proc.pid, signal.SIGTERM, group)
+        try:
+            proc.wait(self._kill_grace)
+        except subprocess.TimeoutExpired:
+            self.signal_session(proc.pid, signal.SIGKILL, group)
+            proc.wait()
+        if group:
+            self.signal_session(proc.pid, signal.SIGKILL, group)
+
+    @staticmethod
+    def _spawn(
+        cmd: list[str], role: Role, group: bool, **kwargs: Any,
+    ) -> subprocess.Popen[bytes]:
+        """Start a session process, in a new process group if asked, and cap it.
+
+        If the caps cannot be applied, the process is killed before the error
+        is raised.
+        """
+        proc: subprocess.Popen[bytes] = subprocess.Popen(
+            cmd, start_new_session=group, **kwargs,
+        )
+        try:
+            ClaudeLauncher.apply_limits(proc.pid, role)
+        except BaseException:
+            ClaudeLauncher.signal_session(proc.pid, signal.SIGKILL, group)
+            proc.wait()
+            raise
+        return proc
+
+    def _run(
+        self, cmd: list[str], role: Role, stdin_data: bytes | None, group: bool,
+    ) -> int:
+        """Run a session and return its exit status.
+
+        Raises ``subprocess.TimeoutExpired`` once a session that overran its
+        timeout has been stopped.
+        """
+        proc: subprocess.Popen[bytes] = self._spawn(
+            cmd, role, group,
+            stdin=None if stdin_data is None else subprocess.PIPE,
+        )
+        try:
+            proc.communicate(input=stdin_data, timeout=role.timeout_seconds)
+        except subprocess.TimeoutExpired:
+            self._terminate(proc, group)
+            raise
+        except BaseException:
+            self.signal_session(proc.pid, signal.SIGKILL, group)
+            proc.wait()
+            raise
+        return proc.returncode
+
+    def _launch_with_tty(
+        self, cmd: list[str], role: Role, stdin_data: bytes | None = None,
+    ) -> int:
+        """Run a session in the foreground with terminal state save/restore."""
         saved_attrs: list = termios.tcgetattr(sys.stdin)  # type: ignore[type-arg]
         try:
-            subprocess.run(cmd, check=False)
+            return self._run(cmd, role, stdin_data, group=False)
         finally:
             termios.tcsetattr(sys.stdin, termios.TCSADRAIN, saved_attrs)
 
-    def launch(self, role: Role, task: Task) -> None:
-        """Launch a Claude session for the given role and task."""
+    def _launch_captured(
+        self,
+        cmd: list[str],
+        role: Role,
+        log_path: Path,
+        stdin_data: bytes | None = None,
+    ) -> int:
+        """Run a session with its output streamed into a task log file.
+
+        Raises ``subprocess.TimeoutExpired`` once a session that overran its
+        timeout has been stopped and its output drained.
+        """
+        log: RotatingLog = RotatingLog(
+            log_path, self._max_log_bytes, self._log_backups,
+        )
+        try:
+            proc: subprocess.Popen[bytes] = self._spawn(
+                cmd, role, True,
+                stdin=subprocess.DEVNULL if stdin_data is None else subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+            returncode: int | None = pump_process(
+                proc,
+                log,
+                sys.stdout.buffer if self._tee else None,
+                sys.stderr.buffer if self._tee else None,
+                stdin_data,
+                role.timeout_seconds,
+                self._kill_grace,
+                lambda signum: self.signal_session(proc.pid, signum, True),
+            )
+        finally:
+            log.close()
+        if returncode is None:
+            assert role.timeout_seconds is not None
+            self.signal_session(proc.pid, signal.SIGKILL, True)
+            raise subprocess.TimeoutExpired(cmd, role.timeout_seconds)
+        return returncode
+
+    def prepare(
+        self, role: Role, task: Task,
+    ) -> tuple[list[str], bytes | None, Path | None]:
+        """Build a session's command, its stdin payload, and any prompt file.
+
+        The caller must remove the prompt file once the session has ended.
+        """
         prompt: str = self._compose_prompt(role, task)
-        cmd: list[str] = self._build_command(prompt, role)
+        encoded: bytes = prompt.encode()
+        if len(encoded) <= self._argv_prompt_limit:
+            return self._build_command(prompt, role), None, None
+        if not role.interactive:
+            return self._build_command(None, role), encoded, None
+        prompt_file: Path = self._write_prompt_file(encoded)
+        cmd: list[str] = self._build_command(
+            f"Your full instructions are in the file {prompt_file}. "
+            "Read that file and follow them.",
+            role,
+        )
+        return cmd, None, prompt_file
 
-        if sys.stdin.isatty():
-            self._launch_with_tty(cmd)
-        else:
-            subprocess.run(cmd, check=False)
+    def launch(self, role: Role, task: Task) -> None:
+        """Run a Claude session for the given role and task to completion.
+
+        Raises ``SessionFailedError`` if the session timed out or exited
+        non-zero.
+        """
+        cmd, stdin_data, prompt_file = self.prepare(role, task)
+        try:
+            if self._log_dir is not None and not role.interactive:
+                returncode: int = self._launch_captured(
+                    cmd, role, self._log_dir / f"{task.id}.log", stdin_data,
+                )
+            elif sys.stdin.isatty():
+                returncode = self._launch_with_tty(cmd, role, stdin_data)
+            else:
+                returncode = self._run(cmd, role, stdin_data, group=True)
+        except subprocess.TimeoutExpired as exc:
+            raise SessionFailedError(task.id, SessionOutcome.TIMED_OUT) from exc
+        finally:
+            if prompt_file is not None:
+                prompt_file.unlink(missing_ok=True)
+        if returncode != 0:
+            raise SessionFailedError(task.id, SessionOutcome.FAILED, returncode)
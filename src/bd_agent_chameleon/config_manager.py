@@ -1,31 +1,101 @@
 """Configuration management for bd-agent-chameleon role definitions."""
 
+import logging
+import os
+import threading
 import tomllib
 from pathlib import Path
 from typing import Any
 
 from bd_agent_chameleon.models import Role
 
+logger: logging.Logger = logging.getLogger(__name__)
+
+_StatKey = tuple[int, int, int]
+
 
 class ConfigManager:
-    """Loads and provides Role configurations from a TOML file."""
+    """Loads and provides Role configurations from a TOML file.
+
+    The file is parsed once into an index from role name to ``Role``. Every
+    lookup revalidates the index with a single ``stat`` of the file (mtime,
+    size, inode) and swaps in a freshly parsed index when it has changed, so
+    edits take effect without a restart. If a changed file fails to parse,
+    the previous index keeps being served.
+    """
 
     def __init__(self, config_path: Path) -> None:
         """Initialize with the path to the TOML configuration file."""
         self._config_path: Path = config_path
+        self._lock: threading.Lock = threading.Lock()
+        self._cache: tuple[_StatKey, dict[str, Role]] | None = None
 
-    def load_role(self, name: str) -> Role:
-        """Resolve a role name to a Role from the config file."""
+    def _stat_key(self) -> _StatKey:
+        """Return the identity of the config file's current contents."""
+        st: os.stat_result = os.stat(self._config_path)
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _parse(self) -> dict[str, Role]:
+        """Parse the config file into an index of roles."""
         with open(self._config_path, "rb") as f:
             config: dict[str, Any] = tomllib.load(f)
+        return {
+            name: Role(
+                name=name,
+                prompt=role_data["prompt"],
+                interactive=role_data["interactive"],
+                agent=role_data.get("agent"),
+                max_concurrency=role_data.get("max_concurrency"),
+                min_workers=role_data.get("min_workers", 0),
+                max_workers=role_data.get("max_workers", 1),
+                timeout_seconds=role_data.get("timeout_seconds"),
+                cpu_seconds=role_data.get("cpu_seconds"),
+                memory_mb=role_data.get("memory_mb"),
+                launches_per_minute=role_data.get("launches_per_minute"),
+                launch_burst=role_data.get("launch_burst", 1),
+            )
+            for name, role_data in config.items()
+        }
 
-        if name not in config:
-            raise KeyError(f"Role '{name}' not found in {self._config_path}")
+    def _index(self) -> dict[str, Role]:
+        """Return the role index, reparsing the file if it has changed."""
+        cache: tuple[_StatKey, dict[str, Role]] | None = self._cache
+        try:
+            key: _StatKey = self._stat_key()
+        except OSError:
+            if cache is None:
+                raise
+            logger.warning("config %s unreadable; keeping roles", self._config_path)
+            return cache[1]
+        if cache is not None and cache[0] == key:
+            return cache[1]
+        with self._lock:
+            cache = self._cache
+            if cache is not None and cache[0] == key:
+                return cache[1]
+            try:
+                index: dict[str, Role] = self._parse()
+            except (OSError, KeyError, ValueError) as exc:
+                if cache is None:
+                    raise
+                logger.warning(
+                    "config %s failed to reload (%s); keeping previous roles",
+                    self._config_path, exc,
+                )
+                self._cache = (key, cache[1])
+                return cache[1]
+            if cache is not None:
+                logger.info("reloaded roles from %s", self._config_path)
+            self._cache = (key, index)
+            return index
+
+    def role_names(self) -> list[str]:
+        """List the names of every role defined in the config file."""
+        return list(self._index())
 
-        role_data: dict[str, Any] = config[name]
-        return Role(
-            name=name,
-            prompt=role_data["prompt"],
-            interactive=role_data["interactive"],
-            agent=role_data.get("agent"),
-        )
+    def load_role(self, name: str) -> Role:
+        """Resolve a role name to a Role from the config file."""
+        index: dict[str, Role] = self._index()
+        if name not in index:
+            raise KeyError(f"Role '{name}' not found in {self._config_path}")
+        return index[name]
@@ -0,0 +1,146 @@
+"""Change watchers that wake idle chameleons when the beads database changes."""
+
+import ctypes
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+from bd_agent_chameleon.protocols import ChangeWatcher
+
+_IN_MODIFY: int = 0x002
+_IN_CLOSE_WRITE: int = 0x008
+_IN_MOVED_TO: int = 0x080
+_IN_CREATE: int = 0x100
+_IN_DELETE: int = 0x200
+_WATCH_MASK: int = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_EVENT_HEADER: struct.Struct = struct.Struct("iIII")
+
+# Files bd-agent-chameleon itself keeps beside the beads database, such as the
+# lease store (and its WAL) and the broker socket. Changes to them say nothing
+# about tasks, so they must not wake idle workers.
+OWN_FILE_PREFIX: str = "chameleon-"
+
+
+def _is_own_file(name: str) -> bool:
+    """Return whether a directory entry belongs to bd-agent-chameleon itself."""
+    return name.startswith(OWN_FILE_PREFIX)
+
+
+def _event_names(data: bytes) -> list[str]:
+    """Return the file name carried by each inotify event in a read buffer."""
+    names: list[str] = []
+    offset: int = 0
+    while offset + _EVENT_HEADER.size <= len(data):
+        length: int = _EVENT_HEADER.unpack_from(data, offset)[3]
+        offset += _EVENT_HEADER.size
+        names.append(os.fsdecode(data[offset : offset + length].rstrip(b"\0")))
+        offset += length
+    return names
+
+
+class InotifyWatcher:
+    """Blocks on inotify events for a directory (Linux only).
+
+    Events for bd-agent-chameleon's own files are read and ignored.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        """Create an inotify instance watching the given directory."""
+        libc: ctypes.CDLL = ctypes.CDLL(None, use_errno=True)
+        fd: int = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            errno: int = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        if libc.inotify_add_watch(fd, os.fsencode(directory), _WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(errno, os.strerror(errno), str(directory))
+        self._fd: int = fd
+
+    def _drain(self) -> bool:
+        """Read every pending event and return whether any concerns a task file."""
+        changed: bool = False
+        try:
+            while data := os.read(self._fd, 4096):
+                changed = changed or any(
+                    not _is_own_file(name) for name in _event_names(data)
+                )
+        except BlockingIOError:
+            pass
+        return changed
+
+    def wait(self, timeout: float) -> bool:
+        """Block until a change event arrives or the timeout elapses."""
+        deadline: float = time.monotonic() + timeout
+        while True:
+            remaining: float = max(0.0, deadline - time.monotonic())
+            readable, _, _ = select.select([self._fd], [], [], remaining)
+            if not readable:
+                return False
+            if self._drain():
+                return True
+
+    def close(self) -> None:
+        """Release the inotify file descriptor."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class StatWatcher:
+    """Detects changes by periodically stat-ing every file in a directory.
+
+    The snapshot taken at the end of one ``wait`` is the baseline for the
+    next, so changes made while the caller was polling are not missed.
+    bd-agent-chameleon's own files are left out of the snapshot.
+    """
+
+    def __init__(self, directory: Path, check_interval: float = 0.25) -> None:
+        """Initialize with the directory to watch and how often to stat it."""
+        self._directory: Path = directory
+        self._check_interval: float = check_interval
+        self._snapshot: frozenset[tuple[str, int, int]] = self._take_snapshot()
+
+    def _take_snapshot(self) -> frozenset[tuple[str, int, int]]:
+        """Return the name, mtime and size of every entry in the directory."""
+        entries: set[tuple[str, int, int]] = set()
+        with os.scandir(self._directory) as it:
+            for entry in it:
+                if _is_own_file(entry.name):
+                    continue
+                try:
+                    st: os.stat_result = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.add((entry.name, st.st_mtime_ns, st.st_size))
+        return frozenset(entries)
+
+    def wait(self, timeout: float) -> bool:
+        """Block until the directory snapshot changes or the timeout elapses."""
+        deadline: float = time.monotonic() + timeout
+        while True:
+            snapshot: frozenset[tuple[str, int, int]] = self._take_snapshot()
+            if snapshot != self._snapshot:
+                self._snapshot = snapshot
+                return True
+            remaining: float = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self._check_interval, remaining))
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+
+def create_watcher(db_path: Path) -> ChangeWatcher:
+    """Build the best available watcher for a beads database path."""
+    directory: Path = db_path if db_path.is_dir() else db_path.parent
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(directory)
+        except OSError:
+            pass
+    return StatWatcher(directory)
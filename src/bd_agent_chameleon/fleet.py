@@ -0,0 +1,163 @@
+"""Fleet supervisor that spawns, restarts, and autoscales chameleon workers."""
+
+import logging
+import math
+import subprocess
+import sys
+import threading
+from collections.abc import Sequence
+from datetime import timedelta
+from pathlib import Path
+
+from bd_agent_chameleon.config_manager import ConfigManager
+from bd_agent_chameleon.leases import LeaseReaper
+from bd_agent_chameleon.models import Role
+from bd_agent_chameleon.protocols import BacklogCounter, WorkerProcess, WorkerSpawner
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+class ProcessSpawner:
+    """Starts each worker as a ``bd-agent-chameleon run`` child process."""
+
+    def __init__(
+        self, config_path: Path, db_path: Path, extra_args: Sequence[str] = (),
+    ) -> None:
+        """Initialize with the paths and extra CLI arguments every worker gets."""
+        self._config_path: Path = config_path
+        self._db_path: Path = db_path
+        self._extra_args: tuple[str, ...] = tuple(extra_args)
+
+    def spawn(self, role: Role) -> WorkerProcess:
+        """Start a worker process serving the role."""
+        cmd: list[str] = [
+            sys.executable, "-m", "bd_agent_chameleon.main", "run",
+            "--config", str(self._config_path),
+            "--db", str(self._db_path),
+            "--role", role.name,
+            *self._extra_args,
+        ]
+        return subprocess.Popen(cmd)
+
+
+class FleetSupervisor:
+    """Keeps each role's worker count matched to its backlog.
+
+    Every check, each role's backlog is counted as its ready open tasks
+    plus the tasks its workers hold in progress, so that claiming work does
+    not shrink the fleet under a running session. The role is sized to one
+    worker per ``tasks_per_worker`` backlog tasks, clamped to the role's
+    ``min_workers`` and ``max_workers``. Workers that exit on their own are
+    replaced. Surplus workers are sent SIGTERM, which a chameleon treats as
+    ``shutdown()``: it finishes its current session before exiting. With a
+    ``reaper``, each check also re-opens tasks whose worker died without
+    releasing them.
+    """
+
+    def __init__(
+        self,
+        config_mgr: ConfigManager,
+        task_mgr: BacklogCounter,
+        spawner: WorkerSpawner,
+        check_interval: timedelta = timedelta(seconds=10),
+        tasks_per_worker: int = 1,
+        reaper: LeaseReaper | None = None,
+    ) -> None:
+        """Initialize with injected dependencies and the scaling policy."""
+        if tasks_per_worker < 1:
+            raise ValueError(
+                f"tasks_per_worker must be at least 1, got {tasks_per_worker}"
+            )
+        self._config_mgr: ConfigManager = config_mgr
+        self._task_mgr: BacklogCounter = task_mgr
+        self._spawner: WorkerSpawner = spawner
+        self._check_interval: timedelta = check_interval
+        self._tasks_per_worker: int = tasks_per_worker
+        self._reaper: LeaseReaper | None = reaper
+        self._workers: dict[str, list[WorkerProcess]] = {}
+        self._draining: list[WorkerProcess] = []
+        self._stopping: threading.Event = threading.Event()
+
+    def workers(self, role_name: str) -> int:
+        """Return how many live, non-draining workers serve a role."""
+        return len(self._workers.get(role_name, []))
+
+    def _desired(self, role: Role) -> int:
+        """Size a role from its backlog, keeping its current size on poll errors."""
+        try:
+            waiting: int = sum(task.ready for task in self._task_mgr.poll(role.label))
+            backlog: int = waiting + self._task_mgr.count_in_progress(role.label)
+        except Exception:
+            logger.exception("could not poll backlog for role %s", role.name)
+            wanted: int = self.workers(role.name)
+        else:
+            wanted = math.ceil(backlog / self._tasks_per_worker)
+        return max(role.min_workers, min(role.max_workers, wanted))
+
+    def _reap(self) -> None:
+        """Forget exited workers, logging any that were not asked to stop."""
+        for name, live in self._workers.items():
+            for worker in [w for w in live if w.poll() is not None]:
+                logger.warning(
+                    "worker for role %s exited with status %s; replacing it",
+                    name, worker.poll(),
+                )
+                live.remove(worker)
+        self._draining = [w for w in self._draining if w.poll() is None]
+
+    def _scale(self, role: Role, desired: int) -> None:
+        """Start or gracefully stop workers until the role has ``desired``."""
+        live: list[WorkerProcess] = self._workers.setdefault(role.name, [])
+        if len(live) != desired:
+            logger.info(
+                "scaling role %s from %d to %d workers", role.name, len(live), desired,
+            )
+        while len(live) < desired:
+            live.append(self._spawner.spawn(role))
+        while len(live) > desired:
+            self._drain(live.pop())
+
+    def _drain(self, worker: WorkerProcess) -> None:
+        """Ask a worker to finish its current session and exit."""
+        worker.terminate()
+        self._draining.append(worker)
+
+    def reconcile(self) -> None:
+        """Run one check: replace exited workers and resize every role."""
+        self._reap()
+        if self._reaper is not None:
+            try:
+                self._reaper.reap()
+            except Exception:
+                logger.exception("lease reaping failed")
+        names: list[str] = self._config_mgr.role_names()
+        for name in names:
+            role: Role = self._config_mgr.load_role(name)
+            self._scale(role, self._desired(role))
+        for name in [n for n in self._workers if n not in names]:
+            logger.info("role %s was removed from the config; draining", name)
+            for worker in self._workers.pop(name):
+                self._drain(worker)
+
+    def run(self) -> None:
+        """Reconcile on every check interval until shutdown, then stop workers."""
+        try:
+            while not self._stopping.is_set():
+                self.reconcile()
+                self._stopping.wait(self._check_interval.total_seconds())
+        finally:
+            self._stop_all()
+
+    def _stop_all(self) -> None:
+        """Gracefully stop every worker and wait for them to exit."""
+        for live in self._workers.values():
+            for worker in live:
+                self._drain(worker)
+        self._workers.clear()
+        for worker in self._draining:
+            worker.wait()
+        self._draining.clear()
+
+    def shutdown(self) -> None:
+        """Signal the supervisor to stop after the current check."""
+        self._stopping.set()
@@ -0,0 +1,204 @@
+"""Claim leases with batched heartbeats, and a reaper for expired ones."""
+
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterable
+from datetime import timedelta
+from pathlib import Path
+
+from bd_agent_chameleon.protocols import TaskManager
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+LEASE_DB_NAME: str = "chameleon-leases.db"
+
+_SCHEMA: str = """
+    CREATE TABLE IF NOT EXISTS leases (
+        task_id TEXT PRIMARY KEY,
+        owner TEXT NOT NULL,
+        expires_at REAL NOT NULL
+    )
+"""
+
+
+def default_lease_path(db_path: Path) -> Path:
+    """Return the lease database path for a beads database."""
+    beads_dir: Path = db_path if db_path.is_dir() else db_path.parent
+    return beads_dir / LEASE_DB_NAME
+
+
+def default_owner() -> str:
+    """Identify this process as a lease owner."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class LeaseStore:
+    """SQLite table of task leases shared by every worker on a host.
+
+    The store lives beside the beads database rather than inside it, so bd's
+    schema is never written to. All operations are short autocommit or
+    single-transaction statements, safe to call from several threads.
+    """
+
+    def __init__(
+        self, path: Path, clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Open (creating if needed) the lease database at ``path``."""
+        self._clock: Callable[[], float] = clock
+        self._lock: threading.Lock = threading.Lock()
+        self._conn: sqlite3.Connection = sqlite3.connect(
+            path, isolation_level=None, check_same_thread=False, timeout=10,
+        )
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute(_SCHEMA)
+
+    def acquire(self, task_id: str, owner: str, ttl: timedelta) -> None:
+        """Record that ``owner`` holds the task until ``ttl`` from now."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO leases VALUES (?, ?, ?)",
+                (task_id, owner, self._clock() + ttl.total_seconds()),
+            )
+
+    def renew(self, task_ids: Iterable[str], owner: str, ttl: timedelta) -> None:
+        """Extend every listed lease held by ``owner`` in one transaction."""
+        expires_at: float = self._clock() + ttl.total_seconds()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "UPDATE leases SET expires_at = ? WHERE task_id = ? AND owner = ?",
+                    ((expires_at, task_id, owner) for task_id in task_ids),
+                )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def drop(self, task_id: str, owner: str) -> None:
+        """Remove ``owner``'s lease on the task."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM leases WHERE task_id = ? AND owner = ?", (task_id, owner),
+            )
+
+    def take_expired(self) -> list[tuple[str, str]]:
+        """Delete every lease past its expiry and return ``(task_id, owner)``.
+
+        Selection and removal are one statement, so a heartbeat that lands
+        concurrently either renews a lease before it is taken or misses it.
+        """
+        with self._lock:
+            rows: list[tuple[str, str]] = self._conn.execute(
+                "DELETE FROM leases WHERE expires_at < ? RETURNING task_id, owner",
+                (self._clock(),),
+            ).fetchall()
+        return rows
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class LeaseKeeper:
+    """Holds this process's leases and renews them all on one heartbeat.
+
+    However many tasks are in flight, each heartbeat is a single batched
+    write to the lease store and never a ``bd`` call.
+    """
+
+    def __init__(
+        self,
+        store: LeaseStore,
+        ttl: timedelta = timedelta(seconds=60),
+        heartbeat_interval: timedelta | None = None,
+        owner: str | None = None,
+    ) -> None:
+        """Initialize; the heartbeat defaults to a quarter of the TTL."""
+        self._store: LeaseStore = store
+        self._ttl: timedelta = ttl
+        self._interval: timedelta = (
+            heartbeat_interval if heartbeat_interval is not None else ttl / 4
+        )
+        if self._interval >= ttl:
+            raise ValueError("heartbeat_interval must be shorter than the lease ttl")
+        self._owner: str = owner if owner is not None else default_owner()
+        self._held: set[str] = set()
+        self._lock: threading.Lock = threading.Lock()
+        self._stopping: threading.Event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def track(self, task_id: str) -> None:
+        """Take a lease on a freshly claimed task."""
+        self._store.acquire(task_id, self._owner, self._ttl)
+        with self._lock:
+            self._held.add(task_id)
+
+    def untrack(self, task_id: str) -> None:
+        """Give up the lease on a task that was completed or released."""
+        with self._lock:
+            self._held.discard(task_id)
+        self._store.drop(task_id, self._owner)
+
+    def heartbeat(self) -> None:
+        """Renew every held lease in one batch."""
+        with self._lock:
+            held: list[str] = list(self._held)
+        if held:
+            self._store.renew(held, self._owner, self._ttl)
+
+    def _beat(self) -> None:
+        """Heartbeat until stopped, surviving transient store errors."""
+        while not self._stopping.wait(self._interval.total_seconds()):
+            try:
+                self.heartbeat()
+            except sqlite3.Error:
+                logger.exception("lease heartbeat failed; retrying next interval")
+
+    def start(self) -> None:
+        """Start the background heartbeat thread."""
+        self._thread = threading.Thread(
+            target=self._beat, name="chameleon-heartbeat", daemon=True,
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop heartbeating. Leases still held are left to expire."""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+class LeaseReaper:
+    """Re-opens tasks whose lease expired because their worker died."""
+
+    def __init__(self, store: LeaseStore, task_mgr: TaskManager) -> None:
+        """Initialize with the lease store and the task manager to release to."""
+        self._store: LeaseStore = store
+        self._task_mgr: TaskManager = task_mgr
+
+    def reap(self) -> list[str]:
+        """Release every task with an expired lease and return their ids.
+
+        A task that cannot be released keeps an already-expired lease so the
+        next pass retries it.
+        """
+        reaped: list[str] = []
+        for task_id, owner in self._store.take_expired():
+            try:
+                self._task_mgr.release(task_id)
+            except Exception:
+                logger.exception("could not release expired task %s", task_id)
+                self._store.acquire(task_id, owner, timedelta(0))
+                continue
+            logger.warning(
+                "re-opened task %s after its lease from %s expired", task_id, owner,
+            )
+            reaped.append(task_id)
+        return reaped
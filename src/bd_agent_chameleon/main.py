@@ -1,6 +1,9 @@
 """CLI entry point for bd-agent-chameleon."""
 
+import asyncio
+import logging
 import signal
+import threading
 from datetime import timedelta
 from pathlib import Path
 from types import FrameType
@@ -8,29 +11,405 @@ from typing import Annotated
 
 import typer
 
+from bd_agent_chameleon.admission import (
+    FileTokenBucket,
+    HostAdmissionController,
+    HostLimits,
+    default_admission_dir,
+)
+from bd_agent_chameleon.async_adapters import (
+    AsyncBeadsTaskManager,
+    AsyncClaudeLauncher,
+    ThreadedTaskManager,
+)
+from bd_agent_chameleon.async_chameleon import AsyncChameleon
+from bd_agent_chameleon.bd_daemon import BdDaemonClient
 from bd_agent_chameleon.beads_task_manager import BeadsTaskManager
+from bd_agent_chameleon.broker import BrokerTaskManager, TaskBroker, default_socket_path
 from bd_agent_chameleon.chameleon import Chameleon
 from bd_agent_chameleon.claude_launcher import ClaudeLauncher
 from bd_agent_chameleon.config_manager import ConfigManager
+from bd_agent_chameleon.db_watcher import create_watcher
+from bd_agent_chameleon.fleet import FleetSupervisor, ProcessSpawner
+from bd_agent_chameleon.leases import (
+    LeaseKeeper,
+    LeaseReaper,
+    LeaseStore,
+    default_lease_path,
+    default_owner,
+)
+from bd_agent_chameleon.metrics import (
+    ChameleonMetrics,
+    MeteredTaskManager,
+    MetricsServer,
+    TextfileExporter,
+)
+from bd_agent_chameleon.poll_scheduler import PollBackoff, RetryTracker
+from bd_agent_chameleon.protocols import (
+    AsyncTaskManager,
+    CandidateSelector,
+    ChangeWatcher,
+    TaskManager,
+    Tracer,
+)
+from bd_agent_chameleon.selection import (
+    PriorityOrdering,
+    SelectionStrategy,
+    TaskOrder,
+    create_selector,
+)
+from bd_agent_chameleon.sqlite_reader import SqliteTaskReader
+from bd_agent_chameleon.tracing import CycleProfiler, JsonLinesTracer
+
+logger: logging.Logger = logging.getLogger(__name__)
 
 app: typer.Typer = typer.Typer()
 
 
+def _configure_logging(log_level: str) -> None:
+    """Send log records to stderr at the requested level."""
+    logging.basicConfig(
+        level=log_level.upper(),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+
+
+def _build_beads_task_manager(
+    db: Path,
+    bd_daemon: bool,
+    sqlite_poll: bool,
+    tracer: Tracer | None = None,
+    poll_limit: int | None = None,
+    resync_interval: float | None = None,
+) -> BeadsTaskManager:
+    """Wire a BeadsTaskManager with its optional daemon and SQLite backends."""
+    if resync_interval is not None and not sqlite_poll:
+        raise typer.BadParameter("--resync-interval needs --sqlite-poll")
+    daemon: BdDaemonClient | None = None
+    if bd_daemon:
+        daemon = BdDaemonClient.for_db(db)
+        if not daemon.connect():
+            logger.warning("bd daemon not reachable; using bd subprocesses")
+            daemon = None
+    reader: SqliteTaskReader | None = (
+        SqliteTaskReader(db, poll_limit) if sqlite_poll else None
+    )
+    return BeadsTaskManager(
+        db,
+        daemon,
+        reader,
+        tracer,
+        poll_limit,
+        resync_interval=(
+            timedelta(seconds=resync_interval) if resync_interval is not None else None
+        ),
+    )
+
+
+async def _run_async(chameleon: AsyncChameleon) -> None:
+    """Run an AsyncChameleon with signal-driven shutdown on the running loop."""
+    chameleon.install_signal_handlers()
+    await chameleon.run()
+
+
 @app.command()
 def run(
-    role: Annotated[str, typer.Option(help="Role name to load from config.")],
     config: Annotated[Path, typer.Option(help="Path to the TOML config file.")],
     db: Annotated[Path, typer.Option(help="Path to the beads database directory.")],
+    role: Annotated[
+        list[str] | None,
+        typer.Option(help="Role name to load from config; repeat to serve several."),
+    ] = None,
+    all_roles: Annotated[
+        bool, typer.Option(help="Serve every role defined in the config file.")
+    ] = False,
     poll_interval: Annotated[
         float, typer.Option(help="Poll interval in seconds.")
     ] = 2.0,
+    max_poll_interval: Annotated[
+        float | None,
+        typer.Option(help="Back off up to this many seconds while the queue is empty."),
+    ] = None,
+    backoff_multiplier: Annotated[
+        float, typer.Option(min=1.0, help="Growth factor per empty poll.")
+    ] = 2.0,
+    poll_jitter: Annotated[
+        float,
+        typer.Option(min=0.0, max=0.99, help="Random +/- fraction applied to waits."),
+    ] = 0.1,
+    concurrency: Annotated[
+        int, typer.Option(min=1, help="Maximum Claude sessions run at once.")
+    ] = 1,
+    prefetch: Annotated[
+        int,
+        typer.Option(min=0, help="Tasks to claim ahead while a session runs."),
+    ] = 0,
+    bd_daemon: Annotated[
+        bool,
+        typer.Option(help="Talk to the bd daemon over its socket when it is running."),
+    ] = False,
+    sqlite_poll: Annotated[
+        bool,
+        typer.Option(help="Poll by reading the beads SQLite database directly."),
+    ] = False,
+    poll_limit: Annotated[
+        int | None,
+        typer.Option(min=1, help="Most task summaries to fetch per poll."),
+    ] = None,
+    resync_interval: Annotated[
+        float | None,
+        typer.Option(
+            min=0.0,
+            help="With --sqlite-poll, read only changed tasks between full"
+            " re-lists this many seconds apart.",
+        ),
+    ] = None,
+    watch: Annotated[
+        bool,
+        typer.Option(help="Re-poll as soon as the database directory changes."),
+    ] = False,
+    broker: Annotated[
+        bool,
+        typer.Option(help="Get tasks from the host's broker instead of polling."),
+    ] = False,
+    broker_socket: Annotated[
+        Path | None,
+        typer.Option(help="Broker socket path; defaults to one in the db directory."),
+    ] = None,
+    session_log_dir: Annotated[
+        Path | None,
+        typer.Option(help="Stream non-interactive session output to per-task logs."),
+    ] = None,
+    session_log_max_bytes: Annotated[
+        int, typer.Option(min=1, help="Rotate a task log once it exceeds this size.")
+    ] = 64 * 1024 * 1024,
+    session_log_backups: Annotated[
+        int, typer.Option(min=0, help="Rotated task logs to keep; 0 truncates.")
+    ] = 1,
+    tee: Annotated[
+        bool, typer.Option(help="Also copy captured session output to the console.")
+    ] = False,
+    kill_grace: Annotated[
+        float,
+        typer.Option(
+            min=0.0, help="Seconds from SIGTERM to SIGKILL for a timed-out session.",
+        ),
+    ] = 10.0,
+    max_attempts: Annotated[
+        int,
+        typer.Option(min=1, help="Failed sessions before a task is parked as blocked."),
+    ] = 3,
+    retry_delay: Annotated[
+        float,
+        typer.Option(
+            min=0.0, help="Seconds before retrying a failed task; doubles per failure.",
+        ),
+    ] = 30.0,
+    use_asyncio: Annotated[
+        bool,
+        typer.Option(
+            "--asyncio", help="Run sessions as asyncio subprocesses on one loop.",
+        ),
+    ] = False,
+    lease_ttl: Annotated[
+        float | None,
+        typer.Option(help="Lease claimed tasks for this many seconds, heartbeated."),
+    ] = None,
+    metrics_port: Annotated[
+        int | None,
+        typer.Option(help="Serve Prometheus metrics on this localhost port."),
+    ] = None,
+    metrics_textfile: Annotated[
+        Path | None,
+        typer.Option(help="Write Prometheus metrics to this textfile-collector file."),
+    ] = None,
+    trace_file: Annotated[
+        Path | None,
+        typer.Option(help="Append a JSON line per poll/claim/launch/bd span here."),
+    ] = None,
+    profile: Annotated[
+        Path | None,
+        typer.Option(help="Profile the first cycles with cProfile into this file."),
+    ] = None,
+    profile_cycles: Annotated[
+        int, typer.Option(min=1, help="Poll cycles covered by --profile.")
+    ] = 100,
+    select: Annotated[
+        SelectionStrategy,
+        typer.Option(help="Order in which polled tasks are tried for a claim."),
+    ] = SelectionStrategy.FIRST,
+    select_window: Annotated[
+        int,
+        typer.Option(min=1, help="Tasks considered by random-top-k and hash."),
+    ] = 8,
+    order: Annotated[
+        TaskOrder,
+        typer.Option(help="Rank polled tasks by priority and age, or keep bd's order."),
+    ] = TaskOrder.PRIORITY,
+    aging: Annotated[
+        float | None,
+        typer.Option(
+            min=1.0, help="Seconds of waiting that raise a task by one priority.",
+        ),
+    ] = None,
+    max_load: Annotated[
+        float | None,
+        typer.Option(help="Defer launches while the 1-minute load per CPU is above."),
+    ] = None,
+    min_available_mb: Annotated[
+        float | None,
+        typer.Option(help="Defer launches while less memory than this is available."),
+    ] = None,
+    max_cpu_pressure: Annotated[
+        float | None,
+        typer.Option(help="Defer launches while CPU PSI some avg10 (%) is above."),
+    ] = None,
+    max_memory_pressure: Annotated[
+        float | None,
+        typer.Option(help="Defer launches while memory PSI some avg10 (%) is above."),
+    ] = None,
+    launches_per_minute: Annotated[
+        float | None,
+        typer.Option(help="Host-wide session launch rate shared by all workers."),
+    ] = None,
+    launch_burst: Annotated[
+        int, typer.Option(min=1, help="Launches the host-wide rate allows at once.")
+    ] = 1,
+    admission_dir: Annotated[
+        Path | None,
+        typer.Option(help="Directory of the shared launch token bucket files."),
+    ] = None,
+    log_level: Annotated[
+        str, typer.Option(help="Logging level (DEBUG, INFO, WARNING, ...).")
+    ] = "WARNING",
 ) -> None:
     """Run bd-agent-chameleon with the given role configuration."""
+    _configure_logging(log_level)
     config_mgr: ConfigManager = ConfigManager(config)
-    task_mgr: BeadsTaskManager = BeadsTaskManager(db)
-    launcher: ClaudeLauncher = ClaudeLauncher()
+    role_names: list[str] = config_mgr.role_names() if all_roles else role or []
+    if not role_names:
+        raise typer.BadParameter("pass --role at least once or --all-roles")
+    metered: bool = metrics_port is not None or metrics_textfile is not None
+    if use_asyncio and (
+        watch or prefetch or lease_ttl or metered or trace_file or profile
+    ):
+        raise typer.BadParameter(
+            "--watch, --prefetch, --lease-ttl, --metrics-*, --trace-file and"
+            " --profile do not apply to --asyncio"
+        )
+    tracer: JsonLinesTracer | None = (
+        JsonLinesTracer(trace_file) if trace_file is not None else None
+    )
+    task_mgr: TaskManager
+    watcher: ChangeWatcher | None = None
+    if broker:
+        broker_mgr: BrokerTaskManager = BrokerTaskManager(
+            broker_socket or default_socket_path(db),
+        )
+        task_mgr = broker_mgr
+        if watch:
+            watcher = broker_mgr
+    else:
+        task_mgr = _build_beads_task_manager(
+            db, bd_daemon, sqlite_poll, tracer, poll_limit, resync_interval,
+        )
+        if watch:
+            watcher = create_watcher(db)
+    ordering: PriorityOrdering | None = (
+        PriorityOrdering(aging=timedelta(seconds=aging) if aging else None)
+        if order == TaskOrder.PRIORITY
+        else None
+    )
+    selector: CandidateSelector = create_selector(
+        select, default_owner(), select_window, ordering,
+    )
+    bucket_dir: Path = (
+        admission_dir if admission_dir is not None else default_admission_dir()
+    )
+    admission: HostAdmissionController = HostAdmissionController(
+        HostLimits(max_load, min_available_mb, max_cpu_pressure, max_memory_pressure),
+        FileTokenBucket(
+            bucket_dir / "host.bucket", launches_per_minute / 60, launch_burst,
+        )
+        if launches_per_minute
+        else None,
+        bucket_dir,
+    )
     interval: timedelta = timedelta(seconds=poll_interval)
-    chameleon: Chameleon = Chameleon(config_mgr, task_mgr, launcher, role, interval)
+    backoff: PollBackoff = PollBackoff(
+        interval,
+        timedelta(seconds=max(max_poll_interval or poll_interval, poll_interval)),
+        backoff_multiplier,
+        poll_jitter,
+    )
+    retries: RetryTracker = RetryTracker(max_attempts, timedelta(seconds=retry_delay))
+    if use_asyncio:
+        async_task_mgr: AsyncTaskManager = (
+            ThreadedTaskManager(task_mgr)
+            if broker or bd_daemon or sqlite_poll
+            else AsyncBeadsTaskManager(db, poll_limit)
+        )
+        async_chameleon: AsyncChameleon = AsyncChameleon(
+            config_mgr,
+            async_task_mgr,
+            AsyncClaudeLauncher(
+                session_log_dir,
+                session_log_max_bytes,
+                session_log_backups,
+                tee,
+                kill_grace=kill_grace,
+            ),
+            role_names,
+            interval,
+            concurrency,
+            backoff,
+            selector,
+            admission,
+            retries,
+        )
+        try:
+            asyncio.run(_run_async(async_chameleon))
+        finally:
+            if isinstance(task_mgr, BrokerTaskManager):
+                task_mgr.close()
+        return
+    launcher: ClaudeLauncher = ClaudeLauncher(
+        session_log_dir,
+        session_log_max_bytes,
+        session_log_backups,
+        tee,
+        kill_grace=kill_grace,
+    )
+    lease_store: LeaseStore | None = None
+    leases: LeaseKeeper | None = None
+    if lease_ttl:
+        lease_store = LeaseStore(default_lease_path(db))
+        leases = LeaseKeeper(lease_store, timedelta(seconds=lease_ttl))
+    metrics: ChameleonMetrics | None = ChameleonMetrics() if metered else None
+    metrics_server: MetricsServer | None = None
+    textfile: TextfileExporter | None = None
+    if metrics is not None and metrics_port is not None:
+        metrics_server = MetricsServer(metrics.registry, metrics_port)
+    if metrics is not None and metrics_textfile is not None:
+        textfile = TextfileExporter(metrics.registry, metrics_textfile)
+    chameleon: Chameleon = Chameleon(
+        config_mgr,
+        MeteredTaskManager(task_mgr, metrics) if metrics is not None else task_mgr,
+        launcher,
+        role_names,
+        interval,
+        concurrency,
+        watcher,
+        backoff,
+        prefetch,
+        leases,
+        metrics,
+        tracer,
+        CycleProfiler(profile, profile_cycles) if profile is not None else None,
+        selector,
+        admission,
+        retries,
+    )
 
     def _handle_signal(signum: int, frame: FrameType | None) -> None:
         """Set chameleon to shutdown on signal."""
@@ -39,7 +418,188 @@ def run(
     signal.signal(signal.SIGINT, _handle_signal)
     signal.signal(signal.SIGTERM, _handle_signal)
 
-    chameleon.run()
+    try:
+        if leases is not None:
+            leases.start()
+        if metrics_server is not None:
+            metrics_server.start()
+        if textfile is not None:
+            textfile.start()
+        chameleon.run()
+    finally:
+        if textfile is not None:
+            textfile.close()
+        if metrics_server is not None:
+            metrics_server.close()
+        if tracer is not None:
+            tracer.close()
+        if leases is not None:
+            leases.close()
+        if lease_store is not None:
+            lease_store.close()
+        if watcher is not None:
+            watcher.close()
+        if isinstance(task_mgr, BrokerTaskManager):
+            task_mgr.close()
+
+
+@app.command("broker")
+def broker_command(
+    db: Annotated[Path, typer.Option(help="Path to the beads database directory.")],
+    socket_path: Annotated[
+        Path | None,
+        typer.Option(
+            "--socket", help="Socket to serve; defaults to one in the db directory.",
+        ),
+    ] = None,
+    poll_interval: Annotated[
+        float, typer.Option(help="Poll interval in seconds.")
+    ] = 2.0,
+    bd_daemon: Annotated[
+        bool,
+        typer.Option(help="Talk to the bd daemon over its socket when it is running."),
+    ] = False,
+    sqlite_poll: Annotated[
+        bool,
+        typer.Option(help="Poll by reading the beads SQLite database directly."),
+    ] = False,
+    poll_limit: Annotated[
+        int | None,
+        typer.Option(min=1, help="Most task summaries to fetch per poll."),
+    ] = None,
+    resync_interval: Annotated[
+        float | None,
+        typer.Option(
+            min=0.0,
+            help="With --sqlite-poll, read only changed tasks between full"
+            " re-lists this many seconds apart.",
+        ),
+    ] = None,
+    log_level: Annotated[
+        str, typer.Option(help="Logging level (DEBUG, INFO, WARNING, ...).")
+    ] = "WARNING",
+) -> None:
+    """Run the host-local poll broker that chameleons connect to with --broker."""
+    _configure_logging(log_level)
+    task_broker: TaskBroker = TaskBroker(
+        _build_beads_task_manager(
+            db,
+            bd_daemon,
+            sqlite_poll,
+            poll_limit=poll_limit,
+            resync_interval=resync_interval,
+        ),
+        socket_path or default_socket_path(db),
+        timedelta(seconds=poll_interval),
+    )
+
+    def _handle_signal(signum: int, frame: FrameType | None) -> None:
+        """Stop the broker on signal."""
+        task_broker.shutdown()
+
+    signal.signal(signal.SIGINT, _handle_signal)
+    signal.signal(signal.SIGTERM, _handle_signal)
+
+    task_broker.serve_forever()
+
+
+@app.command("fleet")
+def fleet_command(
+    config: Annotated[Path, typer.Option(help="Path to the TOML config file.")],
+    db: Annotated[Path, typer.Option(help="Path to the beads database directory.")],
+    check_interval: Annotated[
+        float, typer.Option(help="Seconds between backlog checks.")
+    ] = 10.0,
+    tasks_per_worker: Annotated[
+        int, typer.Option(min=1, help="Open tasks that justify one more worker.")
+    ] = 1,
+    worker_arg: Annotated[
+        list[str] | None,
+        typer.Option(help="Extra argument for every worker's run command; repeat."),
+    ] = None,
+    lease_ttl: Annotated[
+        float | None,
+        typer.Option(help="Give workers leases of this TTL and reap expired ones."),
+    ] = None,
+    bd_daemon: Annotated[
+        bool,
+        typer.Option(help="Talk to the bd daemon over its socket when it is running."),
+    ] = False,
+    sqlite_poll: Annotated[
+        bool,
+        typer.Option(help="Poll by reading the beads SQLite database directly."),
+    ] = False,
+    log_level: Annotated[
+        str, typer.Option(help="Logging level (DEBUG, INFO, WARNING, ...).")
+    ] = "WARNING",
+) -> None:
+    """Spawn, restart, and autoscale one worker process per role slot."""
+    _configure_logging(log_level)
+    task_mgr: BeadsTaskManager = _build_beads_task_manager(db, bd_daemon, sqlite_poll)
+    worker_args: list[str] = list(worker_arg or [])
+    reaper: LeaseReaper | None = None
+    if lease_ttl:
+        worker_args += ["--lease-ttl", str(lease_ttl)]
+        reaper = LeaseReaper(LeaseStore(default_lease_path(db)), task_mgr)
+    supervisor: FleetSupervisor = FleetSupervisor(
+        ConfigManager(config),
+        task_mgr,
+        ProcessSpawner(config, db, worker_args),
+        timedelta(seconds=check_interval),
+        tasks_per_worker,
+        reaper,
+    )
+
+    def _handle_signal(signum: int, frame: FrameType | None) -> None:
+        """Stop the fleet on signal."""
+        supervisor.shutdown()
+
+    signal.signal(signal.SIGINT, _handle_signal)
+    signal.signal(signal.SIGTERM, _handle_signal)
+
+    supervisor.run()
+
+
+@app.command("reap")
+def reap_command(
+    db: Annotated[Path, typer.Option(help="Path to the beads database directory.")],
+    interval: Annotated[
+        float, typer.Option(help="Seconds between passes over expired leases.")
+    ] = 30.0,
+    once: Annotated[
+        bool, typer.Option(help="Make a single pass and exit.")
+    ] = False,
+    bd_daemon: Annotated[
+        bool,
+        typer.Option(help="Talk to the bd daemon over its socket when it is running."),
+    ] = False,
+    log_level: Annotated[
+        str, typer.Option(help="Logging level (DEBUG, INFO, WARNING, ...).")
+    ] = "WARNING",
+) -> None:
+    """Re-open tasks whose worker died holding an expired lease."""
+    _configure_logging(log_level)
+    store: LeaseStore = LeaseStore(default_lease_path(db))
+    reaper: LeaseReaper = LeaseReaper(
+        store, _build_beads_task_manager(db, bd_daemon, sqlite_poll=False),
+    )
+    stopping: threading.Event = threading.Event()
+
+    def _handle_signal(signum: int, frame: FrameType | None) -> None:
+        """Stop reaping on signal."""
+        stopping.set()
+
+    signal.signal(signal.SIGINT, _handle_signal)
+    signal.signal(signal.SIGTERM, _handle_signal)
+
+    try:
+        while True:
+            for task_id in reaper.reap():
+                typer.echo(task_id)
+            if once or stopping.wait(interval):
+                break
+    finally:
+        store.close()
 
 
 def main() -> None:
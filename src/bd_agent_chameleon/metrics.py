@@ -0,0 +1,560 @@
+"""Prometheus-style counters and histograms, with HTTP and textfile exporters."""
+
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Collection, Sequence
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from bd_agent_chameleon.models import Task
+from bd_agent_chameleon.protocols import ClaimConflictError, TaskManager, claim_first
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+SESSION_BUCKETS: tuple[float, ...] = (
+    1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0, 7200.0,
+)
+CONTENT_TYPE: str = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value for the text exposition format."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text exposition format."""
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _label_text(names: Sequence[str], values: Sequence[str]) -> str:
+    """Render ``{name="value",...}``, or nothing when there are no labels."""
+    if not names:
+        return ""
+    pairs: str = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)
+    )
+    return "{" + pairs + "}"
+
+
+class CounterValue:
+    """One monotonically increasing series."""
+
+    def __init__(self) -> None:
+        """Start at zero."""
+        self._lock: threading.Lock = threading.Lock()
+        self._value: float = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Add ``amount`` to the counter."""
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        """Return the current total."""
+        return self._value
+
+
+class GaugeValue:
+    """One series that can go up and down."""
+
+    def __init__(self) -> None:
+        """Start at zero."""
+        self._value: float = 0.0
+
+    def set(self, value: float) -> None:
+        """Replace the gauge's value."""
+        self._value = value
+
+    @property
+    def value(self) -> float:
+        """Return the current value."""
+        return self._value
+
+
+class HistogramValue:
+    """One series of observations counted into fixed buckets.
+
+    Buckets are stored non-cumulatively so that ``observe`` touches a single
+    slot; they are summed only when rendered.
+    """
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        """Start with every bucket empty."""
+        self._lock: threading.Lock = threading.Lock()
+        self._bounds: tuple[float, ...] = bounds
+        self._counts: list[int] = [0] * (len(bounds) + 1)
+        self._sum: float = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        index: int = bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> tuple[list[int], float]:
+        """Return the cumulative bucket counts (ending with +Inf) and the sum."""
+        with self._lock:
+            counts: list[int] = list(self._counts)
+            total: float = self._sum
+        for index in range(1, len(counts)):
+            counts[index] += counts[index - 1]
+        return counts, total
+
+
+class _Family[V: (CounterValue, GaugeValue, HistogramValue)](ABC):
+    """A named metric and its series, one per combination of label values.
+
+    Subclasses set ``kind`` and say how to create and render one series.
+    """
+
+    kind: str = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str]) -> None:
+        """Initialize an empty family."""
+        self.name: str = name
+        self._help: str = help_text
+        self._labelnames: tuple[str, ...] = tuple(labelnames)
+        self._lock: threading.Lock = threading.Lock()
+        self._series: dict[tuple[str, ...], V] = {}
+        if not self._labelnames:
+            self._series[()] = self._new_series()
+
+    @abstractmethod
+    def _new_series(self) -> V:
+        """Create an empty series."""
+
+    def labels(self, *values: str) -> V:
+        """Return the series for these label values, creating it on first use."""
+        series: V | None = self._series.get(values)
+        if series is None:
+            if len(values) != len(self._labelnames):
+                raise ValueError(
+                    f"{self.name} takes labels {self._labelnames}, got {values}"
+                )
+            with self._lock:
+                series = self._series.setdefault(values, self._new_series())
+        return series
+
+    @abstractmethod
+    def _render_series(self, labels: tuple[str, ...], series: V) -> list[str]:
+        """Render the sample lines of one series."""
+
+    def render(self) -> list[str]:
+        """Render the family's HELP, TYPE, and sample lines."""
+        lines: list[str] = [
+            f"# HELP {self.name} {self._help}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        with self._lock:
+            items: list[tuple[tuple[str, ...], V]] = list(self._series.items())
+        for labels, series in items:
+            lines.extend(self._render_series(labels, series))
+        return lines
+
+
+class Counter(_Family[CounterValue]):
+    """A family of counters."""
+
+    kind = "counter"
+
+    def _new_series(self) -> CounterValue:
+        """Create a counter at zero."""
+        return CounterValue()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment the unlabelled series."""
+        self.labels().inc(amount)
+
+    def _render_series(
+        self, labels: tuple[str, ...], series: CounterValue,
+    ) -> list[str]:
+        """Render one counter sample."""
+        label_text: str = _label_text(self._labelnames, labels)
+        return [f"{self.name}{label_text} {_format_value(series.value)}"]
+
+
+class Gauge(_Family[GaugeValue]):
+    """A family of gauges."""
+
+    kind = "gauge"
+
+    def _new_series(self) -> GaugeValue:
+        """Create a gauge at zero."""
+        return GaugeValue()
+
+    def set(self, value: float) -> None:
+        """Set the unlabelled series."""
+        self.labels().set(value)
+
+    def _render_series(self, labels: tuple[str, ...], series: GaugeValue) -> list[str]:
+        """Render one gauge sample."""
+        label_text: str = _label_text(self._labelnames, labels)
+        return [f"{self.name}{label_text} {_format_value(series.value)}"]
+
+
+class Histogram(_Family[HistogramValue]):
+    """A family of histograms sharing one set of bucket bounds."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str],
+        buckets: Sequence[float],
+    ) -> None:
+        """Initialize with sorted, finite bucket upper bounds."""
+        self._bounds: tuple[float, ...] = tuple(sorted(buckets))
+        super().__init__(name, help_text, labelnames)
+
+    def _new_series(self) -> HistogramValue:
+        """Create an empty histogram."""
+        return HistogramValue(self._bounds)
+
+    def observe(self, value: float) -> None:
+        """Record an observation in the unlabelled series."""
+        self.labels().observe(value)
+
+    def _render_series(
+        self, labels: tuple[str, ...], series: HistogramValue,
+    ) -> list[str]:
+        """Render one histogram's buckets, sum, and count."""
+        counts, total = series.snapshot()
+        names: tuple[str, ...] = (*self._labelnames, "le")
+        lines: list[str] = [
+            f"{self.name}_bucket{_label_text(names, (*labels, _format_value(bound)))}"
+            f" {counts[index]}"
+            for index, bound in enumerate((*self._bounds, math.inf))
+        ]
+        label_text: str = _label_text(self._labelnames, labels)
+        lines.append(f"{self.name}_sum{label_text} {_format_value(total)}")
+        lines.append(f"{self.name}_count{label_text} {counts[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    """The set of metric families a process exposes."""
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._families: list[Counter | Gauge | Histogram] = []
+
+    def counter(
+        self, name: str, help_text: str, labelnames: Sequence[str] = (),
+    ) -> Counter:
+        """Register and return a counter family."""
+        family: Counter = Counter(name, help_text, labelnames)
+        self._families.append(family)
+        return family
+
+    def gauge(
+        self, name: str, help_text: str, labelnames: Sequence[str] = (),
+    ) -> Gauge:
+        """Register and return a gauge family."""
+        family: Gauge = Gauge(name, help_text, labelnames)
+        self._families.append(family)
+        return family
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        """Register and return a histogram family."""
+        family: Histogram = Histogram(name, help_text, labelnames, buckets)
+        self._families.append(family)
+        return family
+
+    def render(self) -> str:
+        """Render every family in the Prometheus text exposition format."""
+        lines: list[str] = []
+        for family in self._families:
+            lines.extend(family.render())
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: Path) -> None:
+        """Atomically replace ``path`` with the rendered metrics.
+
+        The file is written beside ``path`` and renamed into place, so a
+        node_exporter textfile collector never reads a partial file.
+        """
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        try:
+            with os.fdopen(fd, "w") as tmp_file:
+                tmp_file.write(self.render())
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+class ChameleonMetrics:
+    """Everything a chameleon worker records, registered on one registry.
+
+    The empty-poll ratio is ``chameleon_empty_polls_total`` divided by
+    ``chameleon_polls_total``.
+    """
+
+    def __init__(self, registry: MetricsRegistry | None = None) -> None:
+        """Register the worker's metric families."""
+        self.registry: MetricsRegistry = (
+            registry if registry is not None else MetricsRegistry()
+        )
+        r: MetricsRegistry = self.registry
+        self.polls: Counter = r.counter(
+            "chameleon_polls_total", "Polls of the task store.",
+        )
+        self.empty_polls: Counter = r.counter(
+            "chameleon_empty_polls_total", "Polls that found no open tasks.",
+        )
+        self.poll_seconds: Histogram = r.histogram(
+            "chameleon_poll_seconds", "Time taken by each poll.",
+        )
+        self.poll_failures: Counter = r.counter(
+            "chameleon_poll_failures_total", "Polls that raised an error.",
+        )
+        self.queue_depth: Gauge = r.gauge(
+            "chameleon_queue_depth", "Open tasks seen at the last poll.", ("label",),
+        )
+        self.claim_seconds: Histogram = r.histogram(
+            "chameleon_claim_seconds", "Time taken by each claim.",
+        )
+        self.claim_failures: Counter = r.counter(
+            "chameleon_claim_failures_total",
+            "Claims that failed, by reason (conflict or error).",
+            ("reason",),
+        )
+        self.complete_seconds: Histogram = r.histogram(
+            "chameleon_complete_seconds", "Time taken by each completion.",
+        )
+        self.complete_failures: Counter = r.counter(
+            "chameleon_complete_failures_total", "Completions that raised an error.",
+        )
+        self.session_seconds: Histogram = r.histogram(
+            "chameleon_session_seconds",
+            "Duration of each Claude session.",
+            ("role",),
+            SESSION_BUCKETS,
+        )
+        self.session_failures: Counter = r.counter(
+            "chameleon_session_failures_total",
+            "Sessions whose launch raised an error.",
+            ("role",),
+        )
+        self.launch_deferrals: Counter = r.counter(
+            "chameleon_launch_deferrals_total",
+            "Polls whose launch was deferred by admission control.",
+        )
+        self.state_seconds: Counter = r.counter(
+            "chameleon_state_seconds_total",
+            "Time the main loop spent in each state.",
+            ("state",),
+        )
+
+
+class MeteredTaskManager:
+    """TaskManager that records poll, claim, and completion metrics.
+
+    Wraps any concrete task manager, so every backend is measured the same
+    way. Releases and description fetches are passed through unmeasured.
+    """
+
+    def __init__(self, task_mgr: TaskManager, metrics: ChameleonMetrics) -> None:
+        """Wrap a task manager, recording into ``metrics``."""
+        self._task_mgr: TaskManager = task_mgr
+        self._metrics: ChameleonMetrics = metrics
+
+    def _timed_poll(self, labels: list[str], any_label: bool) -> list[Task]:
+        """Poll through the wrapped manager and record the result."""
+        metrics: ChameleonMetrics = self._metrics
+        start: float = time.perf_counter()
+        try:
+            tasks: list[Task] = (
+                self._task_mgr.poll_any(labels)
+                if any_label
+                else self._task_mgr.poll(labels[0])
+            )
+        except Exception:
+            metrics.poll_failures.inc()
+            raise
+        finally:
+            metrics.poll_seconds.observe(time.perf_counter() - start)
+        metrics.polls.inc()
+        if not tasks:
+            metrics.empty_polls.inc()
+        if len(labels) == 1:
+            metrics.queue_depth.labels(labels[0]).set(len(tasks))
+        else:
+            for label in labels:
+                metrics.queue_depth.labels(label).set(
+                    sum(1 for task in tasks if label in task.labels)
+                )
+        return tasks
+
+    def poll(self, label: str) -> list[Task]:
+        """List open tasks matching the given label."""
+        return self._timed_poll([label], any_label=False)
+
+    def poll_any(self, labels: list[str]) -> list[Task]:
+        """List open tasks carrying at least one of the given labels."""
+        return self._timed_poll(labels, any_label=True)
+
+    def claim(self, task_id: str) -> None:
+        """Claim a task, recording its latency and any failure."""
+        start: float = time.perf_counter()
+        try:
+            self._task_mgr.claim(task_id)
+        except ClaimConflictError:
+            self._metrics.claim_failures.labels("conflict").inc()
+            raise
+        except Exception:
+            self._metrics.claim_failures.labels("error").inc()
+            raise
+        finally:
+            self._metrics.claim_seconds.observe(time.perf_counter() - start)
+
+    def describe(self, task: Task) -> Task:
+        """Return the task with its full description."""
+        return self._task_mgr.describe(task)
+
+    def complete(self, task_id: str) -> None:
+        """Complete a task, recording its latency and any failure."""
+        start: float = time.perf_counter()
+        try:
+            self._task_mgr.complete(task_id)
+        except Exception:
+            self._metrics.complete_failures.inc()
+            raise
+        finally:
+            self._metrics.complete_seconds.observe(time.perf_counter() - start)
+
+    def release(self, task_id: str) -> None:
+        """Release a claimed task."""
+        self._task_mgr.release(task_id)
+
+    def park(self, task_id: str) -> None:
+        """Park a task that keeps failing."""
+        self._task_mgr.park(task_id)
+
+    def claim_next(self, label: str, exclude: Collection[str] = ()) -> Task | None:
+        """Poll and claim through this wrapper so that both are recorded."""
+        return claim_first(self, self.poll(label), exclude)
+
+
+class MetricsServer:
+    """Serves ``/metrics`` over HTTP from a background thread."""
+
+    def __init__(
+        self, registry: MetricsRegistry, port: int, host: str = "127.0.0.1",
+    ) -> None:
+        """Bind the listening socket; port 0 picks a free port."""
+        handler: type[BaseHTTPRequestHandler] = _handler_for(registry)
+        self._server: ThreadingHTTPServer = ThreadingHTTPServer((host, port), handler)
+        self._thread: threading.Thread | None = None
+
+    @property
+    def port(self) -> int:
+        """Return the port the server is bound to."""
+        return int(self._server.server_address[1])
+
+    def start(self) -> None:
+        """Start serving in a daemon thread."""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="chameleon-metrics", daemon=True,
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop serving and close the socket."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+
+def _handler_for(registry: MetricsRegistry) -> type[BaseHTTPRequestHandler]:
+    """Build a request handler class bound to a registry."""
+
+    class _MetricsHandler(BaseHTTPRequestHandler):
+        """Answers GET /metrics with the registry's rendered metrics."""
+
+        def do_GET(self) -> None:  # noqa: N802
+            """Serve the metrics page, or 404 for any other path."""
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body: bytes = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+            """Route access logs to the module logger at debug level."""
+            logger.debug("metrics request: " + format, *args)
+
+    return _MetricsHandler
+
+
+class TextfileExporter:
+    """Rewrites a textfile-collector file on an interval from a daemon thread."""
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        path: Path,
+        interval: float = 15.0,
+    ) -> None:
+        """Initialize with the registry, target file, and seconds between writes."""
+        self._registry: MetricsRegistry = registry
+        self._path: Path = path
+        self._interval: float = interval
+        self._stopping: threading.Event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _write(self) -> None:
+        """Write the file once, logging rather than raising on I/O errors."""
+        try:
+            self._registry.write_textfile(self._path)
+        except OSError:
+            logger.exception("could not write metrics to %s", self._path)
+
+    def _loop(self) -> None:
+        """Write on every interval until stopped."""
+        while not self._stopping.wait(self._interval):
+            self._write()
+
+    def start(self) -> None:
+        """Write once now, then keep rewriting in the background."""
+        self._write()
+        self._thread = threading.Thread(
+            target=self._loop, name="chameleon-metrics-textfile", daemon=True,
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop the background thread and write the final values."""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._write()
@@ -1,9 +1,24 @@
 """Domain data types for bd-agent-chameleon."""
 
+import sys
+from collections.abc import Iterable
 from dataclasses import dataclass
+from datetime import UTC, datetime
 from enum import StrEnum
 
 ROLE_LABEL_PREFIX: str = "role-"
+DEFAULT_PRIORITY: int = 2
+
+
+def parse_timestamp(value: str | None) -> datetime | None:
+    """Parse a bd ISO-8601 timestamp as an aware datetime, or None if unusable."""
+    if not value:
+        return None
+    try:
+        parsed: datetime = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=UTC)
 
 
 class TaskStatus(StrEnum):
@@ -11,30 +26,113 @@ class TaskStatus(StrEnum):
 
     OPEN = "open"
     IN_PROGRESS = "in_progress"
+    BLOCKED = "blocked"
     CLOSED = "closed"
 
 
-@dataclass(frozen=True)
+_STATUSES: dict[str, TaskStatus] = {status.value: status for status in TaskStatus}
+# Label sets include free-form labels, so the table is emptied once it is full
+# rather than growing with every distinct combination ever polled.
+MAX_LABEL_SETS: int = 1024
+_LABEL_SETS: dict[tuple[str, ...], tuple[str, ...]] = {}
+
+
+def task_status(value: str) -> TaskStatus:
+    """Return the TaskStatus member for a status string from the task store."""
+    status: TaskStatus | None = _STATUSES.get(value)
+    return status if status is not None else TaskStatus(value)
+
+
+def intern_labels(labels: Iterable[str]) -> tuple[str, ...]:
+    """Return a shared tuple for a label set, holding interned strings.
+
+    A backlog has few distinct label sets, so every task carrying the same
+    labels points at one tuple instead of owning a copy. At most
+    ``MAX_LABEL_SETS`` sets are remembered; tuples already handed out stay
+    valid when the table is emptied.
+    """
+    key: tuple[str, ...] = tuple(labels)
+    shared: tuple[str, ...] | None = _LABEL_SETS.get(key)
+    if shared is None:
+        shared = tuple(sys.intern(label) for label in key)
+        if len(_LABEL_SETS) >= MAX_LABEL_SETS:
+            _LABEL_SETS.clear()
+        _LABEL_SETS[shared] = shared
+    return shared
+
+
+class SessionOutcome(StrEnum):
+    """How a Claude session ended."""
+
+    COMPLETED = "completed"
+    FAILED = "failed"
+    TIMED_OUT = "timed_out"
+
+
+@dataclass(frozen=True, slots=True)
 class Task:
-    """A unit of work as seen by the runtime."""
+    """A unit of work as seen by the runtime.
+
+    ``priority`` follows bd: 0 is the most urgent. ``ready`` is False while
+    the task is blocked by a dependency that is not closed yet. A ``summary``
+    task comes from a poll and has an empty ``description`` until
+    ``TaskManager.describe`` fetches it. Tasks are slotted and immutable, so
+    pollers can share one instance across polls while it stays unchanged.
+    """
 
     id: str
     title: str
     description: str
     status: TaskStatus
+    labels: tuple[str, ...] = ()
+    priority: int = DEFAULT_PRIORITY
+    created_at: datetime | None = None
+    ready: bool = True
+    summary: bool = False
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Role:
-    """Configuration that defines how a Claude session behaves."""
+    """Configuration that defines how a Claude session behaves.
+
+    ``timeout_seconds`` caps a session's wall-clock time, ``cpu_seconds`` its
+    CPU time, and ``memory_mb`` its data segment (heap and other private
+    writable memory). None means no limit. ``launches_per_minute`` and
+    ``launch_burst`` size the role's launch token bucket, shared by every
+    worker on the host.
+    """
 
     name: str
     prompt: str
     interactive: bool
     agent: str | None = None
     label: str = ""
+    max_concurrency: int | None = None
+    min_workers: int = 0
+    max_workers: int = 1
+    timeout_seconds: float | None = None
+    cpu_seconds: int | None = None
+    memory_mb: int | None = None
+    launches_per_minute: float | None = None
+    launch_burst: int = 1
 
     def __post_init__(self) -> None:
-        """Derive label from name if not explicitly set."""
+        """Derive label from name if not explicitly set and check worker bounds."""
         if not self.label:
             object.__setattr__(self, "label", f"{ROLE_LABEL_PREFIX}{self.name}")
+        if not 0 <= self.min_workers <= self.max_workers:
+            raise ValueError(
+                f"role {self.name!r} needs 0 <= min_workers <= max_workers, "
+                f"got {self.min_workers} and {self.max_workers}"
+            )
+        for field, value in (
+            ("timeout_seconds", self.timeout_seconds),
+            ("cpu_seconds", self.cpu_seconds),
+            ("memory_mb", self.memory_mb),
+            ("launches_per_minute", self.launches_per_minute),
+            ("launch_burst", self.launch_burst),
+        ):
+            if value is not None and value <= 0:
+                raise ValueError(
+                    f"role {self.name!r} needs a positive {field}, got {value}"
+                )
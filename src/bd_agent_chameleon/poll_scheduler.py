@@ -0,0 +1,128 @@
+"""Adaptive poll scheduling for idle chameleons."""
+
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable
+from datetime import timedelta
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+class PollBackoff:
+    """Exponential backoff between empty polls, with per-instance jitter.
+
+    Each empty poll multiplies the base interval by ``multiplier`` up to
+    ``max_interval``; finding work snaps it back to ``min_interval``. Every
+    returned interval is scaled by a random factor in ``[1 - jitter,
+    1 + jitter]`` so that a fleet started together drifts apart.
+    """
+
+    def __init__(
+        self,
+        min_interval: timedelta,
+        max_interval: timedelta | None = None,
+        multiplier: float = 2.0,
+        jitter: float = 0.0,
+        rng: random.Random | None = None,
+    ) -> None:
+        """Initialize the policy; ``max_interval`` defaults to no backoff."""
+        max_interval = min_interval if max_interval is None else max_interval
+        if max_interval < min_interval:
+            raise ValueError("max_interval must not be below min_interval")
+        if multiplier < 1.0:
+            raise ValueError(f"multiplier must be at least 1, got {multiplier}")
+        if not 0.0 <= jitter < 1.0:
+            raise ValueError(f"jitter must be in [0, 1), got {jitter}")
+        self._min: float = min_interval.total_seconds()
+        self._max: float = max_interval.total_seconds()
+        self._multiplier: float = multiplier
+        self._jitter: float = jitter
+        self._rng: random.Random = rng if rng is not None else random.Random()
+        self._current: float = self._min
+
+    @property
+    def current(self) -> timedelta:
+        """The un-jittered interval the next empty poll will wait."""
+        return timedelta(seconds=self._current)
+
+    def reset(self) -> None:
+        """Snap back to the minimum interval after work was found."""
+        if self._current != self._min:
+            logger.info(
+                "work found; poll interval reset to %.2fs from %.2fs",
+                self._min, self._current,
+            )
+        self._current = self._min
+
+    def next_interval(self) -> timedelta:
+        """Return how long to wait after an empty poll and back off further."""
+        base: float = self._current
+        interval: float = base
+        if self._jitter:
+            interval *= self._rng.uniform(1.0 - self._jitter, 1.0 + self._jitter)
+        grown: float = min(base * self._multiplier, self._max)
+        if grown != base:
+            logger.debug("queue empty; poll interval backing off to %.2fs", grown)
+            if grown == self._max:
+                logger.info("queue idle; poll interval reached ceiling %.2fs", grown)
+        self._current = grown
+        return timedelta(seconds=interval)
+
+
+class RetryTracker:
+    """Per-task failure counts that space out and finally stop retries.
+
+    After the ``n``-th failed session a task is left alone for
+    ``retry_delay * 2 ** (n - 1)``; once it has failed ``max_attempts``
+    times it is exhausted and should be parked instead of released. Safe to
+    share between session threads.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        retry_delay: timedelta = timedelta(seconds=30),
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the policy; ``clock`` returns seconds on a monotonic scale."""
+        if max_attempts < 1:
+            raise ValueError(f"max_attempts must be at least 1, got {max_attempts}")
+        if retry_delay < timedelta(0):
+            raise ValueError(f"retry_delay must not be negative, got {retry_delay}")
+        self._max_attempts: int = max_attempts
+        self._delay: float = retry_delay.total_seconds()
+        self._clock: Callable[[], float] = clock
+        self._lock: threading.Lock = threading.Lock()
+        self._failures: dict[str, int] = {}
+        self._retry_at: dict[str, float] = {}
+
+    def failed(self, task_id: str) -> bool:
+        """Record a failed session and return whether the task is exhausted."""
+        with self._lock:
+            failures: int = self._failures.get(task_id, 0) + 1
+            if failures >= self._max_attempts:
+                self._failures.pop(task_id, None)
+                self._retry_at.pop(task_id, None)
+                return True
+            self._failures[task_id] = failures
+            self._retry_at[task_id] = (
+                self._clock() + self._delay * 2 ** (failures - 1)
+            )
+        logger.info(
+            "task %s failed %d of %d attempts", task_id, failures, self._max_attempts,
+        )
+        return False
+
+    def succeeded(self, task_id: str) -> None:
+        """Forget a task's failures once a session for it has succeeded."""
+        with self._lock:
+            self._failures.pop(task_id, None)
+            self._retry_at.pop(task_id, None)
+
+    def cooling(self, task_id: str) -> bool:
+        """Return whether a failed task is still inside its retry delay."""
+        with self._lock:
+            retry_at: float | None = self._retry_at.get(task_id)
+            return retry_at is not None and self._clock() < retry_at
@@ -1,8 +1,30 @@
 """Protocol definitions for bd-agent-chameleon extension points."""
 
+from collections.abc import Collection, Iterable
+from contextlib import AbstractContextManager
 from typing import Protocol
 
-from bd_agent_chameleon.models import Role, Task
+from bd_agent_chameleon.models import Role, SessionOutcome, Task
+
+
+class ClaimConflictError(Exception):
+    """Raised by ``TaskManager.claim`` when another worker already holds the task."""
+
+
+class SessionFailedError(Exception):
+    """Raised by ``SessionLauncher.launch`` when a session did not complete."""
+
+    def __init__(
+        self, task_id: str, outcome: SessionOutcome, returncode: int | None = None,
+    ) -> None:
+        """Record which task's session ended, how, and its exit status."""
+        message: str = f"session for task {task_id} {outcome}"
+        if returncode is not None:
+            message += f" with exit status {returncode}"
+        super().__init__(message)
+        self.task_id: str = task_id
+        self.outcome: SessionOutcome = outcome
+        self.returncode: int | None = returncode
 
 
 class TaskManager(Protocol):
@@ -12,18 +34,192 @@ class TaskManager(Protocol):
         """List tasks matching a label with status open."""
         ...
 
+    def poll_any(self, labels: list[str]) -> list[Task]:
+        """List open tasks carrying at least one of the labels."""
+        ...
+
     def claim(self, task_id: str) -> None:
-        """Set a task's status to in_progress."""
+        """Set a task's status to in_progress.
+
+        Raises ``ClaimConflictError`` if another worker claimed it first.
+        """
+        ...
+
+    def describe(self, task: Task) -> Task:
+        """Return the task with its full description, fetching it for a summary."""
         ...
 
     def complete(self, task_id: str) -> None:
         """Set a task's status to closed."""
         ...
 
+    def release(self, task_id: str) -> None:
+        """Return a claimed task to open so that another worker can take it."""
+        ...
+
+    def park(self, task_id: str) -> None:
+        """Set a claimed task aside as blocked so that no worker retries it."""
+        ...
+
+    def claim_next(self, label: str, exclude: Collection[str] = ()) -> Task | None:
+        """Claim one open task carrying the label and return it.
+
+        Candidates that another worker claims first are skipped in favour of
+        the next one. Returns None when no candidate could be claimed.
+        """
+        ...
+
+
+def claim_first(
+    task_mgr: TaskManager, tasks: Iterable[Task], exclude: Collection[str] = (),
+) -> Task | None:
+    """Claim the first task not in ``exclude`` that no other worker holds."""
+    for task in tasks:
+        if task.id in exclude:
+            continue
+        try:
+            task_mgr.claim(task.id)
+        except ClaimConflictError:
+            continue
+        return task
+    return None
+
+
+class CandidateSelector(Protocol):
+    """Decides the order in which a worker tries to claim polled tasks."""
+
+    def order(self, tasks: list[Task]) -> list[Task]:
+        """Return the tasks in the order this worker should try them."""
+        ...
+
 
 class SessionLauncher(Protocol):
     """Builds and runs a Claude session."""
 
     def launch(self, role: Role, task: Task) -> None:
-        """Launch a Claude session for the given role and task."""
+        """Run a Claude session for the given role and task to completion.
+
+        Raises ``SessionFailedError`` if the session failed or timed out.
+        """
+        ...
+
+
+class AdmissionController(Protocol):
+    """Decides whether the host can take another session right now."""
+
+    def admit(self, role: Role) -> float:
+        """Take a launch slot for the role and return 0.0.
+
+        If the launch must be deferred, return the seconds to wait before
+        asking again instead.
+        """
+        ...
+
+    def refund(self, role: Role) -> None:
+        """Give back the slot ``admit`` took for a launch that did not happen."""
+        ...
+
+
+class AsyncTaskManager(Protocol):
+    """Asyncio counterpart of ``TaskManager``."""
+
+    async def poll(self, label: str) -> list[Task]:
+        """List tasks matching a label with status open."""
+        ...
+
+    async def poll_any(self, labels: list[str]) -> list[Task]:
+        """List open tasks carrying at least one of the labels."""
+        ...
+
+    async def claim(self, task_id: str) -> None:
+        """Set a task's status to in_progress.
+
+        Raises ``ClaimConflictError`` if another worker claimed it first.
+        """
+        ...
+
+    async def describe(self, task: Task) -> Task:
+        """Return the task with its full description, fetching it for a summary."""
+        ...
+
+    async def complete(self, task_id: str) -> None:
+        """Set a task's status to closed."""
+        ...
+
+    async def release(self, task_id: str) -> None:
+        """Return a claimed task to open so that another worker can take it."""
+        ...
+
+    async def park(self, task_id: str) -> None:
+        """Set a claimed task aside as blocked so that no worker retries it."""
+        ...
+
+    async def claim_next(
+        self, label: str, exclude: Collection[str] = (),
+    ) -> Task | None:
+        """Claim one open task carrying the label and return it, or None."""
+        ...
+
+
+class AsyncSessionLauncher(Protocol):
+    """Asyncio counterpart of ``SessionLauncher``."""
+
+    async def launch(self, role: Role, task: Task) -> None:
+        """Run a Claude session for the given role and task to completion."""
+        ...
+
+
+class WorkerProcess(Protocol):
+    """Handle on a running worker process, as returned by ``subprocess.Popen``."""
+
+    def poll(self) -> int | None:
+        """Return the exit status if the worker has exited, else None."""
+        ...
+
+    def terminate(self) -> None:
+        """Ask the worker to shut down gracefully."""
+        ...
+
+    def wait(self, timeout: float | None = None) -> int:
+        """Block until the worker exits and return its exit status."""
+        ...
+
+
+class WorkerSpawner(Protocol):
+    """Starts worker processes that serve a single role."""
+
+    def spawn(self, role: Role) -> WorkerProcess:
+        """Start a worker for the role and return a handle on it."""
+        ...
+
+
+class BacklogCounter(Protocol):
+    """Counts a role's waiting and held work so that a fleet can be sized to it."""
+
+    def poll(self, label: str) -> list[Task]:
+        """List tasks matching a label with status open."""
+        ...
+
+    def count_in_progress(self, label: str) -> int:
+        """Count the tasks carrying the label that workers currently hold."""
+        ...
+
+
+class ChangeWatcher(Protocol):
+    """Waits for the task store to change."""
+
+    def wait(self, timeout: float) -> bool:
+        """Block until a change or the timeout; return whether a change was seen."""
+        ...
+
+    def close(self) -> None:
+        """Release any resources held by the watcher."""
+        ...
+
+
+class Tracer(Protocol):
+    """Records timed spans around the phases of the work loop."""
+
+    def span(self, name: str, **attributes: object) -> AbstractContextManager[None]:
+        """Time the enclosed block as a span with the given attributes."""
         ...
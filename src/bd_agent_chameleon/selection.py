@@ -0,0 +1,189 @@
+"""Candidate selection strategies that spread a role's workers across its queue."""
+
+import hashlib
+import heapq
+import math
+import random
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from enum import StrEnum
+
+from bd_agent_chameleon.models import Task
+from bd_agent_chameleon.protocols import CandidateSelector
+
+
+class SelectionStrategy(StrEnum):
+    """Names of the built-in candidate selection strategies."""
+
+    FIRST = "first"
+    RANDOM_TOP_K = "random-top-k"
+    HASH = "hash"
+    TWO_CHOICES = "two-choices"
+
+
+class TaskOrder(StrEnum):
+    """Names of the built-in task ordering policies."""
+
+    POLL = "poll"
+    PRIORITY = "priority"
+
+
+class FirstSelector:
+    """Keeps the poll order, so every worker goes for the head of the queue."""
+
+    def order(self, tasks: list[Task]) -> list[Task]:
+        """Return the tasks unchanged."""
+        return tasks
+
+
+class RandomTopKSelector:
+    """Shuffles the first ``k`` tasks and leaves the rest in poll order.
+
+    Workers still favour the highest-priority work, but pick different
+    tasks within it.
+    """
+
+    def __init__(self, k: int, rng: random.Random | None = None) -> None:
+        """Initialize with the window size and an optional random source."""
+        if k < 1:
+            raise ValueError(f"k must be at least 1, got {k}")
+        self._k: int = k
+        self._rng: random.Random = rng if rng is not None else random.Random()
+
+    def order(self, tasks: list[Task]) -> list[Task]:
+        """Return the top ``k`` tasks shuffled, followed by the rest."""
+        head: list[Task] = tasks[: self._k]
+        self._rng.shuffle(head)
+        return head + tasks[self._k :]
+
+
+class HashShardSelector:
+    """Ranks tasks by a rendezvous hash of worker id and task id.
+
+    Every worker ranks the queue differently but deterministically, so
+    workers prefer disjoint tasks without coordinating. When a worker joins
+    or leaves, only that worker's tasks change owners. With ``window``, only
+    the first ``window`` tasks are ranked, which keeps priority ordering
+    across windows.
+    """
+
+    def __init__(self, worker_id: str, window: int | None = None) -> None:
+        """Initialize with this worker's id and an optional ranking window."""
+        if window is not None and window < 1:
+            raise ValueError(f"window must be at least 1, got {window}")
+        self._prefix: bytes = worker_id.encode() + b"\0"
+        self._window: int | None = window
+
+    def _weight(self, task: Task) -> bytes:
+        """Return this worker's hash weight for a task."""
+        return hashlib.blake2b(self._prefix + task.id.encode(), digest_size=8).digest()
+
+    def order(self, tasks: list[Task]) -> list[Task]:
+        """Return the ranked window followed by the rest in poll order."""
+        end: int = len(tasks) if self._window is None else self._window
+        return sorted(tasks[:end], key=self._weight) + tasks[end:]
+
+
+class TwoChoicesSelector:
+    """Samples two tasks and puts the one nearer the head of the queue first.
+
+    Any task can be picked, but higher-priority tasks are favoured, and two
+    workers rarely make the same pick. The remaining tasks follow in poll
+    order as fallbacks.
+    """
+
+    def __init__(self, rng: random.Random | None = None) -> None:
+        """Initialize with an optional random source."""
+        self._rng: random.Random = rng if rng is not None else random.Random()
+
+    def order(self, tasks: list[Task]) -> list[Task]:
+        """Return the better of two random tasks first, then the rest."""
+        if len(tasks) < 2:
+            return tasks
+        first, second = self._rng.sample(range(len(tasks)), 2)
+        best: int = min(first, second)
+        return [tasks[best], *tasks[:best], *tasks[best + 1 :]]
+
+
+class PriorityOrdering:
+    """Orders tasks by bd priority, then oldest first.
+
+    With ``aging``, a task gains one priority level for every ``aging`` it
+    has waited, so old low-priority work eventually overtakes fresh urgent
+    work. Only the best ``window`` tasks are ordered. They are picked with a
+    heap in O(n log window) rather than by sorting the whole backlog, and the
+    rest follow in poll order as fallbacks.
+    """
+
+    def __init__(
+        self,
+        window: int = 32,
+        aging: timedelta | None = None,
+        clock: Callable[[], datetime] = lambda: datetime.now(UTC),
+    ) -> None:
+        """Initialize with the window size, aging rate, and time source."""
+        if window < 1:
+            raise ValueError(f"window must be at least 1, got {window}")
+        if aging is not None and aging <= timedelta(0):
+            raise ValueError("aging must be positive")
+        self._window: int = window
+        self._aging: float | None = aging.total_seconds() if aging else None
+        self._clock: Callable[[], datetime] = clock
+
+    def order(self, tasks: list[Task]) -> list[Task]:
+        """Return the best ``window`` tasks in order, then the rest."""
+        now: float = self._clock().timestamp()
+        aging: float | None = self._aging
+
+        def key(task: Task) -> tuple[float, float]:
+            """Rank by aged priority, breaking ties by creation time."""
+            if task.created_at is None:
+                return float(task.priority), math.inf
+            created: float = task.created_at.timestamp()
+            if aging is None:
+                return float(task.priority), created
+            return task.priority - (now - created) / aging, created
+
+        head: list[Task] = heapq.nsmallest(self._window, tasks, key=key)
+        if len(head) == len(tasks):
+            return head
+        chosen: set[int] = {id(task) for task in head}
+        return head + [task for task in tasks if id(task) not in chosen]
+
+
+class ChainedSelector:
+    """Applies several selectors in turn, each reordering the last one's output."""
+
+    def __init__(self, *selectors: CandidateSelector) -> None:
+        """Initialize with the selectors to apply, first to last."""
+        self._selectors: tuple[CandidateSelector, ...] = selectors
+
+    def order(self, tasks: list[Task]) -> list[Task]:
+        """Return the tasks as ordered by every selector in sequence."""
+        for selector in self._selectors:
+            tasks = selector.order(tasks)
+        return tasks
+
+
+def create_selector(
+    strategy: SelectionStrategy,
+    worker_id: str,
+    k: int = 8,
+    ordering: CandidateSelector | None = None,
+) -> CandidateSelector:
+    """Build the named selection strategy for one worker.
+
+    ``k`` is the random-top-k window, and the ranking window for hash
+    sharding. An ``ordering`` policy, if given, is applied first, so the
+    strategy spreads workers over the best tasks it ranks.
+    """
+    spread: CandidateSelector
+    if strategy == SelectionStrategy.RANDOM_TOP_K:
+        spread = RandomTopKSelector(k)
+    elif strategy == SelectionStrategy.HASH:
+        spread = HashShardSelector(worker_id, k)
+    elif strategy == SelectionStrategy.TWO_CHOICES:
+        spread = TwoChoicesSelector()
+    else:
+        return ordering if ordering is not None else FirstSelector()
+    return spread if ordering is None else ChainedSelector(ordering, spread)
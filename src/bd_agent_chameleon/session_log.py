@@ -0,0 +1,183 @@
+"""Per-task session log files with size-based rotation."""
+
+import os
+import selectors
+import signal
+import subprocess
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import BinaryIO
+
+CHUNK_SIZE: int = 64 * 1024
+
+
+class RotatingLog:
+    """Appends bytes to a log file, rotating it once it grows past a limit.
+
+    On rotation ``name.log`` becomes ``name.log.1``, older backups shift up,
+    and anything beyond ``backups`` is dropped. With ``backups=0`` the file is
+    truncated in place instead.
+    """
+
+    def __init__(self, path: Path, max_bytes: int, backups: int = 1) -> None:
+        """Open (or continue) the log file at ``path``."""
+        if max_bytes < 1:
+            raise ValueError(f"max_bytes must be at least 1, got {max_bytes}")
+        if backups < 0:
+            raise ValueError(f"backups must not be negative, got {backups}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._path: Path = path
+        self._max_bytes: int = max_bytes
+        self._backups: int = backups
+        self._file: BinaryIO = open(path, "ab")  # noqa: SIM115
+        self._size: int = self._file.tell()
+
+    def _backup(self, index: int) -> Path:
+        """Return the path of the given backup generation."""
+        return self._path.with_name(f"{self._path.name}.{index}")
+
+    def _rotate(self) -> None:
+        """Shift backups up by one and start a fresh file."""
+        self._file.close()
+        if self._backups > 0:
+            for index in range(self._backups - 1, 0, -1):
+                if self._backup(index).exists():
+                    os.replace(self._backup(index), self._backup(index + 1))
+            os.replace(self._path, self._backup(1))
+        self._file = open(self._path, "wb")  # noqa: SIM115
+        self._size = 0
+
+    def write(self, data: bytes) -> None:
+        """Append a chunk, rotating first if it would overflow the limit."""
+        if self._size and self._size + len(data) > self._max_bytes:
+            self._rotate()
+        self._file.write(data)
+        self._size += len(data)
+
+    def flush(self) -> None:
+        """Flush buffered bytes to the file."""
+        self._file.flush()
+
+    def close(self) -> None:
+        """Flush and close the file."""
+        self._file.close()
+
+
+def _feed(fd: int, pending: memoryview) -> memoryview:
+    """Write what the pipe will take now and return the unwritten rest."""
+    try:
+        written: int = os.write(fd, pending[:CHUNK_SIZE])
+    except BlockingIOError:
+        return pending
+    except BrokenPipeError:
+        return pending[:0]
+    return pending[written:]
+
+
+class _Deadlines:
+    """SIGTERM at the timeout, then SIGKILL once the grace period has passed."""
+
+    def __init__(
+        self,
+        timeout: float | None,
+        kill_grace: float,
+        send_signal: Callable[[int], None],
+    ) -> None:
+        """Start the timeout clock now."""
+        self._term_at: float | None = (
+            None if timeout is None else time.monotonic() + timeout
+        )
+        self._kill_at: float | None = None
+        self._kill_grace: float = kill_grace
+        self._send_signal: Callable[[int], None] = send_signal
+        self.fired: bool = False
+
+    def remaining(self) -> float | None:
+        """Send any signal that is due and return seconds until the next one."""
+        now: float = time.monotonic()
+        if self._term_at is not None and now >= self._term_at:
+            self._term_at = None
+            self.fired = True
+            self._kill_at = now + self._kill_grace
+            self._send_signal(signal.SIGTERM)
+        if self._kill_at is not None and now >= self._kill_at:
+            self._kill_at = None
+            self._send_signal(signal.SIGKILL)
+        due: float | None = self._term_at
+        if due is None:
+            due = self._kill_at
+        return None if due is None else max(0.0, due - now)
+
+
+def pump_process(
+    proc: subprocess.Popen[bytes],
+    log: RotatingLog,
+    tee_stdout: BinaryIO | None = None,
+    tee_stderr: BinaryIO | None = None,
+    stdin_data: bytes | None = None,
+    timeout: float | None = None,
+    kill_grace: float = 0.0,
+    send_signal: Callable[[int], None] | None = None,
+) -> int | None:
+    """Stream a started process's piped output into ``log`` and wait for it.
+
+    If the process is still running after ``timeout`` seconds, it is sent
+    SIGTERM, and SIGKILL once ``kill_grace`` more seconds have passed. Its
+    output keeps being drained meanwhile, so a process that writes while
+    shutting down is not stalled on a full pipe. Signals go through
+    ``send_signal``, which defaults to the process itself. Returns the exit
+    status, or None if the timeout fired. The process is killed if streaming
+    fails.
+    """
+    assert proc.stdout is not None
+    assert proc.stderr is not None
+    send: Callable[[int], None] = (
+        send_signal if send_signal is not None else proc.send_signal
+    )
+    deadlines: _Deadlines = _Deadlines(timeout, kill_grace, send)
+    pending: memoryview = memoryview(stdin_data or b"")
+    try:
+        with selectors.DefaultSelector() as selector:
+            if proc.stdin is not None:
+                os.set_blocking(proc.stdin.fileno(), False)
+                selector.register(proc.stdin, selectors.EVENT_WRITE)
+            selector.register(proc.stdout, selectors.EVENT_READ, tee_stdout)
+            selector.register(proc.stderr, selectors.EVENT_READ, tee_stderr)
+            while selector.get_map():
+                wait: float | None = deadlines.remaining()
+                if deadlines.fired and proc.stdin is not None and not proc.stdin.closed:
+                    selector.unregister(proc.stdin)
+                    proc.stdin.close()
+                for key, _ in selector.select(wait):
+                    if key.fileobj is proc.stdin:
+                        pending = _feed(key.fd, pending)
+                        if not pending:
+                            selector.unregister(proc.stdin)
+                            proc.stdin.close()
+                        continue
+                    chunk: bytes = os.read(key.fd, CHUNK_SIZE)
+                    if not chunk:
+                        selector.unregister(key.fileobj)
+                        continue
+                    log.write(chunk)
+                    tee: BinaryIO | None = key.data
+                    if tee is not None:
+                        tee.write(chunk)
+                        tee.flush()
+        while True:
+            try:
+                status: int = proc.wait(deadlines.remaining())
+            except subprocess.TimeoutExpired:
+                continue
+            return None if deadlines.fired else status
+    except BaseException:
+        send(signal.SIGKILL)
+        proc.wait()
+        raise
+    finally:
+        if proc.stdin is not None:
+            proc.stdin.close()
+        proc.stdout.close()
+        proc.stderr.close()
+        log.flush()
@@ -0,0 +1,207 @@
+"""Read-only poll path that queries the beads SQLite database directly."""
+
+import sqlite3
+import threading
+from pathlib import Path
+
+from bd_agent_chameleon.models import (
+    Task,
+    intern_labels,
+    parse_timestamp,
+    task_status,
+)
+
+BEADS_DB_NAME: str = "beads.db"
+
+_LABEL_SEPARATOR: str = "\x1f"
+
+_TASK_COLUMNS: str = """
+    SELECT i.id, i.title, i.status,
+        (SELECT group_concat(label, char(31)) FROM labels WHERE issue_id = i.id),
+        i.priority, i.created_at,
+        NOT EXISTS (
+            SELECT 1 FROM dependencies AS d
+            JOIN issues AS blocker ON blocker.id = d.depends_on_id
+            WHERE d.issue_id = i.id AND d.type = 'blocks'
+                AND blocker.status != 'closed'
+        ) AS ready
+    FROM issues AS i
+"""
+
+_HAS_LABEL: str = """
+    EXISTS (
+        SELECT 1 FROM labels AS l
+        WHERE l.issue_id = i.id AND l.label IN ({placeholders})
+    )
+"""
+
+# Ready rows sort first so that blocked ones never crowd them out of the limit.
+_OPEN_TASKS_BY_LABELS: str = _TASK_COLUMNS + f"""
+    WHERE i.status = 'open' AND {_HAS_LABEL}
+    ORDER BY ready DESC, i.priority, i.created_at
+    LIMIT ?
+"""
+
+# A blocker's update can make a task ready without touching the task itself.
+_CHANGED_TASKS_BY_LABELS: str = _TASK_COLUMNS + f"""
+    WHERE (
+        i.updated_at >= ?
+        OR EXISTS (
+            SELECT 1 FROM dependencies AS d
+            JOIN issues AS blocker ON blocker.id = d.depends_on_id
+            WHERE d.issue_id = i.id AND blocker.updated_at >= ?
+        )
+    ) AND {_HAS_LABEL}
+"""
+
+_CURSOR: str = "SELECT max(updated_at) FROM issues"
+
+_DESCRIPTION: str = "SELECT description FROM issues WHERE id = ?"
+
+_Row = tuple[str, str, str, str | None, int, str | None, int]
+
+
+def _split_labels(joined: str | None) -> tuple[str, ...]:
+    """Split a group_concat'ed label column back into a tuple."""
+    return intern_labels(joined.split(_LABEL_SEPARATOR)) if joined else ()
+
+
+def _row_task(row: _Row) -> Task:
+    """Build a task summary from a result row."""
+    task_id, title, status, task_labels, priority, created_at, ready = row
+    return Task(
+        id=task_id,
+        title=title,
+        description="",
+        status=task_status(status),
+        labels=_split_labels(task_labels),
+        priority=priority,
+        created_at=parse_timestamp(created_at),
+        ready=bool(ready),
+        summary=True,
+    )
+
+
+class _RowTaskCache:
+    """Reuses the Task built on the previous poll for rows that did not change.
+
+    A row holds every field of its summary, so an identical row maps to an
+    equal task. Each poll's tasks replace the cache, so it never holds more
+    than one poll's worth of tasks.
+    """
+
+    def __init__(self) -> None:
+        """Start with an empty cache."""
+        self._tasks: dict[_Row, Task] = {}
+
+    def build(self, rows: list[_Row]) -> list[Task]:
+        """Build tasks for the rows, reusing those of unchanged rows."""
+        previous: dict[_Row, Task] = self._tasks
+        current: dict[_Row, Task] = {}
+        for row in rows:
+            task: Task | None = previous.get(row)
+            current[row] = task if task is not None else _row_task(row)
+        self._tasks = current
+        return [current[row] for row in rows]
+
+
+class SqliteTaskReader:
+    """Lists open tasks for labels straight from the beads database.
+
+    Polls return summaries without descriptions, ready tasks first and each
+    group most urgent first, at most ``limit`` of them; ``description`` reads
+    one task's body on demand. ``snapshot`` and ``changes`` let a caller keep
+    its own copy of the open set current by reading only the rows updated
+    since a cursor.
+
+    Each thread keeps its own read-only connection, so each query shape is
+    compiled once and then served from sqlite3's statement cache. Queries run in
+    autocommit mode and never hold a read transaction open between polls,
+    which keeps them from blocking WAL checkpoints by bd writers.
+    """
+
+    def __init__(self, db_path: Path, limit: int | None = None) -> None:
+        """Initialize with the beads database file or its directory."""
+        self._db_file: Path = db_path / BEADS_DB_NAME if db_path.is_dir() else db_path
+        self._limit: int = -1 if limit is None else limit
+        self._local: threading.local = threading.local()
+        self._polled: _RowTaskCache = _RowTaskCache()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's read-only connection, opening it on first use."""
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                f"{self._db_file.resolve().as_uri()}?mode=ro",
+                uri=True,
+                isolation_level=None,
+            )
+            conn.execute("PRAGMA query_only = ON")
+            self._local.conn = conn
+        return conn
+
+    def poll(self, label: str) -> list[Task]:
+        """List open task summaries carrying the given label."""
+        return self.poll_any([label])
+
+    def poll_any(self, labels: list[str]) -> list[Task]:
+        """List open task summaries carrying at least one of the given labels.
+
+        Tasks whose rows are unchanged since the previous poll are returned
+        as the same objects rather than rebuilt.
+        """
+        return self._polled.build(self._open_rows(labels, self._limit))
+
+    def _open_rows(self, labels: list[str], limit: int) -> list[_Row]:
+        """List up to ``limit`` open task rows; -1 means no limit."""
+        query: str = _OPEN_TASKS_BY_LABELS.format(
+            placeholders=", ".join("?" * len(labels)),
+        )
+        return self._connection().execute(query, [*labels, limit]).fetchall()
+
+    def _cursor(self) -> str:
+        """Return the newest ``updated_at`` in the database, or "" if empty."""
+        row: tuple[str | None] = self._connection().execute(_CURSOR).fetchone()
+        return row[0] or ""
+
+    def snapshot(self, labels: list[str]) -> tuple[list[Task], str]:
+        """List every open task summary for the labels, with a change cursor.
+
+        The cursor is read before the tasks, so a change that lands in
+        between is returned again by the next ``changes`` call rather than
+        lost.
+        """
+        cursor: str = self._cursor()
+        return [_row_task(row) for row in self._open_rows(labels, -1)], cursor
+
+    def changes(self, labels: list[str], since: str) -> tuple[list[Task], str]:
+        """List tasks for the labels updated at or after ``since``, in any status.
+
+        A task also counts as changed when one of its blockers changed,
+        since that may have made it ready. Returns the tasks and the cursor
+        for the next call.
+        """
+        cursor: str = self._cursor()
+        query: str = _CHANGED_TASKS_BY_LABELS.format(
+            placeholders=", ".join("?" * len(labels)),
+        )
+        rows: list[_Row] = (
+            self._connection().execute(query, [since, since, *labels]).fetchall()
+        )
+        return [_row_task(row) for row in rows], cursor
+
+    def description(self, task_id: str) -> str | None:
+        """Return a task's description, or None if the task does not exist."""
+        row: tuple[str | None] | None = (
+            self._connection().execute(_DESCRIPTION, (task_id,)).fetchone()
+        )
+        if row is None:
+            return None
+        return row[0] or ""
+
+    def close(self) -> None:
+        """Close the calling thread's connection if it is open."""
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
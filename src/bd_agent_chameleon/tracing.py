@@ -0,0 +1,140 @@
+"""Per-phase tracing spans written as JSON lines, and a cycle profiler."""
+
+import cProfile
+import io
+import itertools
+import json
+import logging
+import pstats
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from pathlib import Path
+from typing import TextIO
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+_NULL_SPAN: AbstractContextManager[None] = nullcontext()
+
+
+class NullTracer:
+    """Tracer that records nothing; every span is one shared no-op."""
+
+    def span(self, name: str, **attributes: object) -> AbstractContextManager[None]:
+        """Return the shared no-op context manager."""
+        return _NULL_SPAN
+
+
+NULL_TRACER: NullTracer = NullTracer()
+
+
+class JsonLinesTracer:
+    """Writes one JSON object per finished span to a file.
+
+    Each record carries the span's ``name``, ``span_id``, the ``parent_id``
+    of the span enclosing it on the same thread (or null), wall-clock
+    ``start``, ``duration_ms``, ``thread``, ``attributes``, and ``error``
+    with the exception type if the block raised.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Open (or continue) the trace file at ``path``."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file: TextIO = open(path, "a", buffering=1)  # noqa: SIM115
+        self._lock: threading.Lock = threading.Lock()
+        self._ids: Iterator[int] = itertools.count(1)
+        self._local: threading.local = threading.local()
+
+    def _stack(self) -> list[int]:
+        """Return this thread's stack of open span ids."""
+        stack: list[int] | None = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = []
+            self._local.stack = stack
+        return stack
+
+    @contextmanager
+    def span(self, name: str, **attributes: object) -> Iterator[None]:
+        """Time the enclosed block and write it out when it ends."""
+        stack: list[int] = self._stack()
+        span_id: int = next(self._ids)
+        parent_id: int | None = stack[-1] if stack else None
+        stack.append(span_id)
+        error: str | None = None
+        start: float = time.time()
+        started: float = time.perf_counter()
+        try:
+            yield
+        except BaseException as exc:
+            error = type(exc).__name__
+            raise
+        finally:
+            duration_ms: float = (time.perf_counter() - started) * 1000
+            stack.pop()
+            record: dict[str, object] = {
+                "name": name,
+                "span_id": span_id,
+                "parent_id": parent_id,
+                "start": start,
+                "duration_ms": round(duration_ms, 3),
+                "thread": threading.current_thread().name,
+                "attributes": attributes,
+                "error": error,
+            }
+            line: str = json.dumps(record, default=str) + "\n"
+            with self._lock:
+                self._file.write(line)
+
+    def close(self) -> None:
+        """Flush and close the trace file."""
+        with self._lock:
+            self._file.close()
+
+
+class CycleProfiler:
+    """Profiles the first ``cycles`` work-loop cycles with cProfile.
+
+    ``tick`` is called at the start of every cycle. Profiling starts on the
+    first tick and stops once ``cycles`` cycles have finished, when the
+    stats are dumped to ``path`` in the ``pstats`` format. Only the thread
+    that calls ``tick`` is profiled.
+    """
+
+    def __init__(self, path: Path, cycles: int = 100) -> None:
+        """Initialize with the output path and the number of cycles to cover."""
+        if cycles < 1:
+            raise ValueError(f"cycles must be at least 1, got {cycles}")
+        self._path: Path = path
+        self._cycles: int = cycles
+        self._profile: cProfile.Profile | None = None
+        self._count: int = 0
+        self._done: bool = False
+
+    def tick(self) -> None:
+        """Mark the start of a cycle, starting or finishing the profile."""
+        if self._done:
+            return
+        if self._count == self._cycles:
+            self.finish()
+            return
+        if self._profile is None:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        self._count += 1
+
+    def finish(self) -> None:
+        """Stop profiling and dump the stats, if that has not happened yet."""
+        if self._done or self._profile is None:
+            return
+        self._profile.disable()
+        self._done = True
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._profile.dump_stats(self._path)
+        summary: io.StringIO = io.StringIO()
+        stats: pstats.Stats = pstats.Stats(self._profile, stream=summary)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(15)
+        logger.info(
+            "profiled %d cycles into %s\n%s", self._count, self._path,
+            summary.getvalue(),
+        )
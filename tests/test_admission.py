@@ -0,0 +1,206 @@
+"""Tests for host-load admission control and shared token buckets."""
+
+from pathlib import Path
+
+import pytest
+
+from bd_agent_chameleon.admission import (
+    FileTokenBucket,
+    HostAdmissionController,
+    HostLimits,
+    HostSample,
+    read_host_sample,
+)
+from bd_agent_chameleon.models import Role
+
+ROLE: Role = Role(name="reviewer", prompt="Review.", interactive=False)
+IDLE: HostSample = HostSample(
+    load_per_cpu=0.1, available_mb=8192, cpu_pressure=0.0, memory_pressure=0.0,
+)
+
+
+class FakeClock:
+    """A settable wall clock."""
+
+    def __init__(self) -> None:
+        """Start at an arbitrary time."""
+        self.now: float = 1000.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+class TestFileTokenBucket:
+    """Tests for the flock'd file token bucket."""
+
+    def test_allows_burst_then_reports_wait(self, tmp_path: Path) -> None:
+        """A full bucket gives ``burst`` tokens, then the time to the next."""
+        clock: FakeClock = FakeClock()
+        bucket: FileTokenBucket = FileTokenBucket(
+            tmp_path / "b", rate=0.5, burst=2, clock=clock,
+        )
+        assert bucket.try_take() == 0.0
+        assert bucket.try_take() == 0.0
+        assert bucket.try_take() == pytest.approx(2.0)
+        clock.now += 2.0
+        assert bucket.try_take() == 0.0
+
+    def test_refill_is_capped_at_burst(self, tmp_path: Path) -> None:
+        """A long idle period does not bank more than ``burst`` tokens."""
+        clock: FakeClock = FakeClock()
+        bucket: FileTokenBucket = FileTokenBucket(
+            tmp_path / "b", rate=1.0, burst=1, clock=clock,
+        )
+        bucket.try_take()
+        clock.now += 3600
+        assert bucket.try_take() == 0.0
+        assert bucket.try_take() > 0
+
+    def test_state_is_shared_through_the_file(self, tmp_path: Path) -> None:
+        """Two buckets on one path draw from the same tokens."""
+        clock: FakeClock = FakeClock()
+        first: FileTokenBucket = FileTokenBucket(tmp_path / "b", 1.0, clock=clock)
+        second: FileTokenBucket = FileTokenBucket(tmp_path / "b", 1.0, clock=clock)
+        assert first.try_take() == 0.0
+        assert second.try_take() > 0
+
+    def test_give_back_restores_a_token(self, tmp_path: Path) -> None:
+        """A refunded token can be taken again at once."""
+        clock: FakeClock = FakeClock()
+        bucket: FileTokenBucket = FileTokenBucket(tmp_path / "b", 1.0, clock=clock)
+        bucket.try_take()
+        bucket.give_back()
+        assert bucket.try_take() == 0.0
+
+    @pytest.mark.parametrize(("rate", "burst"), [(0.0, 1), (1.0, 0)])
+    def test_rejects_bad_parameters(
+        self, tmp_path: Path, rate: float, burst: int,
+    ) -> None:
+        """A non-positive rate or a burst below one is rejected."""
+        with pytest.raises(ValueError):
+            FileTokenBucket(tmp_path / "b", rate, burst)
+
+
+class TestHostLimits:
+    """Tests for judging a host sample against limits."""
+
+    @pytest.mark.parametrize(
+        ("limits", "sample", "reason"),
+        [
+            (HostLimits(max_load_per_cpu=1.0), HostSample(2.0), "load"),
+            (HostLimits(min_available_mb=512), HostSample(0.1, 100), "available"),
+            (HostLimits(max_cpu_pressure=10), HostSample(0.1, None, 50), "CPU"),
+            (
+                HostLimits(max_memory_pressure=10),
+                HostSample(0.1, None, None, 50),
+                "memory pressure",
+            ),
+        ],
+    )
+    def test_reports_broken_limit(
+        self, limits: HostLimits, sample: HostSample, reason: str,
+    ) -> None:
+        """Each limit is reported when the sample breaks it."""
+        violation: str | None = limits.violation(sample)
+        assert violation is not None
+        assert reason in violation
+
+    def test_unknown_signal_does_not_block(self) -> None:
+        """A signal the host does not provide never defers a launch."""
+        limits: HostLimits = HostLimits(max_cpu_pressure=10, min_available_mb=512)
+        assert limits.violation(HostSample(0.1)) is None
+
+    def test_enabled_only_with_a_limit(self) -> None:
+        """Limits with nothing set are disabled."""
+        assert not HostLimits().enabled
+        assert HostLimits(max_load_per_cpu=2.0).enabled
+
+    def test_reads_proc_files(self, tmp_path: Path) -> None:
+        """Memory and pressure are parsed from meminfo and PSI files."""
+        (tmp_path / "pressure").mkdir()
+        (tmp_path / "meminfo").write_text(
+            "MemTotal: 16384000 kB\nMemAvailable: 2097152 kB\n"
+        )
+        (tmp_path / "pressure" / "cpu").write_text(
+            "some avg10=12.50 avg60=3.00 avg300=1.00 total=100\n"
+        )
+        sample: HostSample = read_host_sample(tmp_path)
+        assert sample.available_mb == 2048
+        assert sample.cpu_pressure == 12.5
+        assert sample.memory_pressure is None
+
+
+class TestHostAdmissionController:
+    """Tests for admitting session launches."""
+
+    def test_busy_host_defers_without_spending_tokens(self, tmp_path: Path) -> None:
+        """A limit breach defers by the recheck delay and leaves buckets full."""
+        sample: HostSample = HostSample(load_per_cpu=4.0)
+        host_bucket: FileTokenBucket = FileTokenBucket(tmp_path / "host", 1.0)
+        controller: HostAdmissionController = HostAdmissionController(
+            HostLimits(max_load_per_cpu=2.0),
+            host_bucket,
+            tmp_path,
+            recheck=0.25,
+            sampler=lambda: sample,
+        )
+        assert controller.admit(ROLE) == 0.25
+        assert host_bucket.try_take() == 0.0
+
+    def test_skips_sampling_without_limits(self, tmp_path: Path) -> None:
+        """The host is not sampled when no limit is configured."""
+
+        def fail() -> HostSample:
+            """Fail if the host is sampled."""
+            raise AssertionError("sampled")
+
+        controller: HostAdmissionController = HostAdmissionController(
+            bucket_dir=tmp_path, sampler=fail,
+        )
+        assert controller.admit(ROLE) == 0.0
+
+    def test_role_rate_is_shared_by_controllers(self, tmp_path: Path) -> None:
+        """Workers of one role on a host share the role's launch rate."""
+        role: Role = Role(
+            name="reviewer", prompt="", interactive=False, launches_per_minute=1,
+        )
+        first: HostAdmissionController = HostAdmissionController(
+            bucket_dir=tmp_path, sampler=lambda: IDLE,
+        )
+        second: HostAdmissionController = HostAdmissionController(
+            bucket_dir=tmp_path, sampler=lambda: IDLE,
+        )
+        assert first.admit(role) == 0.0
+        assert second.admit(role) == pytest.approx(60, rel=0.01)
+
+    def test_host_refusal_refunds_the_role_token(self, tmp_path: Path) -> None:
+        """A role token is given back when the host-wide bucket is empty."""
+        role: Role = Role(
+            name="reviewer", prompt="", interactive=False, launches_per_minute=1,
+        )
+        host_bucket: FileTokenBucket = FileTokenBucket(tmp_path / "host", 0.01)
+        host_bucket.try_take()
+        controller: HostAdmissionController = HostAdmissionController(
+            host_bucket=host_bucket, bucket_dir=tmp_path, sampler=lambda: IDLE,
+        )
+        assert controller.admit(role) > 0
+        role_bucket: FileTokenBucket = FileTokenBucket(
+            tmp_path / "role-reviewer.bucket", 1 / 60,
+        )
+        assert role_bucket.try_take() == 0.0
+
+    def test_refund_restores_role_and_host_tokens(self, tmp_path: Path) -> None:
+        """A refunded launch puts back both tokens that admit took."""
+        role: Role = Role(
+            name="reviewer", prompt="", interactive=False, launches_per_minute=1,
+        )
+        host_bucket: FileTokenBucket = FileTokenBucket(tmp_path / "host", 0.01)
+        controller: HostAdmissionController = HostAdmissionController(
+            host_bucket=host_bucket, bucket_dir=tmp_path, sampler=lambda: IDLE,
+        )
+        assert controller.admit(role) == 0.0
+        assert controller.admit(role) > 0
+        controller.refund(role)
+
+        assert controller.admit(role) == 0.0
@@ -0,0 +1,275 @@
+"""Tests for the asyncio task manager and session launcher implementations."""
+
+import asyncio
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from bd_agent_chameleon.async_adapters import (
+    AsyncBeadsTaskManager,
+    AsyncClaudeLauncher,
+    ThreadedSessionLauncher,
+    ThreadedTaskManager,
+)
+from bd_agent_chameleon.claude_launcher import ClaudeLauncher
+from bd_agent_chameleon.models import Role, SessionOutcome, Task, TaskStatus
+from bd_agent_chameleon.protocols import ClaimConflictError, SessionFailedError
+
+ROLE: Role = Role(name="reviewer", prompt="Review.", interactive=False)
+TASK: Task = Task(id="bd-1", title="Fix", description="", status=TaskStatus.OPEN)
+
+
+class FakeProcess:
+    """Stands in for an asyncio subprocess with canned output."""
+
+    def __init__(
+        self, stdout: bytes, returncode: int = 0, stderr: bytes = b"error text",
+    ) -> None:
+        """Store the output and exit status to report."""
+        self._stdout: bytes = stdout
+        self._stderr: bytes = stderr
+        self.returncode: int = returncode
+
+    async def communicate(self) -> tuple[bytes, bytes]:
+        """Return the canned output."""
+        return self._stdout, self._stderr
+
+
+class RecordingTaskManager:
+    """Synchronous task manager that records which thread served each call."""
+
+    def __init__(self) -> None:
+        """Initialize the call log."""
+        self.calls: list[tuple[str, str]] = []
+
+    def poll(self, label: str) -> list[Task]:
+        """Return the single test task."""
+        self.calls.append(("poll", label))
+        return [TASK]
+
+    def poll_any(self, labels: list[str]) -> list[Task]:
+        """Return the single test task."""
+        self.calls.append(("poll_any", ",".join(labels)))
+        return [TASK]
+
+    def claim(self, task_id: str) -> None:
+        """Record the claim."""
+        self.calls.append(("claim", task_id))
+
+    def describe(self, task: Task) -> Task:
+        """Record the fetch and return the task unchanged."""
+        self.calls.append(("describe", task.id))
+        return task
+
+    def complete(self, task_id: str) -> None:
+        """Record the completion."""
+        self.calls.append(("complete", task_id))
+
+    def release(self, task_id: str) -> None:
+        """Record the release."""
+        self.calls.append(("release", task_id))
+
+    def park(self, task_id: str) -> None:
+        """Record the park."""
+        self.calls.append(("park", task_id))
+
+
+class TestThreadedAdapters:
+    """Tests for wrapping synchronous implementations."""
+
+    def test_task_manager_calls_are_delegated(self) -> None:
+        """Every async operation forwards to the wrapped manager."""
+        sync_mgr: RecordingTaskManager = RecordingTaskManager()
+        mgr: ThreadedTaskManager = ThreadedTaskManager(sync_mgr)
+
+        async def scenario() -> list[Task]:
+            """Exercise every operation."""
+            tasks: list[Task] = await mgr.poll_any(["a", "b"])
+            await mgr.claim("bd-1")
+            await mgr.complete("bd-1")
+            await mgr.release("bd-2")
+            await mgr.park("bd-3")
+            return tasks
+
+        assert asyncio.run(scenario()) == [TASK]
+        assert sync_mgr.calls == [
+            ("poll_any", "a,b"),
+            ("claim", "bd-1"),
+            ("complete", "bd-1"),
+            ("release", "bd-2"),
+            ("park", "bd-3"),
+        ]
+
+    def test_launcher_runs_off_the_loop_thread(self) -> None:
+        """A wrapped launcher runs on a worker thread, not the loop thread."""
+        threads: list[threading.Thread] = []
+
+        class Launcher:
+            """Records the thread it ran on."""
+
+            def launch(self, role: Role, task: Task) -> None:
+                """Record the current thread."""
+                threads.append(threading.current_thread())
+
+        asyncio.run(ThreadedSessionLauncher(Launcher()).launch(ROLE, TASK))
+
+        assert threads and threads[0] is not threading.main_thread()
+
+
+class TestAsyncBeadsTaskManager:
+    """Tests for the create_subprocess_exec bd backend."""
+
+    def test_poll_any_runs_bd_ready_and_parses_tasks(self) -> None:
+        """poll_any runs bd ready --label-any and parses its JSON."""
+        out: bytes = (
+            b'[{"id": "bd-1", "title": "Fix", "status": "open", "labels": ["a"]}]'
+        )
+        calls: list[tuple[Any, ...]] = []
+
+        async def fake_exec(*cmd: Any, **kwargs: Any) -> FakeProcess:
+            """Record the command and return canned output."""
+            calls.append(cmd)
+            return FakeProcess(out)
+
+        with patch("asyncio.create_subprocess_exec", fake_exec):
+            tasks: list[Task] = asyncio.run(
+                AsyncBeadsTaskManager(Path("/db")).poll_any(["a", "b"]),
+            )
+
+        assert [t.id for t in tasks] == ["bd-1"]
+        assert tasks[0].labels == ("a",)
+        assert calls[0][:4] == ("bd", "ready", "--label-any", "a,b")
+
+    def test_describe_fetches_summary_with_bd_show(self) -> None:
+        """describe fills in a summary's description from bd show, once."""
+        calls: list[tuple[Any, ...]] = []
+
+        async def fake_exec(*cmd: Any, **kwargs: Any) -> FakeProcess:
+            """Record the command and return a bd show result."""
+            calls.append(cmd)
+            return FakeProcess(b'[{"id": "bd-1", "description": "Body"}]')
+
+        async def describe_twice() -> Task:
+            """Describe the same summary twice on one manager."""
+            mgr: AsyncBeadsTaskManager = AsyncBeadsTaskManager(Path("/db"))
+            summary: Task = Task(
+                id="bd-1", title="Fix", description="", status=TaskStatus.OPEN,
+                summary=True,
+            )
+            await mgr.describe(summary)
+            return await mgr.describe(summary)
+
+        with patch("asyncio.create_subprocess_exec", fake_exec):
+            task: Task = asyncio.run(describe_twice())
+
+        assert (task.description, task.summary) == ("Body", False)
+        assert [cmd[:3] for cmd in calls] == [("bd", "show", "bd-1")]
+
+    def test_failure_raises_called_process_error(self) -> None:
+        """A non-zero bd exit surfaces as CalledProcessError."""
+
+        async def fake_exec(*cmd: Any, **kwargs: Any) -> FakeProcess:
+            """Return a failing process."""
+            return FakeProcess(b"", returncode=1)
+
+        with (
+            patch("asyncio.create_subprocess_exec", fake_exec),
+            pytest.raises(subprocess.CalledProcessError),
+        ):
+            asyncio.run(AsyncBeadsTaskManager(Path("/db")).claim("bd-1"))
+
+    def test_claim_next_skips_a_lost_claim(self) -> None:
+        """A claim bd refuses as already claimed moves on to the next task."""
+        listing: bytes = (
+            b'[{"id": "bd-1", "title": "A", "status": "open"},'
+            b' {"id": "bd-2", "title": "B", "status": "open"}]'
+        )
+
+        async def fake_exec(*cmd: Any, **kwargs: Any) -> FakeProcess:
+            """List two tasks and refuse the claim on bd-1."""
+            if "ready" in cmd:
+                return FakeProcess(listing)
+            if "bd-1" in cmd:
+                return FakeProcess(b"", 1, b"Error: bd-1 is already claimed")
+            return FakeProcess(b"{}")
+
+        mgr: AsyncBeadsTaskManager = AsyncBeadsTaskManager(Path("/db"))
+        with patch("asyncio.create_subprocess_exec", fake_exec):
+            with pytest.raises(ClaimConflictError):
+                asyncio.run(mgr.claim("bd-1"))
+            task: Task | None = asyncio.run(mgr.claim_next("role-qa"))
+
+        assert task is not None
+        assert task.id == "bd-2"
+
+
+class TestAsyncClaudeLauncher:
+    """Tests for the create_subprocess_exec Claude launcher."""
+
+    def test_streams_stdin_prompt_and_captures_output(self, tmp_path: Path) -> None:
+        """A stdin prompt is fed to the session and its output logged."""
+        cmd: list[str] = [
+            sys.executable, "-c", "import sys; print(len(sys.stdin.read()))",
+        ]
+        payload: bytes = b"p" * 500_000
+        with patch.object(
+            ClaudeLauncher, "prepare", return_value=(cmd, payload, None),
+        ):
+            asyncio.run(AsyncClaudeLauncher(log_dir=tmp_path).launch(ROLE, TASK))
+
+        assert (tmp_path / "bd-1.log").read_text() == "500000\n"
+
+    def test_removes_prompt_file_after_session(self, tmp_path: Path) -> None:
+        """A temp prompt file is deleted once the session ends."""
+        prompt_file: Path = tmp_path / "prompt.md"
+        prompt_file.write_text("instructions")
+        cmd: list[str] = [sys.executable, "-c", "pass"]
+        with patch.object(
+            ClaudeLauncher, "prepare", return_value=(cmd, None, prompt_file),
+        ):
+            asyncio.run(AsyncClaudeLauncher().launch(ROLE, TASK))
+
+        assert not prompt_file.exists()
+
+    def test_overrunning_session_times_out(self, tmp_path: Path) -> None:
+        """A session ignoring SIGTERM is killed after the grace period."""
+        role: Role = Role(
+            name="reviewer", prompt="R.", interactive=False, timeout_seconds=0.5,
+        )
+        script: str = (
+            "import signal, time\n"
+            "signal.signal(signal.SIGTERM, signal.SIG_IGN)\n"
+            "print('started', flush=True)\n"
+            "time.sleep(60)\n"
+        )
+        cmd: list[str] = [sys.executable, "-c", script]
+        launcher: AsyncClaudeLauncher = AsyncClaudeLauncher(
+            log_dir=tmp_path, kill_grace=0.5,
+        )
+        start: float = time.monotonic()
+        with (
+            patch.object(ClaudeLauncher, "prepare", return_value=(cmd, None, None)),
+            pytest.raises(SessionFailedError) as caught,
+        ):
+            asyncio.run(launcher.launch(role, TASK))
+
+        assert time.monotonic() - start < 10
+        assert caught.value.outcome == SessionOutcome.TIMED_OUT
+        assert (tmp_path / "bd-1.log").read_text() == "started\n"
+
+    def test_non_zero_exit_fails_the_session(self) -> None:
+        """A session exiting non-zero raises with its exit status."""
+        cmd: list[str] = [sys.executable, "-c", "import sys; sys.exit(2)"]
+        with (
+            patch.object(ClaudeLauncher, "prepare", return_value=(cmd, None, None)),
+            pytest.raises(SessionFailedError) as caught,
+        ):
+            asyncio.run(AsyncClaudeLauncher().launch(ROLE, TASK))
+
+        assert caught.value.returncode == 2
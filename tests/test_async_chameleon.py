@@ -0,0 +1,383 @@
+"""Tests for the asyncio-native AsyncChameleon orchestrator."""
+
+import asyncio
+from collections.abc import Callable
+from datetime import timedelta
+
+import pytest
+
+from bd_agent_chameleon.async_chameleon import AsyncChameleon
+from bd_agent_chameleon.models import Role, SessionOutcome, Task, TaskStatus
+from bd_agent_chameleon.poll_scheduler import RetryTracker
+from bd_agent_chameleon.protocols import ClaimConflictError, SessionFailedError
+
+ROLE: Role = Role(name="reviewer", prompt="Review.", interactive=False)
+
+
+class FakeConfigManager:
+    """Returns a fixed role for every name."""
+
+    def __init__(self, role: Role) -> None:
+        """Store the role to return."""
+        self._role: Role = role
+
+    def load_role(self, name: str) -> Role:
+        """Return the stored role."""
+        return self._role
+
+
+class FakeAsyncTaskManager:
+    """Returns canned poll results and records claim/complete calls."""
+
+    def __init__(self, poll_results: list[list[Task]]) -> None:
+        """Store the sequence of poll results to return."""
+        self._poll_results: list[list[Task]] = list(poll_results)
+        self.claimed: list[str] = []
+        self.completed: list[str] = []
+        self.released: list[str] = []
+        self.parked: list[str] = []
+        self.conflicts: set[str] = set()
+
+    async def poll(self, label: str) -> list[Task]:
+        """Return the next canned result, or empty if exhausted."""
+        return self._poll_results.pop(0) if self._poll_results else []
+
+    async def poll_any(self, labels: list[str]) -> list[Task]:
+        """Return the next canned result for a combined poll."""
+        return await self.poll(labels[0])
+
+    async def claim(self, task_id: str) -> None:
+        """Record the claim, or fail it for ids marked as conflicting."""
+        if task_id in self.conflicts:
+            raise ClaimConflictError(task_id)
+        self.claimed.append(task_id)
+
+    async def describe(self, task: Task) -> Task:
+        """Return the task unchanged."""
+        return task
+
+    async def complete(self, task_id: str) -> None:
+        """Record the completion."""
+        self.completed.append(task_id)
+
+    async def release(self, task_id: str) -> None:
+        """Record the release."""
+        self.released.append(task_id)
+
+    async def park(self, task_id: str) -> None:
+        """Record the park."""
+        self.parked.append(task_id)
+
+
+class GatedLauncher:
+    """Holds every session open until released, tracking peak concurrency."""
+
+    def __init__(self) -> None:
+        """Initialize the gate and counters."""
+        self.gate: asyncio.Event = asyncio.Event()
+        self.launched: list[str] = []
+        self.active: int = 0
+        self.peak: int = 0
+
+    async def launch(self, role: Role, task: Task) -> None:
+        """Record the session and wait for the gate."""
+        self.launched.append(task.id)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await self.gate.wait()
+        self.active -= 1
+
+
+def _make_tasks(count: int) -> list[Task]:
+    """Build a list of open tasks with sequential ids."""
+    return [
+        Task(id=str(i), title=f"T{i}", description="", status=TaskStatus.OPEN)
+        for i in range(count)
+    ]
+
+
+async def _run_until(
+    chameleon: AsyncChameleon, condition: Callable[[], bool],
+) -> None:
+    """Run the chameleon, shutting it down once ``condition()`` holds."""
+    runner: asyncio.Task[None] = asyncio.create_task(chameleon.run())
+    async with asyncio.timeout(5):
+        while not condition():
+            await asyncio.sleep(0.001)
+    chameleon.shutdown()
+    await asyncio.wait_for(runner, 5)
+
+
+class TestAsyncChameleon:
+    """Tests for the event-loop poll-and-launch cycle."""
+
+    def test_runs_sessions_concurrently_up_to_limit(self) -> None:
+        """Up to ``concurrency`` sessions are in flight on one loop."""
+
+        async def scenario() -> None:
+            """Start three gated sessions, then release them."""
+            task_mgr: FakeAsyncTaskManager = FakeAsyncTaskManager([_make_tasks(4)])
+            launcher: GatedLauncher = GatedLauncher()
+            chameleon: AsyncChameleon = AsyncChameleon(
+                FakeConfigManager(ROLE),
+                task_mgr,
+                launcher,
+                "reviewer",
+                timedelta(seconds=0),
+                concurrency=3,
+            )
+
+            def three_running() -> bool:
+                """Release the gate once three sessions are active."""
+                if launcher.active == 3:
+                    launcher.gate.set()
+                    return True
+                return False
+
+            await _run_until(chameleon, three_running)
+
+            assert launcher.peak == 3
+            assert task_mgr.claimed == ["0", "1", "2"]
+            assert sorted(task_mgr.completed) == ["0", "1", "2"]
+
+        asyncio.run(scenario())
+
+    def test_skips_task_lost_to_claim_conflict(self) -> None:
+        """A conflicting claim is skipped and the next task is run."""
+
+        async def scenario() -> None:
+            """Offer two tasks, the first of which conflicts."""
+            task_mgr: FakeAsyncTaskManager = FakeAsyncTaskManager([_make_tasks(2)])
+            task_mgr.conflicts.add("0")
+            launcher: GatedLauncher = GatedLauncher()
+            launcher.gate.set()
+            chameleon: AsyncChameleon = AsyncChameleon(
+                FakeConfigManager(ROLE), task_mgr, launcher, "reviewer",
+                timedelta(seconds=0),
+            )
+            await _run_until(chameleon, lambda: task_mgr.completed == ["1"])
+
+            assert launcher.launched == ["1"]
+
+        asyncio.run(scenario())
+
+    def test_failed_session_releases_its_task(self) -> None:
+        """A timed-out session's task is released and the loop keeps going."""
+
+        class TimingOutLauncher:
+            """Times out on task 0 and succeeds otherwise."""
+
+            async def launch(self, role: Role, task: Task) -> None:
+                """Fail task 0's session."""
+                if task.id == "0":
+                    raise SessionFailedError(task.id, SessionOutcome.TIMED_OUT)
+
+        async def scenario() -> None:
+            """Offer two tasks, the first of which times out."""
+            task_mgr: FakeAsyncTaskManager = FakeAsyncTaskManager([_make_tasks(2)])
+            chameleon: AsyncChameleon = AsyncChameleon(
+                FakeConfigManager(ROLE), task_mgr, TimingOutLauncher(), "reviewer",
+                timedelta(seconds=0), concurrency=2,
+            )
+            await _run_until(chameleon, lambda: task_mgr.completed == ["1"])
+
+            assert task_mgr.released == ["0"]
+
+        asyncio.run(scenario())
+
+    def test_task_that_keeps_failing_is_parked(self) -> None:
+        """After max_attempts failed sessions a task is parked, not released."""
+
+        class FailingLauncher:
+            """Fails every session."""
+
+            async def launch(self, role: Role, task: Task) -> None:
+                """Fail the session."""
+                raise SessionFailedError(task.id, SessionOutcome.FAILED)
+
+        async def scenario() -> None:
+            """Offer the same task until it is parked."""
+            task: Task = _make_tasks(1)[0]
+            task_mgr: FakeAsyncTaskManager = FakeAsyncTaskManager([[task]] * 2)
+            chameleon: AsyncChameleon = AsyncChameleon(
+                FakeConfigManager(ROLE), task_mgr, FailingLauncher(), "reviewer",
+                timedelta(seconds=0), retries=RetryTracker(2, timedelta(0)),
+            )
+            await _run_until(chameleon, lambda: task_mgr.parked == ["0"])
+
+            assert task_mgr.released == ["0"]
+            assert task_mgr.claimed == ["0", "0"]
+
+        asyncio.run(scenario())
+
+    def test_failed_task_is_skipped_during_its_retry_delay(self) -> None:
+        """A task whose session just failed is not claimed again right away."""
+
+        class FailingLauncher:
+            """Fails every session."""
+
+            async def launch(self, role: Role, task: Task) -> None:
+                """Fail the session."""
+                raise SessionFailedError(task.id, SessionOutcome.TIMED_OUT)
+
+        async def scenario() -> None:
+            """Offer the failed task again on the next poll."""
+            tasks: list[Task] = _make_tasks(2)
+            task_mgr: FakeAsyncTaskManager = FakeAsyncTaskManager(
+                [tasks[:1], tasks[:1], tasks[1:]],
+            )
+            chameleon: AsyncChameleon = AsyncChameleon(
+                FakeConfigManager(ROLE), task_mgr, FailingLauncher(), "reviewer",
+                timedelta(seconds=0), retries=RetryTracker(3, timedelta(hours=1)),
+            )
+            await _run_until(chameleon, lambda: task_mgr.released == ["0", "1"])
+
+            assert task_mgr.claimed == ["0", "1"]
+            assert task_mgr.parked == []
+
+        asyncio.run(scenario())
+
+    def test_role_cap_limits_sessions(self) -> None:
+        """A role's max_concurrency caps sessions below the global limit."""
+
+        async def scenario() -> None:
+            """Offer three tasks to a role capped at one session."""
+            capped: Role = Role(
+                name="reviewer", prompt="R.", interactive=False, max_concurrency=1,
+            )
+            tasks: list[Task] = _make_tasks(3)
+            task_mgr: FakeAsyncTaskManager = FakeAsyncTaskManager([tasks, tasks])
+            launcher: GatedLauncher = GatedLauncher()
+            chameleon: AsyncChameleon = AsyncChameleon(
+                FakeConfigManager(capped), task_mgr, launcher, "reviewer",
+                timedelta(seconds=0), concurrency=3,
+            )
+
+            def polled_twice() -> bool:
+                """Release the gate once both polls have been served."""
+                if task_mgr._poll_results:
+                    return False
+                launcher.gate.set()
+                return True
+
+            await _run_until(chameleon, polled_twice)
+
+            assert launcher.peak == 1
+            assert task_mgr.claimed == ["0"]
+
+        asyncio.run(scenario())
+
+    def test_interactive_sessions_never_overlap(self) -> None:
+        """Interactive sessions share the terminal, so only one runs at a time."""
+
+        async def scenario() -> None:
+            """Offer three tasks to an interactive role."""
+            interactive: Role = Role(name="pair", prompt="P.", interactive=True)
+            tasks: list[Task] = _make_tasks(3)
+            task_mgr: FakeAsyncTaskManager = FakeAsyncTaskManager([tasks, tasks])
+            launcher: GatedLauncher = GatedLauncher()
+            chameleon: AsyncChameleon = AsyncChameleon(
+                FakeConfigManager(interactive), task_mgr, launcher, "pair",
+                timedelta(seconds=0), concurrency=3,
+            )
+
+            def polled_twice() -> bool:
+                """Release the gate once both polls have been served."""
+                if task_mgr._poll_results:
+                    return False
+                launcher.gate.set()
+                return True
+
+            await _run_until(chameleon, polled_twice)
+
+            assert launcher.peak == 1
+            assert task_mgr.claimed == ["0"]
+
+        asyncio.run(scenario())
+
+    def test_rejects_zero_concurrency(self) -> None:
+        """A concurrency below one is rejected."""
+        with pytest.raises(ValueError, match="concurrency"):
+            AsyncChameleon(
+                FakeConfigManager(ROLE), FakeAsyncTaskManager([]), GatedLauncher(),
+                "reviewer", concurrency=0,
+            )
+
+    def test_lost_claim_refunds_the_admission(self) -> None:
+        """A slot admitted for a task claimed elsewhere is given back."""
+
+        class CountingAdmission:
+            """Admits every launch and counts refunds."""
+
+            def __init__(self) -> None:
+                """Initialize the counters."""
+                self.asked: int = 0
+                self.refunded: int = 0
+
+            def admit(self, role: Role) -> float:
+                """Admit the launch."""
+                self.asked += 1
+                return 0.0
+
+            def refund(self, role: Role) -> None:
+                """Count the refund."""
+                self.refunded += 1
+
+        async def scenario() -> None:
+            """Lose the claim for task 0, then run task 1."""
+            task_mgr: FakeAsyncTaskManager = FakeAsyncTaskManager([_make_tasks(2)])
+            task_mgr.conflicts.add("0")
+            launcher: GatedLauncher = GatedLauncher()
+            launcher.gate.set()
+            admission: CountingAdmission = CountingAdmission()
+            chameleon: AsyncChameleon = AsyncChameleon(
+                FakeConfigManager(ROLE), task_mgr, launcher, "reviewer",
+                timedelta(seconds=0), admission=admission,
+            )
+            await _run_until(chameleon, lambda: task_mgr.completed == ["1"])
+
+            assert (admission.asked, admission.refunded) == (2, 1)
+
+        asyncio.run(scenario())
+
+    def test_refused_role_is_not_claimed(self) -> None:
+        """Tasks of a role the admission controller refuses stay unclaimed."""
+
+        class RefuseOnce:
+            """Refuses the first launch, then admits every one."""
+
+            def __init__(self) -> None:
+                """Initialize the call log."""
+                self.asked: int = 0
+
+            def admit(self, role: Role) -> float:
+                """Refuse only the first request."""
+                self.asked += 1
+                return 1.0 if self.asked == 1 else 0.0
+
+            def refund(self, role: Role) -> None:
+                """Refunds are not expected here."""
+                raise AssertionError("unexpected refund")
+
+        async def scenario() -> None:
+            """Offer two tasks on each of two polls."""
+            task_mgr: FakeAsyncTaskManager = FakeAsyncTaskManager(
+                [_make_tasks(2), _make_tasks(2)],
+            )
+            launcher: GatedLauncher = GatedLauncher()
+            launcher.gate.set()
+            admission: RefuseOnce = RefuseOnce()
+            chameleon: AsyncChameleon = AsyncChameleon(
+                FakeConfigManager(ROLE),
+                task_mgr,
+                launcher,
+                "reviewer",
+                timedelta(seconds=0),
+                admission=admission,
+            )
+            await _run_until(chameleon, lambda: bool(task_mgr.completed))
+
+            assert task_mgr.claimed[0] == "0"
+            assert admission.asked >= 2
+
+        asyncio.run(scenario())
@@ -0,0 +1,105 @@
+"""Unit tests for BdDaemonClient against an in-process fake daemon."""
+
+import json
+import socketserver
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from bd_agent_chameleon.bd_daemon import BdDaemonClient, BdDaemonError
+
+
+class _FakeDaemonHandler(socketserver.StreamRequestHandler):
+    """Answers newline-delimited JSON requests, recording each one."""
+
+    def handle(self) -> None:
+        """Serve requests until the client disconnects."""
+        server: Any = self.server
+        for line in self.rfile:
+            request: dict[str, Any] = json.loads(line)
+            server.requests.append(request)
+            if request["operation"] == "fail":
+                response: dict[str, Any] = {"success": False, "error": "nope"}
+            else:
+                response = {"success": True, "data": request["args"]}
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+@pytest.fixture
+def daemon_socket(tmp_path: Path) -> Iterator[tuple[Path, list[dict[str, Any]]]]:
+    """Run a fake daemon on a Unix socket and yield its path and request log."""
+    socket_path: Path = tmp_path / "bd.sock"
+    server: Any = socketserver.ThreadingUnixStreamServer(
+        str(socket_path), _FakeDaemonHandler,
+    )
+    server.daemon_threads = True
+    server.requests = []
+    thread: threading.Thread = threading.Thread(
+        target=server.serve_forever, daemon=True,
+    )
+    thread.start()
+    yield socket_path, server.requests
+    server.shutdown()
+    server.server_close()
+
+
+class TestConnect:
+    """Tests for BdDaemonClient.connect."""
+
+    def test_connect_pings_daemon(
+        self, daemon_socket: tuple[Path, list[dict[str, Any]]],
+    ) -> None:
+        """connect() returns True after a successful ping."""
+        socket_path, requests = daemon_socket
+        client: BdDaemonClient = BdDaemonClient(socket_path)
+
+        assert client.connect() is True
+        assert requests[0]["operation"] == "ping"
+        client.close()
+
+    def test_connect_without_daemon_returns_false(self, tmp_path: Path) -> None:
+        """connect() returns False when nothing listens on the socket."""
+        client: BdDaemonClient = BdDaemonClient(tmp_path / "bd.sock")
+
+        assert client.connect() is False
+
+    def test_for_db_places_socket_in_beads_dir(self, tmp_path: Path) -> None:
+        """for_db() resolves the socket inside the database directory."""
+        client: BdDaemonClient = BdDaemonClient.for_db(tmp_path)
+
+        assert client._socket_path == tmp_path / "bd.sock"
+
+
+class TestRequest:
+    """Tests for BdDaemonClient.request."""
+
+    def test_reuses_one_connection(
+        self, daemon_socket: tuple[Path, list[dict[str, Any]]],
+    ) -> None:
+        """Several requests are served over the same socket."""
+        socket_path, requests = daemon_socket
+        client: BdDaemonClient = BdDaemonClient(socket_path)
+
+        first: Any = client.request("list", {"labels": ["role-qa"]})
+        sock: Any = client._sock
+        second: Any = client.request("close", {"id": "x-1"})
+
+        assert first == {"labels": ["role-qa"]}
+        assert second == {"id": "x-1"}
+        assert client._sock is sock
+        assert [r["operation"] for r in requests] == ["list", "close"]
+        client.close()
+
+    def test_daemon_error_raises(
+        self, daemon_socket: tuple[Path, list[dict[str, Any]]],
+    ) -> None:
+        """An unsuccessful response raises BdDaemonError with its message."""
+        socket_path, _ = daemon_socket
+        client: BdDaemonClient = BdDaemonClient(socket_path)
+
+        with pytest.raises(BdDaemonError, match="nope"):
+            client.request("fail", {})
+        client.close()
@@ -1,23 +1,34 @@
 """Unit tests for BeadsTaskManager with mocked subprocess calls."""
 
 import json
+import os
+import sqlite3
 import subprocess
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import replace
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
+from typing import Any
 from unittest.mock import patch
 
 import pytest
 
-from bd_agent_chameleon.beads_task_manager import BeadsTaskManager
-from bd_agent_chameleon.models import Task, TaskStatus
+from bd_agent_chameleon.bd_daemon import BdDaemonError
+from bd_agent_chameleon.beads_task_manager import BeadsTaskManager, DescriptionCache
+from bd_agent_chameleon.models import DEFAULT_PRIORITY, Task, TaskStatus
+from bd_agent_chameleon.protocols import ClaimConflictError
+from bd_agent_chameleon.sqlite_reader import SqliteTaskReader
 
 DB_PATH: Path = Path("/tmp/test-beads")
+FAKES_DIR: Path = Path(__file__).resolve().parent.parent / "benchmarks" / "fakes"
 
 
 class TestPoll:
     """Tests for the poll method."""
 
-    def test_returns_tasks_from_bd_list(self) -> None:
-        """Poll parses bd list JSON into Task objects."""
+    def test_returns_tasks_from_bd_ready(self) -> None:
+        """Poll parses bd ready JSON into task summaries without descriptions."""
         raw_json: str = json.dumps([
             {
                 "id": "abc-1",
@@ -44,7 +55,7 @@ class TestPoll:
 
         mock_run.assert_called_once()
         args: list[str] = mock_run.call_args[0][0]
-        assert "list" in args
+        assert "ready" in args
         assert "--label" in args
         assert "role-reviewer" in args
         assert "--json" in args
@@ -53,12 +64,13 @@ class TestPoll:
         assert tasks[0] == Task(
             id="abc-1",
             title="Fix widget",
-            description="The widget is broken",
+            description="",
             status=TaskStatus.OPEN,
+            summary=True,
         )
 
     def test_returns_empty_list_when_no_tasks(self) -> None:
-        """Poll returns an empty list when bd list yields no results."""
+        """Poll returns an empty list when bd ready yields no results."""
         completed = subprocess.CompletedProcess(
             args=[], returncode=0, stdout="[]", stderr="",
         )
@@ -88,6 +100,77 @@ class TestPoll:
 
         assert tasks[0].description == ""
 
+    def test_parses_priority_and_age(self) -> None:
+        """Priority and creation time are carried on the task."""
+        raw_json: str = json.dumps([
+            {
+                "id": "x-1",
+                "title": "Urgent",
+                "status": "open",
+                "priority": 0,
+                "created_at": "2026-01-02T03:04:05Z",
+            },
+            {"id": "x-2", "title": "Plain", "status": "open"},
+        ])
+        completed = subprocess.CompletedProcess(
+            args=[], returncode=0, stdout=raw_json, stderr="",
+        )
+        with patch(
+            "bd_agent_chameleon.beads_task_manager.subprocess.run",
+            return_value=completed,
+        ):
+            urgent, plain = BeadsTaskManager(db_path=DB_PATH).poll("role-qa")
+
+        assert urgent.priority == 0
+        assert urgent.created_at == datetime(2026, 1, 2, 3, 4, 5, tzinfo=UTC)
+        assert plain.priority == DEFAULT_PRIORITY
+        assert plain.created_at is None
+
+    def test_skips_in_progress_ready_work(self) -> None:
+        """Work bd counts as ready but that is already claimed is not polled."""
+        raw_json: str = json.dumps([
+            {"id": "x-1", "title": "Taken", "status": "in_progress"},
+            {"id": "x-2", "title": "Free", "status": "open"},
+        ])
+        completed = subprocess.CompletedProcess(
+            args=[], returncode=0, stdout=raw_json, stderr="",
+        )
+        with patch(
+            "bd_agent_chameleon.beads_task_manager.subprocess.run",
+            return_value=completed,
+        ):
+            tasks: list[Task] = BeadsTaskManager(db_path=DB_PATH).poll("role-qa")
+
+        assert [t.id for t in tasks] == ["x-2"]
+
+
+class TestPollAny:
+    """Tests for the poll_any method."""
+
+    def test_uses_label_any_and_parses_labels(self) -> None:
+        """poll_any asks bd for any of the labels and keeps each task's labels."""
+        raw_json: str = json.dumps([
+            {
+                "id": "m-1",
+                "title": "Multi",
+                "status": "open",
+                "labels": ["role-qa", "urgent"],
+            },
+        ])
+        completed = subprocess.CompletedProcess(
+            args=[], returncode=0, stdout=raw_json, stderr="",
+        )
+        with patch(
+            "bd_agent_chameleon.beads_task_manager.subprocess.run",
+            return_value=completed,
+        ) as mock_run:
+            mgr = BeadsTaskManager(db_path=DB_PATH)
+            tasks: list[Task] = mgr.poll_any(["role-qa", "role-dev"])
+
+        args: list[str] = mock_run.call_args[0][0]
+        assert args[args.index("--label-any") + 1] == "role-qa,role-dev"
+        assert tasks[0].labels == ("role-qa", "urgent")
+
 
 class TestClaim:
     """Tests for the claim method."""
@@ -109,6 +192,80 @@ class TestClaim:
         assert "abc-1" in args
         assert "--claim" in args
 
+    def test_already_claimed_raises_conflict(self) -> None:
+        """bd refusing a claimed task surfaces as ClaimConflictError."""
+        error = subprocess.CalledProcessError(
+            1, "bd", stderr="Error: issue abc-1 is already claimed by w2",
+        )
+        with patch(
+            "bd_agent_chameleon.beads_task_manager.subprocess.run",
+            side_effect=error,
+        ):
+            mgr = BeadsTaskManager(db_path=DB_PATH)
+            with pytest.raises(ClaimConflictError):
+                mgr.claim("abc-1")
+
+    def test_other_bd_failures_still_raise(self) -> None:
+        """A claim that fails for another reason keeps bd's error."""
+        error = subprocess.CalledProcessError(1, "bd", stderr="database is locked")
+        with patch(
+            "bd_agent_chameleon.beads_task_manager.subprocess.run",
+            side_effect=error,
+        ):
+            mgr = BeadsTaskManager(db_path=DB_PATH)
+            with pytest.raises(subprocess.CalledProcessError):
+                mgr.claim("abc-1")
+
+
+class TestClaimNext:
+    """Tests for claiming the next open task."""
+
+    def test_skips_excluded_and_lost_candidates(self) -> None:
+        """The first task that is neither excluded nor claimed elsewhere wins."""
+        listing: str = json.dumps([
+            {"id": f"t-{i}", "title": "T", "status": "open"} for i in range(3)
+        ])
+
+        def run(cmd: list[str], **kwargs: Any) -> subprocess.CompletedProcess[str]:
+            """List three tasks and refuse the claim on t-1."""
+            if "ready" in cmd:
+                return subprocess.CompletedProcess(cmd, 0, listing, "")
+            if "t-1" in cmd:
+                raise subprocess.CalledProcessError(
+                    1, cmd, stderr="issue t-1 already claimed",
+                )
+            return subprocess.CompletedProcess(cmd, 0, "{}", "")
+
+        with patch(
+            "bd_agent_chameleon.beads_task_manager.subprocess.run",
+            side_effect=run,
+        ) as mock_run:
+            mgr = BeadsTaskManager(db_path=DB_PATH)
+            task: Task | None = mgr.claim_next("role-qa", exclude={"t-0"})
+
+        assert task is not None
+        assert task.id == "t-2"
+        claimed: list[str] = [
+            call[0][0][2] for call in mock_run.call_args_list if "--claim" in call[0][0]
+        ]
+        assert claimed == ["t-1", "t-2"]
+
+    def test_returns_none_when_every_candidate_is_lost(self) -> None:
+        """No task is returned when all claims conflict."""
+        listing: str = json.dumps([{"id": "t-0", "title": "T", "status": "open"}])
+
+        def run(cmd: list[str], **kwargs: Any) -> subprocess.CompletedProcess[str]:
+            """List one task and refuse to claim it."""
+            if "ready" in cmd:
+                return subprocess.CompletedProcess(cmd, 0, listing, "")
+            raise subprocess.CalledProcessError(1, cmd, stderr="already claimed")
+
+        with patch(
+            "bd_agent_chameleon.beads_task_manager.subprocess.run",
+            side_effect=run,
+        ):
+            assert BeadsTaskManager(db_path=DB_PATH).claim_next("role-qa") is None
+
 
 class TestComplete:
     """Tests for the complete method."""
@@ -130,6 +287,191 @@ class TestComplete:
         assert "abc-1" in args
 
 
+SUMMARY: Task = Task(
+    id="abc-1", title="Fix", description="", status=TaskStatus.OPEN, summary=True,
+)
+
+
+def _bd_output(payload: object) -> subprocess.CompletedProcess[str]:
+    """Return a successful bd run printing ``payload`` as JSON."""
+    return subprocess.CompletedProcess(
+        args=[], returncode=0, stdout=json.dumps(payload), stderr="",
+    )
+
+
+class TestSummaries:
+    """Tests for compact polls and lazily fetched descriptions."""
+
+    def test_poll_limit_is_passed_to_bd_and_enforced(self) -> None:
+        """bd ready gets --limit, and extra entries are not parsed."""
+        entries: list[dict[str, str]] = [
+            {"id": f"x-{i}", "title": "T", "status": "open"} for i in range(3)
+        ]
+        with patch(
+            "bd_agent_chameleon.beads_task_manager.subprocess.run",
+            return_value=_bd_output(entries),
+        ) as mock_run:
+            tasks: list[Task] = BeadsTaskManager(DB_PATH, poll_limit=2).poll("q")
+
+        args: list[str] = mock_run.call_args[0][0]
+        assert args[args.index("--limit") + 1] == "2"
+        assert [t.id for t in tasks] == ["x-0", "x-1"]
+
+    def test_unlimited_poll_lifts_bd_default_cap(self) -> None:
+        """Without a poll limit, bd ready is asked for every task."""
+        with patch(
+            "bd_agent_chameleon.beads_task_manager.subprocess.run",
+            return_value=_bd_output([]),
+        ) as mock_run:
+            BeadsTaskManager(DB_PATH).poll("q")
+
+        args: list[str] = mock_run.call_args[0][0]
+        assert args[args.index("--limit") + 1] == "0"
+
+    def test_describe_fetches_once_with_bd_show(self) -> None:
+        """A summary's description comes from bd show and is then cached."""
+        shown: list[dict[str, str]] = [
+            {"id": "abc-1", "title": "Fix", "status": "open", "description": "Body"},
+        ]
+        with patch(
+            "bd_agent_chameleon.beads_task_manager.subprocess.run",
+            return_value=_bd_output(shown),
+        ) as mock_run:
+            mgr = BeadsTaskManager(DB_PATH)
+            first: Task = mgr.describe(SUMMARY)
+            second: Task = mgr.describe(SUMMARY)
+
+        mock_run.assert_called_once()
+        assert mock_run.call_args[0][0][:3] == ["bd", "show", "abc-1"]
+        assert first == second
+        assert (first.description, first.summary) == ("Body", False)
+
+    def test_full_task_is_not_fetched(self) -> None:
+        """A task that already has its description is returned unchanged."""
+        task: Task = Task(id="a", title="T", description="D", status=TaskStatus.OPEN)
+        with patch(
+            "bd_agent_chameleon.beads_task_manager.subprocess.run",
+        ) as mock_run:
+            assert BeadsTaskManager(DB_PATH).describe(task) is task
+
+        mock_run.assert_not_called()
+
+    def test_complete_forgets_the_cached_description(self) -> None:
+        """Closing a task drops its description from the cache."""
+        with patch(
+            "bd_agent_chameleon.beads_task_manager.subprocess.run",
+            return_value=_bd_output({"description": "Body"}),
+        ) as mock_run:
+            mgr = BeadsTaskManager(DB_PATH)
+            mgr.describe(SUMMARY)
+            mgr.complete("abc-1")
+            mgr.describe(SUMMARY)
+
+        assert mock_run.call_count == 3
+
+    def test_reader_serves_descriptions(self) -> None:
+        """With a SQLite reader, descriptions are read without bd."""
+        with patch(
+            "bd_agent_chameleon.beads_task_manager.subprocess.run",
+        ) as mock_run:
+            mgr = BeadsTaskManager(DB_PATH, reader=FakeReader())  # type: ignore[arg-type]
+            task: Task = mgr.describe(SUMMARY)
+
+        mock_run.assert_not_called()
+        assert task.description == "direct body of abc-1"
+
+
+class TestParsedTaskCache:
+    """Tests for reusing unchanged tasks across polls."""
+
+    def _poll_twice(
+        self, first: list[dict[str, Any]], second: list[dict[str, Any]],
+    ) -> tuple[list[Task], list[Task]]:
+        """Poll one manager against two successive bd ready results."""
+        with patch(
+            "bd_agent_chameleon.beads_task_manager.subprocess.run",
+            side_effect=[_bd_output(first), _bd_output(second)],
+        ):
+            mgr = BeadsTaskManager(DB_PATH)
+            return mgr.poll("q"), mgr.poll("q")
+
+    def test_unchanged_task_is_reused(self) -> None:
+        """An entry with the same id and updated_at yields the same object."""
+        entry: dict[str, Any] = {
+            "id": "a", "title": "A", "status": "open", "updated_at": "t1",
+        }
+        before, after = self._poll_twice([entry], [dict(entry)])
+
+        assert after[0] is before[0]
+
+    def test_updated_task_is_parsed_again(self) -> None:
+        """A newer updated_at yields a new task."""
+        entry: dict[str, Any] = {
+            "id": "a", "title": "A", "status": "open", "updated_at": "t1",
+        }
+        before, after = self._poll_twice(
+            [entry], [{**entry, "title": "A2", "updated_at": "t2"}],
+        )
+
+        assert after[0].title == "A2"
+        assert after[0] is not before[0]
+
+
+class TestDescriptionCache:
+    """Tests for the LRU description cache."""
+
+    def test_evicts_least_recently_used(self) -> None:
+        """A full cache drops the entry used longest ago."""
+        cache: DescriptionCache = DescriptionCache(size=2)
+        cache.put("a", "A")
+        cache.put("b", "B")
+        cache.get("a")
+        cache.put("c", "C")
+
+        assert (cache.get("a"), cache.get("b"), cache.get("c")) == ("A", None, "C")
+
+
+class TestRelease:
+    """Tests for the release method."""
+
+    def test_calls_bd_update_with_open_status(self) -> None:
+        """Release reopens the task and clears its assignee via bd update."""
+        completed = subprocess.CompletedProcess(
+            args=[], returncode=0, stdout="[]", stderr="",
+        )
+        with patch(
+            "bd_agent_chameleon.beads_task_manager.subprocess.run",
+            return_value=completed,
+        ) as mock_run:
+            mgr = BeadsTaskManager(db_path=DB_PATH)
+            mgr.release("abc-1")
+
+        args: list[str] = mock_run.call_args[0][0]
+        assert "update" in args
+        assert args[args.index("--status") + 1] == "open"
+        assert args[args.index("--assignee") + 1] == ""
+
+
+class TestPark:
+    """Tests for the park method."""
+
+    def test_calls_bd_update_with_blocked_status(self) -> None:
+        """Park blocks the task and clears its assignee via bd update."""
+        completed = subprocess.CompletedProcess(
+            args=[], returncode=0, stdout="[]", stderr="",
+        )
+        with patch(
+            "bd_agent_chameleon.beads_task_manager.subprocess.run",
+            return_value=completed,
+        ) as mock_run:
+            mgr = BeadsTaskManager(db_path=DB_PATH)
+            mgr.park("abc-1")
+
+        args: list[str] = mock_run.call_args[0][0]
+        assert args[args.index("--status") + 1] == "blocked"
+        assert args[args.index("--assignee") + 1] == ""
+
+
 class TestErrorHandling:
     """Tests for error propagation from bd CLI failures."""
 
@@ -142,3 +484,480 @@ class TestErrorHandling:
             mgr = BeadsTaskManager(db_path=DB_PATH)
             with pytest.raises(subprocess.CalledProcessError):
                 mgr.poll("role-reviewer")
+
+
+class FakeDaemon:
+    """Stands in for BdDaemonClient, answering or failing every request."""
+
+    def __init__(self, response: Any = None, error: Exception | None = None) -> None:
+        """Store the canned response or transport error."""
+        self._response: Any = response
+        self._error: Exception | None = error
+        self.requests: list[tuple[str, dict[str, Any]]] = []
+        self.closed: bool = False
+
+    def request(self, operation: str, args: dict[str, Any]) -> Any:
+        """Record the request and return the canned response."""
+        self.requests.append((operation, args))
+        if self._error is not None:
+            raise self._error
+        return self._response
+
+    def close(self) -> None:
+        """Record that the connection was closed."""
+        self.closed = True
+
+
+class TestDaemonBackend:
+    """Tests for routing requests through the bd daemon."""
+
+    def test_poll_uses_daemon_without_subprocess(self) -> None:
+        """Poll is served by the daemon when one is connected."""
+        daemon = FakeDaemon(
+            response=[{"id": "d-1", "title": "T", "status": "open"}],
+        )
+        with patch(
+            "bd_agent_chameleon.beads_task_manager.subprocess.run",
+        ) as mock_run:
+            mgr = BeadsTaskManager(db_path=DB_PATH, daemon=daemon)  # type: ignore[arg-type]
+            tasks: list[Task] = mgr.poll("role-qa")
+
+        mock_run.assert_not_called()
+        assert daemon.requests == [
+            ("ready", {"labels": ["role-qa"], "status": "open", "limit": 0}),
+        ]
+        assert [t.id for t in tasks] == ["d-1"]
+
+    def test_writes_bypass_daemon(self) -> None:
+        """Claim, complete and release always run the bd CLI."""
+        daemon = FakeDaemon()
+        completed = subprocess.CompletedProcess(
+            args=[], returncode=0, stdout="{}", stderr="",
+        )
+        with patch(
+            "bd_agent_chameleon.beads_task_manager.subprocess.run",
+            return_value=completed,
+        ) as mock_run:
+            mgr = BeadsTaskManager(db_path=DB_PATH, daemon=daemon)  # type: ignore[arg-type]
+            mgr.claim("d-1")
+            mgr.complete("d-1")
+            mgr.release("d-1")
+
+        assert daemon.requests == []
+        commands: list[list[str]] = [c.args[0][1:3] for c in mock_run.call_args_list]
+        assert commands == [["update", "d-1"], ["close", "d-1"], ["update", "d-1"]]
+
+    def test_falls_back_on_daemon_error(self) -> None:
+        """An error reported by the daemon drops it in favour of the bd CLI."""
+        daemon = FakeDaemon(error=BdDaemonError("unknown operation"))
+        completed = subprocess.CompletedProcess(
+            args=[], returncode=0, stdout="[]", stderr="",
+        )
+        with patch(
+            "bd_agent_chameleon.beads_task_manager.subprocess.run",
+            return_value=completed,
+        ) as mock_run:
+            mgr = BeadsTaskManager(db_path=DB_PATH, daemon=daemon)  # type: ignore[arg-type]
+            assert mgr.poll("role-qa") == []
+
+        assert daemon.closed
+        assert mock_run.call_count == 1
+
+    @pytest.mark.parametrize(
+        "entry",
+        [
+            {"id": "d-1", "title": "T", "status": "closed"},
+            {"id": "d-1", "title": "T", "status": "open", "labels": ["role-dev"]},
+        ],
+    )
+    def test_falls_back_when_daemon_ignores_filters(
+        self, entry: dict[str, Any],
+    ) -> None:
+        """A poll answer with tasks outside the filter is not trusted."""
+        daemon = FakeDaemon(response=[entry])
+        completed = subprocess.CompletedProcess(
+            args=[], returncode=0, stdout="[]", stderr="",
+        )
+        with patch(
+            "bd_agent_chameleon.beads_task_manager.subprocess.run",
+            return_value=completed,
+        ):
+            mgr = BeadsTaskManager(db_path=DB_PATH, daemon=daemon)  # type: ignore[arg-type]
+            assert mgr.poll_any(["role-qa", "role-ops"]) == []
+
+        assert daemon.closed
+
+    def test_keeps_daemon_that_counts_in_progress_work_as_ready(self) -> None:
+        """In-progress entries in a ready answer are skipped, not distrusted."""
+        daemon = FakeDaemon(response=[
+            {"id": "d-1", "title": "T", "status": "in_progress"},
+            {"id": "d-2", "title": "T", "status": "open"},
+        ])
+        mgr = BeadsTaskManager(db_path=DB_PATH, daemon=daemon)  # type: ignore[arg-type]
+
+        assert [t.id for t in mgr.poll("role-qa")] == ["d-2"]
+        assert not daemon.closed
+
+    def test_falls_back_to_subprocess_on_transport_error(self) -> None:
+        """A broken daemon connection is dropped in favour of the bd CLI."""
+        daemon = FakeDaemon(error=ConnectionError("gone"))
+        completed = subprocess.CompletedProcess(
+            args=[], returncode=0, stdout="[]", stderr="",
+        )
+        with patch(
+            "bd_agent_chameleon.beads_task_manager.subprocess.run",
+            return_value=completed,
+        ) as mock_run:
+            mgr = BeadsTaskManager(db_path=DB_PATH, daemon=daemon)  # type: ignore[arg-type]
+            mgr.poll("role-qa")
+            mgr.poll("role-qa")
+
+        assert daemon.closed
+        assert len(daemon.requests) == 1
+        assert mock_run.call_count == 2
+
+
+class FakeReader:
+    """Stands in for SqliteTaskReader, answering or failing every poll."""
+
+    def __init__(
+        self, tasks: list[Task] | None = None, error: Exception | None = None,
+    ) -> None:
+        """Store the canned tasks or error."""
+        self._tasks: list[Task] = tasks or []
+        self._error: Exception | None = error
+        self.closed: bool = False
+
+    def poll_any(self, labels: list[str]) -> list[Task]:
+        """Return the canned tasks or raise the canned error."""
+        if self._error is not None:
+            raise self._error
+        return self._tasks
+
+    def description(self, task_id: str) -> str | None:
+        """Return a description derived from the id, or raise the canned error."""
+        if self._error is not None:
+            raise self._error
+        return f"direct body of {task_id}"
+
+    def close(self) -> None:
+        """Record that the reader was closed."""
+        self.closed = True
+
+
+class TestSqliteReaderBackend:
+    """Tests for serving poll from a direct SQLite reader."""
+
+    def test_poll_uses_reader_without_subprocess(self) -> None:
+        """Poll is served by the reader; bd is not invoked."""
+        task = Task(id="r-1", title="T", description="", status=TaskStatus.OPEN)
+        with patch(
+            "bd_agent_chameleon.beads_task_manager.subprocess.run",
+        ) as mock_run:
+            mgr = BeadsTaskManager(DB_PATH, reader=FakeReader([task]))  # type: ignore[arg-type]
+            tasks: list[Task] = mgr.poll("role-qa")
+
+        mock_run.assert_not_called()
+        assert tasks == [task]
+
+    def test_claim_still_uses_bd(self) -> None:
+        """Claims go through the bd CLI even when a reader is configured."""
+        completed = subprocess.CompletedProcess(
+            args=[], returncode=0, stdout="[]", stderr="",
+        )
+        with patch(
+            "bd_agent_chameleon.beads_task_manager.subprocess.run",
+            return_value=completed,
+        ) as mock_run:
+            mgr = BeadsTaskManager(DB_PATH, reader=FakeReader())  # type: ignore[arg-type]
+            mgr.claim("r-1")
+
+        assert "--claim" in mock_run.call_args[0][0]
+
+    def test_falls_back_to_bd_ready_on_sqlite_error(self) -> None:
+        """A failing reader is dropped and bd ready serves the poll."""
+        reader = FakeReader(error=sqlite3.OperationalError("no such table"))
+        completed = subprocess.CompletedProcess(
+            args=[], returncode=0, stdout="[]", stderr="",
+        )
+        with patch(
+            "bd_agent_chameleon.beads_task_manager.subprocess.run",
+            return_value=completed,
+        ) as mock_run:
+            mgr = BeadsTaskManager(DB_PATH, reader=reader)  # type: ignore[arg-type]
+            assert mgr.poll("role-qa") == []
+
+        assert reader.closed
+        assert "ready" in mock_run.call_args[0][0]
+
+
+class RecordingTracer:
+    """Records span names, with the names of spans still open around them."""
+
+    def __init__(self) -> None:
+        """Initialize the span log."""
+        self.spans: list[tuple[str, dict[str, object]]] = []
+
+    @contextmanager
+    def span(self, name: str, **attributes: object) -> Iterator[None]:
+        """Record the span when it ends."""
+        yield
+        self.spans.append((name, attributes))
+
+
+class TestTracing:
+    """Tests for per-phase spans."""
+
+    def test_bd_poll_traces_exec_decode_and_parse(self) -> None:
+        """A bd poll emits spans for the process, JSON decode, and parsing."""
+        raw_json: str = json.dumps([{"id": "a", "title": "A", "status": "open"}])
+        completed = subprocess.CompletedProcess(
+            args=[], returncode=0, stdout=raw_json, stderr="",
+        )
+        tracer: RecordingTracer = RecordingTracer()
+        with patch(
+            "bd_agent_chameleon.beads_task_manager.subprocess.run",
+            return_value=completed,
+        ):
+            BeadsTaskManager(DB_PATH, tracer=tracer).poll("role-a")
+
+        assert tracer.spans == [
+            ("bd.exec", {"command": "ready"}),
+            ("bd.decode", {"command": "ready", "size": len(raw_json)}),
+            ("parse_tasks", {"count": 1}),
+        ]
+
+
+class DeltaReader:
+    """Stands in for SqliteTaskReader's snapshot and changed-since reads."""
+
+    def __init__(self, tasks: list[Task]) -> None:
+        """Store the open tasks for snapshots."""
+        self.tasks: list[Task] = tasks
+        self.changed: list[Task] = []
+        self.snapshots: int = 0
+        self.since: list[str] = []
+
+    def snapshot(self, labels: list[str]) -> tuple[list[Task], str]:
+        """Return every stored task and a cursor counting snapshots."""
+        self.snapshots += 1
+        return list(self.tasks), f"s{self.snapshots}"
+
+    def changes(self, labels: list[str], since: str) -> tuple[list[Task], str]:
+        """Return and clear the pending changes."""
+        self.since.append(since)
+        changed, self.changed = self.changed, []
+        return changed, f"{since}+"
+
+
+def _open(task_id: str, priority: int = DEFAULT_PRIORITY) -> Task:
+    """Build an open task summary."""
+    return Task(
+        id=task_id, title=task_id, description="", status=TaskStatus.OPEN,
+        priority=priority, summary=True,
+    )
+
+
+class TestDeltaPolling:
+    """Tests for serving polls from a view kept current by change cursor."""
+
+    def _manager(
+        self, reader: DeltaReader, clock: list[float], **kwargs: Any,
+    ) -> BeadsTaskManager:
+        """Build a manager with a 60 second resync and a settable clock."""
+        return BeadsTaskManager(
+            DB_PATH,
+            reader=reader,  # type: ignore[arg-type]
+            resync_interval=timedelta(seconds=60),
+            clock=lambda: clock[0],
+            **kwargs,
+        )
+
+    def test_polls_apply_changes_to_the_view(self) -> None:
+        """New open tasks are added and tasks that left open are removed."""
+        reader: DeltaReader = DeltaReader([_open("a"), _open("b")])
+        clock: list[float] = [0.0]
+        mgr: BeadsTaskManager = self._manager(reader, clock)
+        assert sorted(t.id for t in mgr.poll("q")) == ["a", "b"]
+
+        reader.changed = [
+            replace(_open("a"), status=TaskStatus.IN_PROGRESS), _open("c"),
+        ]
+        tasks: list[Task] = mgr.poll("q")
+
+        assert sorted(t.id for t in tasks) == ["b", "c"]
+        assert reader.snapshots == 1
+        assert reader.since == ["s1"]
+
+    def test_view_is_resynced_after_the_interval(self) -> None:
+        """Once the view is older than the interval it is rebuilt in full."""
+        reader: DeltaReader = DeltaReader([_open("a")])
+        clock: list[float] = [0.0]
+        mgr: BeadsTaskManager = self._manager(reader, clock)
+        mgr.poll("q")
+        reader.tasks = [_open("z")]
+        clock[0] = 61.0
+
+        assert [t.id for t in mgr.poll("q")] == ["z"]
+        assert reader.snapshots == 2
+
+    def test_lost_claim_drops_the_task_from_the_view(self) -> None:
+        """A task another worker claimed is not offered again."""
+        reader: DeltaReader = DeltaReader([_open("a"), _open("b")])
+        clock: list[float] = [0.0]
+        mgr: BeadsTaskManager = self._manager(reader, clock)
+        mgr.poll("q")
+        refused = subprocess.CalledProcessError(
+            1, ["bd"], stderr="Error: issue a is already claimed",
+        )
+        with (
+            patch(
+                "bd_agent_chameleon.beads_task_manager.subprocess.run",
+                side_effect=refused,
+            ),
+            pytest.raises(ClaimConflictError),
+        ):
+            mgr.claim("a")
+
+        assert [t.id for t in mgr.poll("q")] == ["b"]
+
+    def test_limit_returns_the_most_urgent(self) -> None:
+        """With a poll limit, the view returns its most urgent tasks."""
+        reader: DeltaReader = DeltaReader(
+            [_open("low", priority=3), _open("high", priority=0), _open("mid", 1)],
+        )
+        mgr: BeadsTaskManager = self._manager(reader, [0.0], poll_limit=2)
+
+        assert [t.id for t in mgr.poll("q")] == ["high", "mid"]
+
+    def test_limit_skips_blocked_tasks(self) -> None:
+        """Blocked tasks are dropped before ranking, so they take no places."""
+        reader: DeltaReader = DeltaReader(
+            [
+                replace(_open("blocked-1", priority=0), ready=False),
+                replace(_open("blocked-2", priority=0), ready=False),
+                _open("ready", priority=1),
+            ],
+        )
+        mgr: BeadsTaskManager = self._manager(reader, [0.0], poll_limit=2)
+
+        assert [t.id for t in mgr.poll("q")] == ["ready"]
+
+
+@pytest.fixture()
+def fake_bd_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Put the fake bd on PATH and fill its database with a blocked chain."""
+    monkeypatch.setenv("PATH", f"{FAKES_DIR}:{os.environ['PATH']}")
+    subprocess.run(["bd", "init", "--db", str(tmp_path)], check=True)
+    with sqlite3.connect(tmp_path / "beads.db") as conn:
+        conn.executemany(
+            "INSERT INTO issues VALUES (?, ?, '', ?, 2, 't0', 't0', NULL)",
+            [
+                ("a", "Blocker", "open"),
+                ("b", "Blocked", "open"),
+                ("c", "Was blocked", "open"),
+                ("d", "Done", "closed"),
+            ],
+        )
+        conn.executemany(
+            "INSERT INTO labels VALUES (?, 'role-qa')", [("a",), ("b",), ("c",)],
+        )
+        conn.executemany(
+            "INSERT INTO dependencies VALUES (?, ?, 'blocks')",
+            [("b", "a"), ("c", "d")],
+        )
+    return tmp_path
+
+
+class TestAgainstFakeBd:
+    """End-to-end checks against the SQLite-backed fake bd."""
+
+    def test_blocked_tasks_are_not_claimable_on_either_path(
+        self, fake_bd_dir: Path,
+    ) -> None:
+        """The bd and direct SQLite paths offer the same unblocked tasks."""
+        via_bd: list[Task] = BeadsTaskManager(fake_bd_dir).poll("role-qa")
+        direct: list[Task] = SqliteTaskReader(fake_bd_dir).poll("role-qa")
+
+        assert sorted(t.id for t in via_bd if t.ready) == ["a", "c"]
+        assert sorted(t.id for t in direct if t.ready) == ["a", "c"]
+
+    def test_released_task_can_be_claimed_by_another_worker(
+        self, fake_bd_dir: Path, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Release clears the assignee that the claim set."""
+        mgr: BeadsTaskManager = BeadsTaskManager(fake_bd_dir)
+        monkeypatch.setenv("BD_ACTOR", "first")
+        mgr.claim("a")
+        with pytest.raises(ClaimConflictError):
+            mgr.claim("a")
+        mgr.release("a")
+
+        monkeypatch.setenv("BD_ACTOR", "second")
+        mgr.claim("a")
+        shown: Any = json.loads(subprocess.run(
+            ["bd", "show", "a", "--json", "--db", str(fake_bd_dir)],
+            capture_output=True, check=True, text=True,
+        ).stdout)
+        assert (shown[0]["status"], shown[0]["assignee"]) == ("in_progress", "second")
+
+    def test_sqlite_poll_limit_skips_blocked_tasks(self, fake_bd_dir: Path) -> None:
+        """Blocked tasks above the poll limit do not hide a ready one."""
+        with sqlite3.connect(fake_bd_dir / "beads.db") as conn:
+            conn.executescript(
+                """
+                INSERT INTO issues VALUES
+                    ('e', 'Unlabelled blocker', '', 'open', 2, 't0', 't0', NULL);
+                INSERT INTO dependencies VALUES ('a', 'e', 'blocks');
+                UPDATE issues SET priority = 0 WHERE id IN ('a', 'b');
+                UPDATE issues SET priority = 1 WHERE id = 'c';
+                """
+            )
+        mgr: BeadsTaskManager = BeadsTaskManager(
+            fake_bd_dir, reader=SqliteTaskReader(fake_bd_dir, 2), poll_limit=2,
+        )
+
+        assert [t.id for t in mgr.poll("role-qa") if t.ready] == ["c"]
+
+    def test_parked_task_is_no_longer_offered(
+        self, fake_bd_dir: Path, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """A parked task drops out of the poll until someone reopens it."""
+        mgr: BeadsTaskManager = BeadsTaskManager(fake_bd_dir)
+        monkeypatch.setenv("BD_ACTOR", "worker")
+        mgr.claim("a")
+        mgr.park("a")
+
+        assert "a" not in {t.id for t in mgr.poll("role-qa")}
+        with pytest.raises(ClaimConflictError):
+            mgr.claim("a")
+
+    def test_counts_in_progress_tasks(
+        self, fake_bd_dir: Path, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Claimed tasks carrying the label are counted as in progress."""
+        monkeypatch.setenv("BD_ACTOR", "worker")
+        mgr: BeadsTaskManager = BeadsTaskManager(fake_bd_dir)
+        assert mgr.count_in_progress("role-qa") == 0
+        mgr.claim("a")
+        mgr.claim("c")
+
+        assert mgr.count_in_progress("role-qa") == 2
+        assert mgr.count_in_progress("role-dev") == 0
+
+    def test_counts_are_not_capped_by_bd_defaults(self, fake_bd_dir: Path) -> None:
+        """More ready and in-progress tasks than bd shows by default are seen."""
+        with sqlite3.connect(fake_bd_dir / "beads.db") as conn:
+            conn.executemany(
+                "INSERT INTO issues VALUES (?, 'T', '', ?, 2, 't0', 't0', NULL)",
+                [(f"n-{i}", "open") for i in range(15)]
+                + [(f"p-{i}", "in_progress") for i in range(55)],
+            )
+            conn.executemany(
+                "INSERT INTO labels VALUES (?, 'role-dev')",
+                [(f"n-{i}",) for i in range(15)] + [(f"p-{i}",) for i in range(55)],
+            )
+        mgr: BeadsTaskManager = BeadsTaskManager(fake_bd_dir)
+
+        assert len(mgr.poll("role-dev")) == 15
+        assert mgr.count_in_progress("role-dev") == 55
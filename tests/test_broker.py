@@ -0,0 +1,241 @@
+"""Tests for the host-local TaskBroker and BrokerTaskManager."""
+
+import shutil
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import replace
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+
+from bd_agent_chameleon.broker import BrokerTaskManager, TaskBroker
+from bd_agent_chameleon.models import Task, TaskStatus
+from bd_agent_chameleon.protocols import ClaimConflictError
+
+
+def _task(task_id: str, *labels: str) -> Task:
+    """Build an open task with the given labels."""
+    return Task(
+        id=task_id,
+        title=f"T{task_id}",
+        description="",
+        status=TaskStatus.OPEN,
+        labels=labels,
+    )
+
+
+class FakeTaskManager:
+    """In-memory task store that counts polls and records writes."""
+
+    def __init__(self, tasks: list[Task]) -> None:
+        """Store the open tasks."""
+        self.tasks: list[Task] = list(tasks)
+        self.polls: int = 0
+        self.claimed: list[str] = []
+        self.completed: list[str] = []
+        self.released: list[str] = []
+        self.parked: list[str] = []
+
+    def poll(self, label: str) -> list[Task]:
+        """Return open tasks carrying the label."""
+        return self.poll_any([label])
+
+    def poll_any(self, labels: list[str]) -> list[Task]:
+        """Return open tasks carrying any of the labels."""
+        self.polls += 1
+        return [t for t in self.tasks if set(t.labels) & set(labels)]
+
+    def claim(self, task_id: str) -> None:
+        """Record the claim and stop offering the task."""
+        self.claimed.append(task_id)
+        self.tasks = [t for t in self.tasks if t.id != task_id]
+
+    def describe(self, task: Task) -> Task:
+        """Return the task with a full description."""
+        return replace(task, description=f"body of {task.id}", summary=False)
+
+    def complete(self, task_id: str) -> None:
+        """Record the completion."""
+        self.completed.append(task_id)
+
+    def release(self, task_id: str) -> None:
+        """Record the release."""
+        self.released.append(task_id)
+
+    def park(self, task_id: str) -> None:
+        """Record the park."""
+        self.parked.append(task_id)
+
+
+@pytest.fixture
+def socket_dir() -> Iterator[Path]:
+    """Yield a short temporary directory suitable for Unix socket paths."""
+    path: Path = Path(tempfile.mkdtemp(prefix="brk"))
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+@pytest.fixture
+def store() -> FakeTaskManager:
+    """Return a store with tasks for two roles."""
+    return FakeTaskManager([
+        _task("q1", "role-qa"),
+        _task("q2", "role-qa"),
+        _task("d1", "role-dev"),
+    ])
+
+
+@pytest.fixture
+def broker_socket(socket_dir: Path, store: FakeTaskManager) -> Iterator[Path]:
+    """Run a broker over the store and yield its socket path."""
+    socket_path: Path = socket_dir / "b.sock"
+    broker: TaskBroker = TaskBroker(store, socket_path, timedelta(seconds=0.05))
+    thread: threading.Thread = threading.Thread(target=broker.serve_forever)
+    thread.start()
+    deadline: float = time.monotonic() + 5
+    while not socket_path.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    yield socket_path
+    broker.shutdown()
+    thread.join(timeout=5)
+
+
+class TestOffers:
+    """Tests for offers pushed by the broker."""
+
+    def test_poll_returns_offered_tasks_for_label(self, broker_socket: Path) -> None:
+        """A client sees the open tasks for the label it polls."""
+        client: BrokerTaskManager = BrokerTaskManager(broker_socket, timeout=5)
+        try:
+            assert sorted(t.id for t in client.poll("role-qa")) == ["q1", "q2"]
+        finally:
+            client.close()
+
+    def test_poll_any_covers_several_labels(self, broker_socket: Path) -> None:
+        """A multi-label client gets offers for all of its labels."""
+        client: BrokerTaskManager = BrokerTaskManager(broker_socket, timeout=5)
+        try:
+            tasks: list[Task] = client.poll_any(["role-qa", "role-dev"])
+            assert sorted(t.id for t in tasks) == ["d1", "q1", "q2"]
+            assert [t.id for t in client.poll("role-dev")] == ["d1"]
+        finally:
+            client.close()
+
+    def test_one_store_poll_serves_every_client(
+        self, broker_socket: Path, store: FakeTaskManager,
+    ) -> None:
+        """Client polls are answered from offers, not from the store."""
+        clients: list[BrokerTaskManager] = [
+            BrokerTaskManager(broker_socket, timeout=5) for _ in range(3)
+        ]
+        try:
+            for client in clients:
+                client.poll("role-qa")
+            polls_before: int = store.polls
+            for _ in range(20):
+                for client in clients:
+                    client.poll("role-qa")
+
+            assert store.polls - polls_before < 20
+        finally:
+            for client in clients:
+                client.close()
+
+    def test_wait_wakes_on_changed_offer(
+        self, broker_socket: Path, store: FakeTaskManager,
+    ) -> None:
+        """wait() returns True once the broker pushes different tasks."""
+        client: BrokerTaskManager = BrokerTaskManager(broker_socket, timeout=5)
+        try:
+            client.poll("role-dev")
+            assert client.wait(0.2) is False
+            store.tasks.append(_task("d2", "role-dev"))
+
+            assert client.wait(5.0) is True
+            assert sorted(t.id for t in client.poll("role-dev")) == ["d1", "d2"]
+        finally:
+            client.close()
+
+
+class TestDescribe:
+    """Tests for fetching full descriptions through the broker."""
+
+    def test_summary_is_described_by_the_broker(self, broker_socket: Path) -> None:
+        """A summary's description is fetched by the broker's task manager."""
+        client: BrokerTaskManager = BrokerTaskManager(broker_socket, timeout=5)
+        try:
+            summary: Task = replace(_task("q1", "role-qa"), summary=True)
+            task: Task = client.describe(summary)
+            assert (task.id, task.description, task.summary) == (
+                "q1", "body of q1", False,
+            )
+        finally:
+            client.close()
+
+
+class TestClaims:
+    """Tests for claim arbitration."""
+
+    def test_second_local_claim_conflicts(
+        self, broker_socket: Path, store: FakeTaskManager,
+    ) -> None:
+        """Two clients racing for one task: one wins, the other gets a conflict."""
+        first: BrokerTaskManager = BrokerTaskManager(broker_socket, timeout=5)
+        second: BrokerTaskManager = BrokerTaskManager(broker_socket, timeout=5)
+        try:
+            first.poll("role-qa")
+            second.poll("role-qa")
+            first.claim("q1")
+            with pytest.raises(ClaimConflictError):
+                second.claim("q1")
+
+            assert store.claimed == ["q1"]
+            assert "q1" not in {t.id for t in second.poll("role-qa")}
+        finally:
+            first.close()
+            second.close()
+
+    def test_complete_is_forwarded(
+        self, broker_socket: Path, store: FakeTaskManager,
+    ) -> None:
+        """Completing through the broker reaches the backing store."""
+        client: BrokerTaskManager = BrokerTaskManager(broker_socket, timeout=5)
+        try:
+            client.poll("role-dev")
+            client.claim("d1")
+            client.complete("d1")
+
+            assert store.completed == ["d1"]
+        finally:
+            client.close()
+
+    def test_release_is_forwarded(
+        self, broker_socket: Path, store: FakeTaskManager,
+    ) -> None:
+        """Releasing through the broker reaches the backing store."""
+        client: BrokerTaskManager = BrokerTaskManager(broker_socket, timeout=5)
+        try:
+            client.poll("role-dev")
+            client.claim("d1")
+            client.release("d1")
+
+            assert store.released == ["d1"]
+        finally:
+            client.close()
+
+    def test_park_is_forwarded(
+        self, broker_socket: Path, store: FakeTaskManager,
+    ) -> None:
+        """Parking through the broker reaches the backing store."""
+        client: BrokerTaskManager = BrokerTaskManager(broker_socket, timeout=5)
+        try:
+            client.poll("role-dev")
+            client.claim("d1")
+            client.park("d1")
+
+            assert store.parked == ["d1"]
+        finally:
+            client.close()
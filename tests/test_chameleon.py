@@ -1,21 +1,36 @@
 """Tests for Chameleon orchestrator."""
 
+import json
+import os
+import threading
+import time
+from dataclasses import replace
 from datetime import timedelta
+from pathlib import Path
+
+import pytest
 
 from bd_agent_chameleon.chameleon import Chameleon, ChameleonState
-from bd_agent_chameleon.models import Role, Task, TaskStatus
+from bd_agent_chameleon.config_manager import ConfigManager
+from bd_agent_chameleon.leases import LeaseKeeper, LeaseStore
+from bd_agent_chameleon.metrics import ChameleonMetrics, MeteredTaskManager
+from bd_agent_chameleon.models import Role, SessionOutcome, Task, TaskStatus
+from bd_agent_chameleon.poll_scheduler import PollBackoff, RetryTracker
+from bd_agent_chameleon.protocols import ClaimConflictError, SessionFailedError
+from bd_agent_chameleon.tracing import JsonLinesTracer
 
 
 class FakeConfigManager:
-    """Returns a fixed role."""
+    """Returns a fixed role, or roles by name."""
 
-    def __init__(self, role: Role) -> None:
-        """Store the role to return."""
+    def __init__(self, role: Role, *others: Role) -> None:
+        """Store the roles to return."""
         self._role: Role = role
+        self._roles: dict[str, Role] = {r.name: r for r in (role, *others)}
 
     def load_role(self, name: str) -> Role:
-        """Return the stored role."""
-        return self._role
+        """Return the named role, or the first one for unknown names."""
+        return self._roles.get(name, self._role)
 
 
 class FakeTaskManager:
@@ -26,9 +41,20 @@ class FakeTaskManager:
         self._poll_results: list[list[Task]] = list(poll_results)
         self.claimed: list[str] = []
         self.completed: list[str] = []
+        self.released: list[str] = []
+        self.parked: list[str] = []
+        self.polled: list[list[str]] = []
 
     def poll(self, label: str) -> list[Task]:
         """Return the next canned result, or empty if exhausted."""
+        self.polled.append([label])
+        if self._poll_results:
+            return self._poll_results.pop(0)
+        return []
+
+    def poll_any(self, labels: list[str]) -> list[Task]:
+        """Return the next canned result for a combined poll."""
+        self.polled.append(list(labels))
         if self._poll_results:
             return self._poll_results.pop(0)
         return []
@@ -37,10 +63,22 @@ class FakeTaskManager:
         """Record the claim."""
         self.claimed.append(task_id)
 
+    def describe(self, task: Task) -> Task:
+        """Return the task unchanged."""
+        return task
+
     def complete(self, task_id: str) -> None:
         """Record the completion."""
         self.completed.append(task_id)
 
+    def release(self, task_id: str) -> None:
+        """Record the release."""
+        self.released.append(task_id)
+
+    def park(self, task_id: str) -> None:
+        """Record the park."""
+        self.parked.append(task_id)
+
 
 class FakeLauncher:
     """Records launch calls."""
@@ -106,9 +144,9 @@ class TestPolling:
         )
         original_execute = chameleon._execute
 
-        def execute_then_stop(role: Role) -> None:
+        def execute_then_stop() -> None:
             """Execute once then shut down."""
-            original_execute(role)
+            original_execute()
             chameleon.shutdown()
 
         chameleon._execute = execute_then_stop  # type: ignore[assignment]
@@ -128,10 +166,10 @@ class TestPolling:
         poll_count: int = 0
         original_poll = chameleon._poll
 
-        def poll_then_stop(role: Role) -> None:
+        def poll_then_stop() -> None:
             """Poll twice then shut down."""
             nonlocal poll_count
-            original_poll(role)
+            original_poll()
             poll_count += 1
             if poll_count >= 2:
                 chameleon.shutdown()
@@ -158,9 +196,9 @@ class TestExecution:
         )
         original_execute = chameleon._execute
 
-        def execute_then_stop(role: Role) -> None:
+        def execute_then_stop() -> None:
             """Execute once then shut down."""
-            original_execute(role)
+            original_execute()
             chameleon.shutdown()
 
         chameleon._execute = execute_then_stop  # type: ignore[assignment]
@@ -185,9 +223,9 @@ class TestExecution:
         states_after_execute: list[ChameleonState] = []
         original_execute = chameleon._execute
 
-        def execute_and_record(role: Role) -> None:
+        def execute_and_record() -> None:
             """Execute, record state, then shut down."""
-            original_execute(role)
+            original_execute()
             states_after_execute.append(chameleon._state)
             chameleon.shutdown()
 
@@ -196,6 +234,114 @@ class TestExecution:
 
         assert states_after_execute == [ChameleonState.POLLING]
 
+    def test_failed_session_releases_task_and_keeps_running(self) -> None:
+        """A timed-out session's task is released, and the next task still runs."""
+
+        class TimingOutLauncher(FakeLauncher):
+            """Times out on task 0."""
+
+            def launch(self, role: Role, task: Task) -> None:
+                """Record the launch and fail task 0's session."""
+                super().launch(role, task)
+                if task.id == "0":
+                    raise SessionFailedError(task.id, SessionOutcome.TIMED_OUT)
+
+        tasks: list[Task] = _make_tasks(2)
+        task_mgr: FakeTaskManager = FakeTaskManager([tasks[:1], tasks[1:]])
+        launcher: TimingOutLauncher = TimingOutLauncher()
+        chameleon: Chameleon = Chameleon(
+            FakeConfigManager(ROLE),
+            task_mgr,
+            launcher,
+            "reviewer",
+            timedelta(seconds=0),
+        )
+        original_execute = chameleon._execute
+
+        def execute_twice() -> None:
+            """Execute, then shut down after the second session."""
+            original_execute()
+            if len(launcher.launches) == 2:
+                chameleon.shutdown()
+
+        chameleon._execute = execute_twice  # type: ignore[assignment]
+        chameleon.run()
+
+        assert task_mgr.released == ["0"]
+        assert task_mgr.completed == ["1"]
+
+    def test_task_that_keeps_failing_is_parked(self) -> None:
+        """After max_attempts failed sessions a task is parked, not released."""
+
+        class FailingLauncher(FakeLauncher):
+            """Fails every session."""
+
+            def launch(self, role: Role, task: Task) -> None:
+                """Record the launch and fail it."""
+                super().launch(role, task)
+                raise SessionFailedError(task.id, SessionOutcome.FAILED)
+
+        task_mgr: FakeTaskManager = FakeTaskManager([[TASK]] * 3)
+        launcher: FailingLauncher = FailingLauncher()
+        chameleon: Chameleon = Chameleon(
+            FakeConfigManager(ROLE),
+            task_mgr,
+            launcher,
+            "reviewer",
+            timedelta(seconds=0),
+            retries=RetryTracker(2, timedelta(0)),
+        )
+        original_poll = chameleon._poll
+
+        def poll_three_times() -> None:
+            """Poll, then shut down once every canned result was served."""
+            original_poll()
+            if len(task_mgr.polled) == 3:
+                chameleon.shutdown()
+
+        chameleon._poll = poll_three_times  # type: ignore[method-assign]
+        chameleon.run()
+
+        assert task_mgr.released == ["42"]
+        assert task_mgr.parked == ["42"]
+        assert len(launcher.launches) == 2
+
+    def test_failed_task_is_skipped_during_its_retry_delay(self) -> None:
+        """A task whose session just failed is not claimed again right away."""
+
+        class FailingLauncher(FakeLauncher):
+            """Fails every session."""
+
+            def launch(self, role: Role, task: Task) -> None:
+                """Record the launch and fail it."""
+                super().launch(role, task)
+                raise SessionFailedError(task.id, SessionOutcome.TIMED_OUT)
+
+        task_mgr: FakeTaskManager = FakeTaskManager([[TASK]] * 2)
+        launcher: FailingLauncher = FailingLauncher()
+        chameleon: Chameleon = Chameleon(
+            FakeConfigManager(ROLE),
+            task_mgr,
+            launcher,
+            "reviewer",
+            timedelta(seconds=0),
+            retries=RetryTracker(3, timedelta(hours=1)),
+        )
+        original_poll = chameleon._poll
+
+        def poll_twice() -> None:
+            """Poll, then shut down after the second poll."""
+            original_poll()
+            if len(task_mgr.polled) == 2:
+                chameleon.shutdown()
+
+        chameleon._poll = poll_twice  # type: ignore[method-assign]
+        chameleon.run()
+
+        assert task_mgr.claimed == ["42"]
+        assert task_mgr.released == ["42"]
+        assert task_mgr.parked == []
+
 
 class TestMultipleCycles:
     """Tests for Chameleon processing multiple tasks."""
@@ -226,10 +372,10 @@ class TestMultipleCycles:
         execute_count: int = 0
         original_execute = chameleon._execute
 
-        def count_and_stop(role: Role) -> None:
+        def count_and_stop() -> None:
             """Count executions and shut down after two."""
             nonlocal execute_count
-            original_execute(role)
+            original_execute()
             execute_count += 1
             if execute_count >= 2:
                 chameleon.shutdown()
@@ -256,12 +402,986 @@ class TestShutdown:
         )
         original_poll = chameleon._poll
 
-        def poll_then_stop(role: Role) -> None:
+        def poll_then_stop() -> None:
             """Poll once then shut down."""
-            original_poll(role)
+            original_poll()
             chameleon.shutdown()
 
         chameleon._poll = poll_then_stop  # type: ignore[assignment]
         chameleon.run()
 
         assert chameleon._state == ChameleonState.SHUTDOWN
+
+
+class BlockingLauncher:
+    """Blocks each launch until released, recording peak concurrency."""
+
+    def __init__(self) -> None:
+        """Initialize the release gate and counters."""
+        self.release: threading.Event = threading.Event()
+        self.started: threading.Semaphore = threading.Semaphore(0)
+        self._lock: threading.Lock = threading.Lock()
+        self._active: int = 0
+        self.peak: int = 0
+        self.finished: list[str] = []
+
+    def launch(self, role: Role, task: Task) -> None:
+        """Record the session start, wait for release, then record the finish."""
+        with self._lock:
+            self._active += 1
+            self.peak = max(self.peak, self._active)
+        self.started.release()
+        self.release.wait(timeout=5)
+        with self._lock:
+            self._active -= 1
+            self.finished.append(task.id)
+
+
+def _make_tasks(count: int) -> list[Task]:
+    """Build a list of open tasks with sequential ids."""
+    return [
+        Task(id=str(i), title=f"T{i}", description="", status=TaskStatus.OPEN)
+        for i in range(count)
+    ]
+
+
+class TestConcurrency:
+    """Tests for running several sessions at once."""
+
+    def test_rejects_non_positive_concurrency(self) -> None:
+        """A concurrency below one is rejected at construction."""
+        with pytest.raises(ValueError, match="concurrency"):
+            Chameleon(
+                FakeConfigManager(ROLE),
+                FakeTaskManager([]),
+                FakeLauncher(),
+                "reviewer",
+                timedelta(seconds=0),
+                concurrency=0,
+            )
+
+    def test_fills_all_slots(self) -> None:
+        """Up to N sessions run at once when enough tasks are queued."""
+        tasks: list[Task] = _make_tasks(3)
+        task_mgr: FakeTaskManager = FakeTaskManager([tasks[0:], tasks[1:], tasks[2:]])
+        launcher: BlockingLauncher = BlockingLauncher()
+        chameleon: Chameleon = Chameleon(
+            FakeConfigManager(ROLE),
+            task_mgr,
+            launcher,
+            "reviewer",
+            timedelta(seconds=0),
+            concurrency=3,
+        )
+        runner: threading.Thread = threading.Thread(target=chameleon.run)
+        runner.start()
+        for _ in range(3):
+            assert launcher.started.acquire(timeout=5)
+        chameleon.shutdown()
+        launcher.release.set()
+        runner.join(timeout=5)
+
+        assert launcher.peak == 3
+        assert task_mgr.claimed == ["0", "1", "2"]
+        assert sorted(task_mgr.completed) == ["0", "1", "2"]
+
+    def test_skips_tasks_already_in_flight(self) -> None:
+        """A task still running in this process is not claimed a second time."""
+        task_a, task_b = _make_tasks(2)
+        task_mgr: FakeTaskManager = FakeTaskManager([[task_a], [task_a, task_b]])
+        launcher: BlockingLauncher = BlockingLauncher()
+        chameleon: Chameleon = Chameleon(
+            FakeConfigManager(ROLE),
+            task_mgr,
+            launcher,
+            "reviewer",
+            timedelta(seconds=0),
+            concurrency=2,
+        )
+        runner: threading.Thread = threading.Thread(target=chameleon.run)
+        runner.start()
+        for _ in range(2):
+            assert launcher.started.acquire(timeout=5)
+        chameleon.shutdown()
+        launcher.release.set()
+        runner.join(timeout=5)
+
+        assert task_mgr.claimed == ["0", "1"]
+
+    def test_shutdown_drains_in_flight_sessions(self) -> None:
+        """run() returns only after in-flight sessions have completed."""
+        task_mgr: FakeTaskManager = FakeTaskManager([_make_tasks(2)])
+        launcher: BlockingLauncher = BlockingLauncher()
+        chameleon: Chameleon = Chameleon(
+            FakeConfigManager(ROLE),
+            task_mgr,
+            launcher,
+            "reviewer",
+            timedelta(seconds=0),
+            concurrency=2,
+        )
+        runner: threading.Thread = threading.Thread(target=chameleon.run)
+        runner.start()
+        assert launcher.started.acquire(timeout=5)
+        chameleon.shutdown()
+        assert runner.is_alive()
+        launcher.release.set()
+        runner.join(timeout=5)
+
+        assert not runner.is_alive()
+        assert task_mgr.completed == ["0"]
+
+    def test_session_error_propagates(self) -> None:
+        """An exception raised inside a pooled session surfaces from run()."""
+
+        class FailingLauncher:
+            """Raises on every launch."""
+
+            def launch(self, role: Role, task: Task) -> None:
+                """Fail the session."""
+                raise RuntimeError("boom")
+
+        chameleon: Chameleon = Chameleon(
+            FakeConfigManager(ROLE),
+            FakeTaskManager([[TASK]]),
+            FailingLauncher(),
+            "reviewer",
+            timedelta(seconds=0),
+            concurrency=2,
+        )
+        original_poll = chameleon._poll
+
+        def poll_until_reaped() -> None:
+            """Keep polling; the reaper raises once the session fails."""
+            original_poll()
+            time.sleep(0.01)
+
+        chameleon._poll = poll_until_reaped  # type: ignore[assignment]
+        with pytest.raises(RuntimeError, match="boom"):
+            chameleon.run()
+
+
+class FakeWatcher:
+    """Records wait calls instead of blocking."""
+
+    def __init__(self) -> None:
+        """Initialize the call log."""
+        self.timeouts: list[float] = []
+
+    def wait(self, timeout: float) -> bool:
+        """Record the timeout and report a change."""
+        self.timeouts.append(timeout)
+        return True
+
+    def close(self) -> None:
+        """No-op close."""
+
+
+class TestWatcher:
+    """Tests for event-driven wake-up when idle."""
+
+    def test_empty_poll_waits_on_watcher(self) -> None:
+        """An empty poll blocks on the watcher with the poll interval as timeout."""
+        watcher: FakeWatcher = FakeWatcher()
+        chameleon: Chameleon = Chameleon(
+            FakeConfigManager(ROLE),
+            FakeTaskManager([]),
+            FakeLauncher(),
+            "reviewer",
+            timedelta(seconds=30),
+            watcher=watcher,
+        )
+        original_poll = chameleon._poll
+
+        def poll_then_stop() -> None:
+            """Poll once then shut down."""
+            original_poll()
+            chameleon.shutdown()
+
+        chameleon._poll = poll_then_stop  # type: ignore[assignment]
+        start: float = time.monotonic()
+        chameleon.run()
+
+        assert watcher.timeouts == [30.0]
+        assert time.monotonic() - start < 5.0
+
+    def test_non_empty_poll_does_not_wait(self) -> None:
+        """A poll that finds work goes straight to executing."""
+        watcher: FakeWatcher = FakeWatcher()
+        chameleon: Chameleon = Chameleon(
+            FakeConfigManager(ROLE),
+            FakeTaskManager([[TASK]]),
+            FakeLauncher(),
+            "reviewer",
+            timedelta(seconds=30),
+            watcher=watcher,
+        )
+        original_execute = chameleon._execute
+
+        def execute_then_stop() -> None:
+            """Execute once then shut down."""
+            original_execute()
+            chameleon.shutdown()
+
+        chameleon._execute = execute_then_stop  # type: ignore[assignment]
+        chameleon.run()
+
+        assert watcher.timeouts == []
+
+
+class TestBackoff:
+    """Tests for adaptive poll backoff in the loop."""
+
+    def test_idle_polls_back_off_and_reset_on_work(self) -> None:
+        """Empty polls grow the wait; finding a task resets it."""
+        watcher: FakeWatcher = FakeWatcher()
+        backoff: PollBackoff = PollBackoff(
+            timedelta(seconds=1), timedelta(seconds=10),
+        )
+        task_mgr: FakeTaskManager = FakeTaskManager([[], [], [TASK], []])
+        chameleon: Chameleon = Chameleon(
+            FakeConfigManager(ROLE),
+            task_mgr,
+            FakeLauncher(),
+            "reviewer",
+            watcher=watcher,
+            backoff=backoff,
+        )
+        poll_count: int = 0
+        original_poll = chameleon._poll
+
+        def poll_four_times() -> None:
+            """Poll four times then shut down."""
+            nonlocal poll_count
+            original_poll()
+            poll_count += 1
+            if poll_count >= 4:
+                chameleon.shutdown()
+
+        chameleon._poll = poll_four_times  # type: ignore[assignment]
+        chameleon.run()
+
+        assert watcher.timeouts == [1.0, 2.0, 1.0]
+        assert task_mgr.completed == ["42"]
+
+
+class TestMultiRole:
+    """Tests for serving several roles from one process."""
+
+    def test_single_combined_poll_and_dispatch_by_label(self) -> None:
+        """One poll covers every role; each task runs under its matching role."""
+        writer: Role = Role(name="writer", prompt="Write.", interactive=False)
+        review_task: Task = Task(
+            id="r", title="R", description="", status=TaskStatus.OPEN,
+            labels=("role-reviewer",),
+        )
+        write_task: Task = Task(
+            id="w", title="W", description="", status=TaskStatus.OPEN,
+            labels=("urgent", "role-writer"),
+        )
+        task_mgr: FakeTaskManager = FakeTaskManager([[write_task], [review_task]])
+        launcher: FakeLauncher = FakeLauncher()
+        chameleon: Chameleon = Chameleon(
+            FakeConfigManager(ROLE, writer),
+            task_mgr,
+            launcher,
+            ["reviewer", "writer"],
+            timedelta(seconds=0),
+        )
+        execute_count: int = 0
+        original_execute = chameleon._execute
+
+        def count_and_stop() -> None:
+            """Shut down after two executions."""
+            nonlocal execute_count
+            original_execute()
+            execute_count += 1
+            if execute_count >= 2:
+                chameleon.shutdown()
+
+        chameleon._execute = count_and_stop  # type: ignore[assignment]
+        chameleon.run()
+
+        assert task_mgr.polled[0] == ["role-reviewer", "role-writer"]
+        assert launcher.launches == [(writer, write_task), (ROLE, review_task)]
+
+    def test_task_without_served_label_is_skipped(self) -> None:
+        """Tasks carrying none of the served labels are never claimed."""
+        writer: Role = Role(name="writer", prompt="Write.", interactive=False)
+        stray: Task = Task(
+            id="s", title="S", description="", status=TaskStatus.OPEN,
+            labels=("role-other",),
+        )
+        task_mgr: FakeTaskManager = FakeTaskManager([[stray]])
+        chameleon: Chameleon = Chameleon(
+            FakeConfigManager(ROLE, writer),
+            task_mgr,
+            FakeLauncher(),
+            ["reviewer", "writer"],
+            timedelta(seconds=0),
+        )
+        original_poll = chameleon._poll
+
+        def poll_then_stop() -> None:
+            """Poll once then shut down."""
+            original_poll()
+            chameleon.shutdown()
+
+        chameleon._poll = poll_then_stop  # type: ignore[assignment]
+        chameleon.run()
+
+        assert task_mgr.claimed == []
+
+    def test_per_role_cap_limits_in_flight_sessions(self) -> None:
+        """A role's max_concurrency caps its sessions below the global limit."""
+        capped: Role = Role(
+            name="reviewer", prompt="Review.", interactive=False, max_concurrency=1,
+        )
+        tasks: list[Task] = _make_tasks(3)
+        task_mgr: FakeTaskManager = FakeTaskManager([tasks, tasks[1:]])
+        launcher: BlockingLauncher = BlockingLauncher()
+        chameleon: Chameleon = Chameleon(
+            FakeConfigManager(capped),
+            task_mgr,
+            launcher,
+            "reviewer",
+            timedelta(seconds=0),
+            concurrency=3,
+        )
+        runner: threading.Thread = threading.Thread(target=chameleon.run)
+        runner.start()
+        assert launcher.started.acquire(timeout=5)
+        time.sleep(0.05)
+        chameleon.shutdown()
+        launcher.release.set()
+        runner.join(timeout=5)
+
+        assert launcher.peak == 1
+        assert task_mgr.claimed == ["0"]
+
+    def test_interactive_sessions_never_overlap(self) -> None:
+        """Interactive sessions share the terminal, so only one runs at a time."""
+        interactive: Role = Role(name="pair", prompt="Pair.", interactive=True)
+        tasks: list[Task] = _make_tasks(3)
+        task_mgr: FakeTaskManager = FakeTaskManager([tasks, tasks[1:]])
+        launcher: BlockingLauncher = BlockingLauncher()
+        chameleon: Chameleon = Chameleon(
+            FakeConfigManager(interactive),
+            task_mgr,
+            launcher,
+            "pair",
+            timedelta(seconds=0),
+            concurrency=3,
+        )
+        runner: threading.Thread = threading.Thread(target=chameleon.run)
+        runner.start()
+        assert launcher.started.acquire(timeout=5)
+        time.sleep(0.05)
+        chameleon.shutdown()
+        launcher.release.set()
+        runner.join(timeout=5)
+
+        assert launcher.peak == 1
+        assert task_mgr.claimed == ["0"]
+
+    def test_capped_role_waits_for_its_slot_without_backing_off(self) -> None:
+        """A poll of only capped work waits for a session instead of backing off."""
+
+        class QueueTaskManager(FakeTaskManager):
+            """Offers every task that has not been claimed yet."""
+
+            def poll(self, label: str) -> list[Task]:
+                """Return the unclaimed tasks."""
+                return [t for t in _make_tasks(2) if t.id not in self.claimed]
+
+        capped: Role = Role(
+            name="reviewer", prompt="Review.", interactive=False, max_concurrency=1,
+        )
+        task_mgr: QueueTaskManager = QueueTaskManager([])
+        launcher: BlockingLauncher = BlockingLauncher()
+        backoff: PollBackoff = PollBackoff(
+            timedelta(seconds=0.01), timedelta(seconds=60),
+        )
+        chameleon: Chameleon = Chameleon(
+            FakeConfigManager(capped),
+            task_mgr,
+            launcher,
+            "reviewer",
+            concurrency=2,
+            backoff=backoff,
+        )
+        runner: threading.Thread = threading.Thread(target=chameleon.run)
+        runner.start()
+        assert launcher.started.acquire(timeout=5)
+        time.sleep(0.1)
+        assert backoff.current == timedelta(seconds=0.01)
+        launcher.release.set()
+        assert launcher.started.acquire(timeout=1)
+        chameleon.shutdown()
+        runner.join(timeout=5)
+
+        assert task_mgr.claimed == ["0", "1"]
+
+    def test_requires_a_role(self) -> None:
+        """An empty role list is rejected."""
+        with pytest.raises(ValueError, match="role"):
+            Chameleon(
+                FakeConfigManager(ROLE), FakeTaskManager([]), FakeLauncher(), [],
+            )
+
+
+class TestClaimConflict:
+    """Tests for losing a claim race."""
+
+    def test_conflict_returns_to_polling_without_launch(self) -> None:
+        """A task claimed elsewhere is skipped and the loop keeps going."""
+
+        class ConflictingTaskManager(FakeTaskManager):
+            """Loses the race for the first task it sees."""
+
+            def claim(self, task_id: str) -> None:
+                """Fail the claim for task 42."""
+                if task_id == "42":
+                    raise ClaimConflictError(task_id)
+                super().claim(task_id)
+
+        other: Task = Task(
+            id="7", title="Other", description="", status=TaskStatus.OPEN,
+        )
+        task_mgr: ConflictingTaskManager = ConflictingTaskManager([[TASK], [other]])
+        launcher: FakeLauncher = FakeLauncher()
+        chameleon: Chameleon = Chameleon(
+            FakeConfigManager(ROLE),
+            task_mgr,
+            launcher,
+            "reviewer",
+            timedelta(seconds=0),
+        )
+        execute_count: int = 0
+        original_execute = chameleon._execute
+
+        def count_and_stop() -> None:
+            """Shut down after two executions."""
+            nonlocal execute_count
+            original_execute()
+            execute_count += 1
+            if execute_count >= 2:
+                chameleon.shutdown()
+
+        chameleon._execute = count_and_stop  # type: ignore[assignment]
+        chameleon.run()
+
+        assert [task.id for _, task in launcher.launches] == ["7"]
+        assert task_mgr.completed == ["7"]
+
+    def test_selector_decides_which_task_is_claimed(self) -> None:
+        """Tasks are tried in the order the selector returns."""
+
+        class ReversingSelector:
+            """Tries the tail of the queue first."""
+
+            def order(self, tasks: list[Task]) -> list[Task]:
+                """Reverse the poll order."""
+                return list(reversed(tasks))
+
+        task_mgr: FakeTaskManager = FakeTaskManager([_make_tasks(3)])
+        launcher: FakeLauncher = FakeLauncher()
+        chameleon: Chameleon = Chameleon(
+            FakeConfigManager(ROLE),
+            task_mgr,
+            launcher,
+            "reviewer",
+            timedelta(seconds=0),
+            selector=ReversingSelector(),
+        )
+        original_execute = chameleon._execute
+
+        def execute_then_stop() -> None:
+            """Execute once then shut down."""
+            original_execute()
+            chameleon.shutdown()
+
+        chameleon._execute = execute_then_stop  # type: ignore[assignment]
+        chameleon.run()
+
+        assert task_mgr.claimed == ["2"]
+
+    def test_blocked_tasks_are_not_claimed(self) -> None:
+        """A task whose dependencies are still open is skipped."""
+        blocked: Task = Task(
+            id="0", title="T", description="", status=TaskStatus.OPEN, ready=False,
+        )
+        task_mgr: FakeTaskManager = FakeTaskManager([[blocked, *_make_tasks(2)[1:]]])
+        chameleon: Chameleon = Chameleon(
+            FakeConfigManager(ROLE),
+            task_mgr,
+            FakeLauncher(),
+            "reviewer",
+            timedelta(seconds=0),
+        )
+        original_execute = chameleon._execute
+
+        def execute_then_stop() -> None:
+            """Execute once then shut down."""
+            original_execute()
+            chameleon.shutdown()
+
+        chameleon._execute = execute_then_stop  # type: ignore[assignment]
+        chameleon.run()
+
+        assert task_mgr.claimed == ["1"]
+
+    def test_conflict_retries_next_candidate_without_polling(self) -> None:
+        """Losing the first task claims the next one from the same poll."""
+
+        class ConflictingTaskManager(FakeTaskManager):
+            """Loses the race for task 0."""
+
+            def claim(self, task_id: str) -> None:
+                """Fail the claim for task 0."""
+                if task_id == "0":
+                    raise ClaimConflictError(task_id)
+                super().claim(task_id)
+
+        task_mgr: ConflictingTaskManager = ConflictingTaskManager([_make_tasks(3)])
+        launcher: FakeLauncher = FakeLauncher()
+        chameleon: Chameleon = Chameleon(
+            FakeConfigManager(ROLE),
+            task_mgr,
+            launcher,
+            "reviewer",
+            timedelta(seconds=0),
+        )
+        original_execute = chameleon._execute
+
+        def execute_then_stop() -> None:
+            """Execute once then shut down."""
+            original_execute()
+            chameleon.shutdown()
+
+        chameleon._execute = execute_then_stop  # type: ignore[assignment]
+        chameleon.run()
+
+        assert [task.id for _, task in launcher.launches] == ["1"]
+        assert task_mgr.claimed == ["1"]
+        assert len(task_mgr.polled) == 1
+
+
+class TestHotReload:
+    """Tests for picking up config edits without a restart."""
+
+    def test_next_task_uses_edited_prompt(self, tmp_path: Path) -> None:
+        """A prompt edited between tasks applies to the next session."""
+        config_file: Path = tmp_path / "roles.toml"
+        config_file.write_text('[reviewer]\nprompt = "Old."\ninteractive = false\n')
+        task_b: Task = Task(
+            id="43", title="Next", description="", status=TaskStatus.OPEN,
+        )
+        task_mgr: FakeTaskManager = FakeTaskManager([[TASK], [task_b]])
+        launcher: FakeLauncher = FakeLauncher()
+        chameleon: Chameleon = Chameleon(
+            ConfigManager(config_file),
+            task_mgr,
+            launcher,
+            "reviewer",
+            timedelta(seconds=0),
+        )
+        execute_count: int = 0
+        original_execute = chameleon._execute
+
+        def edit_after_first() -> None:
+            """Edit the prompt after the first task; stop after the second."""
+            nonlocal execute_count
+            original_execute()
+            execute_count += 1
+            if execute_count == 1:
+                before: int = config_file.stat().st_mtime_ns
+                config_file.write_text(
+                    '[reviewer]\nprompt = "New."\ninteractive = false\n'
+                )
+                os.utime(config_file, ns=(before + 10**6, before + 10**6))
+            else:
+                chameleon.shutdown()
+
+        chameleon._execute = edit_after_first  # type: ignore[assignment]
+        chameleon.run()
+
+        assert [role.prompt for role, _ in launcher.launches] == ["Old.", "New."]
+
+
+class ClaimAwaitingLauncher(FakeLauncher):
+    """Holds each session until the given task ids have been claimed."""
+
+    def __init__(self, task_mgr: FakeTaskManager, expected: list[str]) -> None:
+        """Watch the task manager's claims for the expected ids."""
+        super().__init__()
+        self._task_mgr: FakeTaskManager = task_mgr
+        self._expected: set[str] = set(expected)
+
+    def launch(self, role: Role, task: Task) -> None:
+        """Record the launch once the expected claims are in, or time out."""
+        deadline: float = time.monotonic() + 5
+        while not self._expected <= set(self._task_mgr.claimed):
+            if time.monotonic() > deadline:
+                break
+            time.sleep(0.005)
+        super().launch(role, task)
+
+
+class TestPrefetch:
+    """Tests for claiming the next task while a session runs."""
+
+    def _run(self, chameleon: Chameleon, executions: int) -> None:
+        """Run the chameleon until it has executed the given number of times."""
+        execute_count: int = 0
+        original_execute = chameleon._execute
+
+        def count_and_stop() -> None:
+            """Shut down after the requested number of executions."""
+            nonlocal execute_count
+            original_execute()
+            execute_count += 1
+            if execute_count >= executions:
+                chameleon.shutdown()
+
+        chameleon._execute = count_and_stop  # type: ignore[assignment]
+        chameleon.run()
+
+    def test_next_task_is_claimed_during_session(self) -> None:
+        """The prefetched task is claimed once, mid-session, and run next."""
+        tasks: list[Task] = _make_tasks(2)
+        task_mgr: FakeTaskManager = FakeTaskManager([tasks, tasks, []])
+        launcher: ClaimAwaitingLauncher = ClaimAwaitingLauncher(task_mgr, ["1"])
+        chameleon: Chameleon = Chameleon(
+            FakeConfigManager(ROLE),
+            task_mgr,
+            launcher,
+            "reviewer",
+            timedelta(seconds=0),
+            prefetch=1,
+        )
+        self._run(chameleon, 2)
+
+        assert [task.id for _, task in launcher.launches] == ["0", "1"]
+        assert task_mgr.claimed == ["0", "1"]
+        assert sorted(task_mgr.completed) == ["0", "1"]
+        assert task_mgr.released == []
+
+    def test_unstarted_prefetched_tasks_are_released(self) -> None:
+        """Tasks claimed ahead but never launched go back to open on shutdown."""
+        tasks: list[Task] = _make_tasks(3)
+        task_mgr: FakeTaskManager = FakeTaskManager([tasks[:1], tasks[1:]])
+        launcher: ClaimAwaitingLauncher = ClaimAwaitingLauncher(
+            task_mgr, ["1", "2"],
+        )
+        chameleon: Chameleon = Chameleon(
+            FakeConfigManager(ROLE),
+            task_mgr,
+            launcher,
+            "reviewer",
+            timedelta(seconds=0),
+            prefetch=2,
+        )
+        self._run(chameleon, 1)
+
+        assert [task.id for _, task in launcher.launches] == ["0"]
+        assert task_mgr.completed == ["0"]
+        assert task_mgr.released == ["1", "2"]
+
+    def test_rejects_negative_depth(self) -> None:
+        """A negative prefetch depth is rejected."""
+        with pytest.raises(ValueError, match="prefetch"):
+            Chameleon(
+                FakeConfigManager(ROLE),
+                FakeTaskManager([]),
+                FakeLauncher(),
+                "reviewer",
+                prefetch=-1,
+            )
+
+
+class TestLeases:
+    """Tests for leasing claimed tasks."""
+
+    def test_lease_is_held_during_session_and_dropped_after(
+        self, tmp_path: Path,
+    ) -> None:
+        """A claimed task is leased while it runs and unleased once complete."""
+        store: LeaseStore = LeaseStore(tmp_path / "leases.db")
+        held: list[list[str]] = []
+
+        class LeaseCheckingLauncher(FakeLauncher):
+            """Records which leases exist while the session runs."""
+
+            def launch(self, role: Role, task: Task) -> None:
+                """Snapshot the lease table."""
+                rows = store._conn.execute("SELECT task_id FROM leases").fetchall()
+                held.append([task_id for (task_id,) in rows])
+                super().launch(role, task)
+
+        task_mgr: FakeTaskManager = FakeTaskManager([[TASK]])
+        chameleon: Chameleon = Chameleon(
+            FakeConfigManager(ROLE),
+            task_mgr,
+            LeaseCheckingLauncher(),
+            "reviewer",
+            timedelta(seconds=0),
+            leases=LeaseKeeper(store, timedelta(seconds=60), owner="w1"),
+        )
+        original_execute = chameleon._execute
+
+        def execute_then_stop() -> None:
+            """Execute once then shut down."""
+            original_execute()
+            chameleon.shutdown()
+
+        chameleon._execute = execute_then_stop  # type: ignore[assignment]
+        chameleon.run()
+
+        assert held == [[TASK.id]]
+        assert store._conn.execute("SELECT COUNT(*) FROM leases").fetchone() == (0,)
+
+
+class TestMetrics:
+    """Tests for recording worker metrics."""
+
+    def test_records_sessions_store_calls_and_state_time(self) -> None:
+        """One cycle records a poll, a claim, a session, and time per state."""
+        metrics: ChameleonMetrics = ChameleonMetrics()
+        task_mgr: FakeTaskManager = FakeTaskManager([[TASK]])
+        chameleon: Chameleon = Chameleon(
+            FakeConfigManager(ROLE),
+            MeteredTaskManager(task_mgr, metrics),
+            FakeLauncher(),
+            "reviewer",
+            timedelta(seconds=0),
+            metrics=metrics,
+        )
+        original_execute = chameleon._execute
+
+        def execute_then_stop() -> None:
+            """Execute once then shut down."""
+            original_execute()
+            chameleon.shutdown()
+
+        chameleon._execute = execute_then_stop  # type: ignore[assignment]
+        chameleon.run()
+
+        assert metrics.polls.labels().value == 1
+        assert metrics.queue_depth.labels("role-reviewer").value == 1
+        assert metrics.claim_seconds.labels().snapshot()[0][-1] == 1
+        assert metrics.session_seconds.labels("reviewer").snapshot()[0][-1] == 1
+        text: str = metrics.registry.render()
+        assert 'chameleon_state_seconds_total{state="polling"}' in text
+        assert 'chameleon_state_seconds_total{state="executing"}' in text
+
+    def test_failed_session_is_counted(self) -> None:
+        """A launch that raises is counted against its role and re-raised."""
+
+        class FailingLauncher(FakeLauncher):
+            """Raises on every launch."""
+
+            def launch(self, role: Role, task: Task) -> None:
+                """Fail the session."""
+                raise RuntimeError("boom")
+
+        metrics: ChameleonMetrics = ChameleonMetrics()
+        chameleon: Chameleon = Chameleon(
+            FakeConfigManager(ROLE),
+            FakeTaskManager([[TASK]]),
+            FailingLauncher(),
+            "reviewer",
+            timedelta(seconds=0),
+            metrics=metrics,
+        )
+        with pytest.raises(RuntimeError):
+            chameleon.run()
+
+        assert metrics.session_failures.labels("reviewer").value == 1
+
+
+class TestTracing:
+    """Tests for per-phase tracing spans."""
+
+    def test_one_cycle_emits_a_span_per_phase(self, tmp_path: Path) -> None:
+        """Polling, claiming, launching, and completing each get a span."""
+        path: Path = tmp_path / "trace.jsonl"
+        tracer: JsonLinesTracer = JsonLinesTracer(path)
+        chameleon: Chameleon = Chameleon(
+            FakeConfigManager(ROLE),
+            FakeTaskManager([[TASK]]),
+            FakeLauncher(),
+            "reviewer",
+            timedelta(seconds=0),
+            tracer=tracer,
+        )
+        original_execute = chameleon._execute
+
+        def execute_then_stop() -> None:
+            """Execute once then shut down."""
+            original_execute()
+            chameleon.shutdown()
+
+        chameleon._execute = execute_then_stop  # type: ignore[assignment]
+        chameleon.run()
+        tracer.close()
+
+        names: list[str] = [
+            json.loads(line)["name"] for line in path.read_text().splitlines()
+        ]
+        assert names == ["poll", "claim", "describe", "launch", "complete"]
+
+
+class FakeAdmission:
+    """Refuses the first ``refusals`` launches, then admits every one."""
+
+    def __init__(self, refusals: int) -> None:
+        """Store how many launches to refuse."""
+        self.refusals: int = refusals
+        self.asked: list[str] = []
+        self.refunded: list[str] = []
+
+    def admit(self, role: Role) -> float:
+        """Refuse with a short delay while refusals remain."""
+        self.asked.append(role.name)
+        if self.refusals:
+            self.refusals -= 1
+            return 0.001
+        return 0.0
+
+    def refund(self, role: Role) -> None:
+        """Record the refund."""
+        self.refunded.append(role.name)
+
+
+class TestDescribe:
+    """Tests for fetching the claimed task's full description."""
+
+    def test_launcher_gets_the_described_task(self) -> None:
+        """Only the claimed summary is described, and the launch sees its body."""
+
+        class DescribingTaskManager(FakeTaskManager):
+            """Fills in descriptions and records which tasks were described."""
+
+            def __init__(self, poll_results: list[list[Task]]) -> None:
+                """Initialize the description log."""
+                super().__init__(poll_results)
+                self.described: list[str] = []
+
+            def describe(self, task: Task) -> Task:
+                """Return the task with a description derived from its id."""
+                self.described.append(task.id)
+                return replace(task, description=f"body {task.id}", summary=False)
+
+        summaries: list[Task] = [
+            replace(task, summary=True) for task in _make_tasks(3)
+        ]
+        task_mgr: DescribingTaskManager = DescribingTaskManager([summaries])
+        launcher: FakeLauncher = FakeLauncher()
+        chameleon: Chameleon = Chameleon(
+            FakeConfigManager(ROLE),
+            task_mgr,
+            launcher,
+            "reviewer",
+            timedelta(seconds=0),
+        )
+        original_execute = chameleon._execute
+
+        def execute_then_stop() -> None:
+            """Execute once then shut down."""
+            original_execute()
+            chameleon.shutdown()
+
+        chameleon._execute = execute_then_stop  # type: ignore[assignment]
+        chameleon.run()
+
+        assert task_mgr.described == ["0"]
+        assert launcher.launches[0][1].description == "body 0"
+
+
+class TestAdmission:
+    """Tests for deferring launches the admission controller refuses."""
+
+    def test_refused_launch_claims_nothing_until_admitted(self) -> None:
+        """A deferred task stays unclaimed and is launched on a later poll."""
+        metrics: ChameleonMetrics = ChameleonMetrics()
+        task_mgr: FakeTaskManager = FakeTaskManager([[TASK], [TASK]])
+        launcher: FakeLauncher = FakeLauncher()
+        admission: FakeAdmission = FakeAdmission(refusals=1)
+        chameleon: Chameleon = Chameleon(
+            FakeConfigManager(ROLE),
+            task_mgr,
+            launcher,
+            "reviewer",
+            timedelta(seconds=0),
+            metrics=metrics,
+            admission=admission,
+        )
+        original_execute = chameleon._execute
+
+        def execute_then_stop() -> None:
+            """Execute once then shut down."""
+            original_execute()
+            chameleon.shutdown()
+
+        chameleon._execute = execute_then_stop  # type: ignore[assignment]
+        chameleon.run()
+
+        assert admission.asked == ["reviewer", "reviewer"]
+        assert len(task_mgr.polled) == 2
+        assert task_mgr.claimed == ["42"]
+        assert [task.id for _, task in launcher.launches] == ["42"]
+        assert metrics.launch_deferrals.labels().value == 1
+
+    def test_slot_is_refunded_when_every_claim_is_lost(self) -> None:
+        """Losing every candidate to another worker gives the admission back."""
+
+        class ConflictingTaskManager(FakeTaskManager):
+            """Loses every claim."""
+
+            def claim(self, task_id: str) -> None:
+                """Fail the claim."""
+                raise ClaimConflictError(task_id)
+
+        task_mgr: ConflictingTaskManager = ConflictingTaskManager([_make_tasks(2)])
+        admission: FakeAdmission = FakeAdmission(refusals=0)
+        chameleon: Chameleon = Chameleon(
+            FakeConfigManager(ROLE),
+            task_mgr,
+            FakeLauncher(),
+            "reviewer",
+            timedelta(seconds=0),
+            admission=admission,
+        )
+        original_execute = chameleon._execute
+
+        def execute_then_stop() -> None:
+            """Execute once then shut down."""
+            original_execute()
+            chameleon.shutdown()
+
+        chameleon._execute = execute_then_stop  # type: ignore[assignment]
+        chameleon.run()
+
+        assert admission.asked == ["reviewer"]
+        assert admission.refunded == ["reviewer"]
+
+    def test_refused_prefetched_task_defers_without_polling(self) -> None:
+        """A refused prefetched launch waits instead of polling and asking again."""
+        task_mgr: FakeTaskManager = FakeTaskManager([[TASK]])
+        admission: FakeAdmission = FakeAdmission(refusals=1)
+        chameleon: Chameleon = Chameleon(
+            FakeConfigManager(ROLE),
+            task_mgr,
+            FakeLauncher(),
+            "reviewer",
+            timedelta(seconds=0),
+            admission=admission,
+        )
+        chameleon._prefetched.append((ROLE, _make_tasks(1)[0]))
+        chameleon._poll()
+
+        assert admission.asked == ["reviewer"]
+        assert task_mgr.polled == []
+        assert len(chameleon._prefetched) == 1
+        assert chameleon._state == ChameleonState.POLLING
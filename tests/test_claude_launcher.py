@@ -1,9 +1,18 @@
 """Tests for ClaudeLauncher."""
 
-from unittest.mock import MagicMock, patch
+import os
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+from unittest.mock import DEFAULT, MagicMock, patch
+
+import pytest
 
 from bd_agent_chameleon.claude_launcher import ClaudeLauncher
-from bd_agent_chameleon.models import Role, Task, TaskStatus
+from bd_agent_chameleon.models import Role, SessionOutcome, Task, TaskStatus
+from bd_agent_chameleon.protocols import SessionFailedError
 
 
 class TestComposePrompt:
@@ -84,13 +93,14 @@ class TestBuildCommand:
 class TestLaunch:
     """Tests for ClaudeLauncher.launch."""
 
-    @patch("bd_agent_chameleon.claude_launcher.subprocess.run")
+    @patch("bd_agent_chameleon.claude_launcher.subprocess.Popen")
     @patch("bd_agent_chameleon.claude_launcher.sys.stdin")
     def test_launch_calls_subprocess(
-        self, mock_stdin: MagicMock, mock_run: MagicMock
+        self, mock_stdin: MagicMock, mock_popen: MagicMock
     ) -> None:
-        """launch() invokes subprocess.run with the built command."""
+        """launch() invokes subprocess.Popen with the built command."""
         mock_stdin.isatty.return_value = False
+        mock_popen.return_value.returncode = 0
         role: Role = Role(name="reviewer", prompt="Review.", interactive=False)
         task: Task = Task(
             id="1", title="Fix bug", description="Details.", status=TaskStatus.OPEN
@@ -98,18 +108,19 @@ class TestLaunch:
 
         ClaudeLauncher().launch(role, task)
 
-        mock_run.assert_called_once()
-        cmd: list[str] = mock_run.call_args[0][0]
+        mock_popen.assert_called_once()
+        cmd: list[str] = mock_popen.call_args[0][0]
         assert cmd[0] == "claude"
         assert "--print" in cmd
 
-    @patch("bd_agent_chameleon.claude_launcher.subprocess.run")
+    @patch("bd_agent_chameleon.claude_launcher.subprocess.Popen")
     @patch("bd_agent_chameleon.claude_launcher.sys.stdin")
     def test_launch_interactive_omits_print(
-        self, mock_stdin: MagicMock, mock_run: MagicMock
+        self, mock_stdin: MagicMock, mock_popen: MagicMock
     ) -> None:
         """launch() omits --print for interactive roles."""
         mock_stdin.isatty.return_value = False
+        mock_popen.return_value.returncode = 0
         role: Role = Role(name="writer", prompt="Write.", interactive=True)
         task: Task = Task(
             id="2",
@@ -120,10 +131,10 @@ class TestLaunch:
 
         ClaudeLauncher().launch(role, task)
 
-        cmd: list[str] = mock_run.call_args[0][0]
+        cmd: list[str] = mock_popen.call_args[0][0]
         assert "--print" not in cmd
 
-    @patch("bd_agent_chameleon.claude_launcher.subprocess.run")
+    @patch("bd_agent_chameleon.claude_launcher.subprocess.Popen")
     @patch("bd_agent_chameleon.claude_launcher.termios.tcsetattr")
     @patch("bd_agent_chameleon.claude_launcher.termios.tcgetattr")
     @patch("bd_agent_chameleon.claude_launcher.sys.stdin")
@@ -132,10 +143,11 @@ class TestLaunch:
         mock_stdin: MagicMock,
         mock_tcgetattr: MagicMock,
         mock_tcsetattr: MagicMock,
-        mock_run: MagicMock,
+        mock_popen: MagicMock,
     ) -> None:
         """launch() saves and restores terminal state when stdin is a tty."""
         mock_stdin.isatty.return_value = True
+        mock_popen.return_value.returncode = 0
         saved_attrs: list = [1, 2, 3]
         mock_tcgetattr.return_value = saved_attrs
 
@@ -148,4 +160,238 @@ class TestLaunch:
 
         mock_tcgetattr.assert_called_once_with(mock_stdin)
         mock_tcsetattr.assert_called_once()
-        mock_run.assert_called_once()
+        mock_popen.assert_called_once()
+
+
+class TestCapturedLaunch:
+    """Tests for streaming session output into per-task log files."""
+
+    def test_non_interactive_output_goes_to_task_log(self, tmp_path: Path) -> None:
+        """A --print session's output is written to <log_dir>/<task id>.log."""
+        role: Role = Role(name="reviewer", prompt="Review.", interactive=False)
+        task: Task = Task(
+            id="bd-7", title="Fix bug", description="Details.", status=TaskStatus.OPEN
+        )
+        cmd: list[str] = [sys.executable, "-c", "print('session output')"]
+        with patch.object(ClaudeLauncher, "_build_command", return_value=cmd):
+            ClaudeLauncher(log_dir=tmp_path).launch(role, task)
+
+        assert (tmp_path / "bd-7.log").read_text() == "session output\n"
+
+    @patch("bd_agent_chameleon.claude_launcher.subprocess.Popen")
+    @patch("bd_agent_chameleon.claude_launcher.sys.stdin")
+    def test_interactive_sessions_keep_the_terminal(
+        self, mock_stdin: MagicMock, mock_popen: MagicMock, tmp_path: Path
+    ) -> None:
+        """Interactive roles are not captured even when a log dir is set."""
+        mock_stdin.isatty.return_value = False
+        mock_popen.return_value.returncode = 0
+        role: Role = Role(name="writer", prompt="Write.", interactive=True)
+        task: Task = Task(
+            id="bd-8", title="Docs", description="", status=TaskStatus.OPEN
+        )
+
+        ClaudeLauncher(log_dir=tmp_path).launch(role, task)
+
+        mock_popen.assert_called_once()
+        assert not (tmp_path / "bd-8.log").exists()
+
+
+class TestPromptTransport:
+    """Tests for keeping large prompts out of argv."""
+
+    @patch("bd_agent_chameleon.claude_launcher.subprocess.Popen")
+    @patch("bd_agent_chameleon.claude_launcher.sys.stdin")
+    def test_small_prompt_stays_in_argv(
+        self, mock_stdin: MagicMock, mock_popen: MagicMock
+    ) -> None:
+        """Prompts under the limit are passed as the positional argument."""
+        mock_stdin.isatty.return_value = False
+        mock_popen.return_value.returncode = 0
+        role: Role = Role(name="reviewer", prompt="Review.", interactive=False)
+        task: Task = Task(
+            id="1", title="Fix bug", description="Details.", status=TaskStatus.OPEN
+        )
+
+        ClaudeLauncher().launch(role, task)
+
+        cmd: list[str] = mock_popen.call_args[0][0]
+        assert cmd[1].startswith("Review.")
+        assert mock_popen.return_value.communicate.call_args.kwargs["input"] is None
+
+    @patch("bd_agent_chameleon.claude_launcher.subprocess.Popen")
+    @patch("bd_agent_chameleon.claude_launcher.sys.stdin")
+    def test_large_print_prompt_goes_to_stdin(
+        self, mock_stdin: MagicMock, mock_popen: MagicMock
+    ) -> None:
+        """Non-interactive prompts over the limit are piped on stdin."""
+        mock_stdin.isatty.return_value = False
+        mock_popen.return_value.returncode = 0
+        role: Role = Role(name="reviewer", prompt="Review.", interactive=False)
+        task: Task = Task(
+            id="1", title="RFC", description="x" * 200_000, status=TaskStatus.OPEN
+        )
+
+        ClaudeLauncher().launch(role, task)
+
+        cmd: list[str] = mock_popen.call_args[0][0]
+        assert cmd == ["claude", "--print"]
+        communicate: MagicMock = mock_popen.return_value.communicate
+        assert len(communicate.call_args.kwargs["input"]) > 200_000
+
+    @patch("bd_agent_chameleon.claude_launcher.subprocess.Popen")
+    @patch("bd_agent_chameleon.claude_launcher.sys.stdin")
+    def test_large_interactive_prompt_uses_temp_file(
+        self, mock_stdin: MagicMock, mock_popen: MagicMock
+    ) -> None:
+        """Interactive prompts over the limit are read from a removed temp file."""
+        mock_stdin.isatty.return_value = False
+        mock_popen.return_value.returncode = 0
+        role: Role = Role(name="writer", prompt="Write.", interactive=True)
+        task: Task = Task(
+            id="2", title="RFC", description="y" * 200_000, status=TaskStatus.OPEN
+        )
+        seen: dict[Path, str] = {}
+
+        def read_prompt_file(cmd: list[str], **kwargs: object) -> object:
+            """Capture the prompt file's contents while the session starts."""
+            word: str = next(w for w in cmd[1].split() if "chameleon-prompt-" in w)
+            path: Path = Path(word.rstrip("."))
+            seen[path] = path.read_text()
+            return DEFAULT
+
+        mock_popen.side_effect = read_prompt_file
+
+        ClaudeLauncher().launch(role, task)
+
+        assert len(mock_popen.call_args[0][0][1]) < 1000
+        [(path, contents)] = seen.items()
+        assert contents.startswith("Write.")
+        assert contents.endswith("y" * 100)
+        assert not path.exists()
+
+    def test_captured_session_reads_prompt_from_stdin(self, tmp_path: Path) -> None:
+        """With output capture, a large prompt is streamed to the child's stdin."""
+        role: Role = Role(name="reviewer", prompt="Review.", interactive=False)
+        task: Task = Task(
+            id="bd-9", title="RFC", description="z" * 300_000, status=TaskStatus.OPEN
+        )
+        script: str = "import sys; print(len(sys.stdin.read()))"
+
+        def build(prompt: str | None, role: Role) -> list[str]:
+            """Stand in for claude with a stdin byte counter."""
+            assert prompt is None
+            return [sys.executable, "-c", script]
+
+        with patch.object(ClaudeLauncher, "_build_command", side_effect=build):
+            ClaudeLauncher(log_dir=tmp_path).launch(role, task)
+
+        assert int((tmp_path / "bd-9.log").read_text()) > 300_000
+
+
+def _launch_script(
+    script: str, role: Role, launcher: ClaudeLauncher, task_id: str = "bd-1",
+) -> None:
+    """Launch a Python script in place of claude, with a non-tty stdin."""
+    task: Task = Task(
+        id=task_id, title="T", description="", status=TaskStatus.OPEN,
+    )
+    cmd: list[str] = [sys.executable, "-c", script]
+    with (
+        patch.object(ClaudeLauncher, "_build_command", return_value=cmd),
+        patch("bd_agent_chameleon.claude_launcher.sys.stdin") as mock_stdin,
+    ):
+        mock_stdin.isatty.return_value = False
+        launcher.launch(role, task)
+
+
+class TestSessionOutcome:
+    """Tests for timeouts, exit statuses, and resource caps."""
+
+    def test_non_zero_exit_fails_the_session(self) -> None:
+        """A session exiting non-zero raises with its exit status."""
+        role: Role = Role(name="reviewer", prompt="R.", interactive=False)
+        with pytest.raises(SessionFailedError) as caught:
+            _launch_script("import sys; sys.exit(3)", role, ClaudeLauncher())
+
+        assert caught.value.outcome == SessionOutcome.FAILED
+        assert caught.value.returncode == 3
+        assert str(caught.value) == "session for task bd-1 failed with exit status 3"
+
+    @pytest.mark.parametrize("captured", [False, True])
+    def test_overrunning_session_times_out(
+        self, captured: bool, tmp_path: Path,
+    ) -> None:
+        """A session that ignores SIGTERM is killed once the grace period ends."""
+        role: Role = Role(
+            name="reviewer", prompt="R.", interactive=False, timeout_seconds=0.5,
+        )
+        script: str = (
+            "import signal, time\n"
+            "signal.signal(signal.SIGTERM, signal.SIG_IGN)\n"
+            "time.sleep(60)\n"
+        )
+        launcher: ClaudeLauncher = ClaudeLauncher(
+            log_dir=tmp_path if captured else None, kill_grace=0.5,
+        )
+        start: float = time.monotonic()
+        with pytest.raises(SessionFailedError) as caught:
+            _launch_script(script, role, launcher)
+
+        assert time.monotonic() - start < 10
+        assert caught.value.outcome == SessionOutcome.TIMED_OUT
+        assert str(caught.value) == "session for task bd-1 timed_out"
+
+    def test_timeout_covers_a_session_that_closed_its_output(
+        self, tmp_path: Path,
+    ) -> None:
+        """A captured session cannot escape the timeout by closing its pipes."""
+        role: Role = Role(
+            name="reviewer", prompt="R.", interactive=False, timeout_seconds=0.5,
+        )
+        script: str = "import os, time; os.close(1); os.close(2); time.sleep(60)"
+        start: float = time.monotonic()
+        with pytest.raises(SessionFailedError):
+            _launch_script(script, role, ClaudeLauncher(log_dir=tmp_path))
+
+        assert time.monotonic() - start < 10
+
+    @pytest.mark.skipif(sys.platform != "linux", reason="prlimit is Linux-only")
+    def test_apply_limits_caps_cpu_and_memory(self) -> None:
+        """The role's CPU and memory caps are set on the running process."""
+        role: Role = Role(
+            name="reviewer", prompt="R.", interactive=False,
+            cpu_seconds=30, memory_mb=512,
+        )
+        proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+        try:
+            ClaudeLauncher.apply_limits(proc.pid, role)
+            cpu = resource.prlimit(proc.pid, resource.RLIMIT_CPU)
+            data = resource.prlimit(proc.pid, resource.RLIMIT_DATA)
+        finally:
+            proc.kill()
+            proc.wait()
+
+        assert cpu == (30, 30)
+        assert data == (512 * 1024 * 1024, 512 * 1024 * 1024)
+
+    def test_session_is_killed_when_caps_cannot_be_applied(self) -> None:
+        """A session whose caps are refused is killed before the error surfaces."""
+        role: Role = Role(
+            name="reviewer", prompt="R.", interactive=False, cpu_seconds=1,
+        )
+        pids: list[int] = []
+
+        def refuse(pid: int, role: Role) -> None:
+            """Record the session's pid and refuse the caps."""
+            pids.append(pid)
+            raise PermissionError("hard limit")
+
+        with (
+            patch.object(ClaudeLauncher, "apply_limits", side_effect=refuse),
+            pytest.raises(PermissionError),
+        ):
+            _launch_script("import time; time.sleep(60)", role, ClaudeLauncher())
+
+        with pytest.raises(ProcessLookupError):
+            os.kill(pids[0], 0)
@@ -1,7 +1,9 @@
 """Unit tests for ConfigManager."""
 
+import os
 import tomllib
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -70,6 +72,68 @@ class TestLoadRole:
         assert writer.prompt == "Write."
 
 
+    def test_loads_max_concurrency(self, tmp_path: Path) -> None:
+        """A per-role max_concurrency is read from the config."""
+        config_file: Path = tmp_path / "roles.toml"
+        config_file.write_text(
+            '[coder]\nprompt = "Code."\ninteractive = false\nmax_concurrency = 3\n'
+        )
+        mgr: ConfigManager = ConfigManager(config_path=config_file)
+
+        assert mgr.load_role("coder").max_concurrency == 3
+
+    def test_loads_worker_bounds(self, tmp_path: Path) -> None:
+        """Per-role fleet worker bounds are read from the config."""
+        config_file: Path = tmp_path / "roles.toml"
+        config_file.write_text(
+            '[coder]\nprompt = "Code."\ninteractive = false\n'
+            "min_workers = 1\nmax_workers = 4\n"
+        )
+        role: Role = ConfigManager(config_path=config_file).load_role("coder")
+
+        assert (role.min_workers, role.max_workers) == (1, 4)
+
+
+    def test_loads_session_limits(self, tmp_path: Path) -> None:
+        """Per-role timeout, CPU, and memory caps are read from the config."""
+        config_file: Path = tmp_path / "roles.toml"
+        config_file.write_text(
+            '[coder]\nprompt = "Code."\ninteractive = false\n'
+            "timeout_seconds = 600\ncpu_seconds = 300\nmemory_mb = 2048\n"
+        )
+        role: Role = ConfigManager(config_path=config_file).load_role("coder")
+
+        assert (role.timeout_seconds, role.cpu_seconds, role.memory_mb) == (
+            600, 300, 2048,
+        )
+
+    def test_loads_launch_rate(self, tmp_path: Path) -> None:
+        """A role's launch rate and burst are read from the config."""
+        config_file: Path = tmp_path / "roles.toml"
+        config_file.write_text(
+            '[coder]\nprompt = "Code."\ninteractive = false\n'
+            "launches_per_minute = 6\nlaunch_burst = 2\n"
+        )
+        role: Role = ConfigManager(config_path=config_file).load_role("coder")
+
+        assert (role.launches_per_minute, role.launch_burst) == (6, 2)
+
+
+class TestRoleNames:
+    """Tests for ConfigManager.role_names."""
+
+    def test_lists_every_role(self, tmp_path: Path) -> None:
+        """role_names returns every role table in file order."""
+        config_file: Path = tmp_path / "roles.toml"
+        config_file.write_text(
+            '[reviewer]\nprompt = "Review."\ninteractive = false\n\n'
+            '[writer]\nprompt = "Write."\ninteractive = true\n'
+        )
+        mgr: ConfigManager = ConfigManager(config_path=config_file)
+
+        assert mgr.role_names() == ["reviewer", "writer"]
+
+
 class TestLoadRoleErrors:
     """Tests for ConfigManager.load_role error cases."""
 
@@ -123,3 +187,74 @@ class TestLoadRoleErrors:
 
         with pytest.raises(KeyError):
             mgr.load_role("broken")
+
+
+def _rewrite(config_file: Path, text: str) -> None:
+    """Rewrite a config file so that its stat identity is guaranteed to change."""
+    before: int = config_file.stat().st_mtime_ns
+    config_file.write_text(text)
+    if config_file.stat().st_mtime_ns == before:
+        os.utime(config_file, ns=(before + 1_000_000, before + 1_000_000))
+
+
+class TestCaching:
+    """Tests for the cached role index and hot reload."""
+
+    def test_parses_file_once_while_unchanged(self, tmp_path: Path) -> None:
+        """Repeated lookups of an unchanged file parse it only once."""
+        config_file: Path = tmp_path / "roles.toml"
+        config_file.write_text(
+            '[reviewer]\nprompt = "Review."\ninteractive = false\n'
+        )
+        mgr: ConfigManager = ConfigManager(config_path=config_file)
+
+        with patch(
+            "bd_agent_chameleon.config_manager.tomllib.load", wraps=tomllib.load,
+        ) as mock_load:
+            for _ in range(5):
+                mgr.load_role("reviewer")
+            mgr.role_names()
+
+        assert mock_load.call_count == 1
+
+    def test_reloads_after_file_changes(self, tmp_path: Path) -> None:
+        """An edited prompt is returned by the next lookup."""
+        config_file: Path = tmp_path / "roles.toml"
+        config_file.write_text(
+            '[reviewer]\nprompt = "Review."\ninteractive = false\n'
+        )
+        mgr: ConfigManager = ConfigManager(config_path=config_file)
+        assert mgr.load_role("reviewer").prompt == "Review."
+
+        _rewrite(
+            config_file, '[reviewer]\nprompt = "Review harder."\ninteractive = false\n',
+        )
+
+        assert mgr.load_role("reviewer").prompt == "Review harder."
+
+    def test_keeps_previous_roles_when_reload_fails(self, tmp_path: Path) -> None:
+        """A broken edit does not take down roles that already loaded."""
+        config_file: Path = tmp_path / "roles.toml"
+        config_file.write_text(
+            '[reviewer]\nprompt = "Review."\ninteractive = false\n'
+        )
+        mgr: ConfigManager = ConfigManager(config_path=config_file)
+        mgr.load_role("reviewer")
+
+        _rewrite(config_file, "this is not [valid toml ===")
+
+        assert mgr.load_role("reviewer").prompt == "Review."
+
+    def test_keeps_previous_roles_when_file_disappears(
+        self, tmp_path: Path,
+    ) -> None:
+        """A config file removed mid-run keeps serving the last good roles."""
+        config_file: Path = tmp_path / "roles.toml"
+        config_file.write_text(
+            '[reviewer]\nprompt = "Review."\ninteractive = false\n'
+        )
+        mgr: ConfigManager = ConfigManager(config_path=config_file)
+        mgr.load_role("reviewer")
+        config_file.unlink()
+
+        assert mgr.load_role("reviewer").name == "reviewer"
@@ -0,0 +1,137 @@
+"""Tests for the database change watchers."""
+
+import sys
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+
+from bd_agent_chameleon.broker import BROKER_SOCKET_NAME
+from bd_agent_chameleon.db_watcher import (
+    OWN_FILE_PREFIX,
+    InotifyWatcher,
+    StatWatcher,
+    create_watcher,
+)
+from bd_agent_chameleon.leases import LEASE_DB_NAME, LeaseStore
+
+
+def _write_later(path: Path, delay: float) -> threading.Thread:
+    """Write to a file from a background thread after a delay."""
+
+    def write() -> None:
+        """Sleep, then append to the file."""
+        time.sleep(delay)
+        with open(path, "a") as f:
+            f.write("change\n")
+
+    thread: threading.Thread = threading.Thread(target=write)
+    thread.start()
+    return thread
+
+
+class TestStatWatcher:
+    """Tests for the stat-polling fallback."""
+
+    def test_times_out_without_changes(self, tmp_path: Path) -> None:
+        """wait() returns False when nothing changes before the timeout."""
+        (tmp_path / "beads.db").write_text("x")
+        watcher: StatWatcher = StatWatcher(tmp_path, check_interval=0.01)
+
+        assert watcher.wait(0.05) is False
+
+    def test_detects_change_before_timeout(self, tmp_path: Path) -> None:
+        """wait() returns True soon after a file in the directory changes."""
+        db_file: Path = tmp_path / "beads.db"
+        db_file.write_text("x")
+        watcher: StatWatcher = StatWatcher(tmp_path, check_interval=0.01)
+        writer: threading.Thread = _write_later(db_file, 0.05)
+
+        start: float = time.monotonic()
+        assert watcher.wait(5.0) is True
+        assert time.monotonic() - start < 2.0
+        writer.join()
+
+    def test_change_between_waits_is_not_missed(self, tmp_path: Path) -> None:
+        """A change made while the caller was busy wakes the next wait."""
+        watcher: StatWatcher = StatWatcher(tmp_path, check_interval=0.01)
+        (tmp_path / "beads.db-wal").write_text("x")
+
+        assert watcher.wait(0.0) is True
+
+    def test_ignores_lease_heartbeats(self, tmp_path: Path) -> None:
+        """Writes to the lease store beside the database do not wake waiters."""
+        watcher: StatWatcher = StatWatcher(tmp_path, check_interval=0.01)
+        LeaseStore(tmp_path / LEASE_DB_NAME).acquire("t-1", "me", timedelta(seconds=60))
+
+        assert watcher.wait(0.05) is False
+
+
+@pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="inotify is Linux-only",
+)
+class TestInotifyWatcher:
+    """Tests for the inotify watcher."""
+
+    def test_times_out_without_changes(self, tmp_path: Path) -> None:
+        """wait() returns False when no events arrive."""
+        watcher: InotifyWatcher = InotifyWatcher(tmp_path)
+        try:
+            assert watcher.wait(0.05) is False
+        finally:
+            watcher.close()
+
+    def test_wakes_on_write(self, tmp_path: Path) -> None:
+        """wait() returns True when a file in the directory is written."""
+        watcher: InotifyWatcher = InotifyWatcher(tmp_path)
+        try:
+            writer: threading.Thread = _write_later(tmp_path / "beads.db", 0.05)
+            assert watcher.wait(5.0) is True
+            writer.join()
+            time.sleep(0.05)
+            watcher.wait(0.0)
+            assert watcher.wait(0.05) is False
+        finally:
+            watcher.close()
+
+    def test_ignores_lease_heartbeats(self, tmp_path: Path) -> None:
+        """Lease store writes are skipped, but a task write still wakes."""
+        watcher: InotifyWatcher = InotifyWatcher(tmp_path)
+        try:
+            leases: LeaseStore = LeaseStore(tmp_path / LEASE_DB_NAME)
+            leases.acquire("t-1", "me", timedelta(seconds=60))
+            assert watcher.wait(0.05) is False
+            writer: threading.Thread = _write_later(tmp_path / "beads.db", 0.05)
+            assert watcher.wait(5.0) is True
+            writer.join()
+        finally:
+            watcher.close()
+
+    def test_missing_directory_raises(self, tmp_path: Path) -> None:
+        """Watching a directory that does not exist raises OSError."""
+        with pytest.raises(OSError):
+            InotifyWatcher(tmp_path / "missing")
+
+
+class TestCreateWatcher:
+    """Tests for watcher selection."""
+
+    def test_watches_parent_of_database_file(self, tmp_path: Path) -> None:
+        """A database file path is watched through its directory."""
+        db_file: Path = tmp_path / "beads.db"
+        db_file.write_text("x")
+        watcher = create_watcher(db_file)
+        try:
+            writer: threading.Thread = _write_later(tmp_path / "beads.db-wal", 0.05)
+            assert watcher.wait(5.0) is True
+            writer.join()
+        finally:
+            watcher.close()
+
+
+def test_own_files_share_the_ignored_prefix() -> None:
+    """Every file chameleon keeps beside the database is ignored by watchers."""
+    assert LEASE_DB_NAME.startswith(OWN_FILE_PREFIX)
+    assert BROKER_SOCKET_NAME.startswith(OWN_FILE_PREFIX)
@@ -0,0 +1,297 @@
+"""Tests for the fleet supervisor."""
+
+import sys
+import threading
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from bd_agent_chameleon.fleet import FleetSupervisor, ProcessSpawner
+from bd_agent_chameleon.models import Role, Task, TaskStatus
+
+
+class FakeWorker:
+    """Worker handle whose exit is controlled by the test."""
+
+    def __init__(self, role: Role) -> None:
+        """Start out running."""
+        self.role: Role = role
+        self.returncode: int | None = None
+        self.terminated: bool = False
+
+    def poll(self) -> int | None:
+        """Return the exit status, if any."""
+        return self.returncode
+
+    def terminate(self) -> None:
+        """Record the request and exit cleanly."""
+        self.terminated = True
+        self.returncode = 0
+
+    def wait(self, timeout: float | None = None) -> int:
+        """Return the exit status of a stopped worker."""
+        assert self.returncode is not None
+        return self.returncode
+
+
+class FakeSpawner:
+    """Records every worker it starts."""
+
+    def __init__(self) -> None:
+        """Initialize the spawn log."""
+        self.spawned: list[FakeWorker] = []
+
+    def spawn(self, role: Role) -> FakeWorker:
+        """Start a fake worker for the role."""
+        worker: FakeWorker = FakeWorker(role)
+        self.spawned.append(worker)
+        return worker
+
+
+class FakeConfigManager:
+    """Serves a mutable set of roles."""
+
+    def __init__(self, *roles: Role) -> None:
+        """Index the roles by name."""
+        self.roles: dict[str, Role] = {role.name: role for role in roles}
+
+    def role_names(self) -> list[str]:
+        """List the configured role names."""
+        return list(self.roles)
+
+    def load_role(self, name: str) -> Role:
+        """Return the named role."""
+        return self.roles[name]
+
+
+class BacklogTaskManager:
+    """Reports configurable numbers of open, blocked and held tasks per label."""
+
+    def __init__(
+        self,
+        backlog: dict[str, int],
+        in_progress: dict[str, int] | None = None,
+        blocked: dict[str, int] | None = None,
+    ) -> None:
+        """Store the backlog sizes."""
+        self.backlog: dict[str, int] = backlog
+        self.in_progress: dict[str, int] = in_progress or {}
+        self.blocked: dict[str, int] = blocked or {}
+
+    def poll(self, label: str) -> list[Task]:
+        """Return the label's open tasks, blocked ones last."""
+        ready: int = self.backlog.get(label, 0)
+        return [
+            Task(
+                id=f"{label}-{i}",
+                title="",
+                description="",
+                status=TaskStatus.OPEN,
+                ready=i < ready,
+            )
+            for i in range(ready + self.blocked.get(label, 0))
+        ]
+
+    def count_in_progress(self, label: str) -> int:
+        """Return the label's number of held tasks."""
+        return self.in_progress.get(label, 0)
+
+
+CODER: Role = Role(
+    name="coder", prompt="Code.", interactive=False, min_workers=1, max_workers=3,
+)
+
+
+def _supervisor(
+    task_mgr: BacklogTaskManager, spawner: FakeSpawner, *roles: Role,
+) -> FleetSupervisor:
+    """Build a supervisor over fakes."""
+    return FleetSupervisor(
+        FakeConfigManager(*roles),
+        task_mgr,
+        spawner,
+        timedelta(seconds=0),
+    )
+
+
+class TestScaling:
+    """Tests for sizing roles to their backlog."""
+
+    def test_scales_up_to_backlog_within_max(self) -> None:
+        """A deep backlog starts workers up to max_workers."""
+        spawner: FakeSpawner = FakeSpawner()
+        supervisor: FleetSupervisor = _supervisor(
+            BacklogTaskManager({"role-coder": 10}), spawner, CODER,
+        )
+        supervisor.reconcile()
+
+        assert supervisor.workers("coder") == 3
+        assert len(spawner.spawned) == 3
+
+    def test_keeps_min_workers_when_idle(self) -> None:
+        """An empty backlog still keeps min_workers running."""
+        spawner: FakeSpawner = FakeSpawner()
+        supervisor: FleetSupervisor = _supervisor(
+            BacklogTaskManager({}), spawner, CODER,
+        )
+        supervisor.reconcile()
+
+        assert supervisor.workers("coder") == 1
+
+    def test_scale_down_terminates_surplus_gracefully(self) -> None:
+        """A shrinking backlog terminates the newest workers without replacing them."""
+        task_mgr: BacklogTaskManager = BacklogTaskManager({"role-coder": 3})
+        spawner: FakeSpawner = FakeSpawner()
+        supervisor: FleetSupervisor = _supervisor(task_mgr, spawner, CODER)
+        supervisor.reconcile()
+        task_mgr.backlog["role-coder"] = 1
+        supervisor.reconcile()
+        supervisor.reconcile()
+
+        assert supervisor.workers("coder") == 1
+        assert [w.terminated for w in spawner.spawned] == [False, True, True]
+        assert len(spawner.spawned) == 3
+
+    def test_tasks_per_worker_divides_backlog(self) -> None:
+        """Several open tasks can share one worker."""
+        spawner: FakeSpawner = FakeSpawner()
+        supervisor: FleetSupervisor = FleetSupervisor(
+            FakeConfigManager(CODER),
+            BacklogTaskManager({"role-coder": 5}),
+            spawner,
+            tasks_per_worker=4,
+        )
+        supervisor.reconcile()
+
+        assert supervisor.workers("coder") == 2
+
+    def test_claimed_work_keeps_its_workers(self) -> None:
+        """Tasks moving from open to in progress do not scale the role down."""
+        task_mgr: BacklogTaskManager = BacklogTaskManager({"role-coder": 3})
+        spawner: FakeSpawner = FakeSpawner()
+        supervisor: FleetSupervisor = _supervisor(task_mgr, spawner, CODER)
+        supervisor.reconcile()
+        task_mgr.backlog["role-coder"] = 0
+        task_mgr.in_progress["role-coder"] = 3
+        supervisor.reconcile()
+
+        assert supervisor.workers("coder") == 3
+        assert not any(w.terminated for w in spawner.spawned)
+
+    def test_blocked_tasks_do_not_add_workers(self) -> None:
+        """Only ready open tasks count toward the backlog."""
+        spawner: FakeSpawner = FakeSpawner()
+        supervisor: FleetSupervisor = _supervisor(
+            BacklogTaskManager({"role-coder": 1}, blocked={"role-coder": 5}),
+            spawner,
+            CODER,
+        )
+        supervisor.reconcile()
+
+        assert supervisor.workers("coder") == 1
+
+
+class TestRestarts:
+    """Tests for replacing and retiring workers."""
+
+    def test_replaces_crashed_worker(self) -> None:
+        """A worker that exits on its own is replaced on the next check."""
+        spawner: FakeSpawner = FakeSpawner()
+        supervisor: FleetSupervisor = _supervisor(
+            BacklogTaskManager({}), spawner, CODER,
+        )
+        supervisor.reconcile()
+        spawner.spawned[0].returncode = 1
+        supervisor.reconcile()
+
+        assert len(spawner.spawned) == 2
+        assert supervisor.workers("coder") == 1
+
+    def test_removed_role_is_drained(self) -> None:
+        """Workers for a role dropped from the config are stopped."""
+        config: FakeConfigManager = FakeConfigManager(CODER)
+        spawner: FakeSpawner = FakeSpawner()
+        supervisor: FleetSupervisor = FleetSupervisor(
+            config,
+            BacklogTaskManager({}),
+            spawner,
+        )
+        supervisor.reconcile()
+        del config.roles["coder"]
+        supervisor.reconcile()
+
+        assert supervisor.workers("coder") == 0
+        assert spawner.spawned[0].terminated
+
+    def test_run_stops_every_worker_on_shutdown(self) -> None:
+        """Shutting the supervisor down terminates and waits for all workers."""
+        spawner: FakeSpawner = FakeSpawner()
+        supervisor: FleetSupervisor = _supervisor(
+            BacklogTaskManager({"role-coder": 2}), spawner, CODER,
+        )
+        runner: threading.Thread = threading.Thread(target=supervisor.run)
+        runner.start()
+        supervisor.shutdown()
+        runner.join(timeout=5)
+
+        assert not runner.is_alive()
+        assert spawner.spawned
+        assert all(w.terminated for w in spawner.spawned)
+
+    def test_rejects_non_positive_tasks_per_worker(self) -> None:
+        """tasks_per_worker must be at least one."""
+        with pytest.raises(ValueError, match="tasks_per_worker"):
+            FleetSupervisor(
+                FakeConfigManager(CODER),
+                BacklogTaskManager({}),
+                FakeSpawner(),
+                tasks_per_worker=0,
+            )
+
+
+class TestProcessSpawner:
+    """Tests for spawning real worker processes."""
+
+    @patch("bd_agent_chameleon.fleet.subprocess.Popen")
+    def test_runs_the_chameleon_entry_point(self, mock_popen: MagicMock) -> None:
+        """Workers run the package's run command for a single role."""
+        spawner: ProcessSpawner = ProcessSpawner(
+            Path("roles.toml"), Path(".beads"), ["--watch"],
+        )
+        spawner.spawn(CODER)
+
+        cmd: list[str] = mock_popen.call_args[0][0]
+        assert cmd[:4] == [sys.executable, "-m", "bd_agent_chameleon.main", "run"]
+        assert cmd[cmd.index("--role") + 1] == "coder"
+        assert cmd[-1] == "--watch"
+
+
+class TestLeaseReaping:
+    """Tests for running the lease reaper inside the fleet."""
+
+    def test_each_check_reaps_expired_leases(self) -> None:
+        """Every reconcile pass asks the reaper to re-open dead workers' tasks."""
+
+        class CountingReaper:
+            """Counts reap passes."""
+
+            passes: int = 0
+
+            def reap(self) -> list[str]:
+                """Record a pass."""
+                self.passes += 1
+                return []
+
+        reaper: CountingReaper = CountingReaper()
+        supervisor: FleetSupervisor = FleetSupervisor(
+            FakeConfigManager(CODER),
+            BacklogTaskManager({}),
+            FakeSpawner(),
+            reaper=reaper,
+        )
+        supervisor.reconcile()
+        supervisor.reconcile()
+
+        assert reaper.passes == 2
@@ -0,0 +1,187 @@
+"""Tests for claim leases, heartbeats, and the expired-lease reaper."""
+
+import time
+from collections.abc import Iterable
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+
+from bd_agent_chameleon.leases import (
+    LeaseKeeper,
+    LeaseReaper,
+    LeaseStore,
+    default_lease_path,
+)
+from bd_agent_chameleon.models import Task
+
+TTL: timedelta = timedelta(seconds=60)
+
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self) -> None:
+        """Start at an arbitrary epoch."""
+        self.now: float = 1000.0
+
+    def __call__(self) -> float:
+        """Return the current fake time."""
+        return self.now
+
+
+class CountingStore(LeaseStore):
+    """LeaseStore that counts batched renewals."""
+
+    renewals: int = 0
+
+    def renew(self, task_ids: Iterable[str], owner: str, ttl: timedelta) -> None:
+        """Count the batch, then renew."""
+        self.renewals += 1
+        super().renew(task_ids, owner, ttl)
+
+
+class ReleasingTaskManager:
+    """Records releases, optionally failing them."""
+
+    def __init__(self, fail: bool = False) -> None:
+        """Initialize the release log."""
+        self.released: list[str] = []
+        self._fail: bool = fail
+
+    def poll(self, label: str) -> list[Task]:
+        """Unused."""
+        return []
+
+    def poll_any(self, labels: list[str]) -> list[Task]:
+        """Unused."""
+        return []
+
+    def claim(self, task_id: str) -> None:
+        """Unused."""
+
+    def describe(self, task: Task) -> Task:
+        """Return the task unchanged."""
+        return task
+
+    def complete(self, task_id: str) -> None:
+        """Unused."""
+
+    def release(self, task_id: str) -> None:
+        """Record the release, or fail."""
+        if self._fail:
+            raise RuntimeError("bd unavailable")
+        self.released.append(task_id)
+
+    def park(self, task_id: str) -> None:
+        """Parking is not exercised by the lease tests."""
+
+
+class TestLeaseStore:
+    """Tests for the SQLite lease table."""
+
+    def test_expired_leases_are_taken_once(self, tmp_path: Path) -> None:
+        """Only leases past expiry are returned, and only once."""
+        clock: FakeClock = FakeClock()
+        store: LeaseStore = LeaseStore(tmp_path / "l.db", clock)
+        store.acquire("a", "w1", timedelta(seconds=10))
+        store.acquire("b", "w1", timedelta(seconds=100))
+        clock.now += 50
+
+        assert store.take_expired() == [("a", "w1")]
+        assert store.take_expired() == []
+
+    def test_renew_extends_only_the_owners_leases(self, tmp_path: Path) -> None:
+        """A heartbeat from one owner cannot keep another owner's lease alive."""
+        clock: FakeClock = FakeClock()
+        store: LeaseStore = LeaseStore(tmp_path / "l.db", clock)
+        store.acquire("a", "w1", timedelta(seconds=10))
+        store.acquire("b", "w2", timedelta(seconds=10))
+        clock.now += 5
+        store.renew(["a", "b"], "w1", timedelta(seconds=10))
+        clock.now += 8
+
+        assert store.take_expired() == [("b", "w2")]
+
+    def test_default_path_sits_beside_the_database(self, tmp_path: Path) -> None:
+        """The lease database lives in the beads directory."""
+        assert default_lease_path(tmp_path).parent == tmp_path
+
+
+class TestLeaseKeeper:
+    """Tests for tracking and heartbeating leases."""
+
+    def test_heartbeat_renews_all_leases_in_one_batch(self, tmp_path: Path) -> None:
+        """Many held leases cost one store write per heartbeat."""
+        clock: FakeClock = FakeClock()
+        store: CountingStore = CountingStore(tmp_path / "l.db", clock)
+        keeper: LeaseKeeper = LeaseKeeper(store, TTL, owner="w1")
+        for i in range(100):
+            keeper.track(str(i))
+        clock.now += 50
+        keeper.heartbeat()
+        clock.now += 50
+
+        assert store.renewals == 1
+        assert store.take_expired() == []
+
+    def test_untracked_lease_is_dropped(self, tmp_path: Path) -> None:
+        """A completed task leaves no lease behind to reap."""
+        clock: FakeClock = FakeClock()
+        store: LeaseStore = LeaseStore(tmp_path / "l.db", clock)
+        keeper: LeaseKeeper = LeaseKeeper(store, TTL, owner="w1")
+        keeper.track("a")
+        keeper.untrack("a")
+        clock.now += 1000
+
+        assert store.take_expired() == []
+
+    def test_rejects_heartbeat_not_shorter_than_ttl(self, tmp_path: Path) -> None:
+        """The heartbeat must fire before the lease it renews expires."""
+        with pytest.raises(ValueError, match="heartbeat"):
+            LeaseKeeper(LeaseStore(tmp_path / "l.db"), TTL, TTL)
+
+    def test_background_heartbeat_keeps_leases_alive(self, tmp_path: Path) -> None:
+        """The heartbeat thread renews leases until closed."""
+        store: CountingStore = CountingStore(tmp_path / "l.db")
+        keeper: LeaseKeeper = LeaseKeeper(
+            store, timedelta(seconds=1), timedelta(milliseconds=10), owner="w1",
+        )
+        keeper.track("a")
+        keeper.start()
+        try:
+            for _ in range(500):
+                if store.renewals >= 2:
+                    break
+                time.sleep(0.01)
+        finally:
+            keeper.close()
+
+        assert store.renewals >= 2
+
+
+class TestLeaseReaper:
+    """Tests for re-opening tasks with expired leases."""
+
+    def test_releases_tasks_with_expired_leases(self, tmp_path: Path) -> None:
+        """Expired tasks are released; live ones are left alone."""
+        clock: FakeClock = FakeClock()
+        store: LeaseStore = LeaseStore(tmp_path / "l.db", clock)
+        store.acquire("dead", "w1", timedelta(seconds=10))
+        store.acquire("alive", "w2", timedelta(seconds=100))
+        clock.now += 50
+        task_mgr: ReleasingTaskManager = ReleasingTaskManager()
+
+        assert LeaseReaper(store, task_mgr).reap() == ["dead"]
+        assert task_mgr.released == ["dead"]
+
+    def test_failed_release_is_retried_next_pass(self, tmp_path: Path) -> None:
+        """A task that could not be released stays eligible for reaping."""
+        clock: FakeClock = FakeClock()
+        store: LeaseStore = LeaseStore(tmp_path / "l.db", clock)
+        store.acquire("dead", "w1", timedelta(seconds=10))
+        clock.now += 50
+
+        assert LeaseReaper(store, ReleasingTaskManager(fail=True)).reap() == []
+        clock.now += 1
+        assert LeaseReaper(store, ReleasingTaskManager()).reap() == ["dead"]
@@ -0,0 +1,194 @@
+"""Tests for metric families, exposition, exporters, and MeteredTaskManager."""
+
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from bd_agent_chameleon.metrics import (
+    ChameleonMetrics,
+    MeteredTaskManager,
+    MetricsRegistry,
+    MetricsServer,
+    TextfileExporter,
+)
+from bd_agent_chameleon.models import Task, TaskStatus
+from bd_agent_chameleon.protocols import ClaimConflictError
+
+
+def _task(task_id: str, *labels: str) -> Task:
+    """Build an open task carrying the given labels."""
+    return Task(
+        id=task_id,
+        title=task_id,
+        description="",
+        status=TaskStatus.OPEN,
+        labels=list(labels),
+    )
+
+
+class ScriptedTaskManager:
+    """Returns a fixed poll result and fails claims as instructed."""
+
+    def __init__(self, tasks: list[Task], claim_error: Exception | None = None) -> None:
+        """Store the poll result and the error claims should raise."""
+        self._tasks: list[Task] = tasks
+        self._claim_error: Exception | None = claim_error
+        self.released: list[str] = []
+        self.parked: list[str] = []
+
+    def poll(self, label: str) -> list[Task]:
+        """Return the fixed result."""
+        return self._tasks
+
+    def poll_any(self, labels: list[str]) -> list[Task]:
+        """Return the fixed result."""
+        return self._tasks
+
+    def claim(self, task_id: str) -> None:
+        """Raise the configured error, if any."""
+        if self._claim_error is not None:
+            raise self._claim_error
+
+    def describe(self, task: Task) -> Task:
+        """Return the task unchanged."""
+        return task
+
+    def complete(self, task_id: str) -> None:
+        """Succeed."""
+
+    def release(self, task_id: str) -> None:
+        """Record the release."""
+        self.released.append(task_id)
+
+    def park(self, task_id: str) -> None:
+        """Record the park."""
+        self.parked.append(task_id)
+
+
+class TestExposition:
+    """Tests for the text exposition format."""
+
+    def test_counter_and_gauge_render_with_labels(self) -> None:
+        """Counters and gauges render HELP, TYPE, and labelled samples."""
+        registry: MetricsRegistry = MetricsRegistry()
+        registry.counter("jobs_total", "Jobs run.", ("kind",)).labels("a").inc(2)
+        registry.gauge("depth", "Queue depth.").set(3)
+        text: str = registry.render()
+        assert "# HELP jobs_total Jobs run.\n# TYPE jobs_total counter\n" in text
+        assert 'jobs_total{kind="a"} 2.0\n' in text
+        assert "# TYPE depth gauge\ndepth 3.0\n" in text
+
+    def test_histogram_buckets_are_cumulative(self) -> None:
+        """Bucket counts include every smaller bucket and end with +Inf."""
+        registry: MetricsRegistry = MetricsRegistry()
+        histogram = registry.histogram("latency", "Latency.", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 5.0):
+            histogram.observe(value)
+        text: str = registry.render()
+        assert 'latency_bucket{le="0.1"} 2\n' in text
+        assert 'latency_bucket{le="1.0"} 3\n' in text
+        assert 'latency_bucket{le="+Inf"} 4\n' in text
+        assert "latency_sum 5.65\n" in text
+        assert "latency_count 4\n" in text
+
+    def test_label_values_are_escaped(self) -> None:
+        """Quotes, backslashes, and newlines in label values are escaped."""
+        registry: MetricsRegistry = MetricsRegistry()
+        registry.counter("c", "C.", ("v",)).labels('a"b\\c\nd').inc()
+        assert 'c{v="a\\"b\\\\c\\nd"} 1.0' in registry.render()
+
+    def test_wrong_label_count_is_rejected(self) -> None:
+        """Asking for a series with the wrong number of labels fails."""
+        registry: MetricsRegistry = MetricsRegistry()
+        with pytest.raises(ValueError, match="takes labels"):
+            registry.counter("c", "C.", ("v",)).labels()
+
+
+class TestMeteredTaskManager:
+    """Tests for the recording task manager wrapper."""
+
+    def test_empty_poll_counts_and_sets_depth(self) -> None:
+        """An empty poll is counted and zeroes the label's queue depth."""
+        metrics: ChameleonMetrics = ChameleonMetrics()
+        MeteredTaskManager(ScriptedTaskManager([]), metrics).poll("role-a")
+        assert metrics.polls.labels().value == 1
+        assert metrics.empty_polls.labels().value == 1
+        assert metrics.queue_depth.labels("role-a").value == 0
+
+    def test_poll_any_sets_depth_per_label(self) -> None:
+        """A combined poll records each label's share of the result."""
+        metrics: ChameleonMetrics = ChameleonMetrics()
+        tasks: list[Task] = [_task("1", "role-a"), _task("2", "role-a", "role-b")]
+        MeteredTaskManager(ScriptedTaskManager(tasks), metrics).poll_any(
+            ["role-a", "role-b"],
+        )
+        assert metrics.empty_polls.labels().value == 0
+        assert metrics.queue_depth.labels("role-a").value == 2
+        assert metrics.queue_depth.labels("role-b").value == 1
+
+    def test_claim_failures_are_counted_by_reason(self) -> None:
+        """Conflicts and other claim errors are counted separately."""
+        metrics: ChameleonMetrics = ChameleonMetrics()
+        conflicting = MeteredTaskManager(
+            ScriptedTaskManager([], ClaimConflictError("1")), metrics,
+        )
+        broken = MeteredTaskManager(ScriptedTaskManager([], OSError("bd")), metrics)
+        with pytest.raises(ClaimConflictError):
+            conflicting.claim("1")
+        with pytest.raises(OSError):
+            broken.claim("2")
+        assert metrics.claim_failures.labels("conflict").value == 1
+        assert metrics.claim_failures.labels("error").value == 1
+        assert metrics.claim_seconds.labels().snapshot()[0][-1] == 2
+
+    def test_claim_next_records_its_poll_and_claims(self) -> None:
+        """claim_next goes through the metered poll and claim."""
+        metrics: ChameleonMetrics = ChameleonMetrics()
+        mgr = MeteredTaskManager(ScriptedTaskManager([_task("1"), _task("2")]), metrics)
+        task: Task | None = mgr.claim_next("role-a", exclude={"1"})
+        assert task is not None
+        assert task.id == "2"
+        assert metrics.polls.labels().value == 1
+        assert metrics.claim_seconds.labels().snapshot()[0][-1] == 1
+
+    def test_release_passes_through(self) -> None:
+        """Releases reach the wrapped manager."""
+        inner: ScriptedTaskManager = ScriptedTaskManager([])
+        MeteredTaskManager(inner, ChameleonMetrics()).release("9")
+        assert inner.released == ["9"]
+
+
+class TestExporters:
+    """Tests for the HTTP endpoint and the textfile exporter."""
+
+    def test_http_endpoint_serves_metrics(self) -> None:
+        """GET /metrics returns the rendered registry; other paths 404."""
+        metrics: ChameleonMetrics = ChameleonMetrics()
+        metrics.polls.inc()
+        server: MetricsServer = MetricsServer(metrics.registry, 0)
+        server.start()
+        try:
+            url: str = f"http://127.0.0.1:{server.port}"
+            with urllib.request.urlopen(f"{url}/metrics") as response:
+                body: str = response.read().decode()
+            with pytest.raises(urllib.error.HTTPError):
+                urllib.request.urlopen(f"{url}/other")
+        finally:
+            server.close()
+        assert "chameleon_polls_total 1.0" in body
+
+    def test_textfile_is_written_on_start_and_close(self, tmp_path: Path) -> None:
+        """The file holds current values and no temp files are left behind."""
+        metrics: ChameleonMetrics = ChameleonMetrics()
+        path: Path = tmp_path / "chameleon.prom"
+        exporter: TextfileExporter = TextfileExporter(
+            metrics.registry, path, interval=3600,
+        )
+        exporter.start()
+        assert "chameleon_polls_total 0.0" in path.read_text()
+        metrics.polls.inc()
+        exporter.close()
+        assert "chameleon_polls_total 1.0" in path.read_text()
+        assert [p.name for p in tmp_path.iterdir()] == ["chameleon.prom"]
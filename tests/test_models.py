@@ -2,7 +2,14 @@
 
 import pytest
 
-from bd_agent_chameleon.models import Role, Task, TaskStatus
+from bd_agent_chameleon import models
+from bd_agent_chameleon.models import (
+    Role,
+    Task,
+    TaskStatus,
+    intern_labels,
+    task_status,
+)
 
 
 class TestTask:
@@ -38,6 +45,42 @@ class TestTask:
             task.id = "2"  # type: ignore[misc]
 
 
+    def test_slotted(self) -> None:
+        """Task and Role carry no per-instance __dict__."""
+        task = Task(id="1", title="t", description="d", status=TaskStatus.OPEN)
+        role = Role(name="r", prompt="p", interactive=False)
+        assert not hasattr(task, "__dict__")
+        assert not hasattr(role, "__dict__")
+
+
+class TestInterning:
+    """Tests for sharing repeated task fields."""
+
+    def test_equal_label_sets_share_one_tuple(self) -> None:
+        """Label sets built separately come back as the same object."""
+        first: tuple[str, ...] = intern_labels(["role-" + "qa", "p1"])
+        second: tuple[str, ...] = intern_labels(("role-qa", "p" + "1"))
+        assert first is second
+        assert first == ("role-qa", "p1")
+
+    def test_label_set_table_is_bounded(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """The intern table is emptied once it holds MAX_LABEL_SETS sets."""
+        monkeypatch.setattr(models, "_LABEL_SETS", {})
+        monkeypatch.setattr(models, "MAX_LABEL_SETS", 2)
+        first: tuple[str, ...] = intern_labels(["a"])
+        intern_labels(["b"])
+        intern_labels(["c"])
+
+        assert len(models._LABEL_SETS) == 1
+        assert intern_labels(["a"]) == first
+
+    def test_status_lookup(self) -> None:
+        """Known statuses map to members; unknown ones are rejected."""
+        assert task_status("in_progress") is TaskStatus.IN_PROGRESS
+        with pytest.raises(ValueError):
+            task_status("bogus")
+
+
 class TestRole:
     """Tests for the Role dataclass."""
 
@@ -78,3 +121,28 @@ class TestRole:
         role = Role(name="r", prompt="p", interactive=False)
         with pytest.raises(AttributeError):
             role.name = "x"  # type: ignore[misc]
+
+    def test_worker_bounds_default_to_zero_and_one(self) -> None:
+        """Fleet worker bounds default to scale-to-zero with one worker at most."""
+        role = Role(name="r", prompt="p", interactive=False)
+        assert (role.min_workers, role.max_workers) == (0, 1)
+
+    def test_rejects_min_workers_above_max(self) -> None:
+        """min_workers may not exceed max_workers."""
+        with pytest.raises(ValueError, match="min_workers"):
+            Role(name="r", prompt="p", interactive=False, min_workers=3, max_workers=2)
+
+    @pytest.mark.parametrize(
+        "field",
+        [
+            "timeout_seconds",
+            "cpu_seconds",
+            "memory_mb",
+            "launches_per_minute",
+            "launch_burst",
+        ],
+    )
+    def test_rejects_non_positive_session_limits(self, field: str) -> None:
+        """Session limits must be positive when set."""
+        with pytest.raises(ValueError, match=field):
+            Role(name="r", prompt="p", interactive=False, **{field: 0})
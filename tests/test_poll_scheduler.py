@@ -0,0 +1,171 @@
+"""Unit tests for PollBackoff and RetryTracker."""
+
+import logging
+import random
+from datetime import timedelta
+
+import pytest
+
+from bd_agent_chameleon.poll_scheduler import PollBackoff, RetryTracker
+
+
+def _seconds(delta: timedelta) -> float:
+    """Return a timedelta as float seconds."""
+    return delta.total_seconds()
+
+
+class TestBackoff:
+    """Tests for exponential growth and reset."""
+
+    def test_fixed_interval_without_ceiling(self) -> None:
+        """Without a max interval, every wait is the minimum interval."""
+        backoff: PollBackoff = PollBackoff(timedelta(seconds=2))
+
+        waits: list[float] = [_seconds(backoff.next_interval()) for _ in range(3)]
+
+        assert waits == [2.0, 2.0, 2.0]
+
+    def test_grows_exponentially_to_ceiling(self) -> None:
+        """Empty polls double the wait until the ceiling is reached."""
+        backoff: PollBackoff = PollBackoff(
+            timedelta(seconds=1), timedelta(seconds=5), multiplier=2.0,
+        )
+
+        waits: list[float] = [_seconds(backoff.next_interval()) for _ in range(5)]
+
+        assert waits == [1.0, 2.0, 4.0, 5.0, 5.0]
+
+    def test_reset_snaps_back_to_minimum(self) -> None:
+        """Finding work returns the wait to the minimum interval."""
+        backoff: PollBackoff = PollBackoff(
+            timedelta(seconds=1), timedelta(seconds=8),
+        )
+        for _ in range(3):
+            backoff.next_interval()
+        backoff.reset()
+
+        assert backoff.current == timedelta(seconds=1)
+        assert _seconds(backoff.next_interval()) == 1.0
+
+    def test_jitter_stays_within_bounds(self) -> None:
+        """Jittered waits stay within the configured fraction of the base."""
+        backoff: PollBackoff = PollBackoff(
+            timedelta(seconds=10), jitter=0.2, rng=random.Random(7),
+        )
+
+        waits: list[float] = [_seconds(backoff.next_interval()) for _ in range(50)]
+
+        assert all(8.0 <= w <= 12.0 for w in waits)
+        assert len(set(waits)) > 1
+
+    def test_instances_desynchronize(self) -> None:
+        """Differently seeded instances produce different wait sequences."""
+        first: PollBackoff = PollBackoff(
+            timedelta(seconds=2), jitter=0.1, rng=random.Random(1),
+        )
+        second: PollBackoff = PollBackoff(
+            timedelta(seconds=2), jitter=0.1, rng=random.Random(2),
+        )
+
+        assert first.next_interval() != second.next_interval()
+
+    def test_logs_when_ceiling_reached_and_reset(
+        self, caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        """Reaching the ceiling and resetting are logged at INFO."""
+        backoff: PollBackoff = PollBackoff(
+            timedelta(seconds=1), timedelta(seconds=2),
+        )
+        with caplog.at_level(logging.INFO, logger="bd_agent_chameleon"):
+            backoff.next_interval()
+            backoff.reset()
+
+        messages: str = caplog.text
+        assert "ceiling" in messages
+        assert "reset" in messages
+
+
+class TestValidation:
+    """Tests for PollBackoff argument validation."""
+
+    def test_rejects_ceiling_below_minimum(self) -> None:
+        """max_interval below min_interval is rejected."""
+        with pytest.raises(ValueError, match="max_interval"):
+            PollBackoff(timedelta(seconds=5), timedelta(seconds=1))
+
+    def test_rejects_shrinking_multiplier(self) -> None:
+        """A multiplier below one is rejected."""
+        with pytest.raises(ValueError, match="multiplier"):
+            PollBackoff(timedelta(seconds=1), multiplier=0.5)
+
+    def test_rejects_full_jitter(self) -> None:
+        """A jitter of one or more is rejected."""
+        with pytest.raises(ValueError, match="jitter"):
+            PollBackoff(timedelta(seconds=1), jitter=1.0)
+
+
+class FakeClock:
+    """A monotonic clock that only moves when told to."""
+
+    def __init__(self) -> None:
+        """Start at zero."""
+        self.now: float = 0.0
+
+    def __call__(self) -> float:
+        """Return the current reading."""
+        return self.now
+
+
+class TestRetryTracker:
+    """Tests for per-task retry delays and exhaustion."""
+
+    def test_retry_delay_doubles_per_failure(self) -> None:
+        """Each failure keeps the task cooling for twice as long as the last."""
+        clock: FakeClock = FakeClock()
+        tracker: RetryTracker = RetryTracker(5, timedelta(seconds=10), clock)
+
+        assert not tracker.failed("a")
+        clock.now = 9.0
+        assert tracker.cooling("a")
+        clock.now = 10.0
+        assert not tracker.cooling("a")
+        assert not tracker.failed("a")
+        clock.now = 29.0
+        assert tracker.cooling("a")
+        clock.now = 30.0
+        assert not tracker.cooling("a")
+
+    def test_exhausted_after_max_attempts(self) -> None:
+        """The failure that reaches max_attempts reports the task exhausted."""
+        tracker: RetryTracker = RetryTracker(2, timedelta(0), FakeClock())
+
+        assert not tracker.failed("a")
+        assert tracker.failed("a")
+        assert not tracker.cooling("a")
+
+    def test_success_clears_failures(self) -> None:
+        """A successful session resets the count and the delay."""
+        tracker: RetryTracker = RetryTracker(2, timedelta(seconds=10), FakeClock())
+        tracker.failed("a")
+        tracker.succeeded("a")
+
+        assert not tracker.cooling("a")
+        assert not tracker.failed("a")
+
+    def test_tasks_are_tracked_separately(self) -> None:
+        """One task's failures do not delay another task."""
+        tracker: RetryTracker = RetryTracker(3, timedelta(seconds=10), FakeClock())
+        tracker.failed("a")
+
+        assert tracker.cooling("a")
+        assert not tracker.cooling("b")
+
+    def test_rejects_zero_attempts(self) -> None:
+        """max_attempts below one is rejected."""
+        with pytest.raises(ValueError, match="max_attempts"):
+            RetryTracker(0)
+
+    def test_rejects_negative_delay(self) -> None:
+        """A negative retry delay is rejected."""
+        with pytest.raises(ValueError, match="retry_delay"):
+            RetryTracker(3, timedelta(seconds=-1))
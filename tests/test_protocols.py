@@ -1,5 +1,6 @@
 """Protocol conformance tests for bd-agent-chameleon extension points."""
 
+from collections.abc import Collection
 from typing import Protocol, runtime_checkable
 
 from pathlib import Path
@@ -27,12 +28,30 @@ class FakeTaskManager:
         """Return an empty task list."""
         return []
 
+    def poll_any(self, labels: list[str]) -> list[Task]:
+        """Return an empty task list."""
+        return []
+
     def claim(self, task_id: str) -> None:
         """No-op claim."""
 
+    def describe(self, task: Task) -> Task:
+        """Return the task unchanged."""
+        return task
+
     def complete(self, task_id: str) -> None:
         """No-op complete."""
 
+    def release(self, task_id: str) -> None:
+        """No-op release."""
+
+    def park(self, task_id: str) -> None:
+        """No-op park."""
+
+    def claim_next(self, label: str, exclude: Collection[str] = ()) -> Task | None:
+        """Claim nothing."""
+        return None
+
 
 class FakeSessionLauncher:
     """Minimal SessionLauncher implementation for conformance testing."""
@@ -0,0 +1,207 @@
+"""Tests for candidate selection strategies."""
+
+import random
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from bd_agent_chameleon.models import Task, TaskStatus
+from bd_agent_chameleon.selection import (
+    ChainedSelector,
+    FirstSelector,
+    HashShardSelector,
+    PriorityOrdering,
+    RandomTopKSelector,
+    SelectionStrategy,
+    TwoChoicesSelector,
+    create_selector,
+)
+
+
+def _tasks(count: int) -> list[Task]:
+    """Build open tasks with ids t-0 .. t-(count-1)."""
+    return [
+        Task(id=f"t-{i}", title="T", description="", status=TaskStatus.OPEN)
+        for i in range(count)
+    ]
+
+
+NOW: datetime = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+def _aged(task_id: str, priority: int, age: timedelta | None) -> Task:
+    """Build an open task with a priority, created ``age`` before NOW."""
+    return Task(
+        id=task_id,
+        title="T",
+        description="",
+        status=TaskStatus.OPEN,
+        priority=priority,
+        created_at=None if age is None else NOW - age,
+    )
+
+
+def _ids(tasks: list[Task]) -> list[str]:
+    """Return the ids of the tasks in order."""
+    return [task.id for task in tasks]
+
+
+class TestFirstSelector:
+    """Tests for head-of-queue selection."""
+
+    def test_keeps_poll_order(self) -> None:
+        """Tasks come back in the order they were polled."""
+        tasks: list[Task] = _tasks(3)
+        assert FirstSelector().order(tasks) == tasks
+
+
+class TestRandomTopKSelector:
+    """Tests for random-of-top-K selection."""
+
+    def test_only_the_window_is_shuffled(self) -> None:
+        """The first k tasks are permuted and the rest keep their order."""
+        tasks: list[Task] = _tasks(10)
+        ordered: list[Task] = RandomTopKSelector(4, random.Random(1)).order(tasks)
+        assert sorted(_ids(ordered[:4])) == _ids(tasks[:4])
+        assert ordered[4:] == tasks[4:]
+
+    def test_spreads_first_picks(self) -> None:
+        """Different workers start from different tasks."""
+        tasks: list[Task] = _tasks(8)
+        firsts: set[str] = {
+            RandomTopKSelector(8, random.Random(seed)).order(tasks)[0].id
+            for seed in range(20)
+        }
+        assert len(firsts) > 3
+
+    def test_rejects_empty_window(self) -> None:
+        """A window of zero tasks is rejected."""
+        with pytest.raises(ValueError, match="k must be"):
+            RandomTopKSelector(0)
+
+
+class TestHashShardSelector:
+    """Tests for rendezvous-hash sharding."""
+
+    def test_order_is_stable_per_worker(self) -> None:
+        """One worker ranks the same tasks the same way every poll."""
+        tasks: list[Task] = _tasks(20)
+        selector: HashShardSelector = HashShardSelector("host:1")
+        assert selector.order(tasks) == selector.order(list(reversed(tasks)))
+
+    def test_workers_prefer_different_tasks(self) -> None:
+        """A fleet of workers mostly starts from distinct tasks."""
+        tasks: list[Task] = _tasks(100)
+        firsts: set[str] = {
+            HashShardSelector(f"host:{pid}").order(tasks)[0].id for pid in range(10)
+        }
+        assert len(firsts) >= 8
+
+    def test_window_keeps_later_tasks_in_order(self) -> None:
+        """Only the first ``window`` tasks are ranked."""
+        tasks: list[Task] = _tasks(10)
+        ordered: list[Task] = HashShardSelector("w", window=3).order(tasks)
+        assert sorted(_ids(ordered[:3])) == _ids(tasks[:3])
+        assert ordered[3:] == tasks[3:]
+
+
+class TestTwoChoicesSelector:
+    """Tests for power-of-two-choices selection."""
+
+    def test_puts_the_better_sample_first_and_keeps_the_rest(self) -> None:
+        """The earlier of two sampled tasks leads; every task is still offered."""
+        tasks: list[Task] = _tasks(10)
+        rng: random.Random = random.Random(3)
+        expected: int = min(random.Random(3).sample(range(10), 2))
+        ordered: list[Task] = TwoChoicesSelector(rng).order(tasks)
+        assert ordered[0] == tasks[expected]
+        assert sorted(_ids(ordered)) == sorted(_ids(tasks))
+
+    def test_single_task_is_unchanged(self) -> None:
+        """With fewer than two tasks there is nothing to choose between."""
+        tasks: list[Task] = _tasks(1)
+        assert TwoChoicesSelector().order(tasks) == tasks
+
+
+class TestPriorityOrdering:
+    """Tests for priority-then-age ordering."""
+
+    def test_orders_by_priority_then_oldest(self) -> None:
+        """Lower priority numbers lead; ties go to the oldest task."""
+        tasks: list[Task] = [
+            _aged("new-p2", 2, timedelta(minutes=1)),
+            _aged("old-p2", 2, timedelta(hours=1)),
+            _aged("p0", 0, timedelta(minutes=1)),
+            _aged("undated-p2", 2, None),
+        ]
+        ordered: list[Task] = PriorityOrdering(clock=lambda: NOW).order(tasks)
+        assert _ids(ordered) == ["p0", "old-p2", "new-p2", "undated-p2"]
+
+    def test_aging_lets_old_work_overtake_urgent_work(self) -> None:
+        """A task waiting several aging periods outranks a fresh urgent task."""
+        tasks: list[Task] = [
+            _aged("fresh-p1", 1, timedelta(0)),
+            _aged("stale-p3", 3, timedelta(hours=3)),
+        ]
+        plain: PriorityOrdering = PriorityOrdering(clock=lambda: NOW)
+        aged: PriorityOrdering = PriorityOrdering(
+            aging=timedelta(hours=1), clock=lambda: NOW,
+        )
+        assert _ids(plain.order(tasks)) == ["fresh-p1", "stale-p3"]
+        assert _ids(aged.order(tasks)) == ["stale-p3", "fresh-p1"]
+
+    def test_window_orders_only_the_best_tasks(self) -> None:
+        """The best ``window`` tasks lead and the rest keep their poll order."""
+        tasks: list[Task] = [
+            _aged(f"t-{i}", priority, None)
+            for i, priority in enumerate([3, 2, 0, 3, 1])
+        ]
+        ordered: list[Task] = PriorityOrdering(window=2).order(tasks)
+        assert _ids(ordered) == ["t-2", "t-4", "t-0", "t-1", "t-3"]
+
+    def test_rejects_non_positive_aging(self) -> None:
+        """An aging period of zero is rejected."""
+        with pytest.raises(ValueError, match="aging"):
+            PriorityOrdering(aging=timedelta(0))
+
+
+class TestChainedSelector:
+    """Tests for composing selectors."""
+
+    def test_applies_selectors_in_sequence(self) -> None:
+        """The spread strategy works on the ranked order."""
+        tasks: list[Task] = [_aged("low", 3, None), _aged("high", 0, None)]
+        chained: ChainedSelector = ChainedSelector(
+            PriorityOrdering(), RandomTopKSelector(1),
+        )
+        assert _ids(chained.order(tasks)) == ["high", "low"]
+
+
+class TestCreateSelector:
+    """Tests for building strategies by name."""
+
+    @pytest.mark.parametrize(
+        ("strategy", "kind"),
+        [
+            (SelectionStrategy.FIRST, FirstSelector),
+            (SelectionStrategy.RANDOM_TOP_K, RandomTopKSelector),
+            (SelectionStrategy.HASH, HashShardSelector),
+            (SelectionStrategy.TWO_CHOICES, TwoChoicesSelector),
+        ],
+    )
+    def test_builds_each_strategy(
+        self, strategy: SelectionStrategy, kind: type,
+    ) -> None:
+        """Each strategy name maps to its selector class."""
+        assert isinstance(create_selector(strategy, "w"), kind)
+
+    def test_ordering_runs_before_the_strategy(self) -> None:
+        """An ordering is chained in front of a spread strategy."""
+        ordering: PriorityOrdering = PriorityOrdering()
+        assert create_selector(SelectionStrategy.FIRST, "w", ordering=ordering) is (
+            ordering
+        )
+        assert isinstance(
+            create_selector(SelectionStrategy.HASH, "w", ordering=ordering),
+            ChainedSelector,
+        )
@@ -0,0 +1,140 @@
+"""Tests for per-task session logs."""
+
+import io
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from bd_agent_chameleon.session_log import RotatingLog, pump_process
+
+
+class TestRotatingLog:
+    """Tests for size-based rotation."""
+
+    def test_rotates_into_numbered_backups(self, tmp_path: Path) -> None:
+        """Overflowing the limit shifts the file to .1 and older ones up."""
+        path: Path = tmp_path / "t.log"
+        log: RotatingLog = RotatingLog(path, max_bytes=4, backups=2)
+        for chunk in (b"aaaa", b"bbbb", b"cccc", b"dddd"):
+            log.write(chunk)
+        log.close()
+
+        assert path.read_bytes() == b"dddd"
+        assert (tmp_path / "t.log.1").read_bytes() == b"cccc"
+        assert (tmp_path / "t.log.2").read_bytes() == b"bbbb"
+        assert not (tmp_path / "t.log.3").exists()
+
+    def test_zero_backups_truncates_in_place(self, tmp_path: Path) -> None:
+        """Without backups the file is simply truncated on overflow."""
+        path: Path = tmp_path / "t.log"
+        log: RotatingLog = RotatingLog(path, max_bytes=4, backups=0)
+        log.write(b"aaa")
+        log.write(b"bb")
+        log.close()
+
+        assert path.read_bytes() == b"bb"
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_appends_to_existing_file(self, tmp_path: Path) -> None:
+        """A rerun of the same task continues the log and counts its size."""
+        path: Path = tmp_path / "t.log"
+        path.write_bytes(b"old")
+        log: RotatingLog = RotatingLog(path, max_bytes=5, backups=1)
+        log.write(b"new")
+        log.close()
+
+        assert path.read_bytes() == b"new"
+        assert (tmp_path / "t.log.1").read_bytes() == b"old"
+
+    def test_rejects_non_positive_limit(self, tmp_path: Path) -> None:
+        """A limit below one byte is rejected."""
+        with pytest.raises(ValueError, match="max_bytes"):
+            RotatingLog(tmp_path / "t.log", max_bytes=0)
+
+
+def _piped(script: str) -> subprocess.Popen[bytes]:
+    """Start a Python script with its stdout and stderr piped."""
+    return subprocess.Popen(
+        [sys.executable, "-c", script],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+
+
+class TestPumpProcess:
+    """Tests for streaming a started process under a timeout."""
+
+    def test_captures_both_streams_and_tees(self, tmp_path: Path) -> None:
+        """Stdout and stderr land in the log and in their tee streams."""
+        path: Path = tmp_path / "t.log"
+        log: RotatingLog = RotatingLog(path, max_bytes=1 << 20)
+        out: io.BytesIO = io.BytesIO()
+        err: io.BytesIO = io.BytesIO()
+        proc = _piped(
+            "import sys; sys.stdout.write('hello'); sys.stdout.flush(); "
+            "sys.stderr.write('oops'); sys.exit(3)"
+        )
+        status: int | None = pump_process(proc, log, out, err)
+        log.close()
+
+        assert status == 3
+        assert sorted(path.read_bytes().decode()) == sorted("hellooops")
+        assert out.getvalue() == b"hello"
+        assert err.getvalue() == b"oops"
+
+    def test_large_output_is_rotated_while_streaming(self, tmp_path: Path) -> None:
+        """Output larger than the limit is split across rotated files."""
+        path: Path = tmp_path / "t.log"
+        log: RotatingLog = RotatingLog(path, max_bytes=100_000, backups=1)
+        pump_process(_piped("import sys; sys.stdout.write('x' * 1_000_000)"), log)
+        log.close()
+
+        assert path.stat().st_size <= 100_000
+        assert (tmp_path / "t.log.1").stat().st_size <= 100_000
+
+    def test_returns_exit_status_within_timeout(self, tmp_path: Path) -> None:
+        """A process that finishes in time reports its exit status."""
+        log: RotatingLog = RotatingLog(tmp_path / "t.log", max_bytes=1 << 20)
+        proc = _piped("import sys; print('done'); sys.exit(4)")
+        status: int | None = pump_process(proc, log, timeout=30)
+        log.close()
+
+        assert status == 4
+        assert (tmp_path / "t.log").read_text() == "done\n"
+
+    def test_output_is_drained_until_sigkill(self, tmp_path: Path) -> None:
+        """A process ignoring SIGTERM keeps being read until SIGKILL lands."""
+        log: RotatingLog = RotatingLog(tmp_path / "t.log", max_bytes=1 << 30)
+        script: str = (
+            "import signal, sys, time\n"
+            "signal.signal(signal.SIGTERM, signal.SIG_IGN)\n"
+            "print('started', flush=True)\n"
+            "while True:\n"
+            "    sys.stdout.write('x' * 65536)\n"
+        )
+        proc = _piped(script)
+        start: float = time.monotonic()
+        status: int | None = pump_process(proc, log, timeout=0.5, kill_grace=0.5)
+        log.close()
+
+        assert status is None
+        assert proc.returncode == -9
+        assert time.monotonic() - start < 10
+        assert (tmp_path / "t.log").stat().st_size > 1 << 20
+
+    def test_timeout_covers_a_process_that_closed_its_pipes(
+        self, tmp_path: Path,
+    ) -> None:
+        """Closing stdout and stderr does not escape the timeout."""
+        log: RotatingLog = RotatingLog(tmp_path / "t.log", max_bytes=1 << 20)
+        proc = _piped("import os, time; os.close(1); os.close(2); time.sleep(60)")
+        start: float = time.monotonic()
+        status: int | None = pump_process(proc, log, timeout=0.5, kill_grace=0.5)
+        log.close()
+
+        assert status is None
+        assert time.monotonic() - start < 10
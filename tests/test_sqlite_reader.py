@@ -0,0 +1,264 @@
+"""Unit tests for SqliteTaskReader against a minimal beads-shaped database."""
+
+import sqlite3
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+from bd_agent_chameleon.models import Task, TaskStatus
+from bd_agent_chameleon.sqlite_reader import SqliteTaskReader
+
+
+def _make_db(db_file: Path) -> None:
+    """Create a beads-like database with a few labeled issues."""
+    conn: sqlite3.Connection = sqlite3.connect(db_file)
+    conn.executescript(
+        """
+        PRAGMA journal_mode = WAL;
+        CREATE TABLE issues (
+            id TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            description TEXT,
+            status TEXT NOT NULL,
+            priority INTEGER NOT NULL DEFAULT 2,
+            created_at TEXT,
+            updated_at TEXT NOT NULL DEFAULT '2026-01-01T00:00:00Z'
+        );
+        CREATE TABLE labels (issue_id TEXT NOT NULL, label TEXT NOT NULL);
+        CREATE TABLE dependencies (
+            issue_id TEXT NOT NULL,
+            depends_on_id TEXT NOT NULL,
+            type TEXT NOT NULL DEFAULT 'blocks'
+        );
+        INSERT INTO issues (id, title, description, status) VALUES
+            ('a-1', 'Open QA', 'Check it', 'open'),
+            ('a-2', 'Busy QA', 'Running', 'in_progress'),
+            ('a-3', 'Open dev', NULL, 'open'),
+            ('a-4', 'No desc QA', NULL, 'open');
+        INSERT INTO labels VALUES
+            ('a-1', 'role-qa'),
+            ('a-2', 'role-qa'),
+            ('a-3', 'role-dev'),
+            ('a-4', 'role-qa');
+        """
+    )
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def db_dir(tmp_path: Path) -> Path:
+    """Return a directory holding a populated beads.db."""
+    _make_db(tmp_path / "beads.db")
+    return tmp_path
+
+
+class TestPoll:
+    """Tests for SqliteTaskReader.poll."""
+
+    def test_returns_open_tasks_for_label(self, db_dir: Path) -> None:
+        """Only open tasks with the requested label are returned."""
+        reader: SqliteTaskReader = SqliteTaskReader(db_dir)
+        tasks: list[Task] = reader.poll("role-qa")
+
+        assert sorted(t.id for t in tasks) == ["a-1", "a-4"]
+        assert Task(
+            id="a-1",
+            title="Open QA",
+            description="",
+            status=TaskStatus.OPEN,
+            labels=("role-qa",),
+            summary=True,
+        ) in tasks
+
+    def test_null_description_becomes_empty(self, db_dir: Path) -> None:
+        """A NULL description is returned as an empty string."""
+        reader: SqliteTaskReader = SqliteTaskReader(db_dir)
+
+        assert reader.description("a-3") == ""
+
+    def test_description_of_missing_task_is_none(self, db_dir: Path) -> None:
+        """Reading the description of an unknown task returns None."""
+        reader: SqliteTaskReader = SqliteTaskReader(db_dir)
+
+        assert reader.description("a-1") == "Check it"
+        assert reader.description("nope") is None
+
+    def test_limit_keeps_the_most_urgent(self, db_dir: Path) -> None:
+        """With a limit, only the most urgent tasks are returned."""
+        conn: sqlite3.Connection = sqlite3.connect(db_dir / "beads.db")
+        conn.execute("UPDATE issues SET priority = 0 WHERE id = 'a-4'")
+        conn.commit()
+        conn.close()
+        reader: SqliteTaskReader = SqliteTaskReader(db_dir, limit=1)
+
+        assert [t.id for t in reader.poll("role-qa")] == ["a-4"]
+
+    def test_blocked_tasks_do_not_use_up_the_limit(self, db_dir: Path) -> None:
+        """Blocked tasks more urgent than a ready one do not crowd it out."""
+        writer: sqlite3.Connection = sqlite3.connect(db_dir / "beads.db")
+        writer.executescript(
+            """
+            UPDATE issues SET priority = 0 WHERE id IN ('a-1', 'a-4');
+            INSERT INTO issues (id, title, status, priority) VALUES
+                ('a-5', 'Ready QA', 'open', 1);
+            INSERT INTO labels VALUES ('a-5', 'role-qa');
+            INSERT INTO dependencies (issue_id, depends_on_id) VALUES
+                ('a-1', 'a-2'), ('a-4', 'a-2');
+            """
+        )
+        writer.commit()
+        writer.close()
+        reader: SqliteTaskReader = SqliteTaskReader(db_dir, limit=2)
+
+        tasks: list[Task] = reader.poll("role-qa")
+
+        assert tasks[0].id == "a-5"
+        assert tasks[0].ready
+        assert not tasks[1].ready
+
+    def test_unchanged_rows_reuse_their_tasks(self, db_dir: Path) -> None:
+        """A second poll returns the same objects for rows that did not change."""
+        reader: SqliteTaskReader = SqliteTaskReader(db_dir)
+        first: dict[str, Task] = {t.id: t for t in reader.poll("role-qa")}
+        writer: sqlite3.Connection = sqlite3.connect(db_dir / "beads.db")
+        writer.execute("UPDATE issues SET priority = 0 WHERE id = 'a-4'")
+        writer.commit()
+        writer.close()
+
+        second: dict[str, Task] = {t.id: t for t in reader.poll("role-qa")}
+
+        assert second["a-1"] is first["a-1"]
+        assert second["a-4"] is not first["a-4"]
+        assert second["a-4"].priority == 0
+
+    def test_accepts_database_file_path(self, db_dir: Path) -> None:
+        """The reader can be pointed at the database file itself."""
+        reader: SqliteTaskReader = SqliteTaskReader(db_dir / "beads.db")
+
+        assert [t.id for t in reader.poll("role-dev")] == ["a-3"]
+
+    def test_connection_is_read_only(self, db_dir: Path) -> None:
+        """Writes through the reader's connection are rejected."""
+        reader: SqliteTaskReader = SqliteTaskReader(db_dir)
+        reader.poll("role-qa")
+
+        with pytest.raises(sqlite3.Error):
+            reader._connection().execute("DELETE FROM issues")
+
+    def test_sees_writes_between_polls(self, db_dir: Path) -> None:
+        """A reused connection observes rows committed after the previous poll."""
+        reader: SqliteTaskReader = SqliteTaskReader(db_dir)
+        assert len(reader.poll("role-dev")) == 1
+
+        writer: sqlite3.Connection = sqlite3.connect(db_dir / "beads.db")
+        writer.execute("UPDATE issues SET status = 'closed' WHERE id = 'a-3'")
+        writer.commit()
+        writer.close()
+
+        assert reader.poll("role-dev") == []
+
+    def test_reads_priority_age_and_blockers(self, db_dir: Path) -> None:
+        """Tasks carry priority and creation time; open blockers unset ready."""
+        writer: sqlite3.Connection = sqlite3.connect(db_dir / "beads.db")
+        writer.executescript(
+            """
+            UPDATE issues SET priority = 0, created_at = '2026-01-02T03:04:05Z'
+                WHERE id = 'a-1';
+            INSERT INTO dependencies (issue_id, depends_on_id) VALUES
+                ('a-1', 'a-2'), ('a-4', 'a-3');
+            UPDATE issues SET status = 'closed' WHERE id = 'a-3';
+            """
+        )
+        writer.commit()
+        writer.close()
+
+        tasks: dict[str, Task] = {
+            t.id: t for t in SqliteTaskReader(db_dir).poll("role-qa")
+        }
+
+        assert tasks["a-1"].priority == 0
+        assert tasks["a-1"].created_at == datetime(2026, 1, 2, 3, 4, 5, tzinfo=UTC)
+        assert not tasks["a-1"].ready
+        assert tasks["a-4"].priority == 2
+        assert tasks["a-4"].ready
+
+    def test_poll_any_matches_any_label_once(self, db_dir: Path) -> None:
+        """poll_any returns each matching task once with all of its labels."""
+        writer: sqlite3.Connection = sqlite3.connect(db_dir / "beads.db")
+        writer.execute("INSERT INTO labels VALUES ('a-1', 'role-dev')")
+        writer.commit()
+        writer.close()
+        reader: SqliteTaskReader = SqliteTaskReader(db_dir)
+
+        tasks: list[Task] = reader.poll_any(["role-qa", "role-dev"])
+
+        assert sorted(t.id for t in tasks) == ["a-1", "a-3", "a-4"]
+        by_id: dict[str, Task] = {t.id: t for t in tasks}
+        assert set(by_id["a-1"].labels) == {"role-qa", "role-dev"}
+
+    def test_missing_schema_raises_sqlite_error(self, tmp_path: Path) -> None:
+        """A database without the beads tables raises sqlite3.Error."""
+        sqlite3.connect(tmp_path / "beads.db").close()
+        reader: SqliteTaskReader = SqliteTaskReader(tmp_path)
+
+        with pytest.raises(sqlite3.Error):
+            reader.poll("role-qa")
+
+
+def _write(db_dir: Path, script: str) -> None:
+    """Run a write script against the test database."""
+    writer: sqlite3.Connection = sqlite3.connect(db_dir / "beads.db")
+    writer.executescript(script)
+    writer.commit()
+    writer.close()
+
+
+class TestChanges:
+    """Tests for snapshot and changed-since reads."""
+
+    def test_snapshot_cursor_is_newest_update(self, db_dir: Path) -> None:
+        """A snapshot lists every open task and the newest updated_at."""
+        _write(
+            db_dir,
+            "UPDATE issues SET updated_at = '2026-02-01T00:00:00Z' WHERE id = 'a-2';",
+        )
+        tasks, cursor = SqliteTaskReader(db_dir, limit=1).snapshot(["role-qa"])
+
+        assert sorted(t.id for t in tasks) == ["a-1", "a-4"]
+        assert cursor == "2026-02-01T00:00:00Z"
+
+    def test_changes_include_claimed_and_closed_tasks(self, db_dir: Path) -> None:
+        """Rows updated since the cursor come back whatever their status."""
+        reader: SqliteTaskReader = SqliteTaskReader(db_dir)
+        _, cursor = reader.snapshot(["role-qa"])
+        _write(
+            db_dir,
+            "UPDATE issues SET status = 'in_progress',"
+            " updated_at = '2026-03-01T00:00:00Z' WHERE id = 'a-1';",
+        )
+
+        changed, after = reader.changes(["role-qa"], "2026-02-01T00:00:00Z")
+
+        assert [(t.id, t.status) for t in changed] == [
+            ("a-1", TaskStatus.IN_PROGRESS),
+        ]
+        assert after == "2026-03-01T00:00:00Z"
+        assert cursor < after
+
+    def test_closing_a_blocker_changes_the_blocked_task(self, db_dir: Path) -> None:
+        """A task whose blocker was updated is reported, now ready."""
+        _write(
+            db_dir,
+            "INSERT INTO dependencies (issue_id, depends_on_id)"
+            " VALUES ('a-4', 'a-3');"
+            "UPDATE issues SET status = 'closed',"
+            " updated_at = '2026-03-01T00:00:00Z' WHERE id = 'a-3';",
+        )
+
+        changed, _ = SqliteTaskReader(db_dir).changes(
+            ["role-qa"], "2026-02-01T00:00:00Z",
+        )
+
+        assert [(t.id, t.ready) for t in changed] == [("a-4", True)]
@@ -0,0 +1,109 @@
+"""Tests for JSON-lines tracing and the cycle profiler."""
+
+import json
+import pstats
+import threading
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from bd_agent_chameleon.tracing import NULL_TRACER, CycleProfiler, JsonLinesTracer
+
+
+def _records(path: Path) -> list[dict[str, Any]]:
+    """Read every span record from a trace file."""
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestNullTracer:
+    """Tests for the disabled tracer."""
+
+    def test_spans_are_one_shared_no_op(self) -> None:
+        """Every span is the same reusable object and records nothing."""
+        first = NULL_TRACER.span("poll", task="1")
+        with first, NULL_TRACER.span("claim"):
+            pass
+        assert NULL_TRACER.span("launch") is first
+
+
+class TestJsonLinesTracer:
+    """Tests for writing spans as JSON lines."""
+
+    def test_nested_spans_link_to_their_parent(self, tmp_path: Path) -> None:
+        """An inner span names the outer span as its parent."""
+        path: Path = tmp_path / "trace.jsonl"
+        tracer: JsonLinesTracer = JsonLinesTracer(path)
+        with tracer.span("poll", labels=1), tracer.span("bd.exec", command="list"):
+            pass
+        tracer.close()
+
+        inner, outer = _records(path)
+        assert outer["name"] == "poll"
+        assert outer["parent_id"] is None
+        assert outer["attributes"] == {"labels": 1}
+        assert inner["name"] == "bd.exec"
+        assert inner["parent_id"] == outer["span_id"]
+        assert inner["duration_ms"] >= 0
+        assert inner["error"] is None
+
+    def test_failed_span_records_the_error(self, tmp_path: Path) -> None:
+        """A block that raises is written with the exception type."""
+        path: Path = tmp_path / "trace.jsonl"
+        tracer: JsonLinesTracer = JsonLinesTracer(path)
+        with pytest.raises(OSError), tracer.span("claim"):
+            raise OSError("bd")
+        tracer.close()
+
+        assert _records(path)[0]["error"] == "OSError"
+
+    def test_threads_have_separate_parents(self, tmp_path: Path) -> None:
+        """A span on another thread is not parented to this thread's span."""
+        path: Path = tmp_path / "trace.jsonl"
+        tracer: JsonLinesTracer = JsonLinesTracer(path)
+
+        def launch() -> None:
+            """Record a span on a worker thread."""
+            with tracer.span("launch"):
+                pass
+
+        with tracer.span("poll"):
+            thread: threading.Thread = threading.Thread(target=launch)
+            thread.start()
+            thread.join()
+        tracer.close()
+
+        launch_record: dict[str, Any] = next(
+            r for r in _records(path) if r["name"] == "launch"
+        )
+        assert launch_record["parent_id"] is None
+
+
+class TestCycleProfiler:
+    """Tests for profiling a fixed number of cycles."""
+
+    def test_dumps_stats_after_the_last_cycle(self, tmp_path: Path) -> None:
+        """Stats are written once the requested cycles have finished."""
+        path: Path = tmp_path / "cycles.prof"
+        profiler: CycleProfiler = CycleProfiler(path, cycles=2)
+        profiler.tick()
+        profiler.tick()
+        assert not path.exists()
+        profiler.tick()
+        assert path.exists()
+        assert pstats.Stats(str(path)).total_calls > 0  # type: ignore[attr-defined]
+
+    def test_finish_dumps_a_partial_profile(self, tmp_path: Path) -> None:
+        """Stopping early still writes what was profiled."""
+        path: Path = tmp_path / "cycles.prof"
+        profiler: CycleProfiler = CycleProfiler(path, cycles=100)
+        profiler.tick()
+        profiler.finish()
+        profiler.finish()
+        assert path.exists()
+
+    def test_finish_without_cycles_writes_nothing(self, tmp_path: Path) -> None:
+        """A profiler that never ticked leaves no file behind."""
+        path: Path = tmp_path / "cycles.prof"
+        CycleProfiler(path).finish()
+        assert not path.exists()